@@ -19,10 +19,11 @@ import os
 import vertexai
 from absl import app, flags
 from dotenv import load_dotenv
-from financial_advisor.agent import root_agent
 from vertexai import agent_engines
 from vertexai.preview.reasoning_engines import AdkApp
 
+from financial_advisor import root_agent
+
 FLAGS = flags.FLAGS
 flags.DEFINE_string("project_id", None, "GCP project ID.")
 flags.DEFINE_string("location", None, "GCP location.")
@@ -35,6 +36,22 @@ flags.DEFINE_bool("delete", False, "Deletes an existing agent.")
 flags.mark_bool_flags_as_mutual_exclusive(["create", "delete"])
 
 
+def default_project_id() -> str | None:
+    """Project of the application default credentials, if there is one.
+
+    Importing financial_advisor no longer sets GOOGLE_CLOUD_PROJECT, so the
+    project is resolved here when neither the flag nor the variable is set.
+    """
+    import google.auth
+    from google.auth.exceptions import DefaultCredentialsError
+
+    try:
+        _, project_id = google.auth.default()
+    except DefaultCredentialsError:
+        return None
+    return project_id
+
+
 def create() -> None:
     """Creates an agent engine for Financial Advisors.
 
@@ -59,13 +76,15 @@ def create() -> None:
         adk_app,
         display_name=root_agent.name,
         requirements=[
-            "google-adk (>=0.0.2)",
+            "google-adk (>=1.16.0)",
             "google-cloud-aiplatform[agent_engines] (>=1.91.0,!=1.92.0)",
             "google-genai (>=1.5.0,<2.0.0)",
             "pydantic (>=2.10.6,<3.0.0)",
             "absl-py (>=2.2.1,<3.0.0)",
             "fpdf2 (>=2.8.0)",           # PDF generation
             "matplotlib (>=3.10.0)",     # Plotting utilities
+            "numpy (>=1.26.0)",          # Indicators and the OHLCV store
+            "prometheus-client (>=0.20.0)",  # Metrics
             "python-dotenv (>=1.0.0)",   # Environment variables
         ],
         #        extra_packages=[""],
@@ -100,8 +119,8 @@ def main(argv: list[str]) -> None:
 
     project_id = (
         FLAGS.project_id
-        if FLAGS.project_id
-        else os.getenv("GOOGLE_CLOUD_PROJECT")
+        or os.getenv("GOOGLE_CLOUD_PROJECT")
+        or default_project_id()
     )
     location = (
         FLAGS.location if FLAGS.location else os.getenv("GOOGLE_CLOUD_LOCATION")
@@ -87,7 +87,7 @@ gcloud run deploy "${SERVICE_NAME}" \
     --min-instances=0 \
     --max-instances=10 \
     --set-env-vars="ALPHA_VANTAGE_API_KEY=${ALPHA_VANTAGE_KEY}" \
-    --set-env-vars="GOOGLE_GENAI_USE_VERTEXAI=1"
+    --set-env-vars="GOOGLE_GENAI_USE_VERTEXAI=1,GOOGLE_CLOUD_PROJECT=${PROJECT_ID}"
 
 # Get the service URL
 SERVICE_URL=$(gcloud run services describe "${SERVICE_NAME}" \
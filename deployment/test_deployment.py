@@ -36,14 +36,26 @@ flags.mark_flag_as_required("resource_id")
 flags.mark_flag_as_required("user_id")
 
 
+def default_project_id() -> str | None:
+    """Project of the application default credentials, if there is one."""
+    import google.auth
+    from google.auth.exceptions import DefaultCredentialsError
+
+    try:
+        _, project_id = google.auth.default()
+    except DefaultCredentialsError:
+        return None
+    return project_id
+
+
 def main(argv: list[str]) -> None:  # pylint: disable=unused-argument
 
     load_dotenv()
 
     project_id = (
         FLAGS.project_id
-        if FLAGS.project_id
-        else os.getenv("GOOGLE_CLOUD_PROJECT")
+        or os.getenv("GOOGLE_CLOUD_PROJECT")
+        or default_project_id()
     )
     location = (
         FLAGS.location if FLAGS.location else os.getenv("GOOGLE_CLOUD_LOCATION")
@@ -54,10 +66,6 @@ def main(argv: list[str]) -> None:  # pylint: disable=unused-argument
         else os.getenv("GOOGLE_CLOUD_STORAGE_BUCKET")
     )
 
-    project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
-    location = os.getenv("GOOGLE_CLOUD_LOCATION")
-    bucket = os.getenv("GOOGLE_CLOUD_STORAGE_BUCKET")
-
     if not project_id:
         print("Missing required environment variable: GOOGLE_CLOUD_PROJECT")
         return
@@ -24,11 +24,35 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
-import google.auth
-
-_, project_id = google.auth.default()
-os.environ.setdefault("GOOGLE_CLOUD_PROJECT", project_id)
+# GOOGLE_CLOUD_PROJECT is not looked up here: when it is unset, google-genai
+# reads the project from the application default credentials as the first
+# client is created, which keeps that lookup off the import path.
 os.environ.setdefault("GOOGLE_CLOUD_LOCATION", "global")
 os.environ.setdefault("GOOGLE_GENAI_USE_VERTEXAI", "True")
 
 from . import agent
+
+ROOT_AGENT_ENV = "FINANCIAL_ADVISOR_ROOT_AGENT"
+
+
+def get_root_agent(mode: str | None = None):
+    """
+    Return the root agent for a mode
+
+    Args:
+        mode: "coordinator" (LLM coordinator calling sub-agents as tools) or
+            "workflow" (fixed sequential pipeline behind a conversational
+            front end). Defaults to $FINANCIAL_ADVISOR_ROOT_AGENT, else
+            "coordinator".
+    """
+    mode = (mode or os.getenv(ROOT_AGENT_ENV) or "coordinator").strip().lower()
+    if mode == "coordinator":
+        return agent.financial_coordinator
+    if mode == "workflow":
+        from .workflow import workflow_root_agent
+
+        return workflow_root_agent
+    raise ValueError(f"Unknown {ROOT_AGENT_ENV} {mode!r}; use 'coordinator' or 'workflow'")
+
+
+root_agent = get_root_agent()
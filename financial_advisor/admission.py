@@ -0,0 +1,247 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Admission control for agent runs
+
+At most ADMISSION_MAX_CONCURRENT runs execute at once per instance. Further
+requests wait in a queue of at most ADMISSION_MAX_QUEUE entries for up to
+ADMISSION_QUEUE_TIMEOUT seconds; requests that find the queue full (or time
+out in it) are rejected with 503 and a Retry-After estimate instead of adding
+to a burst of Gemini calls that would all fail with 429.
+
+Waiting requests are grouped per user and freed slots go to users in
+round-robin order, so one user sending many requests does not starve the
+others.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_QUEUE_TIMEOUT = 60.0
+
+# Assumed run duration before any run has finished, in seconds
+DEFAULT_RUN_SECONDS = 60.0
+
+# Weight of the latest run in the moving average of run durations
+_RUN_SECONDS_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """
+    A request was not admitted
+
+    Args:
+        reason: "queue_full" or "queue_timeout"
+        retry_after: Suggested seconds before retrying
+    """
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Server busy ({reason}), retry after {retry_after:.0f}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Admission:
+    """A held run slot; call ``release`` when the run is over."""
+
+    def __init__(self, controller: "AdmissionController"):
+        self._controller = controller
+        self._admitted_at = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(time.monotonic() - self._admitted_at)
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded, per-user fair wait queue
+
+    Args:
+        max_concurrent: Runs allowed at once (defaults to ADMISSION_MAX_CONCURRENT)
+        max_queue: Requests allowed to wait (defaults to ADMISSION_MAX_QUEUE)
+        queue_timeout: Longest wait before rejection (defaults to ADMISSION_QUEUE_TIMEOUT)
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int | None = None,
+        max_queue: int | None = None,
+        queue_timeout: float | None = None,
+    ):
+        self.max_concurrent = max(
+            1,
+            max_concurrent
+            or int(os.getenv("ADMISSION_MAX_CONCURRENT", DEFAULT_MAX_CONCURRENT)),
+        )
+        self.max_queue = (
+            int(os.getenv("ADMISSION_MAX_QUEUE", DEFAULT_MAX_QUEUE))
+            if max_queue is None
+            else max_queue
+        )
+        self.queue_timeout = (
+            float(os.getenv("ADMISSION_QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT))
+            if queue_timeout is None
+            else queue_timeout
+        )
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.run_seconds = DEFAULT_RUN_SECONDS
+        self.stats = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+        # user id -> waiting futures, in round-robin order
+        self._waiters: OrderedDict = OrderedDict()
+
+    def retry_after(self) -> float:
+        """Estimate when a new request would be admitted, in whole seconds."""
+        backlog = (self.queue_depth + 1) / self.max_concurrent
+        return float(max(1, math.ceil(backlog * self.run_seconds)))
+
+    def _admit(self, waited: float) -> Admission:
+        self.stats["admitted"] += 1
+        self.stats["wait_seconds_total"] += waited
+        self.stats["wait_seconds_max"] = max(self.stats["wait_seconds_max"], waited)
+        return Admission(self)
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self.stats["rejected"] += 1
+        if reason == "queue_timeout":
+            self.stats["timed_out"] += 1
+        return AdmissionRejected(reason, self.retry_after())
+
+    async def acquire(self, user_id: str) -> Admission:
+        """
+        Wait for a run slot
+
+        Args:
+            user_id: User the run is for (the unit of fair scheduling)
+
+        Returns:
+            Admission: The held slot
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait timed out
+        """
+        if self.in_flight < self.max_concurrent and not self.queue_depth:
+            self.in_flight += 1
+            return self._admit(0.0)
+        if self.queue_depth >= self.max_queue:
+            raise self._reject("queue_full")
+
+        grant = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(user_id, deque()).append(grant)
+        self.queue_depth += 1
+        self.stats["queued"] += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(grant), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if grant.done() and not grant.cancelled():
+                # Granted as the wait ended; give the slot back if we are cancelled
+                admission = self._admit(time.monotonic() - started)
+                if isinstance(e, asyncio.CancelledError):
+                    admission.release()
+                    raise
+                return admission
+            grant.cancel()
+            self._forget(user_id, grant)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self._reject("queue_timeout") from None
+        return self._admit(time.monotonic() - started)
+
+    def _forget(self, user_id: str, grant: asyncio.Future) -> None:
+        waiting = self._waiters.get(user_id)
+        if waiting and grant in waiting:
+            waiting.remove(grant)
+            self.queue_depth -= 1
+            if not waiting:
+                del self._waiters[user_id]
+
+    def _release(self, held_seconds: float) -> None:
+        self.in_flight -= 1
+        self.run_seconds += _RUN_SECONDS_SMOOTHING * (held_seconds - self.run_seconds)
+        while self.in_flight < self.max_concurrent and self._waiters:
+            user_id, waiting = next(iter(self._waiters.items()))
+            grant = waiting.popleft()
+            self.queue_depth -= 1
+            if waiting:
+                self._waiters.move_to_end(user_id)
+            else:
+                del self._waiters[user_id]
+            if not grant.done():
+                self.in_flight += 1
+                grant.set_result(True)
+
+    @asynccontextmanager
+    async def admit(self, user_id: str) -> AsyncIterator[Admission]:
+        """Hold a run slot for the duration of the block."""
+        admission = await self.acquire(user_id)
+        try:
+            yield admission
+        finally:
+            admission.release()
+
+    def snapshot(self) -> dict:
+        """
+        Report current load and counters
+
+        Returns:
+            dict: in_flight, queue_depth, limits, waiting users, mean and max
+            wait and the admitted/queued/rejected/timed_out counters
+        """
+        admitted = self.stats["admitted"]
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "waiting_users": len(self._waiters),
+            "mean_wait_seconds": (
+                self.stats["wait_seconds_total"] / admitted if admitted else 0.0
+            ),
+            "mean_run_seconds": self.run_seconds,
+            **self.stats,
+        }
+
+
+# Singleton instance
+_controller_instance: AdmissionController | None = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get or create the process-wide admission controller."""
+    global _controller_instance
+    with _controller_lock:
+        if _controller_instance is None:
+            _controller_instance = AdmissionController()
+        return _controller_instance
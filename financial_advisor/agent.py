@@ -18,15 +18,20 @@ from google.adk.agents import LlmAgent
 from google.adk.tools.agent_tool import AgentTool
 
 from . import prompt
+from .model_routing import get_model
+from .output_cache import check_agent_output_cache, store_agent_output
+from .pipeline import (
+    analyze_market_data_parallel_tool,
+    assess_strategy_risks_parallel_tool,
+)
 from .sub_agents.data_analyst import data_analyst_agent
 from .sub_agents.execution_analyst import execution_analyst_agent
 from .sub_agents.risk_analyst import risk_analyst_agent
-from .sub_agents.trading_analyst import trading_analyst_agent
 from .sub_agents.summary_agent import summary_agent
+from .sub_agents.trading_analyst import trading_analyst_agent
 from .tools.visualization_tools import export_summary_to_pdf
 
-
-MODEL = "gemini-2.5-pro"
+MODEL = get_model("financial_coordinator")
 
 
 financial_coordinator = LlmAgent(
@@ -47,8 +52,12 @@ financial_coordinator = LlmAgent(
         AgentTool(agent=execution_analyst_agent),
         AgentTool(agent=risk_analyst_agent),
         AgentTool(agent=summary_agent),
+        analyze_market_data_parallel_tool,
+        assess_strategy_risks_parallel_tool,
         export_summary_to_pdf,
     ],
+    before_tool_callback=check_agent_output_cache,
+    after_tool_callback=store_agent_output,
 )
 
 root_agent = financial_coordinator
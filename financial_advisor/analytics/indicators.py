@@ -0,0 +1,236 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Vectorized technical indicators computed locally from daily OHLCV bars
+
+Every function takes NumPy arrays ordered oldest bar first and returns arrays
+of the same length, with NaN for the warm-up period. Definitions follow the
+TA-Lib conventions Alpha Vantage uses for its indicator endpoints (SMA-seeded
+EMAs, Wilder smoothing for RSI/ATR/ADX, population standard deviation for
+Bollinger Bands), so after the warm-up period values agree with the API
+without spending a call per indicator.
+"""
+
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Exponential weights below this are dropped from the smoothing kernel
+_KERNEL_EPSILON = 1e-12
+
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+
+def _smooth(values: np.ndarray, alpha: float, seed: float) -> np.ndarray:
+    """
+    Exponential smoothing y[n] = (1 - alpha) * y[n-1] + alpha * x[n], y[-1] = seed
+
+    Evaluated in closed form as a seed decay term plus a convolution with a
+    truncated exponential kernel, so there is no Python loop over bars.
+    """
+    n = len(values)
+    if n == 0:
+        return values.copy()
+    decay = 1.0 - alpha
+    if decay <= 0:
+        return values.copy()
+    length = min(n, int(np.ceil(np.log(_KERNEL_EPSILON) / np.log(decay))) + 1)
+    kernel = alpha * decay ** np.arange(length)
+    smoothed = np.convolve(values, kernel)[:n]
+    return smoothed + seed * decay ** np.arange(1, n + 1)
+
+
+def _seeded_average(values: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """SMA of the first ``period`` values, then exponential smoothing."""
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+    seed = values[:period].mean()
+    out[period - 1] = seed
+    out[period:] = _smooth(values[period:], alpha, seed)
+    return out
+
+
+def _nan_aware(values: np.ndarray, fn, *args) -> np.ndarray:
+    """Apply ``fn`` to the non-NaN tail of ``values``, keeping alignment."""
+    out = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid):
+        out[valid[0]:] = fn(values[valid[0]:], *args)
+    return out
+
+
+def sma(close, period: int = 20) -> np.ndarray:
+    """Simple moving average."""
+    close = _as_float(close)
+    out = np.full(len(close), np.nan)
+    if len(close) >= period:
+        cumsum = np.cumsum(np.insert(close, 0, 0.0))
+        out[period - 1:] = (cumsum[period:] - cumsum[:-period]) / period
+    return out
+
+
+def ema(close, period: int = 20) -> np.ndarray:
+    """Exponential moving average seeded with the SMA of the first bars."""
+    return _seeded_average(_as_float(close), period, 2.0 / (period + 1))
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing."""
+    close = _as_float(close)
+    out = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return out
+    change = np.diff(close)
+    gain = _seeded_average(np.clip(change, 0, None), period, 1.0 / period)
+    loss = _seeded_average(np.clip(-change, 0, None), period, 1.0 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + gain / loss)
+    value = np.where(loss == 0, 100.0, value)
+    out[1:] = np.where(np.isnan(gain), np.nan, value)
+    return out
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> dict:
+    """MACD line, signal line and histogram."""
+    close = _as_float(close)
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = _nan_aware(line, ema, signal)
+    return {
+        "macd": line,
+        "signal": signal_line,
+        "histogram": line - signal_line,
+    }
+
+
+def bbands(close, period: int = 20, nbdev: float = 2.0) -> dict:
+    """Bollinger Bands around an SMA using the population standard deviation."""
+    close = _as_float(close)
+    middle = sma(close, period)
+    std = np.full(len(close), np.nan)
+    if len(close) >= period:
+        std[period - 1:] = sliding_window_view(close, period).std(axis=1)
+    return {
+        "upper": middle + nbdev * std,
+        "middle": middle,
+        "lower": middle - nbdev * std,
+    }
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range; the first bar has no previous close and is NaN."""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    prev_close = np.roll(close, 1)
+    tr = np.maximum(high - low, np.maximum(abs(high - prev_close), abs(low - prev_close)))
+    tr[:1] = np.nan
+    return tr
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range with Wilder smoothing."""
+    tr = true_range(high, low, close)
+    out = np.full(len(tr), np.nan)
+    out[1:] = _seeded_average(tr[1:], period, 1.0 / period)
+    return out
+
+
+def adx(high, low, close, period: int = 14) -> dict:
+    """Average Directional Index with the +DI and -DI lines."""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    n = len(close)
+    plus_di = np.full(n, np.nan)
+    minus_di = np.full(n, np.nan)
+    adx_line = np.full(n, np.nan)
+    if n <= period:
+        return {"adx": adx_line, "plus_di": plus_di, "minus_di": minus_di}
+
+    up = np.diff(high)
+    down = -np.diff(low)
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    tr = true_range(high, low, close)[1:]
+
+    smoothed_tr = _seeded_average(tr, period, 1.0 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di[1:] = 100.0 * _seeded_average(plus_dm, period, 1.0 / period) / smoothed_tr
+        minus_di[1:] = 100.0 * _seeded_average(minus_dm, period, 1.0 / period) / smoothed_tr
+        dx = 100.0 * abs(plus_di - minus_di) / (plus_di + minus_di)
+    dx = np.where((plus_di + minus_di) == 0, 0.0, dx)
+    adx_line = _nan_aware(dx, _seeded_average, period, 1.0 / period)
+    return {"adx": adx_line, "plus_di": plus_di, "minus_di": minus_di}
+
+
+def obv(close, volume) -> np.ndarray:
+    """On-Balance Volume, starting from the first bar's volume."""
+    close, volume = _as_float(close), _as_float(volume)
+    if len(close) == 0:
+        return close.copy()
+    direction = np.sign(np.diff(close))
+    return np.concatenate(([volume[0]], volume[0] + np.cumsum(direction * volume[1:])))
+
+
+def stoch(
+    high, low, close, fastk_period: int = 14, slowk_period: int = 3, slowd_period: int = 3
+) -> dict:
+    """Slow stochastic oscillator (%K and %D)."""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    fast_k = np.full(len(close), np.nan)
+    if len(close) >= fastk_period:
+        highest = sliding_window_view(high, fastk_period).max(axis=1)
+        lowest = sliding_window_view(low, fastk_period).min(axis=1)
+        span = highest - lowest
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = 100.0 * (close[fastk_period - 1:] - lowest) / span
+        fast_k[fastk_period - 1:] = np.where(span == 0, 0.0, k)
+    slow_k = _nan_aware(fast_k, sma, slowk_period)
+    slow_d = _nan_aware(slow_k, sma, slowd_period)
+    return {"slow_k": slow_k, "slow_d": slow_d}
+
+
+def stddev(close, period: int = 20) -> np.ndarray:
+    """Rolling population standard deviation of closing prices."""
+    close = _as_float(close)
+    out = np.full(len(close), np.nan)
+    if len(close) >= period:
+        out[period - 1:] = sliding_window_view(close, period).std(axis=1)
+    return out
+
+
+def historical_volatility(close, period: int = 20, periods_per_year: int = 252) -> np.ndarray:
+    """Annualized rolling standard deviation of daily log returns, in percent."""
+    close = _as_float(close)
+    out = np.full(len(close), np.nan)
+    if len(close) > period:
+        returns = np.diff(np.log(close))
+        window_std = sliding_window_view(returns, period).std(axis=1, ddof=1)
+        out[period:] = window_std * np.sqrt(periods_per_year) * 100.0
+    return out
+
+
+def max_drawdown(close) -> float:
+    """Largest peak-to-trough decline over the series, in percent."""
+    close = _as_float(close)
+    if len(close) == 0:
+        return 0.0
+    running_peak = np.maximum.accumulate(close)
+    return float(((close - running_peak) / running_peak).min() * 100.0)
+
+
+def latest(values, digits: int = 4) -> float | None:
+    """Most recent value of a series, rounded, or None if unavailable."""
+    value = float(values[-1]) if len(values) else math.nan
+    return None if math.isnan(value) else round(value, digits)
@@ -0,0 +1,219 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Columnar on-disk store for OHLCV price history
+
+Each (ticker, interval) series lives in its own directory with one raw,
+fixed-width binary file per column::
+
+    <root>/AAPL/daily/timestamp.i8   int64 seconds since epoch, ascending
+    <root>/AAPL/daily/open.f8        float64
+    ...                              high, low, close, volume
+    <root>/AAPL/daily/meta.json      time unit of the series ("D" or "s")
+
+New bars are appended to the end of each file, so an update costs only the
+size of the delta. Reads memory-map the files and slice them with a binary
+search on the timestamp column. The timestamp file is written last, so a
+reader never sees a row whose columns are not all present, and each append
+first cuts the price files back to the timestamp file's length, dropping rows
+left behind by an append that was interrupted.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def get_default_store_path() -> Path:
+    """Return the root directory of the OHLCV store"""
+    configured = os.getenv("OHLCV_STORE_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".cache" / "financial_advisor" / "ohlcv"
+
+
+class OHLCVStore:
+    """
+    Append-only columnar store of OHLCV bars, one series per ticker and interval.
+
+    Bars are passed and returned as dicts of column arrays: ``dates``
+    (numpy datetime64) plus open/high/low/close/volume floats, oldest first.
+    """
+
+    def __init__(self, root: Path | None = None):
+        self.root = Path(root) if root else get_default_store_path()
+        self._locks: dict = {}
+        self._locks_guard = threading.Lock()
+
+    def _series_dir(self, ticker: str, interval: str) -> Path:
+        return self.root / ticker.strip().upper() / interval
+
+    def _lock(self, ticker: str, interval: str) -> threading.Lock:
+        key = (ticker.strip().upper(), interval)
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _column(series_dir: Path, name: str, dtype, mode: str = "r"):
+        path = series_dir / f"{name}.{np.dtype(dtype).kind}8"
+        if not path.exists() or path.stat().st_size == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode=mode)
+
+    @staticmethod
+    def _truncate_columns(series_dir: Path, rows: int) -> None:
+        """Drop price rows beyond the timestamp file, left by an interrupted append."""
+        size = rows * np.dtype(np.float64).itemsize
+        for name in PRICE_COLUMNS:
+            path = series_dir / f"{name}.f8"
+            if path.exists() and path.stat().st_size > size:
+                os.truncate(path, size)
+
+    def _unit(self, series_dir: Path) -> str:
+        meta = series_dir / "meta.json"
+        if meta.exists():
+            return json.loads(meta.read_text())["unit"]
+        return "s"
+
+    def last_timestamp(self, ticker: str, interval: str) -> np.datetime64 | None:
+        """Return the timestamp of the newest stored bar, if any."""
+        series_dir = self._series_dir(ticker, interval)
+        timestamps = self._column(series_dir, "timestamp", np.int64)
+        if not len(timestamps):
+            return None
+        unit = self._unit(series_dir)
+        return np.datetime64(int(timestamps[-1]), "s").astype(f"datetime64[{unit}]")
+
+    def append(self, ticker: str, interval: str, bars: dict) -> int:
+        """
+        Add bars newer than the stored series
+
+        A bar with the same timestamp as the newest stored bar replaces it
+        (the current session's bar keeps changing until the close); older
+        bars are ignored.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Series interval, e.g. "daily" or "5min"
+            bars: Column arrays as returned by ``parse_time_series``
+
+        Returns:
+            int: Number of new bars appended
+        """
+        dates = np.asarray(bars["dates"])
+        if not len(dates):
+            return 0
+        unit = np.datetime_data(dates.dtype)[0]
+        order = np.argsort(dates)
+        timestamps = dates[order].astype("datetime64[s]").astype(np.int64)
+        columns = {name: np.asarray(bars[name], dtype=np.float64)[order] for name in PRICE_COLUMNS}
+
+        series_dir = self._series_dir(ticker, interval)
+        with self._lock(ticker, interval):
+            series_dir.mkdir(parents=True, exist_ok=True)
+            meta = series_dir / "meta.json"
+            if not meta.exists():
+                meta.write_text(json.dumps({"unit": unit}))
+
+            stored = self._column(series_dir, "timestamp", np.int64)
+            last = int(stored[-1]) if len(stored) else None
+            self._truncate_columns(series_dir, len(stored))
+            del stored
+
+            if last is not None:
+                same = np.flatnonzero(timestamps == last)
+                if len(same):
+                    for name in PRICE_COLUMNS:
+                        column = self._column(series_dir, name, np.float64, mode="r+")
+                        column[-1] = columns[name][same[-1]]
+                        column.flush()
+                        del column
+                newer = timestamps > last
+            else:
+                newer = np.ones(len(timestamps), dtype=bool)
+
+            if not newer.any():
+                return 0
+            for name in PRICE_COLUMNS:
+                with open(series_dir / f"{name}.f8", "ab") as f:
+                    f.write(columns[name][newer].tobytes())
+            with open(series_dir / "timestamp.i8", "ab") as f:
+                f.write(timestamps[newer].tobytes())
+            return int(newer.sum())
+
+    def read(
+        self,
+        ticker: str,
+        interval: str,
+        start: str | None = None,
+        end: str | None = None,
+        last: int | None = None,
+    ) -> dict:
+        """
+        Read a range of stored bars
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Series interval, e.g. "daily" or "5min"
+            start: Earliest timestamp to include (ISO date/time string)
+            end: Latest timestamp to include (ISO date/time string)
+            last: Only return the newest ``last`` bars of the range
+
+        Returns:
+            dict: "dates" plus open/high/low/close/volume arrays, oldest first
+        """
+        series_dir = self._series_dir(ticker, interval)
+        timestamps = self._column(series_dir, "timestamp", np.int64)
+        n = len(timestamps)
+        lo, hi = 0, n
+        if start is not None:
+            lo = int(np.searchsorted(timestamps, _to_epoch(start), side="left"))
+        if end is not None:
+            hi = int(np.searchsorted(timestamps, _to_epoch(end), side="right"))
+        if last is not None:
+            lo = max(lo, hi - last)
+
+        unit = self._unit(series_dir)
+        bars = {
+            "dates": np.array(timestamps[lo:hi]).astype("datetime64[s]").astype(
+                f"datetime64[{unit}]"
+            )
+        }
+        for name in PRICE_COLUMNS:
+            # Columns may be ahead of the timestamp file mid-append; cap at n
+            bars[name] = np.array(self._column(series_dir, name, np.float64)[:n][lo:hi])
+        return bars
+
+
+def _to_epoch(value: str) -> int:
+    return int(np.datetime64(value, "s").astype(np.int64))
+
+
+# Singleton instance
+_store_instance: OHLCVStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_ohlcv_store() -> OHLCVStore:
+    """Get or create the process-wide OHLCV store."""
+    global _store_instance
+    with _store_lock:
+        if _store_instance is None:
+            _store_instance = OHLCVStore()
+        return _store_instance
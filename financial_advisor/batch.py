@@ -0,0 +1,465 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Batch analysis of a watchlist of tickers
+
+A batch job runs the workflow's ``analysis_pipeline`` once per ticker with a
+shared risk profile. Jobs and per-ticker results are stored in SQLite
+(BATCH_DB_PATH), so a job interrupted by errors, a quota or a restart can be
+resumed: only tickers without a result are run again.
+
+Runs are bounded by BATCH_MAX_CONCURRENCY, and each run also holds one of
+the admission controller's slots, so batch and /query runs together stay
+within ADMISSION_MAX_CONCURRENT. Alpha Vantage calls already go
+through the shared rate scheduler; on top of that a job pauses (leaving the
+remaining tickers pending) once the daily Alpha Vantage budget is spent, and
+a ticker whose run fails with a Vertex 429 / RESOURCE_EXHAUSTED is retried
+with exponential backoff before it is marked failed.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from pathlib import Path
+
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from .admission import AdmissionRejected, get_admission_controller
+from .plugins import build_plugins
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_CONCURRENCY = 2
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_MAX_TICKERS = 500
+
+# Admission control user of batch runs, queued next to the users of /query
+BATCH_USER_ID = "batch"
+
+# First retry delay after a quota error, in seconds (doubles per attempt)
+QUOTA_RETRY_SECONDS = 10.0
+
+# State keys returned as the result of each ticker: the reports and the
+# structured payloads recorded with them
+RESULT_KEYS = (
+    "market_data_analysis_output",
+    "proposed_trading_strategies_output",
+    "execution_plan_output",
+    "final_risk_assessment_output",
+    "market_data_structured",
+    "trading_strategies_structured",
+    "execution_plan_structured",
+    "risk_assessment_structured",
+)
+
+# Item statuses
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    job_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batch_items (
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    ticker TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    seconds REAL,
+    PRIMARY KEY (job_id, ticker)
+);
+"""
+
+Analyzer = Callable[[str, dict], Awaitable[dict]]
+
+
+def get_batch_concurrency() -> int:
+    """Return the number of tickers analyzed at once (BATCH_MAX_CONCURRENCY)."""
+    return max(1, int(os.getenv("BATCH_MAX_CONCURRENCY", DEFAULT_BATCH_CONCURRENCY)))
+
+
+def get_default_batch_db_path() -> Path:
+    """Return the on-disk location of the batch job database"""
+    configured = os.getenv("BATCH_DB_PATH")
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".cache" / "financial_advisor" / "batch_jobs.sqlite3"
+
+
+def normalize_tickers(tickers: list) -> list:
+    """Upper-case, strip and de-duplicate tickers, keeping their order."""
+    seen = []
+    for ticker in tickers:
+        ticker = str(ticker).strip().upper()
+        if ticker and ticker not in seen:
+            seen.append(ticker)
+    return seen
+
+
+def is_quota_error(error: BaseException) -> bool:
+    """Whether an exception is a rate/quota rejection worth retrying later."""
+    for name in ("code", "status_code"):
+        if getattr(error, name, None) == 429:
+            return True
+    return getattr(error, "status", None) == "RESOURCE_EXHAUSTED" or (
+        "RESOURCE_EXHAUSTED" in str(error)
+    )
+
+
+def alpha_vantage_budget_spent() -> bool:
+    """Whether the shared Alpha Vantage scheduler has no daily calls left."""
+    from .tools.alpha_vantage_tools import get_alpha_vantage_scheduler_stats
+
+    stats = get_alpha_vantage_scheduler_stats()
+    return bool(stats) and stats["day_tokens"] < 1
+
+
+async def analyze_ticker(ticker: str, profile: dict) -> dict:
+    """
+    Run the analysis pipeline for one ticker in a throwaway session
+
+    Args:
+        ticker: Ticker symbol
+        profile: risk_attitude, investment_period and execution_preferences
+
+    Returns:
+        dict: The pipeline's output state keys (RESULT_KEYS) that were set
+    """
+    from .workflow import analysis_pipeline
+
+    runner = Runner(
+        app_name=analysis_pipeline.name,
+        agent=analysis_pipeline,
+        session_service=InMemorySessionService(),
+        plugins=build_plugins(),
+    )
+    session = await runner.session_service.create_session(
+        app_name=analysis_pipeline.name,
+        user_id=BATCH_USER_ID,
+        state={
+            "ticker": ticker,
+            "user_risk_attitude": profile["risk_attitude"],
+            "user_investment_period": profile["investment_period"],
+            "user_execution_preferences": profile.get("execution_preferences") or "None stated",
+        },
+    )
+    result = {}
+    # Batch runs share the /query slots, queued fairly as one more user
+    async with get_admission_controller().admit(BATCH_USER_ID):
+        async for event in runner.run_async(
+            user_id=BATCH_USER_ID,
+            session_id=session.id,
+            new_message=types.Content(
+                role="user", parts=[types.Part(text=f"Analyze {ticker}")]
+            ),
+        ):
+            for key in RESULT_KEYS:
+                if key in event.actions.state_delta:
+                    result[key] = event.actions.state_delta[key]
+    # Payloads are reset to None when their agent starts and may stay unset
+    return {key: value for key, value in result.items() if value is not None}
+
+
+class BatchStore:
+    """
+    SQLite store of batch jobs and their per-ticker results
+
+    Args:
+        path: Database file (defaults to BATCH_DB_PATH)
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path) if path else get_default_batch_db_path()
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the schema on first use."""
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        conn.commit()
+        return conn
+
+    def create_job(self, tickers: list, profile: dict, user_id: str) -> str:
+        """Store a new job with every ticker pending and return its id."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO batch_jobs VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, user_id, json.dumps(profile), PENDING, now, now),
+            )
+            self._conn.executemany(
+                "INSERT INTO batch_items (job_id, position, ticker, status) VALUES (?, ?, ?, ?)",
+                [(job_id, position, ticker, PENDING) for position, ticker in enumerate(tickers)],
+            )
+            self._conn.commit()
+        return job_id
+
+    def set_job_status(self, job_id: str, status: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE batch_jobs SET status = ?, updated_at = ? WHERE job_id = ?",
+                (status, time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def update_item(self, job_id: str, ticker: str, **fields) -> None:
+        """Update columns of one item (result is JSON-encoded)."""
+        if "result" in fields and fields["result"] is not None:
+            fields["result"] = json.dumps(fields["result"], default=str)
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE batch_items SET {assignments} WHERE job_id = ? AND ticker = ?",
+                (*fields.values(), job_id, ticker),
+            )
+            self._conn.commit()
+
+    def reset_unfinished(self, job_id: str) -> int:
+        """Mark failed and interrupted items pending again; return how many."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE batch_items SET status = ?, error = NULL"
+                " WHERE job_id = ? AND status IN (?, ?)",
+                (PENDING, job_id, RUNNING, FAILED),
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def get_job(self, job_id: str) -> dict | None:
+        """
+        Return a job with its items and progress counts
+
+        Returns:
+            dict: job_id, user_id, profile, status, counts and items, or None
+        """
+        with self._lock:
+            job = self._conn.execute(
+                "SELECT user_id, profile, status, created_at, updated_at"
+                " FROM batch_jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+            if job is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT ticker, status, result, error, attempts, seconds"
+                " FROM batch_items WHERE job_id = ? ORDER BY position",
+                (job_id,),
+            ).fetchall()
+        items = [
+            {
+                "ticker": ticker,
+                "status": status,
+                "result": json.loads(result) if result else None,
+                "error": error,
+                "attempts": attempts,
+                "seconds": seconds,
+            }
+            for ticker, status, result, error, attempts, seconds in rows
+        ]
+        counts = dict.fromkeys((PENDING, RUNNING, DONE, FAILED), 0)
+        for item in items:
+            counts[item["status"]] += 1
+        return {
+            "job_id": job_id,
+            "user_id": job[0],
+            "profile": json.loads(job[1]),
+            "status": job[2],
+            "created_at": job[3],
+            "updated_at": job[4],
+            "total": len(items),
+            "counts": counts,
+            "items": items,
+        }
+
+
+class BatchManager:
+    """
+    Schedules batch jobs in this process and publishes per-ticker results
+
+    Args:
+        store: Job store (defaults to a BatchStore at BATCH_DB_PATH)
+        analyze: Coroutine function (ticker, profile) -> result dict
+        max_concurrency: Tickers analyzed at once across all jobs
+        max_attempts: Attempts per ticker when runs hit a quota error
+    """
+
+    def __init__(
+        self,
+        store: BatchStore | None = None,
+        analyze: Analyzer = analyze_ticker,
+        max_concurrency: int | None = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        self.store = store or BatchStore()
+        self.analyze = analyze
+        self.max_concurrency = max_concurrency or get_batch_concurrency()
+        self.max_attempts = max_attempts
+        self._semaphore: asyncio.Semaphore | None = None
+        self._tasks: dict = {}
+        self._listeners: dict = {}
+
+    def _publish(self, job_id: str, event: str, data: dict) -> None:
+        for queue in self._listeners.get(job_id, []):
+            queue.put_nowait((event, data))
+
+    def submit(self, tickers: list, profile: dict, user_id: str = "default") -> str:
+        """Create a job and start it; return the job id."""
+        job_id = self.store.create_job(normalize_tickers(tickers), profile, user_id)
+        self._start(job_id)
+        return job_id
+
+    def resume(self, job_id: str) -> bool:
+        """
+        Re-run the tickers of a job that have no result yet
+
+        Returns:
+            bool: False if the job does not exist or is still running
+        """
+        if self.store.get_job(job_id) is None or self.is_running(job_id):
+            return False
+        self.store.reset_unfinished(job_id)
+        self._start(job_id)
+        return True
+
+    def is_running(self, job_id: str) -> bool:
+        task = self._tasks.get(job_id)
+        return task is not None and not task.done()
+
+    def _start(self, job_id: str) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.store.set_job_status(job_id, RUNNING)
+        self._tasks[job_id] = asyncio.create_task(self._run_job(job_id))
+
+    async def _run_job(self, job_id: str) -> None:
+        job = self.store.get_job(job_id)
+        pending = [item["ticker"] for item in job["items"] if item["status"] == PENDING]
+        paused = asyncio.Event()
+        await asyncio.gather(
+            *(self._run_item(job_id, ticker, job["profile"], paused) for ticker in pending)
+        )
+        job = self.store.get_job(job_id)
+        if paused.is_set():
+            status = "paused"
+        elif job["counts"][FAILED]:
+            status = "partial"
+        else:
+            status = "completed"
+        self.store.set_job_status(job_id, status)
+        self._publish(job_id, "done", {"job_id": job_id, "status": status, **job["counts"]})
+
+    async def _run_item(
+        self, job_id: str, ticker: str, profile: dict, paused: asyncio.Event
+    ) -> None:
+        async with self._semaphore:
+            if paused.is_set() or alpha_vantage_budget_spent():
+                # Leave the ticker pending so a later resume picks it up
+                paused.set()
+                return
+            self.store.update_item(job_id, ticker, status=RUNNING)
+            started = time.perf_counter()
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    result = await self.analyze(ticker, profile)
+                except AdmissionRejected as e:
+                    if attempt < self.max_attempts:
+                        await asyncio.sleep(e.retry_after)
+                        continue
+                    logger.warning("Batch %s: %s not admitted: %s", job_id, ticker, e)
+                    item = {"status": FAILED, "error": str(e)}
+                except Exception as e:
+                    if is_quota_error(e) and attempt < self.max_attempts:
+                        await asyncio.sleep(QUOTA_RETRY_SECONDS * 2 ** (attempt - 1))
+                        continue
+                    logger.warning("Batch %s: %s failed: %s", job_id, ticker, e)
+                    item = {"status": FAILED, "error": str(e)}
+                else:
+                    item = {"status": DONE, "result": result, "error": None}
+                break
+            item.update(attempts=attempt, seconds=time.perf_counter() - started)
+            self.store.update_item(job_id, ticker, **item)
+            self._publish(job_id, "result", {"ticker": ticker, **item})
+
+    async def wait(self, job_id: str) -> None:
+        """Wait until the job's current run finishes."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await task
+
+    async def results(self, job_id: str) -> AsyncGenerator[tuple, None]:
+        """
+        Yield (event, data) for every ticker result of a job, as they complete
+
+        Results stored before the call are replayed first; ends with a
+        ("done", counts) event once the job's run finishes.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._listeners.setdefault(job_id, []).append(queue)
+        replayed = set()
+        try:
+            job = self.store.get_job(job_id)
+            for item in job["items"]:
+                if item["status"] in (DONE, FAILED):
+                    replayed.add(item["ticker"])
+                    yield "result", {
+                        key: item[key]
+                        for key in ("ticker", "status", "result", "error", "attempts", "seconds")
+                    }
+            if not self.is_running(job_id):
+                yield "done", {"job_id": job_id, "status": job["status"], **job["counts"]}
+                return
+            while True:
+                event, data = await queue.get()
+                if event == "result" and data["ticker"] in replayed:
+                    continue
+                yield event, data
+                if event == "done":
+                    return
+        finally:
+            self._listeners[job_id].remove(queue)
+
+
+# Singleton instance
+_manager_instance: BatchManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_batch_manager() -> BatchManager:
+    """Get or create the process-wide batch manager."""
+    global _manager_instance
+    with _manager_lock:
+        if _manager_instance is None:
+            _manager_instance = BatchManager()
+        return _manager_instance
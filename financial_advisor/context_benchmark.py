@@ -0,0 +1,212 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Input size and latency of each analysis stage with and without context shaping
+
+For every exported session JSON file (the ``session-<id>.json`` files in the
+project root) the workflow input block of each consuming stage is rendered
+twice from the recorded state, with the full upstream reports and with the
+shaped ones, and their size is compared. Tokens are estimated offline at
+four characters per token; ``--live`` also runs each stage on a model both
+ways and reports the measured prompt tokens and latency.
+
+Usage:
+    python -m financial_advisor.context_benchmark session-*.json
+    python -m financial_advisor.context_benchmark session-*.json --live --model gemini-2.5-flash
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import statistics
+from pathlib import Path
+
+from .context_shaping import CONTEXT_PLAN, render_inputs
+
+CHARS_PER_TOKEN = 4
+
+# Profile used when a recorded session has none in its state
+_DEFAULT_PROFILE = {
+    "user_risk_attitude": "moderate",
+    "user_investment_period": "long-term",
+    "user_execution_preferences": "None stated",
+}
+
+_LIVE_REQUEST = "Run your analysis on the workflow inputs."
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text offline."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def measure_inputs(state: dict) -> list:
+    """
+    Compare the full and shaped input blocks of every consuming stage
+
+    Args:
+        state: Recorded session state
+
+    Returns:
+        list: One dict per consumer with full/shaped chars and estimated tokens
+    """
+    rows = []
+    for consumer, plan in CONTEXT_PLAN.items():
+        keys = [key for key in plan if key in state]
+        if not keys:
+            continue
+        full = render_inputs(consumer, state, keys, enabled=False)
+        shaped = render_inputs(consumer, state, keys, enabled=True)
+        rows.append(
+            {
+                "agent": consumer,
+                "full_chars": len(full),
+                "shaped_chars": len(shaped),
+                "full_tokens": estimate_tokens(full),
+                "shaped_tokens": estimate_tokens(shaped),
+            }
+        )
+    return rows
+
+
+def _stage_agent(agent, state: dict, shaped: bool):
+    keys = [key for key in CONTEXT_PLAN[agent.name] if key in state]
+    profile = "".join(f"{key}: {state.get(key, value)}\n" for key, value in _DEFAULT_PROFILE.items())
+    instruction = (
+        agent.instruction
+        + "\n\n* Workflow Inputs (from session state):\n"
+        + render_inputs(agent.name, state, keys, enabled=shaped)
+        + profile
+    )
+    return agent.clone(
+        update={"instruction": lambda _ctx: instruction, "include_contents": "none"}
+    )
+
+
+async def measure_live(state: dict, model: str, agent_names: list | None = None) -> list:
+    """
+    Run every consuming stage on a model with full and with shaped inputs
+
+    Returns:
+        list: One dict per consumer with full/shaped latency and prompt tokens
+    """
+    from .model_benchmark import _sub_agents, benchmark_call
+
+    agents = _sub_agents()
+    rows = []
+    for consumer in agent_names or CONTEXT_PLAN:
+        runs = {}
+        for shaped in (False, True):
+            agent = _stage_agent(agents[consumer], state, shaped)
+            runs[shaped] = await benchmark_call(agent, model, _LIVE_REQUEST, state)
+        rows.append(
+            {
+                "agent": consumer,
+                "full_seconds": runs[False]["seconds"],
+                "shaped_seconds": runs[True]["seconds"],
+                "full_prompt_tokens": runs[False]["prompt_tokens"],
+                "shaped_prompt_tokens": runs[True]["prompt_tokens"],
+            }
+        )
+    return rows
+
+
+def summarize(rows: list) -> list:
+    """Average per-session rows into one row per consuming agent."""
+    groups: dict = {}
+    for row in rows:
+        groups.setdefault(row["agent"], []).append(row)
+    return [
+        {
+            "agent": agent,
+            "sessions": len(runs),
+            **{
+                field: statistics.mean(run[field] for run in runs)
+                for field in runs[0]
+                if field != "agent"
+            },
+        }
+        for agent, runs in groups.items()
+    ]
+
+
+def _reduction(before: float, after: float) -> str:
+    return f"{100 * (1 - after / before):.0f}%" if before else "n/a"
+
+
+def format_table(rows: list) -> str:
+    """Render summarized rows as a fixed-width text table."""
+    live = any("full_seconds" in row for row in rows)
+    header = f"{'agent':<26}{'sessions':>9}{'full tok':>10}{'shaped tok':>12}{'saved':>7}"
+    if live:
+        header += f"{'full in':>9}{'shaped in':>11}{'full s':>8}{'shaped s':>10}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        line = (
+            f"{row['agent']:<26}{row['sessions']:>9}{row['full_tokens']:>10.0f}"
+            f"{row['shaped_tokens']:>12.0f}{_reduction(row['full_tokens'], row['shaped_tokens']):>7}"
+        )
+        if live:
+            line += (
+                f"{row['full_prompt_tokens']:>9.0f}{row['shaped_prompt_tokens']:>11.0f}"
+                f"{row['full_seconds']:>8.1f}{row['shaped_seconds']:>10.1f}"
+            )
+        lines.append(line)
+    full = sum(row["full_tokens"] for row in rows)
+    shaped = sum(row["shaped_tokens"] for row in rows)
+    lines.append(f"{'total':<26}{'':>9}{full:>10.0f}{shaped:>12.0f}{_reduction(full, shaped):>7}")
+    lines.append("tok = estimated input tokens (chars/4); in = prompt tokens reported by the model")
+    return "\n".join(lines)
+
+
+async def run_benchmark(
+    session_paths: list,
+    model: str | None = None,
+    agent_names: list | None = None,
+) -> list:
+    """Measure every recorded session, running the stages live if a model is given."""
+    rows = []
+    for path in session_paths:
+        state = json.loads(Path(path).read_text()).get("state", {})
+        measured = {row["agent"]: row for row in measure_inputs(state)}
+        if agent_names:
+            measured = {name: measured[name] for name in agent_names if name in measured}
+        if model:
+            for live in await measure_live(state, model, list(measured)):
+                measured[live["agent"]].update(live)
+        rows.extend(measured.values())
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sessions", nargs="+", type=Path, help="Exported session JSON files")
+    parser.add_argument("--live", action="store_true", help="Also run each stage on a model")
+    parser.add_argument("--model", default="gemini-2.5-flash", help="Model for --live runs")
+    parser.add_argument("--agents", nargs="+", help="Only measure these consuming agents")
+    parser.add_argument("--json", type=Path, help="Also write raw results to this file")
+    args = parser.parse_args()
+
+    rows = asyncio.run(
+        run_benchmark(args.sessions, args.model if args.live else None, args.agents)
+    )
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2))
+    print(format_table(summarize(rows)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Explicit context caching of the static agent instructions
+
+Every model call of an agent re-sends the same system instruction (the long
+prompts in ``prompt.py`` and the sub-agents' ``prompt.py``) and the same tool
+declarations. ``ContextCachePlugin`` stores that prefix once as a Gemini
+cached content and points each request at it, so the prefix is billed at
+the cached input rate and not re-processed on every turn.
+
+ADK's own App-level context caching keys its caches on the session's
+events, so sub-agents run through AgentTool (each in a fresh session) would
+never reuse one. Here caches are keyed on the prefix itself and shared by
+every session and sub-agent run of the process:
+
+    model + system instruction + tools + tool config -> cachedContents/...
+
+Only instructions known to be static are cached: plain string instructions
+without state placeholders, and ``static_instruction`` content (the workflow
+stages move their per-run inputs out of it). ``ContextCacheManager`` creates
+an entry on first use, extends its TTL when it is about to expire, evicts
+the least recently used entry beyond ``CONTEXT_CACHE_MAX_ENTRIES`` and
+deletes its entries when the app shuts down.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 3600
+# Vertex AI rejects cached contents below this size
+DEFAULT_MIN_TOKENS = 2048
+DEFAULT_MAX_ENTRIES = 32
+# An entry this close to expiry has its TTL extended before it is used
+_REFRESH_MARGIN_SECONDS = 120
+# A prefix the API refused to cache is not retried before this delay
+_RETRY_AFTER_SECONDS = 300
+
+
+def is_enabled() -> bool:
+    """Context caching is on unless CONTEXT_CACHE_DISABLED is set."""
+    return not os.getenv("CONTEXT_CACHE_DISABLED")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (4 characters per token)."""
+    return len(text) // 4
+
+
+@dataclass
+class CacheEntry:
+    """A cached content created for one static prefix."""
+
+    name: str
+    model: str
+    expire_time: float
+    tokens: int
+    hits: int = 0
+
+
+def static_prefix(agent: Any) -> str | None:
+    """
+    Return the part of an agent's system instruction that never changes
+
+    Args:
+        agent: The agent making the model call
+
+    Returns:
+        str: The static instruction text, or None if it may vary per request
+    """
+    static = getattr(agent, "static_instruction", None)
+    if static is not None:
+        texts = [part.text for part in static.parts or [] if part.text]
+        return texts[0] if texts else None
+    instruction = getattr(agent, "instruction", None)
+    # Placeholders are filled from session state, so the text would vary
+    if isinstance(instruction, str) and instruction and "{" not in instruction:
+        return instruction
+    return None
+
+
+def _fingerprint(
+    model: str,
+    system_instruction: str,
+    tools: list | None,
+    tool_config: types.ToolConfig | None,
+) -> str:
+    data = {
+        "model": model,
+        "system_instruction": system_instruction,
+        "tools": [tool.model_dump() for tool in tools or [] if isinstance(tool, types.Tool)],
+        "tool_config": tool_config.model_dump() if tool_config else None,
+    }
+    return hashlib.sha256(str(data).encode()).hexdigest()[:16]
+
+
+class ContextCacheManager:
+    """
+    Creates, reuses, refreshes and deletes cached contents for static prefixes
+
+    Args:
+        client: google.genai Client (or any object with the same
+            ``aio.caches`` create/update/delete methods)
+        ttl_seconds: Lifetime of a cached content, extended while in use
+        min_tokens: Prefixes estimated below this size are not cached
+        max_entries: Live entries kept; the least recently used is deleted
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        min_tokens: int = DEFAULT_MIN_TOKENS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = min_tokens
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._failed: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._counts = {
+            "hits": 0,
+            "creates": 0,
+            "refreshes": 0,
+            "expirations": 0,
+            "evictions": 0,
+            "errors": 0,
+            "skipped": 0,
+        }
+
+    @property
+    def _ttl(self) -> str:
+        return f"{self.ttl_seconds}s"
+
+    async def get_cache_name(
+        self,
+        model: str,
+        system_instruction: str,
+        tools: list | None = None,
+        tool_config: types.ToolConfig | None = None,
+    ) -> str | None:
+        """
+        Return the cached content holding this prefix, creating it if needed
+
+        Args:
+            model: Model the cache is created for
+            system_instruction: The static system instruction
+            tools: Tool declarations sent with the instruction
+            tool_config: Tool config sent with the instruction
+
+        Returns:
+            str: Cached content resource name, or None if the prefix is not
+                cached (too small, or the API refused it)
+        """
+        key = _fingerprint(model, system_instruction, tools, tool_config)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            now = time.time()
+            if entry is not None and now >= entry.expire_time:
+                # The API has already dropped it
+                del self._entries[key]
+                self._counts["expirations"] += 1
+                entry = None
+            if entry is not None:
+                if entry.expire_time - now < _REFRESH_MARGIN_SECONDS:
+                    entry = await self._refresh(key, entry)
+            if entry is not None:
+                entry.hits += 1
+                self._counts["hits"] += 1
+                self._entries.move_to_end(key)
+                return entry.name
+            if self._failed.get(key, 0) > now:
+                return None
+
+            tokens = estimate_tokens(system_instruction) + sum(
+                estimate_tokens(tool.model_dump_json(exclude_none=True))
+                for tool in tools or []
+                if isinstance(tool, types.Tool)
+            )
+            if tokens < self.min_tokens:
+                self._counts["skipped"] += 1
+                self._failed[key] = float("inf")
+                return None
+            return await self._create(key, model, system_instruction, tools, tool_config, tokens)
+
+    async def _create(
+        self,
+        key: str,
+        model: str,
+        system_instruction: str,
+        tools: list | None,
+        tool_config: types.ToolConfig | None,
+        tokens: int,
+    ) -> str | None:
+        config = types.CreateCachedContentConfig(
+            system_instruction=system_instruction,
+            tools=tools or None,
+            tool_config=tool_config,
+            ttl=self._ttl,
+            display_name=f"financial-advisor-{key}",
+        )
+        try:
+            cached = await self.client.aio.caches.create(model=model, config=config)
+        except Exception as e:
+            logger.warning("Context cache creation failed for %s: %s", model, e)
+            self._counts["errors"] += 1
+            self._failed[key] = time.time() + _RETRY_AFTER_SECONDS
+            return None
+        self._counts["creates"] += 1
+        self._entries[key] = CacheEntry(
+            name=cached.name,
+            model=model,
+            expire_time=time.time() + self.ttl_seconds,
+            tokens=tokens,
+        )
+        logger.info("Created context cache %s (~%d tokens) for %s", cached.name, tokens, model)
+        await self._evict()
+        return cached.name
+
+    async def _refresh(self, key: str, entry: CacheEntry) -> CacheEntry | None:
+        try:
+            await self.client.aio.caches.update(
+                name=entry.name, config=types.UpdateCachedContentConfig(ttl=self._ttl)
+            )
+        except Exception as e:
+            logger.warning("Context cache refresh failed for %s: %s", entry.name, e)
+            self._counts["errors"] += 1
+            del self._entries[key]
+            return None
+        entry.expire_time = time.time() + self.ttl_seconds
+        self._counts["refreshes"] += 1
+        return entry
+
+    async def _delete(self, entry: CacheEntry) -> None:
+        try:
+            await self.client.aio.caches.delete(name=entry.name)
+        except Exception as e:
+            logger.warning("Context cache deletion failed for %s: %s", entry.name, e)
+            self._counts["errors"] += 1
+
+    async def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            key, entry = self._entries.popitem(last=False)
+            self._locks.pop(key, None)
+            self._counts["evictions"] += 1
+            await self._delete(entry)
+
+    async def close(self) -> None:
+        """Delete every live cached content (called on app shutdown)."""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        now = time.time()
+        await asyncio.gather(
+            *(self._delete(entry) for entry in entries if entry.expire_time > now)
+        )
+
+    def stats(self) -> dict:
+        """Return entry and lifecycle counters."""
+        return {
+            "entries": len(self._entries),
+            "cached_prefix_tokens": sum(entry.tokens for entry in self._entries.values()),
+            **self._counts,
+        }
+
+
+class ContextCachePlugin(BasePlugin):
+    """ADK plugin pointing model calls with a static prefix at its cached content."""
+
+    def __init__(self, name: str = "context_cache"):
+        super().__init__(name=name)
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        config = llm_request.config
+        model = llm_request.model or ""
+        if not is_enabled() or config is None or config.cached_content:
+            return None
+        if not model.startswith("gemini"):
+            return None
+        instruction = config.system_instruction
+        prefix = static_prefix(callback_context._invocation_context.agent)
+        if not prefix or not isinstance(instruction, str) or not instruction.startswith(prefix):
+            return None
+
+        manager = get_context_cache_manager()
+        name = await manager.get_cache_name(model, instruction, config.tools, config.tool_config)
+        if name:
+            # The API rejects requests that repeat what the cache holds
+            config.cached_content = name
+            config.system_instruction = None
+            config.tools = None
+            config.tool_config = None
+        return None
+
+
+# Singleton instance
+_manager_instance: ContextCacheManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_context_cache_manager() -> ContextCacheManager:
+    """
+    Get or create the process-wide context cache manager.
+
+    Returns:
+        ContextCacheManager: Manager using a google.genai Client configured
+            from the environment (Vertex AI or the Gemini API)
+    """
+    global _manager_instance
+    with _manager_lock:
+        if _manager_instance is None:
+            from google.genai import Client
+
+            _manager_instance = ContextCacheManager(
+                Client(),
+                ttl_seconds=int(os.getenv("CONTEXT_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+                min_tokens=int(os.getenv("CONTEXT_CACHE_MIN_TOKENS", DEFAULT_MIN_TOKENS)),
+                max_entries=int(os.getenv("CONTEXT_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            )
+        return _manager_instance
+
+
+def get_context_cache_stats() -> dict:
+    """Return the manager's counters, or {} if no prefix has been cached yet."""
+    if _manager_instance is None:
+        return {}
+    return _manager_instance.stats()
+
+
+async def close_context_cache() -> None:
+    """Delete the process's cached contents, if any were created."""
+    if _manager_instance is not None:
+        await _manager_instance.close()
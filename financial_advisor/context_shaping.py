@@ -0,0 +1,319 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Context shaping: hand each sub-agent only the parts of upstream reports it uses
+
+Every analysis stage used to receive the previous stages' reports verbatim,
+so the risk analyst read three full reports and the summary agent four. The
+plan below names, for each consumer, which upstream output keys it reads and
+how each is reduced:
+
+    sections   keep only the sections whose heading contains a keyword
+               (a section runs to the next heading of the same or higher level)
+    digest     keep only headings and ``* **Key:** value`` lines, i.e. the
+               key metrics, with long values clipped
+    structured pass the typed payload the producing agent recorded
+               (``structured_outputs``) as compact JSON instead, when there is one
+
+A reduction that finds nothing (for example a report in an unexpected format)
+falls back to the full text, and every input is capped at
+CONTEXT_SHAPING_MAX_CHARS characters. CONTEXT_SHAPING=off passes the full
+reports as before; CONTEXT_SHAPING_PLAN points at a JSON file that overrides
+the plan per consumer, e.g.
+``{"risk_analyst_agent": {"execution_plan_output": {"digest": true}}}``.
+"""
+
+import json
+import os
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+from .structured_outputs import dumps_compact, structured_key
+
+DEFAULT_MAX_CHARS = 12000
+
+# Longest value kept on a digest line, in characters
+DIGEST_VALUE_CHARS = 200
+
+TRUNCATION_MARK = "\n[... truncated]"
+
+_MARKDOWN_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*$")
+_BOLD_HEADING = re.compile(r"^\*\*([^*].*?)\*\*\s*:?\s*$")
+_NUMBERING = re.compile(r"^(?:SECTION\s+)?(\d+(?:\.\d+)*)\.?[\s:]", re.IGNORECASE)
+_KEY_VALUE = re.compile(r"^(\s*)(?:[*-]|\d+\.)\s+\*\*(.+?)\*\*\s*(.*)$")
+_LIST_ITEM = re.compile(r"^(\s*)(?:[*-]|\d+\.)\s+(.+)$")
+
+# Bold-line headings rank below markdown headings: numbered ones by depth
+# ("**2.**" above "**2.1**"), unnumbered ones below both
+_BOLD_LEVEL = 7
+_UNNUMBERED_LEVEL = 9
+
+
+@dataclass(frozen=True)
+class Shape:
+    """How one upstream output is reduced for one consumer"""
+
+    sections: tuple = ()
+    digest: bool = False
+    structured: bool = False
+
+
+FULL = Shape()
+
+_TOP_STRATEGIES = ("top strategy", "top 2 recommended", "recommended strategies")
+
+CONTEXT_PLAN = {
+    "trading_analyst_agent": {
+        "market_data_analysis_output": FULL,
+    },
+    "execution_analyst_agent": {
+        "proposed_trading_strategies_output": Shape(sections=_TOP_STRATEGIES),
+    },
+    "risk_analyst_agent": {
+        "market_data_analysis_output": Shape(digest=True, structured=True),
+        "proposed_trading_strategies_output": Shape(sections=_TOP_STRATEGIES),
+        "execution_plan_output": Shape(digest=True),
+    },
+    "summary_agent": {
+        "market_data_analysis_output": Shape(digest=True, structured=True),
+        "proposed_trading_strategies_output": Shape(
+            sections=_TOP_STRATEGIES, digest=True, structured=True
+        ),
+        "execution_plan_output": Shape(digest=True, structured=True),
+        "final_risk_assessment_output": Shape(
+            sections=("executive summary", "comparative", "recommendation", "residual")
+        ),
+    },
+}
+
+
+def is_enabled() -> bool:
+    """Return whether context shaping is on (CONTEXT_SHAPING, default on)."""
+    return os.getenv("CONTEXT_SHAPING", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def get_max_chars() -> int:
+    """Return the per-input character cap (CONTEXT_SHAPING_MAX_CHARS, 0 = none)."""
+    return int(os.getenv("CONTEXT_SHAPING_MAX_CHARS", DEFAULT_MAX_CHARS))
+
+
+def _config_file_plan() -> dict:
+    path = os.getenv("CONTEXT_SHAPING_PLAN")
+    if not path:
+        return {}
+    return json.loads(Path(path).expanduser().read_text())
+
+
+def get_plan(consumer: str) -> dict:
+    """
+    Return how each upstream output is shaped for a consumer
+
+    Args:
+        consumer: Name of the consuming agent (e.g. "risk_analyst_agent")
+
+    Returns:
+        dict: Output key -> Shape (keys missing from the plan get FULL)
+    """
+    plan = dict(CONTEXT_PLAN.get(consumer, {}))
+    for key, spec in _config_file_plan().get(consumer, {}).items():
+        plan[key] = Shape(
+            sections=tuple(spec.get("sections", ())),
+            digest=bool(spec.get("digest")),
+            structured=bool(spec.get("structured")),
+        )
+    return plan
+
+
+def _heading(line: str) -> tuple | None:
+    """Return (level, title) if the line is a heading."""
+    match = _MARKDOWN_HEADING.match(line)
+    if match:
+        return len(match.group(1)), match.group(2).strip("* :")
+    match = _BOLD_HEADING.match(line.strip())
+    if match and line == line.lstrip():
+        title = match.group(1).strip(" :")
+        numbering = _NUMBERING.match(title)
+        if numbering:
+            return _BOLD_LEVEL + numbering.group(1).count("."), title
+        return _UNNUMBERED_LEVEL, title
+    return None
+
+
+def split_sections(text: str) -> list:
+    """
+    Split a markdown report into sections at its headings
+
+    Args:
+        text: Report text
+
+    Returns:
+        list: (level, title, lines) per section; text before the first
+            heading is a section with level 0 and an empty title
+    """
+    sections = [(0, "", [])]
+    for line in text.splitlines():
+        heading = _heading(line)
+        if heading:
+            sections.append((heading[0], heading[1], [line]))
+        else:
+            sections[-1][2].append(line)
+    return [s for s in sections if s[0] or any(line.strip() for line in s[2])]
+
+
+def select_sections(text: str, keywords) -> str:
+    """
+    Keep only the sections whose heading contains one of the keywords
+
+    A selected section includes its sub-sections (everything up to the next
+    heading of the same or a higher level).
+
+    Args:
+        text: Report text
+        keywords: Case-insensitive heading keywords
+
+    Returns:
+        str: The selected sections, or "" if no heading matched
+    """
+    keywords = [k.lower() for k in keywords]
+    kept, open_level = [], None
+    for level, title, lines in split_sections(text):
+        if open_level is not None and level > open_level:
+            kept.extend(lines)
+            continue
+        open_level = None
+        if level and any(k in title.lower() for k in keywords):
+            open_level = level
+            kept.extend(lines)
+    return "\n".join(kept).strip()
+
+
+def _clip_value(value: str, value_chars: int) -> str:
+    value = value.strip()
+    if len(value) > value_chars:
+        return value[:value_chars].rstrip() + "..."
+    return value
+
+
+def digest(text: str, value_chars: int = DIGEST_VALUE_CHARS) -> str:
+    """
+    Reduce a report to its headings and ``* **Key:** value`` lines
+
+    Headings are kept only when their section or one of its sub-sections
+    contributed a key line.
+
+    Args:
+        text: Report text
+        value_chars: Longest value kept per line
+
+    Returns:
+        str: The digest, or "" if the report has no key lines
+    """
+    sections = []
+    for level, _title, lines in split_sections(text):
+        items, open_indent = [], None
+        for line in lines[1:] if level else lines:
+            match = _KEY_VALUE.match(line)
+            if match:
+                indent, key, value = match.groups()
+                items.append(f"{indent}- **{key.strip()}** {_clip_value(value, value_chars)}".rstrip())
+                # A key without a value introduces a list of plain items
+                open_indent = None if value.strip() else len(indent)
+                continue
+            item = _LIST_ITEM.match(line)
+            if item and open_indent is not None and len(item.group(1)) > open_indent:
+                items.append(f"{item.group(1)}- {_clip_value(item.group(2), value_chars)}")
+            elif line.strip():
+                open_indent = None
+        sections.append((level, lines[0] if level else "", items))
+
+    kept = []
+    for i, (level, heading, items) in enumerate(sections):
+        if heading:
+            subtree = [items]
+            for sub_level, _heading, sub_items in sections[i + 1 :]:
+                if sub_level <= level:
+                    break
+                subtree.append(sub_items)
+            if any(subtree):
+                kept.append(heading)
+        kept.extend(items)
+    return "\n".join(kept).strip()
+
+
+def clip(text: str, max_chars: int) -> str:
+    """Cut text at a line boundary so it fits in ``max_chars`` (0 = no cap)."""
+    if not max_chars or len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[: cut if cut > 0 else max_chars] + TRUNCATION_MARK
+
+
+def shape(text: str, spec: Shape, max_chars: int | None = None) -> str:
+    """
+    Reduce one upstream output according to its shape
+
+    Args:
+        text: Full upstream output
+        spec: Sections and/or digest to keep
+        max_chars: Character cap (default: get_max_chars())
+
+    Returns:
+        str: Shaped text, falling back to the (capped) full text when the
+            reduction finds nothing
+    """
+    shaped = text
+    if spec.sections:
+        shaped = select_sections(shaped, spec.sections) or shaped
+    if spec.digest:
+        shaped = digest(shaped) or shaped
+    return clip(shaped, get_max_chars() if max_chars is None else max_chars)
+
+
+def render_inputs(
+    consumer: str,
+    state: Mapping,
+    keys,
+    enabled: bool | None = None,
+) -> str:
+    """
+    Render upstream outputs from state as the input block of a stage
+
+    Args:
+        consumer: Name of the consuming agent
+        state: Session state holding the upstream outputs
+        keys: Output keys to render, in order
+        enabled: Shape the outputs (default: is_enabled()); when False the
+            full outputs are rendered
+
+    Returns:
+        str: One ``key:\\n<text>`` block per output key
+    """
+    if enabled is None:
+        enabled = is_enabled()
+    plan = get_plan(consumer) if enabled else {}
+    blocks = []
+    for key in keys:
+        spec = plan.get(key, FULL)
+        payload = state.get(structured_key(key)) if enabled and spec.structured else None
+        if payload:
+            blocks.append(f"{key} (structured):\n{dumps_compact(payload)}\n")
+            continue
+        text = str(state.get(key, ""))
+        if enabled:
+            text = shape(text, spec)
+        blocks.append(f"{key}:\n{text}\n")
+    return "".join(blocks)
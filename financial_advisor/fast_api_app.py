@@ -14,26 +14,45 @@
 
 """FastAPI application for Financial Advisor Agent"""
 
+import asyncio
 import os
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager, nullcontext
 
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.apps import App
 from google.adk.runners import Runner
-from google.adk.sessions.in_memory_session_service import InMemorySessionService
-from pydantic import BaseModel
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+from pydantic import BaseModel, Field
 
-from .agent import root_agent
+from . import root_agent
+from .admission import Admission, AdmissionRejected, get_admission_controller
+from .batch import DEFAULT_MAX_TICKERS, get_batch_manager
+from .context_cache import close_context_cache, get_context_cache_stats
+from .metrics import HTTP_REQUEST_DURATION, register_stats, render_metrics
+from .plugins import build_plugins
+from .sessions import get_session_service
+from .streaming import EventTranslator, format_sse, stream_events
+from .token_usage import RUN_USAGE_KEY
+from .tools import get_alpha_vantage_connection_stats, get_alpha_vantage_deadline_stats
+from .warmup import get_warmup
 
 
 @asynccontextmanager
 async def lifespan(app_instance: FastAPI) -> AsyncGenerator:
     """Lifespan context manager for FastAPI app."""
-    # Startup
+    # Startup: warm up in the background so /health answers while /ready waits
+    warmup = get_warmup()
+    warmup_task = None if warmup.ready else asyncio.create_task(warmup.run())
     yield
     # Shutdown
+    if warmup_task is not None:
+        warmup_task.cancel()
+    await close_context_cache()
 
 
 app = FastAPI(
@@ -44,17 +63,48 @@ app = FastAPI(
 )
 
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """
+    Record the latency of every request by route template and status.
+
+    For streaming endpoints this is the time until the stream starts.
+    """
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    HTTP_REQUEST_DURATION.labels(
+        request.method, getattr(route, "path", "unmatched"), str(response.status_code)
+    ).observe(time.perf_counter() - started)
+    return response
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return JSONResponse(
-        content={
-            "status": "healthy",
-            "service": "financial-advisor",
-            "version": os.getenv("AGENT_VERSION", "0.0.0"),
-        }
-    )
+    """
+    Liveness check, with session store memory use when available.
+
+    Answers 200 as soon as the server runs; use /ready to know when the
+    instance has warmed up.
+    """
+    content = {
+        "status": "healthy",
+        "service": "financial-advisor",
+        "version": os.getenv("AGENT_VERSION", "0.0.0"),
+        "ready": get_warmup().ready,
+    }
+    if hasattr(session_service, "usage"):
+        content["sessions"] = session_service.usage()
+    content["admission"] = get_admission_controller().snapshot()
+    return JSONResponse(content=content)
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: 503 until warm-up has finished, with each step's result."""
+    warmup = get_warmup()
+    return JSONResponse(status_code=200 if warmup.ready else 503, content=warmup.snapshot())
 
 
 @app.get("/")
@@ -65,45 +115,148 @@ async def root():
             "message": "Financial Advisor API",
             "docs": "/docs",
             "health": "/health",
+            "ready": "/ready",
+            "metrics": "/metrics",
             "agent_endpoint": "/query",
+            "stream_endpoint": "/query/stream",
+            "batch_endpoint": "/batch",
         }
     )
 
 
 # Create ADK App and Runner with session service
-adk_app = App(name="financial_advisor", root_agent=root_agent)
-session_service = InMemorySessionService()
+adk_app = App(
+    name="financial_advisor",
+    root_agent=root_agent,
+    plugins=build_plugins(),
+)
+session_service = get_session_service()
 runner = Runner(app=adk_app, session_service=session_service)
 
+register_stats(
+    {
+        "sessions": getattr(session_service, "usage", dict),
+        "admission": lambda: get_admission_controller().snapshot(),
+        "context_cache": get_context_cache_stats,
+        "warmup": lambda: get_warmup().stats(),
+        "alpha_vantage_mcp": get_alpha_vantage_connection_stats,
+        "alpha_vantage_calls": get_alpha_vantage_deadline_stats,
+    }
+)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 
 class QueryRequest(BaseModel):
     """Request model for queries."""
     query: str
     session_id: str = "default"
+    user_id: str = "default"
 
 
 class QueryResponse(BaseModel):
     """Response model for queries."""
     result: str
     session_id: str
+    usage: dict | None = None
+
+
+async def _get_or_create_session(user_id: str, session_id: str):
+    """Return the session, creating it on the first query."""
+    session = await session_service.get_session(
+        app_name=runner.app_name, user_id=user_id, session_id=session_id
+    )
+    if session is None:
+        session = await session_service.create_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+    return session
+
+
+def _user_message(query: str) -> types.Content:
+    return types.Content(role="user", parts=[types.Part(text=query)])
+
+
+def _active_run(user_id: str, session_id: str):
+    """Keep the session from being evicted while a run uses it, if the store evicts."""
+    track = getattr(session_service, "active_run", None)
+    if track is None:
+        return nullcontext()
+    return track(app_name=adk_app.name, user_id=user_id, session_id=session_id)
+
+
+async def _tracked(events: AsyncGenerator, user_id: str, session_id: str) -> AsyncGenerator:
+    """Yield the events of a streamed run while its session is marked active."""
+    with _active_run(user_id, session_id):
+        async for event in events:
+            yield event
+
+
+def _overloaded(rejection: AdmissionRejected) -> JSONResponse:
+    """503 telling the client when to retry."""
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(int(rejection.retry_after))},
+        content={
+            "error": str(rejection),
+            "reason": rejection.reason,
+            "retry_after": rejection.retry_after,
+        },
+    )
+
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """Streaming response that gives back its admission slot once it is sent.
+
+    The slot is released however the response ends, including when the
+    client disconnects before the body is iterated.
+    """
+
+    def __init__(self, content, admission: Admission, **kwargs):
+        super().__init__(content, **kwargs)
+        self.admission = admission
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.admission.release()
 
 
 @app.post("/query", response_model=QueryResponse)
 async def query_agent(request: QueryRequest):
-    """Query the financial advisor agent."""
+    """Query the financial advisor agent (503 with Retry-After when overloaded)."""
     try:
+        admission = await get_admission_controller().acquire(request.user_id)
+    except AdmissionRejected as e:
+        return _overloaded(e)
+    try:
+        await _get_or_create_session(request.user_id, request.session_id)
+
         # Run the agent
-        result = await runner.run_async(
-            user_content=request.query,
-            session_id=request.session_id,
-        )
+        final_text = ""
+        with _active_run(request.user_id, request.session_id):
+            async for event in runner.run_async(
+                user_id=request.user_id,
+                session_id=request.session_id,
+                new_message=_user_message(request.query),
+            ):
+                if event.is_final_response() and event.content and event.content.parts:
+                    final_text = "".join(p.text or "" for p in event.content.parts)
 
         # Extract the result
-        output = result.get("financial_coordinator_output", "No response")
+        session = await _get_or_create_session(request.user_id, request.session_id)
+        output = session.state.get("financial_coordinator_output") or final_text or "No response"
 
         return QueryResponse(
             result=str(output),
             session_id=request.session_id,
+            usage=session.state.get(RUN_USAGE_KEY),
         )
     except Exception as e:
         return JSONResponse(
@@ -113,3 +266,121 @@ async def query_agent(request: QueryRequest):
                 "message": "Failed to process query",
             }
         )
+    finally:
+        admission.release()
+
+
+@app.post("/query/stream")
+async def query_agent_stream(request: QueryRequest, http_request: Request):
+    """
+    Stream the agent run as server-sent events.
+
+    Frames are sent as soon as ADK produces them (partial text, sub-agent
+    start/finish, tool calls and results), with heartbeat comments while the
+    run is silent. The run is cancelled when the client disconnects.
+    Overloaded instances answer 503 with Retry-After before streaming starts.
+    """
+    try:
+        admission = await get_admission_controller().acquire(request.user_id)
+    except AdmissionRejected as e:
+        return _overloaded(e)
+    try:
+        await _get_or_create_session(request.user_id, request.session_id)
+    except BaseException:
+        admission.release()
+        raise
+    events = _tracked(
+        runner.run_async(
+            user_id=request.user_id,
+            session_id=request.session_id,
+            new_message=_user_message(request.query),
+            run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+        ),
+        request.user_id,
+        request.session_id,
+    )
+    translator = EventTranslator(
+        root_name=root_agent.name,
+        agent_tool_names={
+            tool.name for tool in getattr(root_agent, "tools", []) if isinstance(tool, AgentTool)
+        },
+    )
+
+    return AdmittedStreamingResponse(
+        stream_events(
+            events,
+            translator,
+            request.session_id,
+            is_disconnected=http_request.is_disconnected,
+        ),
+        admission,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class BatchRequest(BaseModel):
+    """Request model for batch analysis of a watchlist."""
+    tickers: list[str] = Field(min_length=1, max_length=DEFAULT_MAX_TICKERS)
+    risk_attitude: str
+    investment_period: str
+    execution_preferences: str = ""
+    user_id: str = "default"
+
+
+def _job_not_found(job_id: str) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"error": f"Unknown batch job {job_id}"})
+
+
+@app.post("/batch", status_code=202)
+async def create_batch(request: BatchRequest):
+    """Start a batch analysis of several tickers with a shared risk profile."""
+    manager = get_batch_manager()
+    job_id = manager.submit(
+        request.tickers,
+        {
+            "risk_attitude": request.risk_attitude,
+            "investment_period": request.investment_period,
+            "execution_preferences": request.execution_preferences,
+        },
+        user_id=request.user_id,
+    )
+    job = manager.store.get_job(job_id)
+    return {"job_id": job_id, "status": job["status"], "total": job["total"]}
+
+
+@app.get("/batch/{job_id}")
+async def get_batch(job_id: str):
+    """Poll a batch job: status, progress counts and per-ticker results."""
+    job = get_batch_manager().store.get_job(job_id)
+    return job if job is not None else _job_not_found(job_id)
+
+
+@app.get("/batch/{job_id}/stream")
+async def stream_batch(job_id: str):
+    """Stream per-ticker results of a batch job as server-sent events."""
+    manager = get_batch_manager()
+    if manager.store.get_job(job_id) is None:
+        return _job_not_found(job_id)
+
+    async def frames():
+        async for event, data in manager.results(job_id):
+            yield format_sse(event, data)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/batch/{job_id}/resume")
+async def resume_batch(job_id: str):
+    """Re-run the tickers of a batch job that failed or never ran."""
+    manager = get_batch_manager()
+    if manager.store.get_job(job_id) is None:
+        return _job_not_found(job_id)
+    if not manager.resume(job_id):
+        return JSONResponse(status_code=409, content={"error": "Batch job is still running"})
+    job = manager.store.get_job(job_id)
+    return {"job_id": job_id, "status": job["status"], "pending": job["counts"]["pending"]}
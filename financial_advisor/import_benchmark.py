@@ -0,0 +1,165 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Import time of the app's entry modules, from ``python -X importtime``
+
+Each module is imported in a fresh interpreter with ``-X importtime`` and the
+per-module timings it prints on stderr are summarized: the total import time,
+the heaviest top-level packages and the heaviest of this package's own
+modules. Modules that are meant to load on first use only (``DEFERRED``) are
+reported when they appear on the import path, and ``--check`` turns that
+into a failing exit code so a regression is caught before it reaches a
+Cloud Run cold start.
+
+Usage:
+    python -m financial_advisor.import_benchmark
+    python -m financial_advisor.import_benchmark financial_advisor.fast_api_app --runs 5 --check
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_MODULES = ("financial_advisor", "financial_advisor.fast_api_app")
+
+# Loaded when a chart or PDF is first made, never at import
+DEFERRED = ("matplotlib", "fpdf")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output (times in microseconds)."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """Parse ``-X importtime`` output, skipping any other stderr lines."""
+    records = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(ImportRecord(name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+def import_records(module: str) -> list[ImportRecord]:
+    """Import a module in a fresh interpreter and return its import timings."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr)
+
+
+def summarize(module: str, records: list[ImportRecord], top: int = 10) -> dict:
+    """
+    Summarize the import timings of one module
+
+    Args:
+        module: The module that was imported
+        records: Its parsed ``-X importtime`` records
+        top: Number of packages and own modules to list
+
+    Returns:
+        dict: total_ms, packages and own_modules (heaviest first, in ms),
+            and the DEFERRED modules that were imported
+    """
+    total_us = sum(record.self_us for record in records)
+    packages: dict = {}
+    for record in records:
+        package = record.name.split(".")[0]
+        packages[package] = packages.get(package, 0) + record.self_us
+    own = [record for record in records if record.name.startswith("financial_advisor")]
+    own.sort(key=lambda record: record.cumulative_us, reverse=True)
+    imported = {record.name for record in records}
+    return {
+        "module": module,
+        "total_ms": round(total_us / 1000, 1),
+        "packages": [
+            (name, round(us / 1000, 1))
+            for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+        "own_modules": [(record.name, round(record.cumulative_us / 1000, 1)) for record in own[:top]],
+        "deferred_imported": sorted(
+            name for name in imported if name.split(".")[0] in DEFERRED and "." not in name
+        ),
+    }
+
+
+def run_benchmark(modules: list, runs: int = 3, top: int = 10) -> list:
+    """Import each module ``runs`` times and keep the run with the median total."""
+    results = []
+    for module in modules:
+        summaries = [summarize(module, import_records(module), top) for _ in range(runs)]
+        summaries.sort(key=lambda summary: summary["total_ms"])
+        median = summaries[len(summaries) // 2]
+        median["runs_ms"] = [summary["total_ms"] for summary in summaries]
+        results.append(median)
+    return results
+
+
+def format_report(results: list) -> str:
+    """Render the summaries as text."""
+    lines = []
+    for result in results:
+        spread = statistics.pstdev(result["runs_ms"]) if len(result["runs_ms"]) > 1 else 0.0
+        lines.append(f"import {result['module']}: {result['total_ms']:.0f} ms (sd {spread:.0f} ms)")
+        lines.append("  heaviest packages (self time):")
+        lines.extend(f"    {name:<48}{ms:>9.1f} ms" for name, ms in result["packages"])
+        lines.append("  heaviest financial_advisor modules (cumulative):")
+        lines.extend(f"    {name:<48}{ms:>9.1f} ms" for name, ms in result["own_modules"])
+        if result["deferred_imported"]:
+            lines.append(f"  DEFERRED MODULES ON THE IMPORT PATH: {', '.join(result['deferred_imported'])}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES), help="Modules to import")
+    parser.add_argument("--runs", type=int, default=3, help="Imports per module (median is shown)")
+    parser.add_argument("--top", type=int, default=10, help="Packages and modules to list")
+    parser.add_argument("--json", type=Path, help="Also write raw results to this file")
+    parser.add_argument(
+        "--check", action="store_true", help="Exit with status 1 if a deferred module is imported"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmark(args.modules, args.runs, args.top)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    print(format_report(results))
+    if args.check and any(result["deferred_imported"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
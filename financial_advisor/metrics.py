@@ -0,0 +1,300 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Prometheus metrics for the FastAPI app
+
+Agent, model and tool metrics are recorded by ``MetricsPlugin``, an ADK
+plugin registered on the app's Runner. Plugins see every agent, model and
+tool callback, including those of sub-agents run through AgentTool, so no
+agent code has to change:
+
+    financial_advisor_agent_run_duration_seconds{agent}
+    financial_advisor_model_call_duration_seconds{agent, model}
+    financial_advisor_model_errors_total{agent, model}
+    financial_advisor_model_tokens_total{agent, model, type}
+    financial_advisor_tool_call_duration_seconds{tool, kind}
+    financial_advisor_tool_errors_total{tool, kind}
+
+``kind`` is "mcp" for Alpha Vantage tools, "agent" for AgentTool and
+"function" otherwise; token ``type`` is prompt, output, cached, uncached
+(prompt tokens not served from a context cache) or thoughts.
+HTTP latency is recorded by the app's middleware, and cache, session and
+admission figures are read from their owners when /metrics is scraped.
+"""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.mcp_tool.mcp_tool import McpTool
+from google.adk.tools.tool_context import ToolContext
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+PREFIX = "financial_advisor"
+
+# Agent runs and model calls take seconds to minutes; tool calls milliseconds to seconds
+_RUN_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+_CALL_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+REGISTRY = CollectorRegistry()
+
+HTTP_REQUEST_DURATION = Histogram(
+    f"{PREFIX}_http_request_duration_seconds",
+    "HTTP request latency by route and status.",
+    ("method", "route", "status"),
+    buckets=_RUN_BUCKETS,
+    registry=REGISTRY,
+)
+AGENT_RUN_DURATION = Histogram(
+    f"{PREFIX}_agent_run_duration_seconds",
+    "Wall-clock duration of each agent run.",
+    ("agent",),
+    buckets=_RUN_BUCKETS,
+    registry=REGISTRY,
+)
+MODEL_CALL_DURATION = Histogram(
+    f"{PREFIX}_model_call_duration_seconds",
+    "Latency of each model call.",
+    ("agent", "model"),
+    buckets=_RUN_BUCKETS,
+    registry=REGISTRY,
+)
+MODEL_ERRORS = Counter(
+    f"{PREFIX}_model_errors",
+    "Model calls that raised an error.",
+    ("agent", "model"),
+    registry=REGISTRY,
+)
+MODEL_TOKENS = Counter(
+    f"{PREFIX}_model_tokens",
+    "Tokens reported in model usage metadata.",
+    ("agent", "model", "type"),
+    registry=REGISTRY,
+)
+TOOL_CALL_DURATION = Histogram(
+    f"{PREFIX}_tool_call_duration_seconds",
+    "Latency of each tool call.",
+    ("tool", "kind"),
+    buckets=_CALL_BUCKETS,
+    registry=REGISTRY,
+)
+TOOL_ERRORS = Counter(
+    f"{PREFIX}_tool_errors",
+    "Tool calls that raised or returned an error.",
+    ("tool", "kind"),
+    registry=REGISTRY,
+)
+
+_TOKEN_FIELDS = {
+    "prompt": "prompt_token_count",
+    "output": "candidates_token_count",
+    "cached": "cached_content_token_count",
+    "thoughts": "thoughts_token_count",
+}
+
+
+def tool_kind(tool: BaseTool) -> str:
+    """Classify a tool as "mcp", "agent" or "function"."""
+    from .tools.alpha_vantage_tools import ManagedMCPTool
+
+    if isinstance(tool, (McpTool, ManagedMCPTool)):
+        return "mcp"
+    if isinstance(tool, AgentTool):
+        return "agent"
+    return "function"
+
+
+def _is_error_result(result: Any) -> bool:
+    if isinstance(result, dict):
+        return bool(result.get("isError")) or result.get("status") == "error"
+    return bool(getattr(result, "isError", False))
+
+
+class MetricsPlugin(BasePlugin):
+    """ADK plugin recording agent, model and tool metrics."""
+
+    def __init__(self, name: str = "metrics"):
+        super().__init__(name=name)
+        self._started: dict = {}
+
+    def _start(self, key: tuple) -> None:
+        self._started[key] = time.perf_counter()
+
+    def _elapsed(self, key: tuple) -> float | None:
+        started = self._started.pop(key, None)
+        return None if started is None else time.perf_counter() - started
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        self._start(("agent", callback_context.invocation_id, agent.name))
+
+    async def after_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        seconds = self._elapsed(("agent", callback_context.invocation_id, agent.name))
+        if seconds is not None:
+            AGENT_RUN_DURATION.labels(agent.name).observe(seconds)
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        key = ("model", callback_context.invocation_id, callback_context.agent_name)
+        self._started[key] = (time.perf_counter(), llm_request.model or "unknown")
+
+    def _model_call(self, callback_context: CallbackContext) -> tuple:
+        key = ("model", callback_context.invocation_id, callback_context.agent_name)
+        started, model = self._started.pop(key, (None, "unknown"))
+        seconds = None if started is None else time.perf_counter() - started
+        return seconds, model
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        if llm_response.partial:
+            return
+        seconds, model = self._model_call(callback_context)
+        agent = callback_context.agent_name
+        if seconds is not None:
+            MODEL_CALL_DURATION.labels(agent, model).observe(seconds)
+        usage = llm_response.usage_metadata
+        if usage is None:
+            return
+        for token_type, field in _TOKEN_FIELDS.items():
+            count = getattr(usage, field, None)
+            if count:
+                MODEL_TOKENS.labels(agent, model, token_type).inc(count)
+        uncached = (usage.prompt_token_count or 0) - (usage.cached_content_token_count or 0)
+        if uncached > 0:
+            MODEL_TOKENS.labels(agent, model, "uncached").inc(uncached)
+
+    async def on_model_error_callback(
+        self,
+        *,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+        error: Exception,
+    ) -> None:
+        _, model = self._model_call(callback_context)
+        MODEL_ERRORS.labels(callback_context.agent_name, model).inc()
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict, tool_context: ToolContext
+    ) -> None:
+        self._start(("tool", tool_context.function_call_id))
+
+    async def after_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict, tool_context: ToolContext, result: Any
+    ) -> None:
+        kind = tool_kind(tool)
+        seconds = self._elapsed(("tool", tool_context.function_call_id))
+        if seconds is not None:
+            TOOL_CALL_DURATION.labels(tool.name, kind).observe(seconds)
+        if _is_error_result(result):
+            TOOL_ERRORS.labels(tool.name, kind).inc()
+
+    async def on_tool_error_callback(
+        self, *, tool: BaseTool, tool_args: dict, tool_context: ToolContext, error: Exception
+    ) -> None:
+        kind = tool_kind(tool)
+        seconds = self._elapsed(("tool", tool_context.function_call_id))
+        if seconds is not None:
+            TOOL_CALL_DURATION.labels(tool.name, kind).observe(seconds)
+        TOOL_ERRORS.labels(tool.name, kind).inc()
+
+
+def cache_stats() -> dict:
+    """Return hit/miss counters of every active cache, by cache name."""
+    from . import output_cache
+    from .tools.alpha_vantage_tools import (
+        get_alpha_vantage_cache_stats,
+        get_alpha_vantage_single_flight_stats,
+        get_alpha_vantage_tool_schema_stats,
+    )
+
+    caches = {}
+    alpha_vantage = get_alpha_vantage_cache_stats()
+    if alpha_vantage:
+        caches["alpha_vantage_responses"] = alpha_vantage
+    tool_schemas = get_alpha_vantage_tool_schema_stats()
+    if tool_schemas:
+        caches["alpha_vantage_tool_list"] = tool_schemas
+    if output_cache._cache_instance is not None:
+        caches["agent_outputs"] = output_cache._cache_instance.stats()
+    single_flight = get_alpha_vantage_single_flight_stats()
+    if single_flight:
+        # A collapsed call is served by another caller's request
+        caches["alpha_vantage_single_flight"] = {
+            "hits": single_flight["collapsed"],
+            "misses": single_flight["executed"],
+        }
+    return caches
+
+
+class StatsCollector:
+    """
+    Exports dicts of numbers, read at scrape time, as gauges
+
+    Args:
+        sources: Metric name fragment -> callable returning {field: number};
+            each field becomes ``financial_advisor_<name>_<field>``
+    """
+
+    def __init__(self, sources: dict[str, Callable[[], dict]]):
+        self.sources = sources
+
+    def collect(self):
+        hits = CounterMetricFamily(f"{PREFIX}_cache_hits", "Cache hits.", labels=("cache",))
+        misses = CounterMetricFamily(f"{PREFIX}_cache_misses", "Cache misses.", labels=("cache",))
+        ratio = GaugeMetricFamily(
+            f"{PREFIX}_cache_hit_ratio", "Share of lookups served from the cache.", labels=("cache",)
+        )
+        for cache, stats in cache_stats().items():
+            lookups = stats["hits"] + stats["misses"]
+            hits.add_metric((cache,), stats["hits"])
+            misses.add_metric((cache,), stats["misses"])
+            ratio.add_metric((cache,), stats["hits"] / lookups if lookups else 0.0)
+        yield from (hits, misses, ratio)
+
+        for name, source in self.sources.items():
+            for field, value in (source() or {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    yield GaugeMetricFamily(
+                        f"{PREFIX}_{name}_{field}", f"{name} {field}", value=value
+                    )
+
+
+def register_stats(sources: dict[str, Callable[[], dict]]) -> None:
+    """Export scrape-time gauges (and the cache metrics) from the given sources."""
+    REGISTRY.register(StatsCollector(sources))
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return the metrics in the Prometheus text format and its content type."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
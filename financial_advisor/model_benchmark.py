@@ -0,0 +1,194 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Latency and token cost of each sub-agent on each candidate model
+
+Replays the sub-agent requests recorded in exported session JSON files
+(the ``session-<id>.json`` files in the project root) against every
+candidate model, and reports mean latency, tokens and estimated cost per
+agent per model. The data analyst calls Alpha Vantage; point
+ALPHA_VANTAGE_MCP_URL at the offline stand-in for repeatable runs.
+
+Usage:
+    python -m financial_advisor.model_benchmark session-*.json \\
+        --models gemini-2.5-pro gemini-2.5-flash --repeat 2
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+from google.adk.agents import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from .model_routing import FAST_MODEL, PRO_MODEL, estimate_cost, get_model
+
+
+def _sub_agents() -> dict:
+    from .sub_agents.data_analyst import data_analyst_agent
+    from .sub_agents.execution_analyst import execution_analyst_agent
+    from .sub_agents.risk_analyst import risk_analyst_agent
+    from .sub_agents.summary_agent import summary_agent
+    from .sub_agents.trading_analyst import trading_analyst_agent
+
+    agents = (
+        data_analyst_agent,
+        trading_analyst_agent,
+        execution_analyst_agent,
+        risk_analyst_agent,
+        summary_agent,
+    )
+    return {agent.name: agent for agent in agents}
+
+
+def load_agent_requests(session_path: Path, agent_names) -> tuple[list, dict]:
+    """
+    Extract the sub-agent calls recorded in an exported session
+
+    Args:
+        session_path: Path to a session JSON export
+        agent_names: Names of the sub-agents to collect calls for
+
+    Returns:
+        tuple: ([(agent_name, request), ...] in call order, session state)
+    """
+    session = json.loads(Path(session_path).read_text())
+    calls = []
+    for event in session.get("events", []):
+        for part in (event.get("content") or {}).get("parts") or []:
+            call = part.get("functionCall") or part.get("function_call")
+            if call and call.get("name") in agent_names:
+                calls.append((call["name"], (call.get("args") or {}).get("request", "")))
+    return calls, session.get("state", {})
+
+
+async def benchmark_call(agent: LlmAgent, model: str, request: str, state: dict) -> dict:
+    """
+    Run one agent request on a given model and measure it
+
+    Returns:
+        dict: agent, model, seconds, prompt/output tokens and estimated cost
+    """
+    runner = InMemoryRunner(agent=agent.clone(update={"model": model}))
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="benchmark", state=dict(state)
+    )
+    prompt_tokens = output_tokens = 0
+    started = time.perf_counter()
+    async for event in runner.run_async(
+        user_id="benchmark",
+        session_id=session.id,
+        new_message=types.Content(role="user", parts=[types.Part(text=request)]),
+    ):
+        usage = event.usage_metadata
+        if usage:
+            prompt_tokens += usage.prompt_token_count or 0
+            output_tokens += (usage.candidates_token_count or 0) + (
+                usage.thoughts_token_count or 0
+            )
+    return {
+        "agent": agent.name,
+        "model": model,
+        "seconds": time.perf_counter() - started,
+        "prompt_tokens": prompt_tokens,
+        "output_tokens": output_tokens,
+        "cost_usd": estimate_cost(model, prompt_tokens, output_tokens),
+    }
+
+
+def summarize(results: list) -> list:
+    """Aggregate benchmark results into one row per (agent, model)."""
+    groups: dict = {}
+    for result in results:
+        groups.setdefault((result["agent"], result["model"]), []).append(result)
+
+    rows = []
+    for (agent, model), runs in groups.items():
+        costs = [r["cost_usd"] for r in runs if r["cost_usd"] is not None]
+        rows.append(
+            {
+                "agent": agent,
+                "model": model,
+                "runs": len(runs),
+                "mean_seconds": statistics.mean(r["seconds"] for r in runs),
+                "mean_prompt_tokens": statistics.mean(r["prompt_tokens"] for r in runs),
+                "mean_output_tokens": statistics.mean(r["output_tokens"] for r in runs),
+                "mean_cost_usd": statistics.mean(costs) if costs else None,
+                "configured": get_model(agent) == model,
+            }
+        )
+    return rows
+
+
+def format_table(rows: list) -> str:
+    """Render summarized rows as a fixed-width text table."""
+    header = f"{'agent':<26}{'model':<24}{'runs':>5}{'latency s':>11}{'in tok':>9}{'out tok':>9}{'cost $':>10}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        cost = "n/a" if row["mean_cost_usd"] is None else f"{row['mean_cost_usd']:.4f}"
+        model = row["model"] + (" *" if row["configured"] else "")
+        lines.append(
+            f"{row['agent']:<26}{model:<24}{row['runs']:>5}{row['mean_seconds']:>11.1f}"
+            f"{row['mean_prompt_tokens']:>9.0f}{row['mean_output_tokens']:>9.0f}{cost:>10}"
+        )
+    lines.append("* = model currently assigned to the agent")
+    return "\n".join(lines)
+
+
+async def run_benchmark(
+    session_paths: list,
+    models: list,
+    agent_names: list | None = None,
+    repeat: int = 1,
+) -> list:
+    """Replay every recorded sub-agent request on every model."""
+    agents = _sub_agents()
+    if agent_names:
+        agents = {name: agents[name] for name in agent_names}
+
+    results = []
+    for path in session_paths:
+        calls, state = load_agent_requests(path, agents)
+        for agent_name, request in calls:
+            for model in models:
+                for _ in range(repeat):
+                    results.append(
+                        await benchmark_call(agents[agent_name], model, request, state)
+                    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sessions", nargs="+", type=Path, help="Exported session JSON files")
+    parser.add_argument("--models", nargs="+", default=[PRO_MODEL, FAST_MODEL])
+    parser.add_argument("--agents", nargs="+", help="Only benchmark these sub-agents")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", type=Path, help="Also write raw results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run_benchmark(args.sessions, args.models, args.agents, args.repeat)
+    )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    print(format_table(summarize(results)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Central per-agent model assignment
+
+Extraction and formatting agents run on a fast model, reasoning-heavy agents
+on the pro model. Any assignment can be overridden, most specific first:
+
+1. ``FINANCIAL_ADVISOR_MODEL_<AGENT_NAME>`` (e.g. FINANCIAL_ADVISOR_MODEL_RISK_ANALYST_AGENT)
+2. A JSON file ``{"agent_name": "model"}`` named by FINANCIAL_ADVISOR_MODEL_CONFIG
+3. ``FINANCIAL_ADVISOR_MODEL_DEFAULT`` for every agent not listed
+4. DEFAULT_AGENT_MODELS below
+"""
+
+import json
+import os
+from pathlib import Path
+
+PRO_MODEL = "gemini-2.5-pro"
+FAST_MODEL = "gemini-2.5-flash"
+
+DEFAULT_AGENT_MODELS = {
+    "financial_coordinator": PRO_MODEL,
+    "workflow_coordinator": FAST_MODEL,   # conversation only, no analysis
+    "data_analyst_agent": FAST_MODEL,     # fetches and formats market data
+    "trading_analyst_agent": PRO_MODEL,
+    "execution_analyst_agent": PRO_MODEL,
+    "risk_analyst_agent": PRO_MODEL,
+    "summary_agent": FAST_MODEL,          # condenses existing outputs
+}
+
+# USD per 1M tokens (input, output); thinking tokens are billed as output
+MODEL_PRICES = {
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+}
+
+# Cached input tokens are billed at this fraction of the input price
+CACHED_INPUT_PRICE_RATIO = 0.25
+
+_ENV_PREFIX = "FINANCIAL_ADVISOR_MODEL_"
+
+
+def _config_file_models() -> dict:
+    path = os.getenv("FINANCIAL_ADVISOR_MODEL_CONFIG")
+    if not path:
+        return {}
+    return json.loads(Path(path).expanduser().read_text())
+
+
+def get_model(agent_name: str) -> str:
+    """
+    Return the model an agent should run on
+
+    Args:
+        agent_name: Name of the agent (e.g. "risk_analyst_agent")
+
+    Returns:
+        str: Model name
+    """
+    override = os.getenv(_ENV_PREFIX + agent_name.upper())
+    if override:
+        return override
+    configured = _config_file_models().get(agent_name)
+    if configured:
+        return configured
+    return os.getenv(_ENV_PREFIX + "DEFAULT") or DEFAULT_AGENT_MODELS.get(
+        agent_name, PRO_MODEL
+    )
+
+
+def get_model_assignments() -> dict:
+    """Return the resolved model of every known agent."""
+    return {name: get_model(name) for name in DEFAULT_AGENT_MODELS}
+
+
+def estimate_cost(
+    model: str,
+    prompt_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0,
+) -> float | None:
+    """
+    Estimate the USD cost of a model call
+
+    Args:
+        model: Model name
+        prompt_tokens: Input tokens, including cached ones
+        output_tokens: Output tokens, including thinking tokens
+        cached_tokens: Input tokens served from the context cache
+
+    Returns:
+        float: Cost in USD, or None if the model has no known price
+    """
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        return None
+    input_price, output_price = prices
+    cached_tokens = min(cached_tokens, prompt_tokens)
+    input_cost = (prompt_tokens - cached_tokens + cached_tokens * CACHED_INPUT_PRICE_RATIO) * input_price
+    return (input_cost + output_tokens * output_price) / 1_000_000
@@ -0,0 +1,311 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache of completed sub-agent outputs keyed by a fingerprint of their inputs
+
+Two users asking for the same ticker with the same risk attitude and
+investment period get the same analysis without a second generation. The
+fingerprint of each sub-agent holds the normalized inputs it depends on:
+
+    data_analyst_agent       ticker, last completed trading day
+    trading_analyst_agent    market analysis hash, risk attitude, period
+    execution_analyst_agent  strategies hash, risk attitude, period, preferences
+    risk_analyst_agent       all three upstream hashes, risk attitude, period, preferences
+    summary_agent            all four upstream hashes
+
+Because every downstream fingerprint includes the hash of the upstream
+output, a new market analysis (after its entry expires) invalidates the whole
+chain. Entries live as long as the daily market data they derive from.
+
+The cache is wired into the coordinator as before/after tool callbacks, so a
+hit short-circuits the AgentTool call entirely; OutputCachePlugin cleans up
+after calls that raise. An entry holds the prose
+output together with the structured payload the sub-agent recorded, and a
+hit restores both. Hits and misses are reported in session state under
+``agent_output_cache``.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any
+
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+from .structured_outputs import STRUCTURED_OUTPUTS
+from .tools.degraded_data import DEGRADED_DATA_KEY
+from .tools.market_data import last_completed_trading_day
+from .tools.response_cache import DEFAULT_TOOL_TTLS, ToolResponseCache
+
+CACHE_REPORT_KEY = "agent_output_cache"
+
+# Outputs are as fresh as the daily bars they are derived from
+DEFAULT_OUTPUT_TTL = DEFAULT_TOOL_TTLS["TIME_SERIES_DAILY"]
+
+# Upstream output state keys each sub-agent depends on
+_UPSTREAM_KEYS = {
+    "data_analyst_agent": (),
+    "trading_analyst_agent": ("market_data_analysis_output",),
+    "execution_analyst_agent": ("proposed_trading_strategies_output",),
+    "risk_analyst_agent": (
+        "market_data_analysis_output",
+        "proposed_trading_strategies_output",
+        "execution_plan_output",
+    ),
+    "summary_agent": (
+        "market_data_analysis_output",
+        "proposed_trading_strategies_output",
+        "execution_plan_output",
+        "final_risk_assessment_output",
+    ),
+}
+_NEEDS_PROFILE = {"trading_analyst_agent", "execution_analyst_agent", "risk_analyst_agent"}
+_NEEDS_PREFERENCES = {"execution_analyst_agent", "risk_analyst_agent"}
+
+_RISK_ATTITUDES = (
+    ("very conservative", "very conservative"),
+    ("very aggressive", "very aggressive"),
+    ("conservative", "conservative"),
+    ("aggressive", "aggressive"),
+    ("moderate", "moderate"),
+    ("balanced", "moderate"),
+    ("medium", "moderate"),
+)
+_INVESTMENT_PERIODS = (
+    ("intraday", "intraday"),
+    ("day trad", "intraday"),
+    ("short", "short-term"),
+    ("medium", "medium-term"),
+    ("mid", "medium-term"),
+    ("long", "long-term"),
+)
+
+_RISK_PATTERN = re.compile(r"risk\s+(?:attitude|tolerance|profile)[^.\n]{0,40}", re.I)
+_PERIOD_PATTERN = re.compile(r"investment\s+(?:period|horizon)[^.\n]{0,40}", re.I)
+
+# Fingerprints computed before a call, by function call id, for the after callback
+_pending: dict = {}
+_pending_lock = threading.Lock()
+
+
+def _match_vocabulary(text: str | None, vocabulary) -> str | None:
+    text = (text or "").lower()
+    for keyword, value in vocabulary:
+        if keyword in text:
+            return value
+    return None
+
+
+def normalize_risk_attitude(text: str | None) -> str | None:
+    """Map free text to a canonical risk attitude, or None if none is named."""
+    return _match_vocabulary(text, _RISK_ATTITUDES)
+
+
+def normalize_investment_period(text: str | None) -> str | None:
+    """Map free text to a canonical investment period, or None if none is named."""
+    return _match_vocabulary(text, _INVESTMENT_PERIODS)
+
+
+def _digest(text: Any) -> str:
+    return hashlib.sha256(str(text).encode()).hexdigest()[:16]
+
+
+def fingerprint_inputs(agent_name: str, state: dict, request: str = "") -> dict | None:
+    """
+    Build the normalized cache key of a sub-agent call
+
+    Inputs are taken from state (``ticker``, ``user_risk_attitude``,
+    ``user_investment_period``, ``user_execution_preferences`` and the
+    upstream output keys), falling back to the request text for the risk
+    attitude and investment period. The ticker must come from state; the
+    ticker of later stages is covered by the hash of the market analysis.
+
+    Args:
+        agent_name: Name of the sub-agent being called
+        state: Current session state
+        request: Request text the coordinator sent to the sub-agent
+
+    Returns:
+        dict: Fingerprint, or None if the call is not cacheable (unknown
+        agent, or an input could not be determined)
+    """
+    if agent_name not in _UPSTREAM_KEYS:
+        return None
+    fingerprint = {}
+
+    if agent_name == "data_analyst_agent":
+        # Never guessed from the request text: a wrong guess would serve one
+        # company's analysis for another. Coordinator runs do not set it.
+        ticker = state.get("ticker")
+        if not ticker:
+            return None
+        fingerprint["ticker"] = ticker.upper()
+        fingerprint["trading_day"] = last_completed_trading_day().isoformat()
+
+    for key in _UPSTREAM_KEYS[agent_name]:
+        if not state.get(key):
+            return None
+        fingerprint[key] = _digest(state[key])
+
+    if agent_name in _NEEDS_PROFILE:
+        risk = normalize_risk_attitude(state.get("user_risk_attitude"))
+        period = normalize_investment_period(state.get("user_investment_period"))
+        if risk is None:
+            match = _RISK_PATTERN.search(request)
+            risk = normalize_risk_attitude(match.group(0)) if match else None
+        if period is None:
+            match = _PERIOD_PATTERN.search(request)
+            period = normalize_investment_period(match.group(0)) if match else None
+        if risk is None or period is None:
+            return None
+        fingerprint["risk_attitude"] = risk
+        fingerprint["investment_period"] = period
+
+    if agent_name in _NEEDS_PREFERENCES:
+        preferences = state.get("user_execution_preferences") or ""
+        fingerprint["execution_preferences"] = " ".join(preferences.lower().split())
+
+    return fingerprint
+
+
+def get_default_output_cache_path() -> Path:
+    """Return the on-disk location of the sub-agent output cache"""
+    configured = os.getenv("AGENT_OUTPUT_CACHE_PATH")
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".cache" / "financial_advisor" / "agent_output_cache.sqlite3"
+
+
+# Singleton instance
+_cache_instance: ToolResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_agent_output_cache() -> ToolResponseCache | None:
+    """
+    Get or create the process-wide sub-agent output cache.
+
+    Returns:
+        ToolResponseCache: The cache, or None if AGENT_OUTPUT_CACHE_DISABLED is set
+    """
+    global _cache_instance
+    if os.getenv("AGENT_OUTPUT_CACHE_DISABLED"):
+        return None
+    with _cache_lock:
+        if _cache_instance is None:
+            ttl = float(os.getenv("AGENT_OUTPUT_CACHE_TTL", DEFAULT_OUTPUT_TTL))
+            _cache_instance = ToolResponseCache(
+                get_default_output_cache_path(), ttls={}, default_ttl=ttl
+            )
+        return _cache_instance
+
+
+def _report(tool_context: ToolContext, agent_name: str, hit: bool) -> None:
+    report = dict(tool_context.state.get(CACHE_REPORT_KEY) or {"hits": 0, "misses": 0})
+    report["hits" if hit else "misses"] += 1
+    report["agents"] = {**report.get("agents", {}), agent_name: "hit" if hit else "miss"}
+    tool_context.state[CACHE_REPORT_KEY] = report
+
+
+def check_agent_output_cache(
+    tool: BaseTool, args: dict, tool_context: ToolContext
+) -> dict | None:
+    """
+    before_tool_callback: answer an AgentTool call from the cache if possible
+
+    On a hit the cached output is written to the sub-agent's output_key (as
+    the AgentTool run would have done) and returned as the tool result, so
+    the sub-agent does not run.
+    """
+    cache = get_agent_output_cache()
+    if cache is None or not isinstance(tool, AgentTool):
+        return None
+    agent = tool.agent
+    fingerprint = fingerprint_inputs(
+        agent.name, tool_context.state.to_dict(), str(args.get("request", ""))
+    )
+    if fingerprint is None:
+        return None
+
+    spec = STRUCTURED_OUTPUTS.get(agent.name)
+    cached = cache.get(agent.name, fingerprint)
+    if cached is None:
+        with _pending_lock:
+            _pending[tool_context.function_call_id] = fingerprint
+        if spec:
+            # Only a payload recorded by this call may be cached with its output
+            tool_context.state[spec.state_key] = None
+        _report(tool_context, agent.name, hit=False)
+        return None
+
+    # Entries written before structured payloads existed hold the bare output
+    if isinstance(cached, dict) and "output" in cached:
+        output, structured = cached["output"], cached.get("structured")
+    else:
+        output, structured = cached, None
+    output_key = getattr(agent, "output_key", None)
+    if output_key:
+        tool_context.state[output_key] = output
+    if spec and structured:
+        tool_context.state[spec.state_key] = structured
+    _report(tool_context, agent.name, hit=True)
+    return {"result": output}
+
+
+def store_agent_output(
+    tool: BaseTool, args: dict, tool_context: ToolContext, tool_response: Any
+) -> None:
+    """after_tool_callback: cache the output of an AgentTool call that missed.
+
+    Nothing is cached while the session's market data is stale or demo data.
+    """
+    with _pending_lock:
+        fingerprint = _pending.pop(tool_context.function_call_id, None)
+    cache = get_agent_output_cache()
+    if fingerprint is None or cache is None or not tool_response:
+        return None
+    if tool_context.state.get(DEGRADED_DATA_KEY):
+        return None
+    spec = STRUCTURED_OUTPUTS.get(tool.agent.name)
+    structured = tool_context.state.get(spec.state_key) if spec else None
+    cache.set(tool.agent.name, fingerprint, {"output": tool_response, "structured": structured})
+    return None
+
+
+class OutputCachePlugin(BasePlugin):
+    """ADK plugin forgetting the fingerprint of an AgentTool call that raised.
+
+    The coordinator's after_tool_callback does not run for a failed call, so
+    without this its pending fingerprint would be kept forever.
+    """
+
+    def __init__(self, name: str = "agent_output_cache"):
+        super().__init__(name=name)
+
+    async def on_tool_error_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict,
+        tool_context: ToolContext,
+        error: Exception,
+    ) -> None:
+        with _pending_lock:
+            _pending.pop(tool_context.function_call_id, None)
+        return None
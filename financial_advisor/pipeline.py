@@ -0,0 +1,260 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Concurrent fan-out of independent sub-agent runs
+
+The coordinator normally calls one sub-agent at a time through AgentTool. The
+tools in this module run several independent instances of a sub-agent at
+once (one per ticker, or one per top strategy), bounded by
+``PIPELINE_MAX_CONCURRENCY``, and record per-item and overall timings under
+``state["stage_timings"]``.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import MutableMapping
+from typing import Any
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools import FunctionTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+
+from .sub_agents.data_analyst import data_analyst_agent
+from .sub_agents.risk_analyst import risk_analyst_agent
+from .utils.stage_timing import record_stage_timing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 3
+
+
+def get_max_concurrency() -> int:
+    """Return the fan-out concurrency limit (PIPELINE_MAX_CONCURRENCY)."""
+    return max(1, int(os.getenv("PIPELINE_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)))
+
+
+async def run_agent(
+    agent: BaseAgent,
+    request: str,
+    state: dict | None = None,
+    user_id: str = "user",
+    plugins: list | None = None,
+) -> str:
+    """
+    Run an agent to completion in its own throwaway session
+
+    Unlike AgentTool, state changes made by the agent are not forwarded to
+    the caller's session, so several runs can proceed concurrently without
+    overwriting each other's output keys.
+
+    Args:
+        agent: Agent to run
+        request: User message sent to the agent
+        state: Initial session state (copied)
+        user_id: User the session belongs to
+        plugins: Runner plugins, so callbacks also observe the nested run
+
+    Returns:
+        str: The agent's output_key value if it set one, else its final text
+    """
+    runner = Runner(
+        app_name=agent.name,
+        agent=agent,
+        session_service=InMemorySessionService(),
+        plugins=plugins,
+    )
+    session = await runner.session_service.create_session(
+        app_name=agent.name, user_id=user_id, state=dict(state or {})
+    )
+    output_key = getattr(agent, "output_key", None)
+    output, last_text = None, ""
+    async for event in runner.run_async(
+        user_id=user_id,
+        session_id=session.id,
+        new_message=types.Content(role="user", parts=[types.Part(text=request)]),
+    ):
+        if output_key and output_key in event.actions.state_delta:
+            output = event.actions.state_delta[output_key]
+        if event.content and event.content.parts:
+            text = "\n".join(p.text for p in event.content.parts if p.text)
+            last_text = text or last_text
+    return str(output) if output is not None else last_text
+
+
+async def fan_out(
+    agent: BaseAgent,
+    requests: dict,
+    state: MutableMapping[str, Any],
+    stage: str,
+    user_id: str = "user",
+    plugins: list | None = None,
+    max_concurrency: int | None = None,
+) -> dict:
+    """
+    Run one instance of ``agent`` per request, at most ``max_concurrency`` at a time
+
+    Args:
+        agent: Agent to run for every item
+        requests: Item label -> request text
+        state: Caller's session state; copied into every run and used to
+            record timings under ``stage_timings``
+        stage: Name of the fan-out stage in the timings
+        user_id: User the nested sessions belong to
+        plugins: Runner plugins for the nested runs
+        max_concurrency: Concurrency limit (default: get_max_concurrency())
+
+    Returns:
+        dict: Item label -> {"status", "output" or "message", "seconds"}
+    """
+    limit = max_concurrency or get_max_concurrency()
+    semaphore = asyncio.Semaphore(limit)
+    snapshot = {
+        key: value
+        for key, value in (state.to_dict() if hasattr(state, "to_dict") else state).items()
+        if not key.startswith("_adk")
+    }
+
+    async def run_one(label: str, request: str):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                output = await run_agent(agent, request, snapshot, user_id, plugins)
+                result = {"status": "success", "output": output}
+            except Exception as e:
+                logger.warning("%s failed for %s: %s", agent.name, label, e)
+                result = {"status": "error", "message": str(e)}
+            result["seconds"] = round(time.perf_counter() - started, 3)
+            return label, result
+
+    started = time.perf_counter()
+    results = dict(
+        await asyncio.gather(
+            *(run_one(label, request) for label, request in requests.items())
+        )
+    )
+    for label, result in results.items():
+        record_stage_timing(state, f"{agent.name}[{label}]", result["seconds"])
+    record_stage_timing(
+        state,
+        stage,
+        time.perf_counter() - started,
+        items=len(requests),
+        max_concurrency=limit,
+    )
+    return results
+
+
+def _join_sections(results: dict) -> str:
+    sections = []
+    for label, result in results.items():
+        body = result.get("output") or f"Analysis failed: {result.get('message')}"
+        sections.append(f"## {label}\n\n{body}")
+    return "\n\n---\n\n".join(sections)
+
+
+def _nested_run_options(tool_context: ToolContext) -> dict:
+    invocation = tool_context._invocation_context
+    return {
+        "user_id": invocation.user_id,
+        "plugins": list(invocation.plugin_manager.plugins),
+    }
+
+
+async def analyze_market_data_parallel(tickers: list[str], tool_context: ToolContext) -> dict:
+    """
+    Run the market data analysis for several tickers concurrently.
+
+    Use this instead of calling data_analyst_agent repeatedly when the user
+    asks about more than one ticker.
+
+    Args:
+        tickers: Stock ticker symbols (e.g., ["AAPL", "MSFT"])
+
+    Returns:
+        dict: Per-ticker analysis text (also stored in market_data_analysis_output)
+    """
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    results = await fan_out(
+        data_analyst_agent,
+        {ticker: f"Analyze the market ticker {ticker}" for ticker in tickers},
+        tool_context.state,
+        stage="analyze_market_data_parallel",
+        **_nested_run_options(tool_context),
+    )
+    tool_context.state["market_data_analyses"] = {
+        ticker: result.get("output") for ticker, result in results.items()
+    }
+    tool_context.state["market_data_analysis_output"] = _join_sections(results)
+    return {"status": "success", "analyses": results}
+
+
+async def assess_strategy_risks_parallel(
+    strategies: list[str],
+    risk_attitude: str,
+    investment_period: str,
+    tool_context: ToolContext,
+) -> dict:
+    """
+    Write the detailed risk analysis for each top strategy concurrently.
+
+    Each strategy is assessed by its own risk analyst run, using the market
+    analysis, proposed strategies and execution plan already in state.
+
+    Args:
+        strategies: Names of the top strategies (usually the TOP 2)
+        risk_attitude: The user's stated risk attitude
+        investment_period: The user's stated investment period
+
+    Returns:
+        dict: Per-strategy risk analysis (also stored in final_risk_assessment_output)
+    """
+    state = tool_context.state
+    context = (
+        f"Market data analysis:\n{state.get('market_data_analysis_output', '')}\n\n"
+        f"Proposed trading strategies:\n{state.get('proposed_trading_strategies_output', '')}\n\n"
+        f"Execution plan:\n{state.get('execution_plan_output', '')}\n\n"
+        f"User risk attitude: {risk_attitude}\n"
+        f"User investment period: {investment_period}"
+    )
+    requests = {
+        strategy: (
+            f"Assess ONLY this strategy: {strategy}\n"
+            "Produce the detailed risk analysis section for this single strategy "
+            "(all subsections). Skip the comparative overview, the final "
+            "recommendation and the summary question.\n\n" + context
+        )
+        for strategy in strategies
+    }
+    results = await fan_out(
+        risk_analyst_agent,
+        requests,
+        state,
+        stage="assess_strategy_risks_parallel",
+        **_nested_run_options(tool_context),
+    )
+    state["strategy_risk_assessments"] = {
+        strategy: result.get("output") for strategy, result in results.items()
+    }
+    state["final_risk_assessment_output"] = _join_sections(results)
+    return {"status": "success", "assessments": results}
+
+
+# Create FunctionTool instances (function names are the tool names the model sees)
+analyze_market_data_parallel_tool = FunctionTool(func=analyze_market_data_parallel)
+assess_strategy_risks_parallel_tool = FunctionTool(func=assess_strategy_risks_parallel)
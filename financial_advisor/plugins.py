@@ -0,0 +1,36 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""ADK plugins every Runner of the advisor is built with"""
+
+from .context_cache import ContextCachePlugin
+from .metrics import MetricsPlugin
+from .output_cache import OutputCachePlugin
+from .token_usage import TokenUsagePlugin
+
+
+def build_plugins() -> list:
+    """
+    Create the plugin list shared by the API runner and batch runs
+
+    Returns:
+        list: Metrics, token usage, context cache and output cache plugins
+    """
+    return [
+        MetricsPlugin(),
+        TokenUsagePlugin(),
+        ContextCachePlugin(),
+        OutputCachePlugin(),
+    ]
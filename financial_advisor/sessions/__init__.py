@@ -0,0 +1,78 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Session services selectable by configuration
+
+SESSION_BACKEND picks the service used by the FastAPI app:
+
+    bounded  BoundedMemorySessionService (default): in process, evicting least
+             recently used idle sessions past SESSION_MEMORY_LIMIT_MB, spilled
+             to SESSION_SPILL_PATH when set
+    memory   ADK's InMemorySessionService (unbounded)
+    sqlite   SqliteSessionService at SESSION_DB_PATH
+    redis    RedisSessionService at REDIS_URL (shared by all instances)
+
+Only sqlite and redis can be shared by several instances. All but memory
+expire sessions idle for SESSION_TTL_SECONDS and keep the newest
+SESSION_MAX_EVENTS events of each session.
+"""
+
+import os
+
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+
+from .base import PersistentSessionService, get_max_events, get_session_ttl
+from .bounded_memory import BoundedMemorySessionService
+from .redis_service import RedisSessionService
+from .sqlite_service import SqliteSessionService
+
+SESSION_BACKEND_ENV = "SESSION_BACKEND"
+
+_BACKENDS = {
+    "bounded": BoundedMemorySessionService,
+    "memory": InMemorySessionService,
+    "sqlite": SqliteSessionService,
+    "redis": RedisSessionService,
+}
+
+
+def get_session_service(backend: str | None = None) -> BaseSessionService:
+    """
+    Create the session service for the configured backend
+
+    Args:
+        backend: "bounded", "memory", "sqlite" or "redis"; defaults to SESSION_BACKEND
+
+    Returns:
+        BaseSessionService: A new session service
+    """
+    backend = (backend or os.getenv(SESSION_BACKEND_ENV) or "bounded").strip().lower()
+    if backend not in _BACKENDS:
+        raise ValueError(
+            f"Unknown {SESSION_BACKEND_ENV} {backend!r}; expected one of {sorted(_BACKENDS)}"
+        )
+    return _BACKENDS[backend]()
+
+
+__all__ = [
+    "BoundedMemorySessionService",
+    "PersistentSessionService",
+    "RedisSessionService",
+    "SESSION_BACKEND_ENV",
+    "SqliteSessionService",
+    "get_max_events",
+    "get_session_service",
+    "get_session_ttl",
+]
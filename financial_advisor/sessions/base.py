@@ -0,0 +1,135 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Shared behaviour of the persistent session services
+
+Session state is split by key prefix the same way ADK's in-memory service
+does: ``app:`` keys are shared by every session of the app, ``user:`` keys by
+every session of a user, and ``temp:`` keys are never stored. Backends write
+only the keys an event changed (its state delta) and append the event, so a
+turn costs a few small writes instead of a rewrite of the whole session.
+Idle sessions expire after a TTL and each session keeps a bounded number of
+its most recent events.
+"""
+
+import abc
+import os
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+# Idle time after which a session expires, in seconds
+DEFAULT_SESSION_TTL = 24 * 60 * 60
+
+# Events kept per session; older events are dropped first
+DEFAULT_MAX_EVENTS = 200
+
+
+def get_session_ttl() -> float:
+    """Return the idle session TTL in seconds (SESSION_TTL_SECONDS, 0 = never)."""
+    return float(os.getenv("SESSION_TTL_SECONDS", DEFAULT_SESSION_TTL))
+
+
+def get_max_events() -> int:
+    """Return the per-session event cap (SESSION_MAX_EVENTS, 0 = unlimited)."""
+    return int(os.getenv("SESSION_MAX_EVENTS", DEFAULT_MAX_EVENTS))
+
+
+def split_state(state: dict | None) -> tuple[dict, dict, dict]:
+    """
+    Split state (or a state delta) into its storage scopes
+
+    Args:
+        state: Session state or an event's state delta
+
+    Returns:
+        tuple: (app-scoped, user-scoped, session-scoped) keys; temp keys dropped
+    """
+    app_state, user_state, session_state = {}, {}, {}
+    for key, value in (state or {}).items():
+        if key.startswith(State.TEMP_PREFIX):
+            continue
+        if key.startswith(State.APP_PREFIX):
+            app_state[key] = value
+        elif key.startswith(State.USER_PREFIX):
+            user_state[key] = value
+        else:
+            session_state[key] = value
+    return app_state, user_state, session_state
+
+
+def encode_event(event: Event) -> str:
+    """Serialize an event for storage."""
+    return event.model_dump_json(exclude_none=True)
+
+
+def decode_event(data) -> Event:
+    """Rebuild an event from its stored form."""
+    return Event.model_validate_json(data)
+
+
+def filter_events(events: list, config: GetSessionConfig | None) -> list:
+    """Apply the ``num_recent_events`` / ``after_timestamp`` options of get_session."""
+    if config is None:
+        return events
+    if config.after_timestamp:
+        events = [event for event in events if event.timestamp >= config.after_timestamp]
+    if config.num_recent_events:
+        events = events[-config.num_recent_events :]
+    return events
+
+
+class PersistentSessionService(BaseSessionService):
+    """
+    Base of the session services that persist state deltas
+
+    Subclasses store each appended event together with the state keys it
+    changed; this class keeps the Session object held by the Runner in step
+    with what was stored.
+
+    Args:
+        ttl_seconds: Idle time after which a session expires (0 = never)
+        max_events: Events kept per session, oldest dropped first (0 = unlimited)
+    """
+
+    def __init__(
+        self, ttl_seconds: float | None = None, max_events: int | None = None
+    ):
+        self.ttl_seconds = get_session_ttl() if ttl_seconds is None else ttl_seconds
+        self.max_events = get_max_events() if max_events is None else max_events
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        """Append an event and persist it with its state delta."""
+        if event.partial:
+            return event
+        event = await super().append_event(session, event)
+        session.last_update_time = event.timestamp
+        delta = event.actions.state_delta if event.actions else None
+        await self._store_event(session, event, *split_state(delta))
+        if self.max_events and len(session.events) > self.max_events:
+            del session.events[: -self.max_events]
+        return event
+
+    @abc.abstractmethod
+    async def _store_event(
+        self,
+        session: Session,
+        event: Event,
+        app_delta: dict,
+        user_delta: dict,
+        session_delta: dict,
+    ) -> None:
+        """Persist one event and the state keys it changed, refreshing the TTL."""
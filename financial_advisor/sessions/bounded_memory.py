@@ -0,0 +1,375 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""In-process session service with a memory ceiling
+
+Sessions are kept in memory in least-recently-used order, together with an
+estimate of their size: the encoded length of their state values and events
+(the same bytes a session JSON export takes). When the total passes the
+ceiling, the least recently used idle sessions are evicted until it fits
+again. Evicted sessions are spilled to a SQLite file when a spill path is
+configured, and loaded back transparently on their next use; otherwise they
+are dropped.
+
+A session is never evicted while a run holds it through ``active_run``,
+which the API wraps around every Runner call. Runs started elsewhere are not
+tracked; for them a session only counts as idle once nothing has been
+appended to it for ``min_idle_seconds``, which must exceed the longest gap
+between events of a run (a slow sub-agent or tool call).
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from google.adk.events import Event
+from google.adk.sessions import Session
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+
+from .base import PersistentSessionService, encode_event, filter_events, split_state
+from .sqlite_service import SqliteSessionService
+
+# Default memory ceiling for all sessions of the process, in MB
+DEFAULT_MEMORY_LIMIT_MB = 512
+
+# Sessions updated more recently than this are not evicted, in seconds; well
+# above the slowest stage, for runs not tracked by active_run
+DEFAULT_MIN_IDLE_SECONDS = 300
+
+
+def get_memory_limit_bytes() -> int:
+    """Return the session memory ceiling (SESSION_MEMORY_LIMIT_MB, 0 = unbounded)."""
+    return int(float(os.getenv("SESSION_MEMORY_LIMIT_MB", DEFAULT_MEMORY_LIMIT_MB)) * 2**20)
+
+
+def get_spill_path() -> Path | None:
+    """Return the spill file for evicted sessions (SESSION_SPILL_PATH), if any."""
+    configured = os.getenv("SESSION_SPILL_PATH")
+    return Path(configured).expanduser() if configured else None
+
+
+def _value_size(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+@dataclass
+class _Entry:
+    """A stored session and the estimated size of its parts."""
+
+    session: Session
+    value_sizes: dict = field(default_factory=dict)
+    event_sizes: list = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return sum(self.value_sizes.values()) + sum(self.event_sizes)
+
+
+class BoundedMemorySessionService(PersistentSessionService):
+    """
+    In-memory session service with LRU eviction past a memory ceiling
+
+    Args:
+        max_bytes: Memory ceiling for all sessions (defaults to SESSION_MEMORY_LIMIT_MB)
+        spill_path: SQLite file evicted sessions are written to (defaults to
+            SESSION_SPILL_PATH; evicted sessions are dropped when unset)
+        min_idle_seconds: Sessions updated more recently are never evicted,
+            even without an active run
+        ttl_seconds: Idle time after which a session expires (0 = never)
+        max_events: Events kept per session, oldest dropped first (0 = unlimited)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int | None = None,
+        spill_path: Path | None = None,
+        min_idle_seconds: float = DEFAULT_MIN_IDLE_SECONDS,
+        ttl_seconds: float | None = None,
+        max_events: int | None = None,
+    ):
+        super().__init__(ttl_seconds=ttl_seconds, max_events=max_events)
+        self.max_bytes = get_memory_limit_bytes() if max_bytes is None else max_bytes
+        self.min_idle_seconds = min_idle_seconds
+        spill_path = spill_path or get_spill_path()
+        self.spill = (
+            SqliteSessionService(spill_path, ttl_seconds=self.ttl_seconds, max_events=0)
+            if spill_path
+            else None
+        )
+        self.bytes_used = 0
+        self.evictions = 0
+        self.spilled = 0
+        self.restored = 0
+        self._sessions: OrderedDict = OrderedDict()
+        # Session key -> number of runs currently using it
+        self._active_runs: dict = {}
+        self._app_state: dict = {}
+        self._user_state: dict = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def active_run(self, *, app_name: str, user_id: str, session_id: str) -> Iterator[None]:
+        """Keep a session from being evicted while a run uses it."""
+        key = (app_name, user_id, session_id)
+        with self._lock:
+            self._active_runs[key] = self._active_runs.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                if self._active_runs[key] > 1:
+                    self._active_runs[key] -= 1
+                else:
+                    del self._active_runs[key]
+
+    def _scoped_state(self, app_name: str, user_id: str) -> dict:
+        return {
+            **self._app_state.get(app_name, {}),
+            **self._user_state.get((app_name, user_id), {}),
+        }
+
+    def _update_scoped(self, app_name: str, user_id: str, app_delta: dict, user_delta: dict):
+        if app_delta:
+            self._app_state.setdefault(app_name, {}).update(app_delta)
+        if user_delta:
+            self._user_state.setdefault((app_name, user_id), {}).update(user_delta)
+
+    def _is_expired(self, session: Session, now: float) -> bool:
+        return bool(self.ttl_seconds) and session.last_update_time + self.ttl_seconds <= now
+
+    def _insert(self, session: Session) -> None:
+        """Store a copy of a session (session-scoped state only) as most recent."""
+        key = (session.app_name, session.user_id, session.id)
+        app_state, user_state, session_state = split_state(session.state)
+        self._update_scoped(session.app_name, session.user_id, app_state, user_state)
+        stored = session.model_copy(deep=True)
+        stored.state = session_state
+        entry = _Entry(
+            session=stored,
+            value_sizes={name: _value_size(value) for name, value in session_state.items()},
+            event_sizes=[len(encode_event(event)) for event in stored.events],
+        )
+        self._remove(key)
+        self._sessions[key] = entry
+        self.bytes_used += entry.size
+
+    def _remove(self, key: tuple) -> _Entry | None:
+        entry = self._sessions.pop(key, None)
+        if entry is not None:
+            self.bytes_used -= entry.size
+        return entry
+
+    def _select_evictions(self, now: float) -> list:
+        """Remove LRU idle sessions until under the ceiling; return them for spilling."""
+        if not self.max_bytes or self.bytes_used <= self.max_bytes:
+            return []
+        evicted = []
+        for key in list(self._sessions):
+            if self.bytes_used <= self.max_bytes:
+                break
+            entry = self._sessions[key]
+            if key in self._active_runs:
+                continue
+            if entry.session.last_update_time + self.min_idle_seconds > now:
+                continue
+            self._remove(key)
+            self.evictions += 1
+            evicted.append(entry.session)
+        return evicted
+
+    async def _evict(self) -> None:
+        with self._lock:
+            evicted = self._select_evictions(time.time())
+            if self.spill is None:
+                return
+            for session in evicted:
+                session = session.model_copy(
+                    update={
+                        "state": {
+                            **session.state,
+                            **self._scoped_state(session.app_name, session.user_id),
+                        }
+                    }
+                )
+                self.spill.save_session(session)
+                self.spilled += 1
+
+    async def _restore(self, app_name: str, user_id: str, session_id: str) -> Session | None:
+        """Load a spilled session back into memory."""
+        if self.spill is None:
+            return None
+        session = await self.spill.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        if session is None:
+            return None
+        await self.spill.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        with self._lock:
+            # Scoped state in memory is newer than the copy written at eviction
+            session.state = {**session.state, **self._scoped_state(app_name, user_id)}
+            self._insert(session)
+            self.restored += 1
+        return session
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: dict[str, Any] | None = None,
+        session_id: str | None = None,
+    ) -> Session:
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=dict(state or {}),
+            last_update_time=time.time(),
+        )
+        if self.spill is not None:
+            await self.spill.delete_session(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+        with self._lock:
+            self._insert(session)
+            session.state = {
+                **split_state(session.state)[2],
+                **self._scoped_state(app_name, user_id),
+            }
+        await self._evict()
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: GetSessionConfig | None = None,
+    ) -> Session | None:
+        key = (app_name, user_id, session_id)
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is not None and self._is_expired(entry.session, time.time()):
+                self._remove(key)
+                return None
+            if entry is not None:
+                self._sessions.move_to_end(key)
+                session = entry.session.model_copy(deep=True)
+                session.state.update(self._scoped_state(app_name, user_id))
+        if entry is None:
+            session = await self._restore(app_name, user_id, session_id)
+            if session is None:
+                return None
+        session.events = filter_events(session.events, config)
+        return session
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        now = time.time()
+        with self._lock:
+            scoped = self._scoped_state(app_name, user_id)
+            sessions = {
+                key[2]: Session(
+                    app_name=app_name,
+                    user_id=user_id,
+                    id=key[2],
+                    state={**entry.session.state, **scoped},
+                    last_update_time=entry.session.last_update_time,
+                )
+                for key, entry in self._sessions.items()
+                if key[:2] == (app_name, user_id) and not self._is_expired(entry.session, now)
+            }
+        if self.spill is not None:
+            spilled = await self.spill.list_sessions(app_name=app_name, user_id=user_id)
+            for session in spilled.sessions:
+                sessions.setdefault(session.id, session)
+        return ListSessionsResponse(sessions=list(sessions.values()))
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        with self._lock:
+            self._remove((app_name, user_id, session_id))
+        if self.spill is not None:
+            await self.spill.delete_session(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+
+    async def _store_event(
+        self,
+        session: Session,
+        event: Event,
+        app_delta: dict,
+        user_delta: dict,
+        session_delta: dict,
+    ) -> None:
+        key = (session.app_name, session.user_id, session.id)
+        with self._lock:
+            self._update_scoped(session.app_name, session.user_id, app_delta, user_delta)
+            entry = self._sessions.get(key)
+            if entry is None:
+                # Evicted while its caller held it: the caller's copy is current
+                self._insert(session)
+                entry = self._sessions[key]
+            else:
+                stored = entry.session
+                stored.events.append(event)
+                entry.event_sizes.append(len(encode_event(event)))
+                self.bytes_used += entry.event_sizes[-1]
+                for name, value in session_delta.items():
+                    stored.state[name] = value
+                    size = _value_size(value)
+                    self.bytes_used += size - entry.value_sizes.get(name, 0)
+                    entry.value_sizes[name] = size
+                stored.last_update_time = event.timestamp
+                self._sessions.move_to_end(key)
+            if self.max_events and len(entry.event_sizes) > self.max_events:
+                dropped = len(entry.event_sizes) - self.max_events
+                self.bytes_used -= sum(entry.event_sizes[:dropped])
+                del entry.event_sizes[:dropped]
+                del entry.session.events[:dropped]
+        await self._evict()
+
+    def usage(self) -> dict:
+        """
+        Report memory use of the stored sessions
+
+        Returns:
+            dict: sessions, bytes, limit_bytes, largest_session_bytes,
+            active_runs and the eviction/spill/restore counters
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self.bytes_used,
+                "limit_bytes": self.max_bytes,
+                "largest_session_bytes": max(
+                    (entry.size for entry in self._sessions.values()), default=0
+                ),
+                "active_runs": sum(self._active_runs.values()),
+                "evictions": self.evictions,
+                "spilled": self.spilled,
+                "restored": self.restored,
+            }
@@ -0,0 +1,255 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Redis session service
+
+Keys, for a session ``<app>:<user>:<id>`` under the key prefix:
+
+    <prefix>:session:<app>:<user>:<id>:meta    hash    updated_at
+    <prefix>:session:<app>:<user>:<id>:state   hash    one field per state key
+    <prefix>:session:<app>:<user>:<id>:events  list    encoded events, oldest first
+    <prefix>:sessions:<app>:<user>             zset    session id -> updated_at
+    <prefix>:user_state:<app>:<user>           hash    ``user:`` keys
+    <prefix>:app_state:<app>                   hash    ``app:`` keys
+
+Appending an event is one MULTI/EXEC transaction: RPUSH the event, LTRIM the
+list to the newest ``max_events``, HSET only the keys in its state delta and
+PEXPIRE the session keys, so idle sessions are expired by Redis itself.
+
+Only the Redis protocol is required (Redis, Valkey, Memorystore, or the
+``redis_stand_in`` module for local runs). Needs the ``redis`` package.
+"""
+
+import json
+import os
+import time
+import uuid
+from typing import Any
+
+from google.adk.events import Event
+from google.adk.sessions import Session
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+
+from .base import (
+    PersistentSessionService,
+    decode_event,
+    encode_event,
+    filter_events,
+    split_state,
+)
+
+DEFAULT_REDIS_URL = "redis://localhost:6379/0"
+DEFAULT_KEY_PREFIX = "financial_advisor"
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+def _loads_hash(fields: dict) -> dict:
+    return {key: json.loads(value) for key, value in fields.items()}
+
+
+class RedisSessionService(PersistentSessionService):
+    """
+    Session service backed by a Redis-protocol server
+
+    Args:
+        url: Server URL (defaults to REDIS_URL)
+        key_prefix: Prefix of every key written (defaults to SESSION_KEY_PREFIX)
+        ttl_seconds: Idle time after which a session expires (0 = never)
+        max_events: Events kept per session, oldest dropped first (0 = unlimited)
+        client: Existing ``redis.asyncio`` client to use instead of ``url``
+    """
+
+    def __init__(
+        self,
+        url: str | None = None,
+        key_prefix: str | None = None,
+        ttl_seconds: float | None = None,
+        max_events: int | None = None,
+        client: Any = None,
+    ):
+        super().__init__(ttl_seconds=ttl_seconds, max_events=max_events)
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.from_url(
+                url or os.getenv("REDIS_URL", DEFAULT_REDIS_URL), decode_responses=True
+            )
+        self.client = client
+        self.key_prefix = key_prefix or os.getenv("SESSION_KEY_PREFIX", DEFAULT_KEY_PREFIX)
+
+    def _session_key(self, app_name: str, user_id: str, session_id: str, part: str) -> str:
+        return f"{self.key_prefix}:session:{app_name}:{user_id}:{session_id}:{part}"
+
+    def _index_key(self, app_name: str, user_id: str) -> str:
+        return f"{self.key_prefix}:sessions:{app_name}:{user_id}"
+
+    def _user_state_key(self, app_name: str, user_id: str) -> str:
+        return f"{self.key_prefix}:user_state:{app_name}:{user_id}"
+
+    def _app_state_key(self, app_name: str) -> str:
+        return f"{self.key_prefix}:app_state:{app_name}"
+
+    def _session_keys(self, app_name: str, user_id: str, session_id: str) -> list:
+        return [
+            self._session_key(app_name, user_id, session_id, part)
+            for part in ("meta", "state", "events")
+        ]
+
+    def _write_state(self, pipe, app_name: str, user_id: str, app_delta: dict, user_delta: dict):
+        if app_delta:
+            pipe.hset(
+                self._app_state_key(app_name),
+                mapping={key: _dumps(value) for key, value in app_delta.items()},
+            )
+        if user_delta:
+            pipe.hset(
+                self._user_state_key(app_name, user_id),
+                mapping={key: _dumps(value) for key, value in user_delta.items()},
+            )
+
+    def _touch(self, pipe, app_name: str, user_id: str, session_id: str, now: float):
+        pipe.hset(self._session_key(app_name, user_id, session_id, "meta"), "updated_at", now)
+        pipe.zadd(self._index_key(app_name, user_id), {session_id: now})
+        if self.ttl_seconds:
+            for key in self._session_keys(app_name, user_id, session_id):
+                pipe.pexpire(key, int(self.ttl_seconds * 1000))
+
+    async def _scoped_state(self, app_name: str, user_id: str) -> dict:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._app_state_key(app_name))
+            pipe.hgetall(self._user_state_key(app_name, user_id))
+            app_state, user_state = await pipe.execute()
+        return {**_loads_hash(app_state), **_loads_hash(user_state)}
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: dict[str, Any] | None = None,
+        session_id: str | None = None,
+    ) -> Session:
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        app_state, user_state, session_state = split_state(state)
+        now = time.time()
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(*self._session_keys(app_name, user_id, session_id))
+            if session_state:
+                pipe.hset(
+                    self._session_key(app_name, user_id, session_id, "state"),
+                    mapping={key: _dumps(value) for key, value in session_state.items()},
+                )
+            self._write_state(pipe, app_name, user_id, app_state, user_state)
+            self._touch(pipe, app_name, user_id, session_id, now)
+            await pipe.execute()
+        merged = {**session_state, **await self._scoped_state(app_name, user_id)}
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=merged,
+            last_update_time=now,
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: GetSessionConfig | None = None,
+    ) -> Session | None:
+        start = 0
+        if config and config.num_recent_events and not config.after_timestamp:
+            start = -config.num_recent_events
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hget(self._session_key(app_name, user_id, session_id, "meta"), "updated_at")
+            pipe.hgetall(self._session_key(app_name, user_id, session_id, "state"))
+            pipe.lrange(self._session_key(app_name, user_id, session_id, "events"), start, -1)
+            updated_at, state, events = await pipe.execute()
+        if updated_at is None:
+            await self.client.zrem(self._index_key(app_name, user_id), session_id)
+            return None
+        state = {**_loads_hash(state), **await self._scoped_state(app_name, user_id)}
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=state,
+            events=filter_events([decode_event(data) for data in events], config),
+            last_update_time=float(updated_at),
+        )
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        index = self._index_key(app_name, user_id)
+        if self.ttl_seconds:
+            await self.client.zremrangebyscore(index, "-inf", time.time() - self.ttl_seconds)
+        entries = await self.client.zrange(index, 0, -1, withscores=True)
+        scoped = await self._scoped_state(app_name, user_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for session_id, _ in entries:
+                pipe.hgetall(self._session_key(app_name, user_id, session_id, "state"))
+            states = await pipe.execute() if entries else []
+        return ListSessionsResponse(
+            sessions=[
+                Session(
+                    app_name=app_name,
+                    user_id=user_id,
+                    id=session_id,
+                    state={**_loads_hash(state), **scoped},
+                    last_update_time=updated_at,
+                )
+                for (session_id, updated_at), state in zip(entries, states, strict=True)
+            ]
+        )
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(*self._session_keys(app_name, user_id, session_id))
+            pipe.zrem(self._index_key(app_name, user_id), session_id)
+            await pipe.execute()
+
+    async def _store_event(
+        self,
+        session: Session,
+        event: Event,
+        app_delta: dict,
+        user_delta: dict,
+        session_delta: dict,
+    ) -> None:
+        key = (session.app_name, session.user_id, session.id)
+        events_key = self._session_key(*key, "events")
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.rpush(events_key, encode_event(event))
+            if self.max_events:
+                pipe.ltrim(events_key, -self.max_events, -1)
+            if session_delta:
+                pipe.hset(
+                    self._session_key(*key, "state"),
+                    mapping={name: _dumps(value) for name, value in session_delta.items()},
+                )
+            self._write_state(pipe, session.app_name, session.user_id, app_delta, user_delta)
+            self._touch(pipe, *key, event.timestamp)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        await self.client.aclose()
@@ -0,0 +1,363 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Local stand-in for a Redis server
+
+Speaks enough of the Redis protocol (RESP2, or RESP3 after HELLO 3) for the Redis session service:
+the hash, list and sorted-set commands it uses, key expiry and MULTI/EXEC.
+Data lives in process memory and is lost when the process exits.
+
+Usage:
+    # Serve on redis://127.0.0.1:6399/0
+    python -m financial_advisor.sessions.redis_stand_in --port 6399
+
+    export SESSION_BACKEND=redis REDIS_URL=redis://127.0.0.1:6399/0
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import time
+
+
+class _Error(Exception):
+    """Error reply sent to the client."""
+
+
+def _encode(value, protocol: int = 2) -> bytes:
+    """Encode a reply; RESP2 flattens maps and pairs into plain arrays."""
+    if isinstance(value, _Error):
+        return f"-ERR {value}\r\n".encode()
+    if value is None:
+        return b"_\r\n" if protocol == 3 else b"$-1\r\n"
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, float) and protocol == 3:
+        return f",{value!r}\r\n".encode()
+    if isinstance(value, dict):
+        if protocol == 3:
+            items = [item for pair in value.items() for item in pair]
+            return f"%{len(value)}\r\n".encode() + b"".join(
+                _encode(item, protocol) for item in items
+            )
+        value = [item for pair in value.items() for item in pair]
+    if isinstance(value, list):
+        if protocol == 2:
+            value = [
+                item
+                for entry in value
+                for item in (entry if isinstance(entry, tuple) else (entry,))
+            ]
+        return f"*{len(value)}\r\n".encode() + b"".join(
+            _encode(item, protocol) for item in value
+        )
+    if isinstance(value, tuple):
+        return _encode(list(value), protocol)
+    if isinstance(value, str) and value in ("OK", "QUEUED", "PONG"):
+        return f"+{value}\r\n".encode()
+    if isinstance(value, float):
+        value = _format_score(value)
+    data = value if isinstance(value, bytes) else str(value).encode()
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+def _format_score(score: float) -> str:
+    return repr(score) if score != int(score) else str(int(score))
+
+
+def _slice(items: list, start: int, stop: int) -> list:
+    length = len(items)
+    start = max(start + length if start < 0 else start, 0)
+    stop = stop + length if stop < 0 else stop
+    return items[start : stop + 1]
+
+
+class RedisStandIn:
+    """
+    In-memory Redis-protocol server
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on (0 picks a free port)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.data: dict = {}
+        self._expires: dict = {}
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self) -> "RedisStandIn":
+        """Start listening; ``port`` is updated to the bound port."""
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        """Stop listening and close the server."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def ttl_ms(self, key: str) -> float | None:
+        """Remaining time to live of a key in milliseconds, or None."""
+        self._expire(key)
+        if key not in self._expires:
+            return None
+        return (self._expires[key] - time.monotonic()) * 1000
+
+    def _expire(self, key: str) -> None:
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.data.pop(key, None)
+            self._expires.pop(key, None)
+
+    def _get(self, key: str, kind: type):
+        self._expire(key)
+        value = self.data.get(key)
+        if value is not None and not isinstance(value, kind):
+            raise _Error("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _create(self, key: str, kind: type):
+        value = self._get(key, kind)
+        if value is None:
+            value = self.data[key] = kind()
+        return value
+
+    def _drop_if_empty(self, key: str) -> None:
+        if key in self.data and not self.data[key]:
+            self.data.pop(key)
+            self._expires.pop(key, None)
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> list | None:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.decode().split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(length + 2))[:-2].decode())
+        return args
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        queued: list | None = None
+        protocol = 2
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                name = args[0].upper()
+                if name == "HELLO":
+                    protocol = int(args[1]) if len(args) > 1 else protocol
+                    reply = {
+                        "server": "redis",
+                        "version": "7.2.0",
+                        "proto": protocol,
+                        "id": 1,
+                        "mode": "standalone",
+                        "role": "master",
+                        "modules": [],
+                    }
+                elif name == "MULTI":
+                    queued, reply = [], "OK"
+                elif name == "EXEC":
+                    reply = [self._execute(command) for command in queued or []]
+                    queued = None
+                elif name == "DISCARD":
+                    queued, reply = None, "OK"
+                elif queued is not None:
+                    queued.append(args)
+                    reply = "QUEUED"
+                else:
+                    reply = self._execute(args)
+                writer.write(_encode(reply, protocol))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _execute(self, args: list):
+        handler = getattr(self, f"_cmd_{args[0].lower()}", None)
+        if handler is None:
+            return _Error(f"unknown command '{args[0]}'")
+        try:
+            return handler(*args[1:])
+        except _Error as e:
+            return e
+        except (TypeError, ValueError):
+            return _Error(f"wrong arguments for '{args[0]}' command")
+
+    # Connection
+
+    def _cmd_ping(self, *args):
+        return args[0] if args else "PONG"
+
+    def _cmd_client(self, *args):
+        return "OK"
+
+    def _cmd_select(self, db):
+        return "OK"
+
+    def _cmd_flushall(self, *args):
+        self.data.clear()
+        self._expires.clear()
+        return "OK"
+
+    # Keys
+
+    def _cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            self._expire(key)
+            removed += self.data.pop(key, None) is not None
+            self._expires.pop(key, None)
+        return removed
+
+    def _cmd_exists(self, *keys):
+        return sum(self._get(key, object) is not None for key in keys)
+
+    def _cmd_keys(self, pattern):
+        for key in list(self.data):
+            self._expire(key)
+        return [key for key in self.data if fnmatch.fnmatchcase(key, pattern)]
+
+    def _cmd_pexpire(self, key, milliseconds):
+        if self._get(key, object) is None:
+            return 0
+        self._expires[key] = time.monotonic() + int(milliseconds) / 1000
+        return 1
+
+    def _cmd_expire(self, key, seconds):
+        return self._cmd_pexpire(key, int(seconds) * 1000)
+
+    def _cmd_pttl(self, key):
+        if self._get(key, object) is None:
+            return -2
+        remaining = self.ttl_ms(key)
+        return -1 if remaining is None else int(remaining)
+
+    # Hashes
+
+    def _cmd_hset(self, key, *pairs):
+        if not pairs or len(pairs) % 2:
+            raise ValueError
+        fields = self._create(key, dict)
+        added = 0
+        for field, value in zip(pairs[::2], pairs[1::2], strict=True):
+            added += field not in fields
+            fields[field] = value
+        return added
+
+    def _cmd_hget(self, key, field):
+        return (self._get(key, dict) or {}).get(field)
+
+    def _cmd_hgetall(self, key):
+        return dict(self._get(key, dict) or {})
+
+    def _cmd_hdel(self, key, *fields):
+        values = self._get(key, dict) or {}
+        removed = sum(values.pop(field, None) is not None for field in fields)
+        self._drop_if_empty(key)
+        return removed
+
+    # Lists
+
+    def _cmd_rpush(self, key, *values):
+        items = self._create(key, list)
+        items.extend(values)
+        return len(items)
+
+    def _cmd_lrange(self, key, start, stop):
+        return _slice(self._get(key, list) or [], int(start), int(stop))
+
+    def _cmd_ltrim(self, key, start, stop):
+        items = self._get(key, list)
+        if items is not None:
+            items[:] = _slice(items, int(start), int(stop))
+            self._drop_if_empty(key)
+        return "OK"
+
+    def _cmd_llen(self, key):
+        return len(self._get(key, list) or [])
+
+    # Sorted sets
+
+    def _cmd_zadd(self, key, *pairs):
+        if not pairs or len(pairs) % 2:
+            raise ValueError
+        members = self._create(key, dict)
+        added = 0
+        for score, member in zip(pairs[::2], pairs[1::2], strict=True):
+            added += member not in members
+            members[member] = float(score)
+        return added
+
+    def _cmd_zrem(self, key, *members):
+        values = self._get(key, dict) or {}
+        removed = sum(values.pop(member, None) is not None for member in members)
+        self._drop_if_empty(key)
+        return removed
+
+    def _cmd_zrange(self, key, start, stop, *options):
+        members = sorted((self._get(key, dict) or {}).items(), key=lambda item: (item[1], item[0]))
+        members = _slice(members, int(start), int(stop))
+        if any(option.upper() == "WITHSCORES" for option in options):
+            return [(member, score) for member, score in members]
+        return [member for member, _ in members]
+
+    def _cmd_zremrangebyscore(self, key, low, high):
+        members = self._get(key, dict) or {}
+        low, high = float(low), float(high)
+        doomed = [member for member, score in members.items() if low <= score <= high]
+        for member in doomed:
+            members.pop(member)
+        self._drop_if_empty(key)
+        return len(doomed)
+
+
+async def _serve_forever(host: str, port: int) -> None:
+    server = await RedisStandIn(host, port).start()
+    print(f"Redis stand-in listening on {server.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6399)
+    args = parser.parse_args()
+    asyncio.run(_serve_forever(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""SQLite session service
+
+One row per session, one row per state key and one row per event. Appending
+an event inserts the event row and upserts only the keys in its state delta;
+the session's state is assembled from its key rows when it is read. Sessions
+idle for longer than the TTL are treated as missing and purged, and only the
+newest ``max_events`` event rows of a session are kept.
+
+A file on a shared volume lets several instances serve the same sessions;
+use the Redis service when instances do not share a filesystem.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from google.adk.events import Event
+from google.adk.sessions import Session
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+
+from .base import (
+    PersistentSessionService,
+    decode_event,
+    encode_event,
+    filter_events,
+    split_state,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id)
+);
+CREATE TABLE IF NOT EXISTS session_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, key)
+);
+CREATE TABLE IF NOT EXISTS scoped_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, key)
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session ON events (app_name, user_id, session_id, seq);
+"""
+
+# Owner of app-scoped rows in scoped_state (user-scoped rows use the user id)
+_APP_OWNER = ""
+
+_SESSION_TABLES = ("sessions", "session_state", "events")
+
+
+def get_default_session_db_path() -> Path:
+    """Return the on-disk location of the session database"""
+    configured = os.getenv("SESSION_DB_PATH")
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".cache" / "financial_advisor" / "sessions.sqlite3"
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+class SqliteSessionService(PersistentSessionService):
+    """
+    Session service backed by a SQLite database
+
+    Args:
+        path: Database file (defaults to SESSION_DB_PATH)
+        ttl_seconds: Idle time after which a session expires (0 = never)
+        max_events: Events kept per session, oldest dropped first (0 = unlimited)
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        ttl_seconds: float | None = None,
+        max_events: int | None = None,
+    ):
+        super().__init__(ttl_seconds=ttl_seconds, max_events=max_events)
+        self.path = Path(path) if path else get_default_session_db_path()
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the schema on first use."""
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        conn.commit()
+        return conn
+
+    def _is_expired(self, updated_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and updated_at + self.ttl_seconds <= now
+
+    def _delete_rows(self, app_name: str, user_id: str, session_id: str) -> None:
+        for table in _SESSION_TABLES:
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                (app_name, user_id, session_id),
+            )
+
+    def _upsert_scoped(self, app_name: str, owner: str, delta: dict) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO scoped_state VALUES (?, ?, ?, ?)",
+            [(app_name, owner, key, _dumps(value)) for key, value in delta.items()],
+        )
+
+    def _scoped_state(self, app_name: str, user_id: str) -> dict:
+        rows = self._conn.execute(
+            "SELECT key, value FROM scoped_state WHERE app_name = ? AND user_id IN (?, ?)",
+            (app_name, _APP_OWNER, user_id),
+        ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: dict[str, Any] | None = None,
+        session_id: str | None = None,
+    ) -> Session:
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        app_state, user_state, session_state = split_state(state)
+        now = time.time()
+        with self._lock:
+            self._delete_rows(app_name, user_id, session_id)
+            self._conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?)",
+                (app_name, user_id, session_id, now),
+            )
+            self._conn.executemany(
+                "INSERT INTO session_state VALUES (?, ?, ?, ?, ?)",
+                [
+                    (app_name, user_id, session_id, key, _dumps(value))
+                    for key, value in session_state.items()
+                ],
+            )
+            self._upsert_scoped(app_name, _APP_OWNER, app_state)
+            self._upsert_scoped(app_name, user_id, user_state)
+            self._conn.commit()
+            merged = {**session_state, **self._scoped_state(app_name, user_id)}
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=merged,
+            last_update_time=now,
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: GetSessionConfig | None = None,
+    ) -> Session | None:
+        key = (app_name, user_id, session_id)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT updated_at FROM sessions"
+                " WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            if self._is_expired(row[0], time.time()):
+                self._delete_rows(*key)
+                self._conn.commit()
+                return None
+            state = {
+                name: json.loads(value)
+                for name, value in self._conn.execute(
+                    "SELECT key, value FROM session_state"
+                    " WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                    key,
+                )
+            }
+            state.update(self._scoped_state(app_name, user_id))
+            events = [
+                decode_event(data)
+                for (data,) in self._conn.execute(
+                    "SELECT data FROM events"
+                    " WHERE app_name = ? AND user_id = ? AND session_id = ? ORDER BY seq",
+                    key,
+                )
+            ]
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=state,
+            events=filter_events(events, config),
+            last_update_time=row[0],
+        )
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT session_id, updated_at FROM sessions WHERE app_name = ? AND user_id = ?",
+                (app_name, user_id),
+            ).fetchall()
+            scoped = self._scoped_state(app_name, user_id)
+            sessions = []
+            for session_id, updated_at in rows:
+                if self._is_expired(updated_at, now):
+                    continue
+                state = {
+                    name: json.loads(value)
+                    for name, value in self._conn.execute(
+                        "SELECT key, value FROM session_state"
+                        " WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                        (app_name, user_id, session_id),
+                    )
+                }
+                sessions.append(
+                    Session(
+                        app_name=app_name,
+                        user_id=user_id,
+                        id=session_id,
+                        state={**state, **scoped},
+                        last_update_time=updated_at,
+                    )
+                )
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        with self._lock:
+            self._delete_rows(app_name, user_id, session_id)
+            self._conn.commit()
+
+    async def _store_event(
+        self,
+        session: Session,
+        event: Event,
+        app_delta: dict,
+        user_delta: dict,
+        session_delta: dict,
+    ) -> None:
+        key = (session.app_name, session.user_id, session.id)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO events (app_name, user_id, session_id, data) VALUES (?, ?, ?, ?)",
+                (*key, encode_event(event)),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO session_state VALUES (?, ?, ?, ?, ?)",
+                [(*key, name, _dumps(value)) for name, value in session_delta.items()],
+            )
+            self._upsert_scoped(session.app_name, _APP_OWNER, app_delta)
+            self._upsert_scoped(session.app_name, session.user_id, user_delta)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)",
+                (*key, event.timestamp),
+            )
+            if self.max_events:
+                self._conn.execute(
+                    "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+                    " AND seq <= (SELECT seq FROM events"
+                    "  WHERE app_name = ? AND user_id = ? AND session_id = ?"
+                    "  ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+                    (*key, *key, self.max_events),
+                )
+            self._conn.commit()
+
+    def save_session(self, session: Session) -> None:
+        """
+        Write a whole session (state and events), replacing any stored copy
+
+        Used to spill sessions evicted from memory. ``app:`` and ``user:`` keys
+        in the session state are stored in their shared scopes.
+
+        Args:
+            session: Session to store
+        """
+        key = (session.app_name, session.user_id, session.id)
+        app_state, user_state, session_state = split_state(session.state)
+        with self._lock:
+            self._delete_rows(*key)
+            self._conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?)", (*key, session.last_update_time)
+            )
+            self._conn.executemany(
+                "INSERT INTO session_state VALUES (?, ?, ?, ?, ?)",
+                [(*key, name, _dumps(value)) for name, value in session_state.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO events (app_name, user_id, session_id, data) VALUES (?, ?, ?, ?)",
+                [(*key, encode_event(event)) for event in session.events],
+            )
+            self._upsert_scoped(session.app_name, _APP_OWNER, app_state)
+            self._upsert_scoped(session.app_name, session.user_id, user_state)
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """
+        Delete every session that has been idle for longer than the TTL
+
+        Returns:
+            int: Number of sessions deleted
+        """
+        if not self.ttl_seconds:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = self._conn.execute(
+                "SELECT app_name, user_id, session_id FROM sessions WHERE updated_at <= ?",
+                (cutoff,),
+            ).fetchall()
+            for key in expired:
+                self._delete_rows(*key)
+            self._conn.commit()
+        return len(expired)
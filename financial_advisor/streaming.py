@@ -0,0 +1,202 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Server-sent events for agent runs
+
+ADK events are translated into SSE frames as soon as they are produced:
+
+    token        partial model text        {"author", "text"}
+    message      complete model text       {"author", "text"}
+    agent_start  a sub-agent started       {"agent"}
+    agent_end    a sub-agent finished      {"agent"}
+    tool_call    a tool was called         {"author", "name", "args"}
+    tool_result  a tool returned           {"author", "name", "response"}
+    done         the run finished          {"session_id"}
+    error        the run failed            {"message"}
+
+Sub-agents called through AgentTool show up as agent_start/agent_end around
+the call; sub-agents that run directly (workflow mode) are detected from the
+event author changing. Heartbeat comments are sent while the run is silent.
+"""
+
+import asyncio
+import json
+import os
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+from typing import Any
+
+from google.adk.events import Event
+
+DEFAULT_HEARTBEAT_SECONDS = 15.0
+
+# Longest tool response sent in a tool_result frame, in characters
+_MAX_RESPONSE_CHARS = 2000
+
+HEARTBEAT_FRAME = ": heartbeat\n\n"
+
+
+def get_heartbeat_seconds() -> float:
+    """Return the heartbeat interval (SSE_HEARTBEAT_SECONDS)."""
+    return float(os.getenv("SSE_HEARTBEAT_SECONDS", DEFAULT_HEARTBEAT_SECONDS))
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one SSE frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _truncate(value: Any) -> Any:
+    text = json.dumps(value, default=str)
+    if len(text) <= _MAX_RESPONSE_CHARS:
+        return value
+    return text[:_MAX_RESPONSE_CHARS] + "..."
+
+
+class EventTranslator:
+    """
+    Stateful translation of ADK events into SSE frames
+
+    Args:
+        root_name: Name of the root agent (its turns are not sub-agent runs)
+        agent_tool_names: Names of tools that run a sub-agent (AgentTool)
+    """
+
+    def __init__(self, root_name: str, agent_tool_names: set):
+        self.root_name = root_name
+        self.agent_tool_names = set(agent_tool_names)
+        self._active_author: str | None = None
+
+    def _author_frames(self, author: str) -> list:
+        frames = []
+        if author in ("user", self._active_author):
+            return frames
+        if self._active_author not in (None, self.root_name):
+            frames.append(format_sse("agent_end", {"agent": self._active_author}))
+        if author != self.root_name:
+            frames.append(format_sse("agent_start", {"agent": author}))
+        self._active_author = author
+        return frames
+
+    def translate(self, event: Event) -> list:
+        """Return the SSE frames for one ADK event."""
+        frames = self._author_frames(event.author)
+        if not event.content or not event.content.parts:
+            return frames
+
+        for part in event.content.parts:
+            if part.function_call:
+                name = part.function_call.name
+                if name in self.agent_tool_names:
+                    frames.append(format_sse("agent_start", {"agent": name}))
+                else:
+                    frames.append(
+                        format_sse(
+                            "tool_call",
+                            {"author": event.author, "name": name, "args": part.function_call.args},
+                        )
+                    )
+            elif part.function_response:
+                name = part.function_response.name
+                if name in self.agent_tool_names:
+                    frames.append(format_sse("agent_end", {"agent": name}))
+                else:
+                    frames.append(
+                        format_sse(
+                            "tool_result",
+                            {
+                                "author": event.author,
+                                "name": name,
+                                "response": _truncate(part.function_response.response),
+                            },
+                        )
+                    )
+            elif part.text and not part.thought:
+                kind = "token" if event.partial else "message"
+                frames.append(format_sse(kind, {"author": event.author, "text": part.text}))
+        return frames
+
+    def finish(self) -> list:
+        """Close a sub-agent that was still active when the run ended."""
+        if self._active_author in (None, self.root_name):
+            return []
+        frames = [format_sse("agent_end", {"agent": self._active_author})]
+        self._active_author = None
+        return frames
+
+
+async def stream_events(
+    events: AsyncIterator[Event],
+    translator: EventTranslator,
+    session_id: str,
+    heartbeat_seconds: float | None = None,
+    is_disconnected: Callable[[], Any] | None = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Turn an ADK event stream into SSE frames with heartbeats
+
+    The run is consumed by a background task so heartbeats can be sent while
+    it is silent. If the client disconnects (``is_disconnected`` returns
+    True, or the response stream is closed/cancelled), the run is cancelled.
+
+    Args:
+        events: Events from ``Runner.run_async``
+        translator: Event translator for this run
+        session_id: Session the run belongs to (reported in the done frame)
+        heartbeat_seconds: Silence after which a heartbeat is sent
+        is_disconnected: Async callable reporting whether the client has gone
+
+    Yields:
+        str: Encoded SSE frames
+    """
+    heartbeat = heartbeat_seconds or get_heartbeat_seconds()
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+
+    async def produce():
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            await queue.put(finished)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                if is_disconnected is not None and await is_disconnected():
+                    return
+                yield HEARTBEAT_FRAME
+                continue
+
+            if item is finished:
+                for frame in translator.finish():
+                    yield frame
+                yield format_sse("done", {"session_id": session_id})
+                return
+            if isinstance(item, Exception):
+                yield format_sse("error", {"message": str(item)})
+                return
+            for frame in translator.translate(item):
+                yield frame
+    finally:
+        if not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except (asyncio.CancelledError, Exception):
+                pass
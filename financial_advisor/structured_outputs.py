@@ -0,0 +1,400 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Typed payloads recorded by the sub-agents alongside their prose reports
+
+Each sub-agent calls its ``record_*`` tool once with the figures its report
+states. The payload is validated against the Pydantic model below and saved
+as compact JSON under its own state key, so downstream code reads fields
+instead of parsing prose:
+
+    data_analyst_agent       market_data_structured      MarketData
+    trading_analyst_agent    trading_strategies_structured  TradingStrategies
+    execution_analyst_agent  execution_plan_structured   ExecutionPlan
+    risk_analyst_agent       risk_assessment_structured  RiskAssessment
+    summary_agent            executive_summary_structured   ExecutiveSummary
+
+A payload that fails validation is not stored; the tool returns the errors
+so the model can fix the call. The payload of a sub-agent is cleared when the
+sub-agent starts, so a run that records nothing never leaves a stale payload
+from an earlier ticker behind. Consumers fall back to the prose when no
+payload is present.
+"""
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.tools import FunctionTool
+from google.adk.tools.tool_context import ToolContext
+from pydantic import BaseModel, Field, ValidationError
+
+from .tools.degraded_data import DEGRADED_DATA_KEY, DEMO_SOURCE
+
+
+class MarketData(BaseModel):
+    """Price and fundamentals stated in the market analysis report"""
+
+    ticker: str
+    report_date: Optional[str] = None
+    current_price: Optional[float] = None
+    previous_close: Optional[float] = None
+    price_change: Optional[float] = None
+    price_change_percent: Optional[float] = None
+    volume: Optional[int] = None
+    trend_30d: Optional[str] = Field(None, description="One-line description of the 30-day price trend")
+    change_30d: Optional[float] = None
+    change_30d_percent: Optional[float] = None
+    market_cap: Optional[float] = None
+    week_52_high: Optional[float] = None
+    week_52_low: Optional[float] = None
+    pe_ratio: Optional[float] = None
+    eps: Optional[float] = None
+    dividend_yield_percent: Optional[float] = None
+    sector: Optional[str] = None
+    industry: Optional[str] = None
+    sentiment: Optional[str] = Field(None, description="Overall news sentiment, if analyzed")
+
+
+class ReturnScenario(BaseModel):
+    """One return projection of a top strategy"""
+
+    scenario: str = Field(description="conservative, moderate or aggressive")
+    annual_return_percent: Optional[float] = None
+    projected_value: Optional[float] = Field(None, description="Value of $1,000 at the end of the period")
+    probability: Optional[str] = None
+
+
+class Strategy(BaseModel):
+    """One proposed trading strategy"""
+
+    name: str
+    summary: Optional[str] = None
+    entry_conditions: Optional[str] = None
+    exit_conditions: Optional[str] = None
+    estimated_annual_return_percent: Optional[float] = None
+    max_drawdown_percent: Optional[float] = None
+    key_risks: list[str] = []
+    top_rank: Optional[int] = Field(None, description="1 or 2 for the top recommended strategies")
+    scenarios: list[ReturnScenario] = []
+
+
+class TradingStrategies(BaseModel):
+    """Every proposed strategy, with the top two ranked"""
+
+    strategies: list[Strategy] = Field(min_length=1)
+
+    def top(self) -> list:
+        """Return the ranked strategies, best first."""
+        ranked = [s for s in self.strategies if s.top_rank]
+        return sorted(ranked, key=lambda s: s.top_rank)
+
+
+class EntryTranche(BaseModel):
+    """One planned entry order"""
+
+    price: Optional[float] = None
+    allocation_percent: Optional[float] = None
+    order_type: Optional[str] = None
+
+
+class ExecutionParameters(BaseModel):
+    """Execution plan of one strategy"""
+
+    strategy: str
+    order_type: Optional[str] = None
+    entry_tranches: list[EntryTranche] = []
+    position_size_percent: Optional[float] = Field(None, description="Share of capital committed at entry")
+    stop_loss: Optional[float] = None
+    stop_loss_rule: Optional[str] = None
+    take_profit: Optional[float] = None
+    profit_taking_rule: Optional[str] = None
+    exit_rule: Optional[str] = None
+
+
+class ExecutionPlan(BaseModel):
+    """Execution plans of the top strategies"""
+
+    plans: list[ExecutionParameters] = Field(min_length=1)
+
+
+class StrategyRisk(BaseModel):
+    """Risk profile of one strategy"""
+
+    strategy: str
+    risk_level: str = Field(description="e.g. Low, Medium, Medium-High, High")
+    risk_score: Optional[float] = Field(None, ge=0, le=10, description="0 (least) to 10 (most risky)")
+    max_drawdown_percent: Optional[float] = None
+    key_risks: list[str] = []
+    mitigations: list[str] = []
+
+
+class RiskAssessment(BaseModel):
+    """Risk scores of the top strategies and the final recommendation"""
+
+    strategies: list[StrategyRisk] = Field(min_length=1)
+    recommended_strategy: Optional[str] = None
+    overall_assessment: Optional[str] = None
+
+
+class SummarySection(BaseModel):
+    """One section of the executive summary"""
+
+    heading: str
+    paragraphs: list[str] = []
+    bullets: list[str] = []
+
+
+class ExecutiveSummary(BaseModel):
+    """Executive summary laid out as sections, as rendered in the PDF"""
+
+    title: Optional[str] = None
+    sections: list[SummarySection] = Field(min_length=1)
+    recommendation: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class StructuredOutput:
+    """Where a sub-agent's prose and structured payload are stored"""
+
+    output_key: str
+    state_key: str
+    model: type
+
+
+STRUCTURED_OUTPUTS = {
+    "data_analyst_agent": StructuredOutput(
+        "market_data_analysis_output", "market_data_structured", MarketData
+    ),
+    "trading_analyst_agent": StructuredOutput(
+        "proposed_trading_strategies_output", "trading_strategies_structured", TradingStrategies
+    ),
+    "execution_analyst_agent": StructuredOutput(
+        "execution_plan_output", "execution_plan_structured", ExecutionPlan
+    ),
+    "risk_analyst_agent": StructuredOutput(
+        "final_risk_assessment_output", "risk_assessment_structured", RiskAssessment
+    ),
+    "summary_agent": StructuredOutput(
+        "executive_summary_output", "executive_summary_structured", ExecutiveSummary
+    ),
+}
+
+_BY_OUTPUT_KEY = {spec.output_key: spec for spec in STRUCTURED_OUTPUTS.values()}
+_BY_MODEL = {spec.model: spec for spec in STRUCTURED_OUTPUTS.values()}
+
+
+def structured_key(output_key: str) -> Optional[str]:
+    """Return the state key of the payload recorded with a prose output key."""
+    spec = _BY_OUTPUT_KEY.get(output_key)
+    return spec.state_key if spec else None
+
+
+def load_structured(state: Mapping, output_key: str) -> Optional[BaseModel]:
+    """
+    Return the validated payload recorded with a prose output, if any
+
+    Args:
+        state: Session state
+        output_key: Prose output key (e.g. "market_data_analysis_output")
+
+    Returns:
+        BaseModel: The payload, or None if none was recorded or it is invalid
+    """
+    spec = _BY_OUTPUT_KEY.get(output_key)
+    payload = state.get(spec.state_key) if spec else None
+    if not payload:
+        return None
+    try:
+        return spec.model.model_validate(payload)
+    except ValidationError:
+        return None
+
+
+def dumps_compact(payload: Any) -> str:
+    """Serialize a payload as compact, key-sorted JSON."""
+    return json.dumps(payload, separators=(",", ":"), sort_keys=True, default=str)
+
+
+def _record(model: type, value: Any, tool_context: ToolContext) -> dict:
+    try:
+        payload = value if isinstance(value, model) else model.model_validate(value)
+    except ValidationError as e:
+        return {
+            "status": "error",
+            "message": f"Invalid {model.__name__}; fix these fields and call again",
+            "errors": [
+                f"{'.'.join(str(p) for p in error['loc'])}: {error['msg']}" for error in e.errors()
+            ],
+        }
+    state_key = _BY_MODEL[model].state_key
+    tool_context.state[state_key] = payload.model_dump(mode="json", exclude_defaults=True)
+    return {"status": "success", "state_key": state_key}
+
+
+def reset_structured_output(callback_context: CallbackContext) -> None:
+    """before_agent_callback: drop the payload an earlier run of this agent recorded."""
+    spec = STRUCTURED_OUTPUTS.get(callback_context.agent_name)
+    if spec and callback_context.state.get(spec.state_key) is not None:
+        callback_context.state[spec.state_key] = None
+    return None
+
+
+def record_market_data(market_data: MarketData, tool_context: ToolContext) -> dict:
+    """
+    Save the figures of the market analysis report as structured data.
+
+    Call this once, before writing the report, with the values the report
+    states. Leave out any value that is not available.
+
+    Args:
+        market_data: Ticker, price, price change, volume, 30-day trend and fundamentals
+
+    Returns:
+        dict: Status, or the validation errors to fix before calling again
+    """
+    return _record(MarketData, market_data, tool_context)
+
+
+def record_trading_strategies(strategies: TradingStrategies, tool_context: ToolContext) -> dict:
+    """
+    Save the proposed strategies as structured data.
+
+    Call this once, before writing the report, with every proposed strategy.
+    Give the two recommended strategies top_rank 1 and 2 and their return
+    scenarios.
+
+    Args:
+        strategies: All proposed strategies
+
+    Returns:
+        dict: Status, or the validation errors to fix before calling again
+    """
+    return _record(TradingStrategies, strategies, tool_context)
+
+
+def record_execution_plan(plan: ExecutionPlan, tool_context: ToolContext) -> dict:
+    """
+    Save the execution parameters of each planned strategy as structured data.
+
+    Call this once, before writing the plan, with the orders, entry tranches,
+    position size, stop-loss and profit-taking levels the plan states.
+
+    Args:
+        plan: One set of execution parameters per strategy
+
+    Returns:
+        dict: Status, or the validation errors to fix before calling again
+    """
+    return _record(ExecutionPlan, plan, tool_context)
+
+
+def record_risk_assessment(assessment: RiskAssessment, tool_context: ToolContext) -> dict:
+    """
+    Save the risk level and score of each strategy as structured data.
+
+    Call this once, before writing the assessment, with the risk level, a
+    0-10 risk score, key risks and mitigations per strategy, and the
+    recommended strategy.
+
+    Args:
+        assessment: Per-strategy risk profiles and the recommendation
+
+    Returns:
+        dict: Status, or the validation errors to fix before calling again
+    """
+    return _record(RiskAssessment, assessment, tool_context)
+
+
+def record_executive_summary(summary: ExecutiveSummary, tool_context: ToolContext) -> dict:
+    """
+    Save the executive summary as sections for the PDF report.
+
+    Call this once, after composing the summary, with each section's heading,
+    paragraphs and bullet points as plain text (no markdown).
+
+    Args:
+        summary: The executive summary as a list of sections
+
+    Returns:
+        dict: Status, or the validation errors to fix before calling again
+    """
+    return _record(ExecutiveSummary, summary, tool_context)
+
+
+record_market_data_tool = FunctionTool(func=record_market_data)
+record_trading_strategies_tool = FunctionTool(func=record_trading_strategies)
+record_execution_plan_tool = FunctionTool(func=record_execution_plan)
+record_risk_assessment_tool = FunctionTool(func=record_risk_assessment)
+record_executive_summary_tool = FunctionTool(func=record_executive_summary)
+
+
+def key_figures(state: Mapping) -> list:
+    """
+    Collect the headline figures of an analysis from its structured payloads
+
+    Args:
+        state: Session state
+
+    Returns:
+        list: (label, value) rows, empty if no payload was recorded
+    """
+    rows = []
+    for entry in state.get(DEGRADED_DATA_KEY) or []:
+        subject = " ".join(filter(None, (entry["tool"], entry.get("symbol"))))
+        if entry["source"] == DEMO_SOURCE:
+            rows.append((f"Demo data: {subject}", "sample figures, not market data"))
+        else:
+            rows.append((f"Stale data: {subject}", f"as of {entry.get('as_of')}"))
+    market = load_structured(state, "market_data_analysis_output")
+    if market:
+        for label, value, fmt in (
+            ("Current price", market.current_price, "${:,.2f}"),
+            ("Market capitalization", market.market_cap, "${:,.0f}"),
+            ("P/E ratio", market.pe_ratio, "{:.2f}"),
+            ("EPS", market.eps, "${:.2f}"),
+            ("Dividend yield", market.dividend_yield_percent, "{:.2f}%"),
+        ):
+            if value is not None:
+                rows.append((label, fmt.format(value)))
+        if market.week_52_low is not None and market.week_52_high is not None:
+            rows.append(("52-week range", f"${market.week_52_low:,.2f} - ${market.week_52_high:,.2f}"))
+
+    strategies = load_structured(state, "proposed_trading_strategies_output")
+    if strategies:
+        for strategy in strategies.top():
+            value = strategy.name
+            if strategy.estimated_annual_return_percent is not None:
+                value += f" ({strategy.estimated_annual_return_percent:g}% per year)"
+            rows.append((f"Top strategy #{strategy.top_rank}", value))
+
+    plan = load_structured(state, "execution_plan_output")
+    if plan:
+        for params in plan.plans:
+            if params.stop_loss is not None:
+                rows.append((f"Stop-loss: {params.strategy}", f"${params.stop_loss:,.2f}"))
+
+    risk = load_structured(state, "final_risk_assessment_output")
+    if risk:
+        for profile in risk.strategies:
+            value = profile.risk_level
+            if profile.risk_score is not None:
+                value += f" ({profile.risk_score:g}/10)"
+            rows.append((f"Risk: {profile.strategy}", value))
+        if risk.recommended_strategy:
+            rows.append(("Recommended strategy", risk.recommended_strategy))
+    return rows
@@ -16,18 +16,33 @@
 
 from google.adk import Agent
 
-from financial_advisor.tools import get_all_alpha_vantage_tools
+from financial_advisor.model_routing import get_model
+from financial_advisor.structured_outputs import (
+    record_market_data_tool,
+    reset_structured_output,
+)
+from financial_advisor.tools import get_alpha_vantage_tools_for
+from financial_advisor.tools.degraded_data import reset_degraded_data
+from financial_advisor.utils.stage_timing import record_stage_end, record_stage_start
+
 from . import prompt
 
-MODEL = "gemini-2.5-pro"  # Using same model as coordinator (known to work)
+MODEL = get_model("data_analyst_agent")
 
-# Get Alpha Vantage MCP toolset (provides 60+ tools for market data)
-alpha_vantage_toolset = get_all_alpha_vantage_tools()
+# Alpha Vantage MCP toolset (provides 60+ tools for market data), created on first
+# use and limited to the tools the prompt relies on
+alpha_vantage_toolset = get_alpha_vantage_tools_for("data_analyst_agent")
 
 data_analyst_agent = Agent(
     model=MODEL,
     name="data_analyst_agent",
     instruction=prompt.DATA_ANALYST_PROMPT,
     output_key="market_data_analysis_output",
-    tools=[alpha_vantage_toolset],
+    tools=[alpha_vantage_toolset, record_market_data_tool],
+    before_agent_callback=[
+        record_stage_start,
+        reset_structured_output,
+        reset_degraded_data,
+    ],
+    after_agent_callback=record_stage_end,
 )
@@ -34,7 +34,7 @@ Mandatory Process - Data Collection:
 
 Step 1: Essential Market Data (CRITICAL - Minimize API calls):
 
-REQUIRED (2 API calls only):
+REQUIRED (one call each):
 1. Use alpha_vantage_global_quote tool to get current live stock price for the provided_ticker:
    - Current price
    - Price change and change percent
@@ -49,20 +49,23 @@ REQUIRED (2 API calls only):
    - Dividend yield and payout ratio
    - Business description
 
-OPTIONAL (Skip these to avoid rate limits - use only if absolutely necessary):
-- alpha_vantage_time_series_daily for historical trends
-- alpha_vantage_news_sentiment for news analysis
-- Other financial statement tools
+3. Use alpha_vantage_time_series_daily ONCE (compact output) to get the recent daily closes:
+   - 30-day price trend and 30-day change, for the structured output below
+   - Skip it if the user only asked for the current quote or fundamentals
 
-IMPORTANT: To minimize API calls and avoid rate limits, use ONLY the 2 required tools above (GLOBAL_QUOTE and COMPANY_OVERVIEW).
-Do NOT use optional tools unless explicitly requested by the user.
+ON REQUEST ONLY:
+4. Use alpha_vantage_news_sentiment only when the user asks about news, sentiment or recent events
+   for the provided_ticker. Call it once, limited to the provided_ticker.
+
+IMPORTANT: These four tools are the only ones available. To minimize API calls and avoid rate limits,
+call each tool at most once per ticker and never call NEWS_SENTIMENT unless the user asked for it.
+If a tool returns a result with "status": "budget_exhausted", do NOT call that tool again. Continue with the data already gathered and state in the report which data was unavailable.
 
 Information Focus Areas (ensure coverage using MCP tools):
-Company Fundamentals: Use COMPANY_OVERVIEW and financial statement tools for comprehensive company analysis
-Financial News & Performance: Already covered by NEWS_SENTIMENT tool
-Market Sentiment & Analyst Opinions: Covered by NEWS_SENTIMENT and company data
-Risk Factors & Opportunities: Identified through news sentiment, company overview, and financial statements
-Material Events: Captured in news sentiment data
+Company Fundamentals: Use COMPANY_OVERVIEW for company analysis
+Price Performance: Use GLOBAL_QUOTE and TIME_SERIES_DAILY
+Market Sentiment & Material Events: Covered by NEWS_SENTIMENT, when it was requested
+Risk Factors & Opportunities: Identified through the company overview, price trend and (if requested) news sentiment
 
 Data Quality: Aim to gather comprehensive, accurate information from Alpha Vantage MCP tools. All data comes from verified financial data sources.
 Mandatory Process - Synthesis & Analysis:
@@ -103,8 +106,13 @@ The data_analyst must return a single, comprehensive report object or string wit
 **3. Executive Summary:**
    * Brief (3-5 bullet points) overview of the most critical findings based on current price and fundamentals.
    * Assessment of current valuation based on P/E ratio and market position.
-   * Note on price momentum (based on price change percentage).
+   * Note on price momentum (based on price change percentage and the 30-day trend).
+   * If news sentiment was requested, the overall sentiment and the most material recent headlines.
 
 **Note:** Due to API rate limit optimization, this report focuses on essential market data and company fundamentals.
-For detailed news analysis, historical trends, or analyst commentary, these can be requested separately if needed.
+News analysis is included only when requested; analyst commentary and longer history can be requested separately.
+
+** Structured Output: Before writing the report, call the record_market_data tool ONCE with the ticker and the figures the
+report will state (price, price change, volume, 30-day trend, fundamentals and, if analyzed, sentiment). Leave out values that are not available.
+If the tool returns errors, fix the fields and call it again.
 """
@@ -16,13 +16,23 @@
 
 from google.adk import Agent
 
+from financial_advisor.model_routing import get_model
+from financial_advisor.structured_outputs import (
+    record_execution_plan_tool,
+    reset_structured_output,
+)
+from financial_advisor.utils.stage_timing import record_stage_end, record_stage_start
+
 from . import prompt
 
-MODEL = "gemini-2.5-pro"
+MODEL = get_model("execution_analyst_agent")
 
 execution_analyst_agent = Agent(
     model=MODEL,
     name="execution_analyst_agent",
     instruction=prompt.EXECUTION_ANALYST_PROMPT,
     output_key="execution_plan_output",
+    tools=[record_execution_plan_tool],
+    before_agent_callback=[record_stage_start, reset_structured_output],
+    after_agent_callback=record_stage_end,
 )
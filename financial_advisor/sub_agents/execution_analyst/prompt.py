@@ -126,6 +126,9 @@ the user's own decision-making process.
 Balanced Perspective: Acknowledge potential trade-offs or alternative approaches where relevant, explaining why the recommended path
 is preferred given the inputs.
 
+** Structured Output: Before writing the plan, call the record_execution_plan tool ONCE with the order type, entry tranches,
+position size, stop-loss and profit-taking levels of each planned strategy. If the tool returns errors, fix the fields and call it again.
+
 ** Legal Disclaimer and User Acknowledgment (MUST be displayed prominently):
 "Important Disclaimer: For Educational and Informational Purposes Only." "The information and trading strategy outlines provided by this tool, including any analysis, commentary, or potential scenarios, are generated by an AI model and are for educational and informational purposes only. They do not constitute, and should not be interpreted as, financial advice, investment recommendations, endorsements, or offers to buy or sell any securities or other financial instruments." "Google and its affiliates make no representations or warranties of any kind, express or implied, about the completeness, accuracy, reliability, suitability, or availability with respect to the information provided. Any reliance you place on such information is therefore strictly at your own risk."1 "This is not an offer to buy or sell any security. Investment decisions should not be made based solely on the information provided here. Financial markets are subject to risks, and past performance is not indicative of future results. You should conduct your own thorough research and consult with a qualified independent financial advisor before making any investment decisions." "By using this tool and reviewing these strategies, you acknowledge that you understand this disclaimer and agree that Google and its affiliates are not liable for any losses or damages arising from your use of or reliance on this information."
 """
@@ -16,13 +16,24 @@
 
 from google.adk import Agent
 
+from financial_advisor.model_routing import get_model
+from financial_advisor.structured_outputs import (
+    record_risk_assessment_tool,
+    reset_structured_output,
+)
+from financial_advisor.tools import get_risk_analyst_tools
+from financial_advisor.utils.stage_timing import record_stage_end, record_stage_start
+
 from . import prompt
 
-MODEL="gemini-2.5-pro"
+MODEL = get_model("risk_analyst_agent")
 
 risk_analyst_agent = Agent(
     model=MODEL,
     name="risk_analyst_agent",
     instruction=prompt.RISK_ANALYST_PROMPT,
     output_key="final_risk_assessment_output",
+    tools=[*get_risk_analyst_tools(), record_risk_assessment_tool],
+    before_agent_callback=[record_stage_start, reset_structured_output],
+    after_agent_callback=record_stage_end,
 )
@@ -34,6 +34,11 @@ Long-term (months to years)). This impacts timeframe relevance, review frequency
 user_execution_preferences: User-defined preferences regarding execution (e.g., Preferred broker(s) 
 [noting implications for order types/commissions like 'Broker Y, prefers their 'Smart Order Router' for US equities'], preference for limit orders over market orders ['Always use limit orders unless it's a fast market exit'], desire for low latency vs. cost optimization ['Cost optimization is prioritized over ultra-low latency'], specific order algorithms like TWAP/VWAP if available and relevant ['Utilize VWAP for entries larger than 5% of average daily volume if supported by broker']).
 
+* Tool Usage:
+Call compute_risk_metrics ONCE with the ticker to get ATR, Bollinger Band width, standard deviation, historical volatility and maximum drawdown.
+These are computed locally from a single daily price fetch, so do not call it more than once per ticker.
+Use these figures for stop-loss sizing, drawdown estimates and volatility exposure. If the tool returns an error status, proceed with qualitative estimates.
+
 * Requested Output Structure: Comprehensive Strategy-Wise Risk Analysis Report
 
 The analysis must be organized with the following structure:
@@ -187,6 +192,10 @@ After completing the risk analysis, you MUST ask the user:
 
 ═══════════════════════════════════════════════════════════════════════════
 
+** Structured Output: Before writing the assessment, call the record_risk_assessment tool ONCE with the risk level,
+a 0-10 risk score, maximum drawdown, key risks and mitigations of each strategy, and the recommended strategy.
+If the tool returns errors, fix the fields and call it again.
+
 ** Legal Disclaimer and User Acknowledgment (MUST be displayed prominently): 
 "Important Disclaimer: For Educational and Informational Purposes Only." "The information and trading strategy outlines provided by this tool, including any analysis, commentary, or potential scenarios, are generated by an AI model and are for educational and informational purposes only. They do not constitute, and should not be interpreted as, financial advice, investment recommendations, endorsements, or offers to buy or sell any securities or other financial instruments." "Google and its affiliates make no representations or warranties of any kind, express or implied, about the completeness, accuracy, reliability, suitability, or availability with respect to the information provided. Any reliance you place on such information is therefore strictly at your own risk."1 "This is not an offer to buy or sell any security. Investment decisions should not be made based solely on the information provided here. Financial markets are subject to risks, and past performance is not indicative of future results. You should conduct your own thorough research and consult with a qualified independent financial advisor before making any investment decisions." "By using this tool and reviewing these strategies, you acknowledge that you understand this disclaimer and agree that Google and its affiliates are not liable for any losses or damages arising from your use of or reliance on this information."
 """
@@ -16,14 +16,23 @@
 
 from google.adk import Agent
 
+from financial_advisor.model_routing import get_model
+from financial_advisor.structured_outputs import (
+    record_executive_summary_tool,
+    reset_structured_output,
+)
+from financial_advisor.utils.stage_timing import record_stage_end, record_stage_start
+
 from . import prompt
 
-# Use same model as coordinator (known to work in your project)
-MODEL = "gemini-2.5-pro"
+MODEL = get_model("summary_agent")
 
 summary_agent = Agent(
     model=MODEL,
     name="summary_agent",
     instruction=prompt.SUMMARY_AGENT_PROMPT,
     output_key="executive_summary_output",
+    tools=[record_executive_summary_tool],
+    before_agent_callback=[record_stage_start, reset_structured_output],
+    after_agent_callback=record_stage_end,
 )
@@ -184,6 +184,9 @@ END OF REPORT
 
 ** Storage: This executive summary MUST be stored in the state key: executive_summary_output.
 
+** Structured Output: After composing the summary, call the record_executive_summary tool ONCE with its sections
+(heading, paragraphs and bullet points as plain text), then output the summary text. The PDF report is laid out from these sections.
+
 ** Output Requirements:
 - Keep the summary concise: target 3-5 pages when exported to PDF
 - Use clear, professional language
@@ -16,13 +16,24 @@
 
 from google.adk import Agent
 
+from financial_advisor.model_routing import get_model
+from financial_advisor.structured_outputs import (
+    record_trading_strategies_tool,
+    reset_structured_output,
+)
+from financial_advisor.tools import get_trading_analyst_tools
+from financial_advisor.utils.stage_timing import record_stage_end, record_stage_start
+
 from . import prompt
 
-MODEL="gemini-2.5-pro"
+MODEL = get_model("trading_analyst_agent")
 
 trading_analyst_agent = Agent(
     model=MODEL,
     name="trading_analyst_agent",
     instruction=prompt.TRADING_ANALYST_PROMPT,
     output_key="proposed_trading_strategies_output",
+    tools=[*get_trading_analyst_tools(), record_trading_strategies_tool],
+    before_agent_callback=[record_stage_start, reset_structured_output],
+    after_agent_callback=record_stage_end,
 )
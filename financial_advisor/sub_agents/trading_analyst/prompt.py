@@ -45,6 +45,11 @@ For each strategy, use the market data to:
 3. Estimate expected returns based on historical performance patterns and current valuation
 4. Assess alignment with user risk profile and investment period
 
+* Tool Usage:
+Call compute_technical_indicators ONCE with the ticker to get RSI, MACD, EMA/SMA, Bollinger Bands, Stochastic, ADX and OBV.
+These are computed locally from a single daily price fetch, so do not call it more than once per ticker.
+Use the indicator values to ground entry/exit conditions. If the tool returns an error status, proceed using market_data_analysis_output only.
+
 * Inputs (to trading_analyst):
 
 ** User Risk Attitude (user_risk_attitude):
@@ -159,6 +164,9 @@ For EACH of the top 2 strategies, provide:
 
 ** Storage: This complete collection of trading strategies (including TOP 2 detailed analysis) MUST be stored in the state key: proposed_trading_strategies_output.
 
+** Structured Output: Before writing the strategies, call the record_trading_strategies tool ONCE with every proposed strategy.
+Set top_rank 1 and 2 on the TOP 2 strategies and include their return scenarios. If the tool returns errors, fix the fields and call it again.
+
 * User Notification & Disclaimer Presentation: After generation, the agent MUST present the following to the user:
 ** Introduction to Strategies: "Based on the market analysis and your preferences, I have formulated [Number] potential 
 trading strategy outlines for your consideration."
@@ -0,0 +1,257 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Token and cost accounting per run and per agent
+
+``TokenUsagePlugin`` adds up the usage metadata of every model response in a
+run, per agent, and writes it to session state:
+
+    token_usage          the latest run: {"agents": {...}, "total": {...}}
+    token_usage_session  the same, summed over every run of the session
+
+Each agent entry holds its model, number of calls, prompt/cached/output/
+thinking tokens and estimated cost in USD. Sub-agents run through AgentTool
+or the fan-out tools start nested runs; they inherit the outer run's
+accumulator through a context variable, so their tokens are charged to the
+run that caused them.
+
+The module is also a CLI that aggregates the accounting over exported
+session JSON files, falling back to the usage metadata recorded on the
+session's events for files exported before accounting existed:
+
+    python -m financial_advisor.token_usage session-*.json
+"""
+
+import argparse
+import contextvars
+import json
+from pathlib import Path
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+
+from .model_routing import estimate_cost
+
+RUN_USAGE_KEY = "token_usage"
+SESSION_USAGE_KEY = "token_usage_session"
+
+_COUNTERS = ("calls", "prompt_tokens", "cached_tokens", "output_tokens", "thoughts_tokens")
+
+_USAGE_FIELDS = {
+    "prompt_tokens": "prompt_token_count",
+    "cached_tokens": "cached_content_token_count",
+    "output_tokens": "candidates_token_count",
+    "thoughts_tokens": "thoughts_token_count",
+}
+
+
+def _empty_entry(model: str | None = None) -> dict:
+    return {"model": model, **dict.fromkeys(_COUNTERS, 0), "cost_usd": 0.0}
+
+
+def add_usage(agents: dict, agent: str, model: str, usage: dict) -> None:
+    """
+    Add one model call's token counts to a per-agent report
+
+    Args:
+        agents: Agent name -> entry, updated in place
+        agent: Agent that made the call
+        model: Model that served it
+        usage: prompt_tokens, cached_tokens, output_tokens, thoughts_tokens
+    """
+    entry = agents.setdefault(agent, _empty_entry(model))
+    entry["model"] = model
+    entry["calls"] += 1
+    for name in _USAGE_FIELDS:
+        entry[name] += usage.get(name) or 0
+    cost = estimate_cost(
+        model,
+        usage.get("prompt_tokens") or 0,
+        (usage.get("output_tokens") or 0) + (usage.get("thoughts_tokens") or 0),
+        cached_tokens=usage.get("cached_tokens") or 0,
+    )
+    entry["cost_usd"] += cost or 0.0
+
+
+def merge_reports(*reports: dict | None) -> dict:
+    """Sum per-agent reports and compute their total."""
+    agents: dict = {}
+    for report in reports:
+        for agent, entry in ((report or {}).get("agents") or {}).items():
+            merged = agents.setdefault(agent, _empty_entry(entry.get("model")))
+            merged["model"] = entry.get("model") or merged["model"]
+            for name in (*_COUNTERS, "cost_usd"):
+                merged[name] += entry.get(name) or 0
+    total = {name: sum(entry[name] for entry in agents.values()) for name in _COUNTERS}
+    total["cost_usd"] = sum(entry["cost_usd"] for entry in agents.values())
+    return {"agents": agents, "total": total}
+
+
+class _RunUsage:
+    """Token counts of one top-level run."""
+
+    def __init__(self, invocation_id: str, session_report: dict | None):
+        self.invocation_id = invocation_id
+        self.session_report = session_report
+        self.agents: dict = {}
+        self.finished = False
+
+    def report(self) -> dict:
+        return merge_reports({"agents": self.agents})
+
+
+_current_run: contextvars.ContextVar = contextvars.ContextVar("token_usage_run", default=None)
+
+
+class TokenUsagePlugin(BasePlugin):
+    """ADK plugin accumulating token usage and cost per agent into session state."""
+
+    def __init__(self, name: str = "token_usage"):
+        super().__init__(name=name)
+        self._models: dict = {}
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        run = _current_run.get()
+        if run is None or run.finished:
+            session_report = invocation_context.session.state.get(SESSION_USAGE_KEY)
+            _current_run.set(_RunUsage(invocation_context.invocation_id, session_report))
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        run = _current_run.get()
+        if run is not None and run.invocation_id == invocation_context.invocation_id:
+            run.finished = True
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        self._models[key] = llm_request.model or "unknown"
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        run = _current_run.get()
+        usage = llm_response.usage_metadata
+        if run is None or usage is None or llm_response.partial:
+            return
+        model = self._models.pop(
+            (callback_context.invocation_id, callback_context.agent_name), "unknown"
+        )
+        add_usage(
+            run.agents,
+            callback_context.agent_name,
+            model,
+            {name: getattr(usage, field, None) for name, field in _USAGE_FIELDS.items()},
+        )
+
+    async def after_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        # Only the outer run writes state; nested runs forward their state
+        # into it and would overwrite each other's snapshots
+        run = _current_run.get()
+        if run is None or run.invocation_id != callback_context.invocation_id:
+            return
+        report = run.report()
+        callback_context.state[RUN_USAGE_KEY] = report
+        callback_context.state[SESSION_USAGE_KEY] = merge_reports(run.session_report, report)
+
+
+def session_usage(session: dict) -> dict:
+    """
+    Return the per-agent usage recorded in an exported session
+
+    Uses ``token_usage_session`` from the session state when present, else
+    the usage metadata of the session's own events (which only cover agents
+    that ran in the session itself, not sub-agents run through AgentTool).
+
+    Args:
+        session: Parsed session JSON export
+
+    Returns:
+        dict: {"agents": {...}, "total": {...}}
+    """
+    recorded = (session.get("state") or {}).get(SESSION_USAGE_KEY)
+    if recorded:
+        return merge_reports(recorded)
+
+    agents: dict = {}
+    for event in session.get("events", []):
+        usage = event.get("usageMetadata") or event.get("usage_metadata")
+        if not usage or event.get("partial"):
+            continue
+        add_usage(
+            agents,
+            event.get("author", "unknown"),
+            event.get("modelVersion") or event.get("model_version") or "unknown",
+            {
+                "prompt_tokens": usage.get("promptTokenCount", usage.get("prompt_token_count")),
+                "cached_tokens": usage.get(
+                    "cachedContentTokenCount", usage.get("cached_content_token_count")
+                ),
+                "output_tokens": usage.get(
+                    "candidatesTokenCount", usage.get("candidates_token_count")
+                ),
+                "thoughts_tokens": usage.get(
+                    "thoughtsTokenCount", usage.get("thoughts_token_count")
+                ),
+            },
+        )
+    return merge_reports({"agents": agents})
+
+
+def format_report(report: dict, sessions: int) -> str:
+    """Render an aggregated report as a table, most expensive agent first."""
+    total_cost = report["total"]["cost_usd"]
+    header = (
+        f"{'agent':<26}{'model':<24}{'calls':>6}{'in tok':>11}{'cached':>10}"
+        f"{'out tok':>10}{'cost $':>10}{'share':>7}"
+    )
+    lines = [header, "-" * len(header)]
+    rows = sorted(report["agents"].items(), key=lambda item: item[1]["cost_usd"], reverse=True)
+    for agent, entry in rows:
+        share = entry["cost_usd"] / total_cost if total_cost else 0.0
+        lines.append(
+            f"{agent:<26}{(entry['model'] or '?'):<24}{entry['calls']:>6}"
+            f"{entry['prompt_tokens']:>11}{entry['cached_tokens']:>10}"
+            f"{entry['output_tokens'] + entry['thoughts_tokens']:>10}"
+            f"{entry['cost_usd']:>10.4f}{share:>7.0%}"
+        )
+    lines.append("-" * len(header))
+    lines.append(f"{sessions} session(s), total estimated cost ${total_cost:.4f}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sessions", nargs="+", type=Path, help="Exported session JSON files")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = merge_reports(
+        *(session_usage(json.loads(path.read_text())) for path in args.sessions)
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report, len(args.sessions)))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,17 +15,31 @@
 """Tools module for financial advisor agents"""
 
 from .alpha_vantage_tools import (
-    get_alpha_vantage_mcp_toolset,
     get_all_alpha_vantage_tools,
+    get_alpha_vantage_cache_stats,
+    get_alpha_vantage_connection_stats,
+    get_alpha_vantage_deadline_stats,
+    get_alpha_vantage_mcp_toolset,
+    get_alpha_vantage_scheduler_stats,
+    get_alpha_vantage_single_flight_stats,
+    get_alpha_vantage_tool_schema_stats,
+    get_alpha_vantage_tools_for,
 )
-from .trading_analyst_tools import get_trading_analyst_tools
-from .risk_analyst_tools import get_risk_analyst_tools
 from .execution_analyst_tools import get_execution_analyst_tools
+from .risk_analyst_tools import get_risk_analyst_tools
+from .trading_analyst_tools import get_trading_analyst_tools
 
 __all__ = [
     # Data Analyst Tools
     "get_alpha_vantage_mcp_toolset",
     "get_all_alpha_vantage_tools",
+    "get_alpha_vantage_tools_for",
+    "get_alpha_vantage_cache_stats",
+    "get_alpha_vantage_connection_stats",
+    "get_alpha_vantage_deadline_stats",
+    "get_alpha_vantage_scheduler_stats",
+    "get_alpha_vantage_single_flight_stats",
+    "get_alpha_vantage_tool_schema_stats",
     # Trading Analyst Tools
     "get_trading_analyst_tools",
     # Risk Analyst Tools
@@ -14,11 +14,89 @@
 
 """Alpha Vantage MCP tools for financial data retrieval"""
 
+import asyncio
+import heapq
+import itertools
+import json
+import logging
 import os
 import threading
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
 from typing import Any
-from google.adk.tools import MCPToolset
-from google.adk.tools.mcp_tool.mcp_toolset import StreamableHTTPConnectionParams
+
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools import BaseTool, MCPToolset
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.mcp_tool.mcp_tool import McpTool
+from google.adk.tools.mcp_tool.mcp_toolset import (
+    McpToolset,
+    StreamableHTTPConnectionParams,
+)
+from google.adk.tools.tool_context import ToolContext
+from mcp.types import CallToolResult, TextContent
+
+from .deadlines import DeadlineExceeded, DeadlinePolicy
+from .degraded_data import (
+    DEMO_SOURCE,
+    STALE_SOURCE,
+    fallback_source,
+    note_degraded_data,
+)
+from .mcp_pool import (
+    CircuitBreaker,
+    CircuitOpenError,
+    MCPConnectionPool,
+    PooledMcpToolset,
+)
+from .response_cache import DAY, ToolResponseCache, normalize_tool_args
+from .single_flight import SingleFlight
+from .tool_schema_cache import DEFAULT_SCHEMA_TTL, ToolSchemaCache
+
+logger = logging.getLogger(__name__)
+
+# Called as hook(tool_name, args, result) after a fresh successful response
+ResultHook = Callable[[str, dict, CallToolResult], None]
+
+DEFAULT_ALPHA_VANTAGE_MCP_URL = "https://mcp.alphavantage.co/mcp"
+
+# Tools declared to each agent's model. The server offers 60+ tools and every
+# declaration is sent with every model call, so agents only see what their
+# prompt uses. ALPHA_VANTAGE_TOOLS_<AGENT_NAME> overrides an entry with a
+# comma separated list, or "*" for all tools.
+DEFAULT_TOOL_ALLOWLISTS = {
+    "data_analyst_agent": (
+        "GLOBAL_QUOTE",
+        "COMPANY_OVERVIEW",
+        "TIME_SERIES_DAILY",
+        "NEWS_SENTIMENT",
+    ),
+}
+
+# Phrases Alpha Vantage puts in a successful-looking response when the call
+# was actually throttled; such responses must never be cached.
+_RATE_LIMIT_MARKERS = (
+    "rate limit",
+    "api call frequency",
+    "premium endpoint",
+    "thank you for using alpha vantage",
+)
+
+
+def get_alpha_vantage_mcp_url(api_key: str) -> str:
+    """
+    Build the MCP endpoint URL for the given API key.
+
+    ALPHA_VANTAGE_MCP_URL overrides the public endpoint, e.g. to point the
+    agents at the offline stand-in in ``mcp_replay_server.py``.
+    """
+    return f"{get_alpha_vantage_mcp_base_url()}?apikey={api_key}"
+
+
+def get_alpha_vantage_mcp_base_url() -> str:
+    """Return the MCP endpoint without credentials, e.g. to key caches on."""
+    return os.getenv("ALPHA_VANTAGE_MCP_URL", DEFAULT_ALPHA_VANTAGE_MCP_URL)
 
 
 class LazyMCPToolset:
@@ -57,7 +135,7 @@ class LazyMCPToolset:
 
                     # Create connection parameters for Alpha Vantage HTTP MCP server
                     connection_params = StreamableHTTPConnectionParams(
-                        url=f"https://mcp.alphavantage.co/mcp?apikey={api_key}"
+                        url=get_alpha_vantage_mcp_url(api_key)
                     )
 
                     # Connect to Alpha Vantage MCP server
@@ -89,6 +167,601 @@ class LazyMCPToolset:
         return toolset
 
 
+def _is_cacheable(result: Any) -> bool:
+    """Return True if a tool result is a genuine answer worth caching."""
+    if not isinstance(result, CallToolResult) or result.isError:
+        return False
+    for item in result.content:
+        text = getattr(item, "text", "") or ""
+        if any(marker in text.lower() for marker in _RATE_LIMIT_MARKERS):
+            return False
+    return True
+
+
+# Scheduling priority per tool (lower runs first). Quotes and fundamentals
+# are what every report needs; news sentiment is nice-to-have.
+TOOL_PRIORITIES = {
+    "GLOBAL_QUOTE": 0,
+    "COMPANY_OVERVIEW": 1,
+    "TIME_SERIES_DAILY": 2,
+    "TIME_SERIES_INTRADAY": 2,
+    "EARNINGS": 3,
+    "INCOME_STATEMENT": 3,
+    "BALANCE_SHEET": 3,
+    "CASH_FLOW": 3,
+    "NEWS_SENTIMENT": 9,
+}
+DEFAULT_TOOL_PRIORITY = 5
+
+
+class TokenBucket:
+    """Classic token bucket: ``capacity`` tokens, refilled continuously."""
+
+    def __init__(self, capacity: float, refill_seconds: float):
+        self.capacity = capacity
+        self.rate = capacity / refill_seconds
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until one token is available (0 if available now)."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        """Consume one token. Callers must check ``wait_time()`` first."""
+        self._refill()
+        self.tokens -= 1
+
+
+class AlphaVantageScheduler:
+    """
+    Client-side rate limiter and request scheduler for Alpha Vantage calls.
+
+    Enforces per-minute and per-day token buckets for the API key. Calls that
+    cannot run immediately wait in a priority queue (quotes before news
+    sentiment). When the budget cannot be met within ``max_wait``
+    seconds a structured "budget exhausted" result is returned instead of
+    letting the request fail with a 429.
+    """
+
+    def __init__(
+        self,
+        calls_per_minute: int = 5,
+        calls_per_day: int = 25,
+        max_wait: float = 30.0,
+    ):
+        self.minute_bucket = TokenBucket(calls_per_minute, 60)
+        self.day_bucket = TokenBucket(calls_per_day, 24 * 60 * 60)
+        self.max_wait = max_wait
+        self._waiters: list = []
+        self._sequence = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+        self.stats = {
+            "scheduled": 0,
+            "queued": 0,
+            "budget_exhausted": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "AlphaVantageScheduler":
+        """Create a scheduler from ALPHA_VANTAGE_CALLS_PER_* environment variables."""
+        return cls(
+            calls_per_minute=int(os.getenv("ALPHA_VANTAGE_CALLS_PER_MINUTE", "5")),
+            calls_per_day=int(os.getenv("ALPHA_VANTAGE_CALLS_PER_DAY", "25")),
+            max_wait=float(os.getenv("ALPHA_VANTAGE_MAX_QUEUE_WAIT", "30")),
+        )
+
+    def _wait_time(self) -> float:
+        return max(self.minute_bucket.wait_time(), self.day_bucket.wait_time())
+
+    def available_now(self) -> bool:
+        """Return True if a call could start now without queueing."""
+        return not self._waiters and self._wait_time() == 0
+
+    async def _acquire(self, priority: int) -> bool:
+        """Wait for a token in priority order. Returns False if over budget."""
+        if self._wait_time() > self.max_wait:
+            return False
+        if not self._waiters and self._wait_time() == 0:
+            self.minute_bucket.take()
+            self.day_bucket.take()
+            return True
+
+        self.stats["queued"] += 1
+        grant = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), grant))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            return await asyncio.wait_for(asyncio.shield(grant), self.max_wait)
+        except asyncio.CancelledError:
+            # A caller past its deadline must not be handed a token later
+            if not grant.done():
+                grant.cancel()
+            elif not grant.cancelled() and grant.result():
+                self.minute_bucket.tokens += 1
+                self.day_bucket.tokens += 1
+            raise
+        except asyncio.TimeoutError:
+            if not grant.done():
+                grant.cancel()
+            elif not grant.cancelled() and grant.result():
+                return True
+            return False
+
+    async def _dispatch(self) -> None:
+        """Hand out tokens to queued callers, highest priority first."""
+        while self._waiters:
+            delay = self._wait_time()
+            if delay > self.max_wait:
+                # Budget will not recover in time for anyone in the queue
+                while self._waiters:
+                    _, _, grant = heapq.heappop(self._waiters)
+                    if not grant.done():
+                        grant.set_result(False)
+                return
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            _, _, grant = heapq.heappop(self._waiters)
+            if grant.done():
+                continue
+            self.minute_bucket.take()
+            self.day_bucket.take()
+            grant.set_result(True)
+
+    async def submit(
+        self, tool_name: str, call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run ``call`` once the rate budget allows it.
+
+        Args:
+            tool_name: Name of the Alpha Vantage tool being called
+            call: Zero-argument coroutine function performing the request
+
+        Returns:
+            The call's result, or a budget-exhausted CallToolResult
+        """
+        priority = TOOL_PRIORITIES.get(tool_name.upper(), DEFAULT_TOOL_PRIORITY)
+        if not await self._acquire(priority):
+            self.stats["budget_exhausted"] += 1
+            return budget_exhausted_result(tool_name, self._wait_time())
+        self.stats["scheduled"] += 1
+        return await call()
+
+
+def budget_exhausted_result(tool_name: str, retry_after: float) -> CallToolResult:
+    """
+    Build the structured result returned when the API budget is used up.
+
+    Args:
+        tool_name: Name of the tool that could not be called
+        retry_after: Seconds until the budget allows another call
+
+    Returns:
+        CallToolResult: An error result the model can reason about
+    """
+    payload = {
+        "status": "budget_exhausted",
+        "tool": tool_name,
+        "retry_after_seconds": round(retry_after, 1),
+        "message": (
+            "Alpha Vantage API budget exhausted. Do not retry this tool now; "
+            "continue with the data already gathered and note that it is "
+            "unavailable."
+        ),
+    }
+    return CallToolResult(
+        content=[TextContent(type="text", text=json.dumps(payload))],
+        structuredContent=payload,
+        isError=True,
+    )
+
+
+def _failure_reason(error: BaseException) -> str:
+    """Name the underlying error, looking inside anyio's exception groups."""
+    while getattr(error, "exceptions", None):
+        error = error.exceptions[0]
+    return type(error).__name__
+
+
+def upstream_unavailable_result(tool_name: str, reason: str) -> CallToolResult:
+    """
+    Build the structured result returned when the server cannot be reached
+    and there is nothing to fall back to.
+
+    Args:
+        tool_name: Name of the tool that could not be called
+        reason: Why the call did not go through
+
+    Returns:
+        CallToolResult: An error result the model can reason about
+    """
+    payload = {
+        "status": "unavailable",
+        "tool": tool_name,
+        "reason": reason,
+        "message": (
+            "Alpha Vantage is currently unavailable and no earlier data is "
+            "stored for this request. Do not retry this tool now; continue "
+            "with the data already gathered and note that it is unavailable."
+        ),
+    }
+    return CallToolResult(
+        content=[TextContent(type="text", text=json.dumps(payload))],
+        structuredContent=payload,
+        isError=True,
+    )
+
+
+class DegradationPolicy:
+    """
+    Decides what a tool call returns when the MCP server cannot answer.
+
+    The last stored response is preferred, however old, as long as the cache
+    still keeps it (see ``keep_stale`` on ToolResponseCache). Without one,
+    the deterministic demo data from ``mcp_replay_server.py`` is used when
+    ``demo`` is set. Either way the result starts with a note telling the
+    model where the figures come from, and its ``_meta`` records the source.
+    """
+
+    def __init__(self, cache: ToolResponseCache | None = None, demo: bool = True):
+        self._cache = cache
+        self._demo = demo
+        self.stats = {"stale_cache": 0, "demo": 0, "unavailable": 0}
+
+    def fallback(self, tool_name: str, args: dict, reason: str) -> CallToolResult:
+        """
+        Build the result for a call that did not reach the server
+
+        Args:
+            tool_name: Name of the tool being called
+            args: Tool arguments
+            reason: Why the call did not go through
+
+        Returns:
+            CallToolResult: Stale, demo or unavailable result
+        """
+        stored = self._cache.get_stale(tool_name, args) if self._cache else None
+        if stored is not None:
+            payload, stored_at = stored
+            self.stats["stale_cache"] += 1
+            result = CallToolResult.model_validate(payload)
+            when = datetime.fromtimestamp(stored_at, timezone.utc)
+            age_hours = (time.time() - stored_at) / 3600
+            note = (
+                f"[STALE DATA] Alpha Vantage is unavailable ({reason}). This "
+                f"{tool_name} response was retrieved {when:%Y-%m-%d %H:%M} UTC, "
+                f"{age_hours:.1f} hours ago. Say in the report that these "
+                "figures are stale and give their date."
+            )
+            meta = {"source": STALE_SOURCE, "stored_at": when.isoformat()}
+            return result.model_copy(
+                update={
+                    "content": [TextContent(type="text", text=note), *result.content],
+                    "meta": {**(result.meta or {}), **meta, "reason": reason},
+                }
+            )
+
+        # Imported here: the replay server pulls in the MCP server package
+        from .mcp_replay_server import demo_response
+
+        demo = demo_response(tool_name, args) if self._demo else None
+        if demo is not None:
+            self.stats["demo"] += 1
+            note = (
+                f"[DEMO DATA] Alpha Vantage is unavailable ({reason}) and no "
+                "earlier response is stored. These are illustrative sample "
+                "figures, not market data. Say so clearly in the report."
+            )
+            return CallToolResult(
+                content=[
+                    TextContent(type="text", text=note),
+                    TextContent(type="text", text=json.dumps(demo)),
+                ],
+                structuredContent=demo,
+                _meta={"source": DEMO_SOURCE, "reason": reason},
+            )
+
+        self.stats["unavailable"] += 1
+        return upstream_unavailable_result(tool_name, reason)
+
+
+class ManagedMCPTool(BaseTool):
+    """
+    Wraps a single MCP tool with caching, single-flight and rate scheduling.
+
+    The wrapped tool's name, description and function declaration are passed
+    through unchanged, so the model sees exactly the same tool surface.
+    Calls go through the connection ``pool``'s request slots and circuit
+    breaker when one is given, and are bounded and hedged by ``deadlines``.
+    A call that fails, runs past its deadline or is refused by the circuit
+    breaker is answered by the ``degradation`` policy instead of raising, and
+    the substitution is noted in session state for the report.
+    """
+
+    def __init__(
+        self,
+        tool: BaseTool,
+        cache: ToolResponseCache | None = None,
+        scheduler: AlphaVantageScheduler | None = None,
+        single_flight: SingleFlight | None = None,
+        on_result: ResultHook | None = None,
+        pool: MCPConnectionPool | None = None,
+        degradation: DegradationPolicy | None = None,
+        deadlines: DeadlinePolicy | None = None,
+    ):
+        super().__init__(
+            name=tool.name,
+            description=tool.description,
+            is_long_running=tool.is_long_running,
+            custom_metadata=tool.custom_metadata,
+        )
+        self._tool = tool
+        self._cache = cache
+        self._scheduler = scheduler
+        self._single_flight = single_flight
+        self._on_result = on_result
+        self._pool = pool
+        self._degradation = degradation
+        self._deadlines = deadlines
+
+    def _get_declaration(self):
+        """Expose the wrapped tool's declaration unchanged."""
+        return self._tool._get_declaration()
+
+    async def run_async(
+        self, *, args: dict[str, Any], tool_context: ToolContext
+    ) -> Any:
+        """Return a cached response if fresh, otherwise call the MCP server."""
+        if self._cache is not None:
+            cached = self._cache.get(self.name, args)
+            if cached is not None:
+                return CallToolResult.model_validate(cached)
+
+        async def call():
+            if self._pool is None:
+                return await self._tool.run_async(args=args, tool_context=tool_context)
+            async with self._pool.lease():
+                return await self._tool.run_async(args=args, tool_context=tool_context)
+
+        async def scheduled(run):
+            if self._scheduler is not None:
+                return await self._scheduler.submit(self.name, run)
+            return await run()
+
+        def can_hedge():
+            # A hedge must neither queue for budget nor probe a failing server
+            return (self._scheduler is None or self._scheduler.available_now()) and (
+                self._pool is None or self._pool.breaker.state == CircuitBreaker.CLOSED
+            )
+
+        async def bounded():
+            # Started once the scheduler dispatches the call, so waiting for
+            # rate budget does not count against the deadline
+            return await self._deadlines.run(
+                self.name,
+                call,
+                can_hedge,
+                hedge=lambda: scheduled(call),
+                on_expired=self._pool.record_timeout if self._pool else None,
+            )
+
+        async def fetch():
+            if (
+                self._pool is not None
+                and self._degradation is not None
+                and self._pool.breaker.state == CircuitBreaker.OPEN
+            ):
+                # Skip the scheduler: no point spending budget on a refusal
+                return self._degradation.fallback(self.name, args, "circuit open")
+            try:
+                result = await scheduled(bounded if self._deadlines else call)
+            except CircuitOpenError:
+                if self._degradation is None:
+                    raise
+                return self._degradation.fallback(self.name, args, "circuit open")
+            except DeadlineExceeded as e:
+                if self._degradation is None:
+                    raise
+                logger.warning("%s", e)
+                return self._degradation.fallback(
+                    self.name, args, f"no answer within {e.deadline:g}s"
+                )
+            except Exception as e:
+                if self._degradation is None:
+                    raise
+                logger.warning("%s call failed: %r", self.name, e)
+                return self._degradation.fallback(self.name, args, _failure_reason(e))
+            if _is_cacheable(result):
+                if self._cache is not None:
+                    self._cache.set(self.name, args, result.model_dump(mode="json"))
+                if self._on_result is not None:
+                    try:
+                        self._on_result(self.name, args, result)
+                    except Exception as e:
+                        logger.warning("Result hook failed for %s: %s", self.name, e)
+            return result
+
+        if self._single_flight is not None:
+            key = (self.name.upper(), normalize_tool_args(args))
+            result = await self._single_flight.do(key, fetch)
+        else:
+            result = await fetch()
+        self._note_fallback(result, args, tool_context)
+        return result
+
+    def _note_fallback(
+        self, result: Any, args: dict, tool_context: ToolContext | None
+    ) -> None:
+        """Note a stale or demo answer in session state for the report."""
+        source = fallback_source(result)
+        if tool_context is None or source is None:
+            return
+        meta = result.meta
+        note_degraded_data(
+            tool_context.state,
+            {
+                "tool": self.name,
+                "symbol": str((args or {}).get("symbol", "")).upper() or None,
+                "source": source,
+                "as_of": meta.get("stored_at"),
+                "reason": meta.get("reason"),
+            },
+        )
+
+
+class ManagedMCPToolset(BaseToolset):
+    """
+    Transparent caching and rate-limiting layer in front of an MCPToolset.
+
+    Lists the same tools as the wrapped toolset, but each tool consults a
+    persistent ToolResponseCache, collapses concurrent identical calls across
+    sessions through a shared SingleFlight, and goes through the
+    AlphaVantageScheduler before calling the MCP server. ``on_result`` is
+    called with (tool name, args, result) for every fresh successful response.
+    The tool list is fetched from the server once and reused; each tool opens
+    an MCP session again when it is called after the connection dropped.
+    With a ``schema_cache``, an MCPToolset's tool list is read from disk
+    when the cached list for ``server`` is still valid, so a cold start
+    declares its tools without an MCP round trip. ``pool``, ``degradation``
+    and ``deadlines`` are handed to every tool (see ManagedMCPTool).
+    """
+
+    def __init__(
+        self,
+        toolset: BaseToolset,
+        cache: ToolResponseCache | None = None,
+        scheduler: AlphaVantageScheduler | None = None,
+        single_flight: SingleFlight | None = None,
+        on_result: ResultHook | None = None,
+        schema_cache: ToolSchemaCache | None = None,
+        server: str = "",
+        pool: MCPConnectionPool | None = None,
+        degradation: DegradationPolicy | None = None,
+        deadlines: DeadlinePolicy | None = None,
+    ):
+        super().__init__(
+            tool_filter=toolset.tool_filter,
+            tool_name_prefix=toolset.tool_name_prefix,
+        )
+        self._toolset = toolset
+        self._cache = cache
+        self._scheduler = scheduler
+        self._single_flight = single_flight or SingleFlight()
+        self._on_result = on_result
+        self._schema_cache = schema_cache
+        self._server = server
+        self._pool = pool
+        self._degradation = degradation
+        self._deadlines = deadlines
+        self._tools: list[BaseTool] | None = None
+        self._tools_lock = asyncio.Lock()
+
+    @property
+    def cache(self) -> ToolResponseCache | None:
+        """The response cache shared by all wrapped tools."""
+        return self._cache
+
+    @property
+    def scheduler(self) -> AlphaVantageScheduler | None:
+        """The rate scheduler shared by all wrapped tools."""
+        return self._scheduler
+
+    @property
+    def single_flight(self) -> SingleFlight:
+        """The single-flight group shared by all wrapped tools."""
+        return self._single_flight
+
+    @property
+    def schema_cache(self) -> ToolSchemaCache | None:
+        """The on-disk tool list cache, if any."""
+        return self._schema_cache
+
+    @property
+    def pool(self) -> MCPConnectionPool | None:
+        """The MCP connection pool shared by all wrapped tools, if any."""
+        return self._pool
+
+    @property
+    def degradation(self) -> DegradationPolicy | None:
+        """The fallback policy shared by all wrapped tools, if any."""
+        return self._degradation
+
+    @property
+    def deadlines(self) -> DeadlinePolicy | None:
+        """The deadline and hedging policy shared by all wrapped tools, if any."""
+        return self._deadlines
+
+    def _load_cached_tools(self) -> list[BaseTool] | None:
+        """Rebuild the MCP tools from the schema cache without listing them."""
+        toolset = self._toolset
+        if self._schema_cache is None or not isinstance(toolset, McpToolset):
+            return None
+        schemas = self._schema_cache.load(self._server)
+        if schemas is None:
+            return None
+        tools = [
+            McpTool(
+                mcp_tool=schema,
+                mcp_session_manager=toolset._mcp_session_manager,
+                auth_scheme=toolset._auth_scheme,
+                auth_credential=toolset._auth_credential,
+            )
+            for schema in schemas
+        ]
+        return [tool for tool in tools if toolset._is_tool_selected(tool, None)]
+
+    def _save_tool_schemas(self, tools: list[BaseTool]) -> None:
+        if self._schema_cache is None or not tools:
+            return
+        if not all(isinstance(tool, McpTool) for tool in tools):
+            return
+        try:
+            self._schema_cache.save(self._server, [tool._mcp_tool for tool in tools])
+        except OSError as e:
+            logger.warning("Could not store the MCP tool list: %s", e)
+
+    async def get_tools(
+        self, readonly_context: ReadonlyContext | None = None
+    ) -> list[BaseTool]:
+        """Return the wrapped toolset's tools with caching applied."""
+        async with self._tools_lock:
+            if self._tools is None:
+                tools = self._load_cached_tools()
+                if tools is None:
+                    tools = await self._toolset.get_tools(readonly_context)
+                    self._save_tool_schemas(tools)
+                self._tools = [
+                    ManagedMCPTool(
+                        tool,
+                        cache=self._cache,
+                        scheduler=self._scheduler,
+                        single_flight=self._single_flight,
+                        on_result=self._on_result,
+                        pool=self._pool,
+                        degradation=self._degradation,
+                        deadlines=self._deadlines,
+                    )
+                    for tool in tools
+                ]
+        return list(self._tools)
+
+    async def close(self) -> None:
+        """Close the underlying MCP connection and forget the tool list."""
+        self._tools = None
+        await self._toolset.close()
+
+
 # Singleton instance
 _alpha_vantage_toolset_instance = None
 _toolset_lock = threading.Lock()
@@ -109,6 +782,17 @@ def get_alpha_vantage_mcp_toolset():
     - News sentiment (NEWS_SENTIMENT)
     - And many more...
 
+    Responses are served from a persistent on-disk cache with per-tool TTLs
+    (see ``response_cache.py``) unless ALPHA_VANTAGE_CACHE_DISABLED is set.
+    Cache misses go through an AlphaVantageScheduler that keeps calls within
+    the key's per-minute and per-day budget, and time series responses are
+    appended to the local OHLCV store. The tool list itself is cached on disk
+    for ALPHA_VANTAGE_TOOLS_CACHE_TTL seconds (see ``tool_schema_cache.py``).
+    MCP sessions come from a self-healing pool with a circuit breaker (see
+    ``mcp_pool.py``). Each call has a per-tool deadline and slow calls are
+    hedged (see ``deadlines.py``); calls that cannot reach the server or miss
+    their deadline get the last stored response or demo data, flagged as such.
+
     Returns:
         MCPToolset: Alpha Vantage MCP toolset
     """
@@ -130,18 +814,217 @@ def get_alpha_vantage_mcp_toolset():
             else:
                 # Create connection parameters for Alpha Vantage HTTP MCP server
                 connection_params = StreamableHTTPConnectionParams(
-                    url=f"https://mcp.alphavantage.co/mcp?apikey={api_key}"
+                    url=get_alpha_vantage_mcp_url(api_key)
+                )
+
+                # Connect to Alpha Vantage MCP server through a session pool
+                toolset = PooledMcpToolset(connection_params=connection_params)
+
+                cache = None
+                if not os.getenv("ALPHA_VANTAGE_CACHE_DISABLED"):
+                    cache = ToolResponseCache(
+                        keep_stale=float(
+                            os.getenv("ALPHA_VANTAGE_CACHE_KEEP_STALE", 7 * DAY)
+                        )
+                    )
+                demo_fallback = os.getenv("ALPHA_VANTAGE_DEMO_FALLBACK", "1")
+
+                schema_cache = None
+                schema_ttl = float(
+                    os.getenv("ALPHA_VANTAGE_TOOLS_CACHE_TTL", DEFAULT_SCHEMA_TTL)
                 )
+                if schema_ttl > 0:
+                    schema_cache = ToolSchemaCache(ttl=schema_ttl)
+
+                # Imported here: market_data builds on this module
+                from .market_data import record_time_series
 
-                # Connect to Alpha Vantage MCP server directly (no wrapper needed for web deployment)
-                _alpha_vantage_toolset_instance = MCPToolset(
-                    connection_params=connection_params
+                _alpha_vantage_toolset_instance = ManagedMCPToolset(
+                    toolset,
+                    cache=cache,
+                    scheduler=AlphaVantageScheduler.from_env(),
+                    on_result=record_time_series,
+                    schema_cache=schema_cache,
+                    server=get_alpha_vantage_mcp_base_url(),
+                    pool=toolset.pool,
+                    degradation=DegradationPolicy(
+                        cache, demo=demo_fallback.lower() not in ("0", "false")
+                    ),
+                    deadlines=DeadlinePolicy.from_env(),
                 )
 
         return _alpha_vantage_toolset_instance
 
 
+def get_alpha_vantage_cache_stats() -> dict:
+    """
+    Get hit/miss/eviction counters for the Alpha Vantage response cache.
+
+    Returns:
+        dict: Cache statistics, or an empty dict if caching is not active
+    """
+    toolset = _alpha_vantage_toolset_instance
+    if isinstance(toolset, ManagedMCPToolset) and toolset.cache is not None:
+        return toolset.cache.stats()
+    return {}
+
+
+def get_alpha_vantage_scheduler_stats() -> dict:
+    """
+    Get queueing and budget counters for the Alpha Vantage scheduler.
+
+    Returns:
+        dict: Scheduler statistics, or an empty dict if not active
+    """
+    toolset = _alpha_vantage_toolset_instance
+    if isinstance(toolset, ManagedMCPToolset) and toolset.scheduler is not None:
+        scheduler = toolset.scheduler
+        return {
+            **scheduler.stats,
+            "queue_depth": len(scheduler._waiters),
+            "minute_tokens": round(scheduler.minute_bucket.tokens, 2),
+            "day_tokens": round(scheduler.day_bucket.tokens, 2),
+        }
+    return {}
+
+
+def get_alpha_vantage_tool_schema_stats() -> dict:
+    """
+    Get hit/miss/change counters for the on-disk tool list cache.
+
+    Returns:
+        dict: Tool list cache statistics, or an empty dict if not active
+    """
+    toolset = _alpha_vantage_toolset_instance
+    if isinstance(toolset, ManagedMCPToolset) and toolset.schema_cache is not None:
+        return toolset.schema_cache.stats()
+    return {}
+
+
+def get_alpha_vantage_connection_stats() -> dict:
+    """
+    Get MCP connection pool, circuit breaker and fallback counters.
+
+    Returns:
+        dict: Connection statistics, or an empty dict if not active
+    """
+    toolset = _alpha_vantage_toolset_instance
+    if not isinstance(toolset, ManagedMCPToolset) or toolset.pool is None:
+        return {}
+    stats = toolset.pool.stats()
+    if toolset.degradation is not None:
+        stats.update(
+            {f"fallback_{k}": v for k, v in toolset.degradation.stats.items()}
+        )
+    return stats
+
+
+def get_alpha_vantage_deadline_stats() -> dict:
+    """
+    Get deadline, hedging and per-tool latency counters.
+
+    Returns:
+        dict: Deadline statistics, or an empty dict if not active
+    """
+    toolset = _alpha_vantage_toolset_instance
+    if not isinstance(toolset, ManagedMCPToolset) or toolset.deadlines is None:
+        return {}
+    stats = dict(toolset.deadlines.stats)
+    for tool, percentiles in toolset.deadlines.latency_percentiles().items():
+        for name, seconds in percentiles.items():
+            stats[f"{tool.lower()}_{name}_seconds"] = seconds
+    return stats
+
+
+def get_alpha_vantage_single_flight_stats() -> dict:
+    """
+    Get counters for concurrent identical calls collapsed into one request.
+
+    Returns:
+        dict: Single-flight statistics, or an empty dict if not active
+    """
+    toolset = _alpha_vantage_toolset_instance
+    if isinstance(toolset, ManagedMCPToolset):
+        return toolset.single_flight.stats()
+    return {}
+
+
+def get_tool_allowlist(agent_name: str) -> tuple[str, ...] | None:
+    """
+    Get the Alpha Vantage tools declared to an agent's model.
+
+    Args:
+        agent_name: Name of the agent using the tools
+
+    Returns:
+        tuple: Allowed tool names, or None to declare every tool
+    """
+    configured = os.getenv(f"ALPHA_VANTAGE_TOOLS_{agent_name.upper()}")
+    if configured is None:
+        return DEFAULT_TOOL_ALLOWLISTS.get(agent_name)
+    if configured.strip() == "*":
+        return None
+    return tuple(name.strip() for name in configured.split(",") if name.strip())
+
+
+class DeferredAlphaVantageToolset(BaseToolset):
+    """
+    Stand-in for the shared Alpha Vantage toolset that builds it on first use.
+
+    Agents list this at import time; the MCP toolset, its response cache and
+    scheduler are only created when the agent first asks for its tools.
+    With an ``allowlist`` only those tools (matched case-insensitively) are
+    returned; if none of them exist on the server all tools are returned.
+    """
+
+    def __init__(self, allowlist: tuple[str, ...] | None = None):
+        super().__init__()
+        self._allowlist = (
+            frozenset(name.upper() for name in allowlist) if allowlist else None
+        )
+
+    async def get_tools(
+        self, readonly_context: ReadonlyContext | None = None
+    ) -> list[BaseTool]:
+        """Return the shared toolset's tools, creating the toolset if needed."""
+        toolset = get_alpha_vantage_mcp_toolset()
+        if not isinstance(toolset, BaseToolset):
+            # No API key: LazyMCPToolset has already warned, offer no tools
+            return []
+        tools = await toolset.get_tools(readonly_context)
+        if self._allowlist is None:
+            return tools
+        allowed = [tool for tool in tools if tool.name.upper() in self._allowlist]
+        if not allowed and tools:
+            logger.warning(
+                "None of the allowed tools %s are offered by the MCP server; "
+                "declaring all %d tools",
+                sorted(self._allowlist),
+                len(tools),
+            )
+            return tools
+        return allowed
+
+    async def close(self) -> None:
+        """Close the shared toolset if it was ever created."""
+        if isinstance(_alpha_vantage_toolset_instance, BaseToolset):
+            await _alpha_vantage_toolset_instance.close()
+
+
 # Backward compatibility alias
 def get_all_alpha_vantage_tools():
-    """Get Alpha Vantage MCP toolset (backward compatible)"""
-    return get_alpha_vantage_mcp_toolset()
+    """Get Alpha Vantage MCP toolset (backward compatible), created on first use"""
+    return DeferredAlphaVantageToolset()
+
+
+def get_alpha_vantage_tools_for(agent_name: str) -> DeferredAlphaVantageToolset:
+    """
+    Get the Alpha Vantage toolset for one agent, limited to its allowlist.
+
+    Args:
+        agent_name: Name of the agent, used to look up its allowlist
+
+    Returns:
+        DeferredAlphaVantageToolset: Toolset declaring only the agent's tools
+    """
+    return DeferredAlphaVantageToolset(get_tool_allowlist(agent_name))
@@ -0,0 +1,217 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Per-tool deadlines and hedged retries for slow upstream calls
+
+``DeadlinePolicy.run`` bounds a call by its tool's deadline. Once enough
+latencies of a tool have been seen, a call still running at the tool's
+``hedge_percentile`` latency gets a second, identical attempt, and the first
+attempt to answer wins; the other is cancelled. Timed out calls count as
+taking the full deadline, so a tool that keeps timing out raises its own
+hedge threshold rather than hedging every call.
+"""
+
+import asyncio
+import bisect
+import os
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+DEFAULT_DEADLINE = 30.0
+# Seconds; quotes are on every report's critical path, news is optional
+DEFAULT_TOOL_DEADLINES = {
+    "GLOBAL_QUOTE": 15.0,
+    "COMPANY_OVERVIEW": 20.0,
+    "TIME_SERIES_DAILY": 30.0,
+    "NEWS_SENTIMENT": 20.0,
+}
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised when a call is not answered within its tool's deadline."""
+
+    def __init__(self, tool_name: str, deadline: float):
+        super().__init__(f"{tool_name} deadline of {deadline:g}s exceeded")
+        self.tool_name = tool_name
+        self.deadline = deadline
+
+
+class LatencyWindow:
+    """Sorted sliding window of the most recent latencies of one tool"""
+
+    def __init__(self, size: int = 200):
+        self._recent: deque = deque(maxlen=size)
+        self._sorted: list = []
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def add(self, seconds: float) -> None:
+        if len(self._recent) == self._recent.maxlen:
+            self._sorted.pop(bisect.bisect_left(self._sorted, self._recent[0]))
+        self._recent.append(seconds)
+        bisect.insort(self._sorted, seconds)
+
+    def percentile(self, percent: float) -> float:
+        index = min(len(self._sorted) - 1, int(len(self._sorted) * percent / 100))
+        return self._sorted[index]
+
+
+def parse_deadlines(value: str) -> dict:
+    """Parse "TOOL=seconds,TOOL=seconds" into {TOOL: seconds}."""
+    deadlines = {}
+    for item in value.split(","):
+        name, _, seconds = item.partition("=")
+        if name.strip() and seconds.strip():
+            deadlines[name.strip().upper()] = float(seconds)
+    return deadlines
+
+
+class DeadlinePolicy:
+    """
+    Deadlines and hedging for tool calls
+
+    Args:
+        deadlines: Tool name -> deadline in seconds
+        default_deadline: Deadline of tools not in ``deadlines`` (0: none)
+        hedge_percentile: Latency percentile after which a call is hedged
+            (0: never hedge)
+        min_samples: Latencies of a tool seen before its calls are hedged
+    """
+
+    def __init__(
+        self,
+        deadlines: dict | None = None,
+        default_deadline: float = DEFAULT_DEADLINE,
+        hedge_percentile: float = 95.0,
+        min_samples: int = 20,
+    ):
+        self.deadlines = {**DEFAULT_TOOL_DEADLINES, **(deadlines or {})}
+        self.default_deadline = default_deadline
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self._latencies: dict[str, LatencyWindow] = {}
+        self.stats = {"calls": 0, "deadline_exceeded": 0, "hedged": 0, "hedge_wins": 0}
+
+    @classmethod
+    def from_env(cls) -> "DeadlinePolicy":
+        """Create a policy from ALPHA_VANTAGE_TOOL_DEADLINE* and *_HEDGE_* variables."""
+        return cls(
+            deadlines=parse_deadlines(os.getenv("ALPHA_VANTAGE_TOOL_DEADLINES", "")),
+            default_deadline=float(
+                os.getenv("ALPHA_VANTAGE_TOOL_DEADLINE", DEFAULT_DEADLINE)
+            ),
+            hedge_percentile=float(os.getenv("ALPHA_VANTAGE_HEDGE_PERCENTILE", "95")),
+            min_samples=int(os.getenv("ALPHA_VANTAGE_HEDGE_MIN_SAMPLES", "20")),
+        )
+
+    def deadline_for(self, tool_name: str) -> float:
+        """Return the deadline in seconds of the given tool (0: none)."""
+        return self.deadlines.get(tool_name.upper(), self.default_deadline)
+
+    def hedge_delay(self, tool_name: str) -> float | None:
+        """Return when to hedge a call of the tool, or None not to hedge."""
+        window = self._latencies.get(tool_name.upper())
+        if self.hedge_percentile <= 0 or window is None:
+            return None
+        if len(window) < self.min_samples:
+            return None
+        return window.percentile(self.hedge_percentile)
+
+    def record(self, tool_name: str, seconds: float) -> None:
+        """Add one observed latency of the tool."""
+        self._latencies.setdefault(tool_name.upper(), LatencyWindow()).add(seconds)
+
+    def latency_percentiles(self) -> dict:
+        """Return the p50 and p95 latency of every tool seen."""
+        return {
+            name: {"p50": window.percentile(50), "p95": window.percentile(95)}
+            for name, window in self._latencies.items()
+        }
+
+    async def run(
+        self,
+        tool_name: str,
+        attempt: Callable[[], Awaitable[Any]],
+        can_hedge: Callable[[], bool] = lambda: True,
+        hedge: Callable[[], Awaitable[Any]] | None = None,
+        on_expired: Callable[[], None] | None = None,
+    ) -> Any:
+        """
+        Run ``attempt`` within the tool's deadline, hedging it once if slow
+
+        Args:
+            tool_name: Name of the tool being called
+            attempt: Zero-argument coroutine function making one attempt
+            can_hedge: Checked before hedging, e.g. whether budget is left
+            hedge: Makes the hedged attempt instead of ``attempt``, e.g.
+                through a rate scheduler
+            on_expired: Called when the deadline expires with attempts still
+                running, e.g. to count a circuit breaker failure
+
+        Returns:
+            The result of the first attempt to succeed
+
+        Raises:
+            DeadlineExceeded: If no attempt succeeded within the deadline
+        """
+        self.stats["calls"] += 1
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = self.deadline_for(tool_name)
+        hedge_delay = self.hedge_delay(tool_name)
+        if deadline > 0 and hedge_delay is not None and hedge_delay >= deadline:
+            hedge_delay = None
+        first = asyncio.ensure_future(attempt())
+        attempts = {first: started}
+        try:
+            while True:
+                waits = []
+                if deadline > 0:
+                    waits.append(started + deadline - loop.time())
+                if hedge_delay is not None:
+                    waits.append(started + hedge_delay - loop.time())
+                timeout = max(0.0, min(waits)) if waits else None
+                done, _ = await asyncio.wait(
+                    attempts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    attempt_started = attempts.pop(task)
+                    if task.exception() is not None and attempts:
+                        # The other attempt may still succeed
+                        continue
+                    if task.exception() is None:
+                        self.record(tool_name, loop.time() - attempt_started)
+                        if task is not first:
+                            self.stats["hedge_wins"] += 1
+                    return task.result()
+                elapsed = loop.time() - started
+                if deadline > 0 and elapsed >= deadline:
+                    self.stats["deadline_exceeded"] += 1
+                    self.record(tool_name, deadline)
+                    if on_expired is not None:
+                        on_expired()
+                    raise DeadlineExceeded(tool_name, deadline)
+                if hedge_delay is not None and elapsed >= hedge_delay:
+                    # At most one hedge per call
+                    hedge_delay = None
+                    if attempts and can_hedge():
+                        self.stats["hedged"] += 1
+                        retry = asyncio.ensure_future((hedge or attempt)())
+                        attempts[retry] = loop.time()
+        finally:
+            for task in attempts:
+                task.cancel()
@@ -0,0 +1,60 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Tracking of tool results served from stale or demo data
+
+When the market data API cannot answer, the Alpha Vantage toolset substitutes
+the last stored response or demo data and marks the result's ``_meta`` with
+its source. Each substitution is noted in session state under
+DEGRADED_DATA_KEY so the report can list it next to the key figures.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from google.adk.agents.callback_context import CallbackContext
+
+DEGRADED_DATA_KEY = "degraded_data_sources"
+
+STALE_SOURCE = "stale_cache"
+DEMO_SOURCE = "demo"
+
+
+def fallback_source(result: Any) -> str | None:
+    """Return "stale_cache" or "demo" for a substituted result, else None."""
+    source = (getattr(result, "meta", None) or {}).get("source")
+    return source if source in (STALE_SOURCE, DEMO_SOURCE) else None
+
+
+def note_degraded_data(state: Mapping, entry: dict) -> None:
+    """
+    Record that a tool answered with stale or demo data
+
+    Args:
+        state: Session state
+        entry: tool, symbol, source ("stale_cache" or "demo"), as_of and reason
+    """
+    subject = (entry["tool"], entry.get("symbol"))
+    entries = [
+        e for e in state.get(DEGRADED_DATA_KEY) or [] if (e["tool"], e.get("symbol")) != subject
+    ]
+    state[DEGRADED_DATA_KEY] = [*entries, entry]
+
+
+def reset_degraded_data(callback_context: CallbackContext) -> None:
+    """before_agent_callback: forget stale data noted by an earlier analysis."""
+    if callback_context.state.get(DEGRADED_DATA_KEY):
+        callback_context.state[DEGRADED_DATA_KEY] = []
+    return None
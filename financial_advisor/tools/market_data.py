@@ -0,0 +1,208 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""OHLCV price history fetched through the Alpha Vantage toolset"""
+
+import csv
+import io
+import json
+import os
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+from google.adk.tools.base_toolset import BaseToolset
+
+from ..analytics.ohlcv_store import get_ohlcv_store
+from .alpha_vantage_tools import get_alpha_vantage_mcp_toolset
+from .degraded_data import DEMO_SOURCE, fallback_source
+
+DAILY_SERIES_TOOL = "TIME_SERIES_DAILY"
+INTRADAY_SERIES_TOOL = "TIME_SERIES_INTRADAY"
+
+_OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def parse_time_series(payload: Any) -> dict:
+    """
+    Convert a TIME_SERIES_DAILY or TIME_SERIES_INTRADAY response into column arrays
+
+    Accepts the JSON shape ({"Time Series (Daily)": {date: {"1. open": ...}}})
+    as a dict or string, or the CSV shape (timestamp,open,high,low,close,volume).
+
+    Args:
+        payload: Response body from a TIME_SERIES_* tool
+
+    Returns:
+        dict: "dates" (datetime64[D] for daily bars, datetime64[s] for
+        intraday bars) plus open/high/low/close/volume float arrays, ordered
+        oldest bar first
+    """
+    if isinstance(payload, str) and not payload.lstrip().startswith("{"):
+        rows = list(csv.DictReader(io.StringIO(payload.strip())))
+        records = {row["timestamp"]: row for row in rows}
+    else:
+        data = json.loads(payload) if isinstance(payload, str) else payload
+        series_key = next((k for k in data if k.startswith("Time Series")), None)
+        if series_key is None:
+            message = data.get("Information") or data.get("Note") or data.get("Error Message")
+            raise ValueError(message or "Response has no time series")
+        records = {
+            day: {key.split(". ", 1)[-1]: value for key, value in bar.items()}
+            for day, bar in data[series_key].items()
+        }
+
+    days = sorted(records)
+    unit = "D" if days and len(days[0]) == 10 else "s"
+    columns = {"dates": np.array(days, dtype=f"datetime64[{unit}]")}
+    for field in _OHLCV_FIELDS:
+        columns[field] = np.array([records[day][field] for day in days], dtype=float)
+    return columns
+
+
+def _result_text(result: Any) -> str:
+    """
+    Concatenate the text content of an MCP tool result
+
+    Stale and demo results start with a note for the model; it is skipped so
+    only the response body is returned.
+    """
+    content = list(result.content)
+    if fallback_source(result) is not None:
+        content = content[1:]
+    return "".join(getattr(item, "text", "") or "" for item in content)
+
+
+def series_interval(tool_name: str, args: dict | None) -> str | None:
+    """Return the store interval for a time series call, or None if not stored."""
+    tool_name = tool_name.upper()
+    if tool_name == DAILY_SERIES_TOOL:
+        return "daily"
+    if tool_name == INTRADAY_SERIES_TOOL:
+        return str((args or {}).get("interval", "5min"))
+    return None
+
+
+def record_time_series(tool_name: str, args: dict | None, result: Any) -> None:
+    """
+    Persist the bars of a successful TIME_SERIES_DAILY/INTRADAY call
+
+    Registered as a result hook on the managed Alpha Vantage toolset, so bars
+    fetched by any agent are appended to the OHLCV store. Responses that are
+    not parseable time series are ignored.
+    """
+    interval = series_interval(tool_name, args)
+    symbol = (args or {}).get("symbol")
+    if interval is None or not symbol:
+        return
+    try:
+        bars = parse_time_series(_result_text(result))
+    except (ValueError, KeyError):
+        return
+    get_ohlcv_store().append(symbol, interval, bars)
+
+
+def last_completed_trading_day(today: date | None = None) -> date:
+    """Most recent weekday before ``today`` (market holidays are not modeled)."""
+    day = (today or date.today()) - timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def data_source_fields(bars: dict) -> dict:
+    """
+    Tool result fields flagging bars that did not come from the live API
+
+    Args:
+        bars: Columns returned by fetch_daily_ohlcv
+
+    Returns:
+        dict: {"data_source": {...}} for stale or demo bars, else empty
+    """
+    source = bars.get("data_source")
+    return {"data_source": source} if source else {}
+
+
+async def fetch_daily_ohlcv(
+    symbol: str,
+    tool_context: Any | None = None,
+    outputsize: str = "compact",
+) -> dict:
+    """
+    Get daily OHLCV bars for a ticker, fetching only when the store is stale
+
+    Bars are read from the local OHLCV store. If the newest stored bar is
+    older than the last completed trading day, one TIME_SERIES_DAILY call is
+    made through the managed Alpha Vantage toolset (so repeated and concurrent
+    requests are served from the response cache or collapsed into one
+    upstream request) and only the new bars are appended. With DEMO_MODE
+    enabled, deterministic demo bars are returned without any API call.
+
+    Args:
+        symbol: Stock ticker symbol (e.g., "AAPL")
+        tool_context: Tool context of the calling agent, if any
+        outputsize: "compact" (latest 100 bars) or "full"
+
+    Returns:
+        dict: Column arrays as returned by parse_time_series. When the API
+        was unavailable and stale or demo bars were used instead, a
+        "data_source" entry holds their source, as_of date and reason.
+    """
+    symbol = symbol.strip().upper()
+    args = {"symbol": symbol, "outputsize": outputsize}
+
+    if os.getenv("DEMO_MODE", "").lower() in ("1", "true"):
+        from .mcp_replay_server import demo_response
+
+        payload = demo_response(DAILY_SERIES_TOOL, args)
+        if payload is None:
+            raise ValueError(f"No demo price history for {symbol}")
+        return parse_time_series(payload)
+
+    store = get_ohlcv_store()
+    newest = store.last_timestamp(symbol, "daily")
+    if newest is not None and newest >= np.datetime64(last_completed_trading_day()):
+        return store.read(symbol, "daily")
+
+    toolset = get_alpha_vantage_mcp_toolset()
+    if not isinstance(toolset, BaseToolset):
+        raise RuntimeError("Alpha Vantage MCP tools are not configured")
+    tools = {tool.name: tool for tool in await toolset.get_tools()}
+    if DAILY_SERIES_TOOL not in tools:
+        raise RuntimeError(f"{DAILY_SERIES_TOOL} is not offered by the MCP server")
+
+    result = await tools[DAILY_SERIES_TOOL].run_async(
+        args=args, tool_context=tool_context
+    )
+    text = _result_text(result)
+    if result.isError:
+        raise RuntimeError(text or f"{DAILY_SERIES_TOOL} failed for {symbol}")
+    bars = parse_time_series(text)
+    source = fallback_source(result)
+    if source == DEMO_SOURCE:
+        # Sample bars must never end up in the store next to real prices
+        bars["data_source"] = {"source": source, "reason": result.meta.get("reason")}
+        return bars
+    # The toolset's result hook has usually stored these bars already;
+    # appending again is idempotent and covers toolsets without the hook.
+    store.append(symbol, "daily", bars)
+    bars = store.read(symbol, "daily")
+    if source is not None:
+        bars["data_source"] = {
+            "source": source,
+            "as_of": result.meta.get("stored_at"),
+            "reason": result.meta.get("reason"),
+        }
+    return bars
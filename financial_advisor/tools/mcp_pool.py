@@ -0,0 +1,465 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Pooled, self-healing MCP sessions with a circuit breaker
+
+``MCPConnectionPool`` replaces the session manager of an MCP toolset. It
+keeps up to ``size`` sessions per set of headers and hands them out in turn,
+pings idle sessions to keep them alive, and reconnects dropped sessions with
+exponential backoff. Callers wrap each request in ``lease()``, which bounds
+the number of concurrent requests and feeds the circuit breaker: after
+``failure_threshold`` failures in a row the circuit opens and requests are
+refused for ``reset_timeout`` seconds, then a single trial request decides
+whether it closes again.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import random
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import timedelta
+
+from google.adk.tools.mcp_tool.mcp_session_manager import (
+    MCPSessionManager,
+    StdioConnectionParams,
+)
+from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+
+logger = logging.getLogger(__name__)
+
+# JSON-RPC error code the MCP client uses when a request times out
+_REQUEST_TIMEOUT = 408
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised by ``lease()`` while the circuit breaker refuses requests."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"MCP circuit open, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker
+
+    Args:
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds the circuit stays open before a trial request
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opens = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        """The current state, moving from open to half-open once due."""
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a trial request through."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return True if a request may go to the server now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("MCP circuit closed")
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    def release_trial(self) -> None:
+        """Let another trial through after one ended without an outcome."""
+        self._trial = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state == self.CLOSED:
+                logger.warning(
+                    "MCP circuit opened after %d consecutive failures", self.failures
+                )
+            self.opens += 1
+            self._opened_at = time.monotonic()
+        self._trial = False
+
+
+class _SessionHandle:
+    """The task holding one pooled session open, and how to ask it to stop."""
+
+    def __init__(self, owner: asyncio.Task, closing: asyncio.Event):
+        self.owner = owner
+        self.closing = closing
+
+    @property
+    def open(self) -> bool:
+        return not self.owner.done()
+
+    async def close(self, timeout: float = 5.0) -> None:
+        self.closing.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self.owner), timeout)
+        except asyncio.TimeoutError:
+            self.owner.cancel()
+        except Exception as e:
+            logger.debug("Error closing MCP session: %s", e)
+
+
+class MCPConnectionPool(MCPSessionManager):
+    """
+    Session manager keeping a small pool of healthy MCP sessions
+
+    Args:
+        connection_params: Parameters for the MCP connection
+        size: Sessions kept per set of headers
+        max_concurrent: Requests allowed in flight at once through ``lease()``
+        keepalive_interval: Seconds between pings of open sessions (0: never)
+        connect_attempts: Connection attempts before ``create_session`` fails
+        backoff_base: Delay before the first reconnection attempt, doubled
+            after each further failure
+        backoff_max: Upper bound of the reconnection delay
+        breaker: Circuit breaker fed by ``lease()``
+    """
+
+    def __init__(
+        self,
+        connection_params,
+        size: int = 2,
+        max_concurrent: int = 4,
+        keepalive_interval: float = 30.0,
+        connect_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        breaker: CircuitBreaker | None = None,
+    ):
+        super().__init__(connection_params)
+        self.size = max(1, size)
+        self.max_concurrent = max(1, max_concurrent)
+        self.keepalive_interval = keepalive_interval
+        self.connect_attempts = max(1, connect_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        # session key -> (session, _SessionHandle, generation) or None per slot
+        self._slots: dict[str, list] = {}
+        self._cursor = itertools.count()
+        self._generation = 0
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._keepalive_task: asyncio.Task | None = None
+        self.in_flight = 0
+        self.waiting = 0
+        self._counts = {
+            "connects": 0,
+            "reconnects": 0,
+            "connect_failures": 0,
+            "keepalive_pings": 0,
+            "keepalive_failures": 0,
+            "requests": 0,
+            "request_failures": 0,
+            "rejected": 0,
+        }
+
+    @classmethod
+    def from_env(cls, connection_params) -> "MCPConnectionPool":
+        """Create a pool configured by ALPHA_VANTAGE_MCP_* environment variables."""
+        return cls(
+            connection_params,
+            size=int(os.getenv("ALPHA_VANTAGE_MCP_POOL_SIZE", "2")),
+            max_concurrent=int(os.getenv("ALPHA_VANTAGE_MCP_MAX_CONCURRENT", "4")),
+            keepalive_interval=float(os.getenv("ALPHA_VANTAGE_MCP_KEEPALIVE", "30")),
+            connect_attempts=int(os.getenv("ALPHA_VANTAGE_MCP_CONNECT_ATTEMPTS", "3")),
+            breaker=CircuitBreaker(
+                failure_threshold=int(
+                    os.getenv("ALPHA_VANTAGE_MCP_BREAKER_FAILURES", "5")
+                ),
+                reset_timeout=float(
+                    os.getenv("ALPHA_VANTAGE_MCP_BREAKER_RESET", "30")
+                ),
+            ),
+        )
+
+    async def _own_session(
+        self,
+        merged_headers: dict | None,
+        ready: asyncio.Future,
+        closing: asyncio.Event,
+    ) -> None:
+        """
+        Open one session and hold it until ``closing`` is set
+
+        The transport's task group lives in this task, so a dropped
+        connection ends this task instead of cancelling whichever caller
+        happened to open the session, and closing happens in the task that
+        opened it, as anyio requires.
+        """
+        try:
+            async with AsyncExitStack() as exit_stack:
+                transports = await exit_stack.enter_async_context(
+                    self._create_client(merged_headers)
+                )
+                if isinstance(self._connection_params, StdioConnectionParams):
+                    session = ClientSession(
+                        *transports[:2],
+                        read_timeout_seconds=timedelta(
+                            seconds=self._connection_params.timeout
+                        ),
+                    )
+                else:
+                    session = ClientSession(*transports[:2])
+                session = await exit_stack.enter_async_context(session)
+                await session.initialize()
+                ready.set_result(session)
+                await closing.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(
+                    ConnectionError("MCP connection cancelled")
+                    if isinstance(e, asyncio.CancelledError)
+                    else e
+                )
+            else:
+                logger.info("MCP session ended: %r", e)
+            if not isinstance(e, Exception):
+                raise
+
+    async def _connect(self, merged_headers: dict | None) -> tuple:
+        """Open and initialize one session in its own task."""
+        ready = asyncio.get_running_loop().create_future()
+        closing = asyncio.Event()
+        owner = asyncio.create_task(self._own_session(merged_headers, ready, closing))
+        try:
+            session = await ready
+        except BaseException:
+            owner.cancel()
+            raise
+        return session, _SessionHandle(owner, closing)
+
+    async def _connect_with_backoff(self, merged_headers: dict | None) -> tuple:
+        """Connect, retrying with exponential backoff and jitter."""
+        for attempt in range(self.connect_attempts):
+            try:
+                return await self._connect(merged_headers)
+            except Exception as e:
+                self._counts["connect_failures"] += 1
+                if attempt == self.connect_attempts - 1:
+                    raise
+                delay = min(self.backoff_max, self.backoff_base * 2**attempt)
+                delay *= random.uniform(0.5, 1.0)
+                logger.warning(
+                    "MCP connection failed (%s), retrying in %.1fs", e, delay
+                )
+                await asyncio.sleep(delay)
+
+    def _is_usable(self, slot: tuple | None) -> bool:
+        if slot is None:
+            return False
+        session, handle, generation = slot
+        return (
+            generation == self._generation
+            and handle.open
+            and not self._is_session_disconnected(session)
+        )
+
+    async def create_session(self, headers: dict | None = None) -> ClientSession:
+        """
+        Return a healthy pooled session, reconnecting it if needed
+
+        Args:
+            headers: Optional headers, merged with the connection headers
+
+        Returns:
+            ClientSession: An initialized session
+        """
+        self._ensure_keepalive()
+        merged_headers = self._merge_headers(headers)
+        key = self._generate_session_key(merged_headers)
+        async with self._session_lock:
+            slots = self._slots.setdefault(key, [None] * self.size)
+            index = next(self._cursor) % self.size
+            slot = slots[index]
+            if self._is_usable(slot):
+                return slot[0]
+            if slot is not None:
+                slots[index] = None
+                self._counts["reconnects"] += 1
+                await slot[1].close()
+            session, handle = await self._connect_with_backoff(merged_headers)
+            self._counts["connects"] += 1
+            slots[index] = (session, handle, self._generation)
+            return session
+
+    def invalidate(self) -> None:
+        """Mark every open session for reconnection on its next use."""
+        self._generation += 1
+
+    @asynccontextmanager
+    async def lease(self):
+        """
+        Hold one of the ``max_concurrent`` request slots around a request
+
+        Raises:
+            CircuitOpenError: If the circuit breaker refuses requests
+        """
+        if not self.breaker.allow():
+            self._counts["rejected"] += 1
+            raise CircuitOpenError(self.breaker.retry_after())
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self._counts["requests"] += 1
+        try:
+            yield
+        except McpError as e:
+            # The server answered; only a timed out request is a failure
+            if e.error.code == _REQUEST_TIMEOUT:
+                self._record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        except asyncio.CancelledError:
+            self.breaker.release_trial()
+            raise
+        except Exception:
+            self._record_failure()
+            raise
+        else:
+            self.breaker.record_success()
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def record_timeout(self) -> None:
+        """
+        Count a request that was cancelled at its deadline as a failure
+
+        Cancelled requests are otherwise neutral, so that cancelling the
+        losing attempt of a hedged call does not trip the breaker.
+        """
+        self._record_failure()
+
+    def _record_failure(self) -> None:
+        self._counts["request_failures"] += 1
+        self.breaker.record_failure()
+        # The session that failed is not known, so reconnect them all
+        self.invalidate()
+
+    def _ensure_keepalive(self) -> None:
+        if self.keepalive_interval <= 0:
+            return
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+
+    async def _keepalive(self) -> None:
+        """Ping open sessions so idle ones are not dropped by the server."""
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            for slots in list(self._slots.values()):
+                for slot in list(slots):
+                    if not self._is_usable(slot):
+                        continue
+                    self._counts["keepalive_pings"] += 1
+                    try:
+                        await asyncio.wait_for(
+                            slot[0].send_ping(), self.keepalive_interval
+                        )
+                    except Exception as e:
+                        self._counts["keepalive_failures"] += 1
+                        logger.info("MCP keep-alive ping failed: %s", e)
+                        if slot in slots:
+                            slots[slots.index(slot)] = None
+                            await slot[1].close()
+
+    async def close(self) -> None:
+        """Stop the keep-alive task and close every pooled session."""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        async with self._session_lock:
+            for slots in self._slots.values():
+                for slot in slots:
+                    if slot is not None:
+                        await slot[1].close()
+            self._slots.clear()
+
+    def stats(self) -> dict:
+        """Return connection, request and circuit breaker counters."""
+        state = self.breaker.state
+        return {
+            **self._counts,
+            "sessions": sum(
+                self._is_usable(slot)
+                for slots in self._slots.values()
+                for slot in slots
+            ),
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "circuit_open": int(state == CircuitBreaker.OPEN),
+            "circuit_half_open": int(state == CircuitBreaker.HALF_OPEN),
+            "circuit_opens": self.breaker.opens,
+            "consecutive_failures": self.breaker.failures,
+        }
+
+
+class PooledMcpToolset(McpToolset):
+    """
+    MCP toolset whose tools share an MCPConnectionPool
+
+    Args:
+        connection_params: Parameters for the MCP connection
+        pool: Pool to use, by default one configured from the environment
+    """
+
+    def __init__(self, *, connection_params, pool: MCPConnectionPool | None = None):
+        super().__init__(connection_params=connection_params)
+        self._mcp_session_manager = pool or MCPConnectionPool.from_env(
+            connection_params
+        )
+
+    @property
+    def pool(self) -> MCPConnectionPool:
+        """The connection pool shared by this toolset's tools."""
+        return self._mcp_session_manager
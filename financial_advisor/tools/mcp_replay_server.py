@@ -0,0 +1,423 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Offline stand-in for the Alpha Vantage MCP server
+
+Serves the Alpha Vantage tool surface over streamable HTTP from recorded
+fixtures, falling back to responses synthesized from ``demo_data.py`` for the
+demo tickers. In record mode every call is proxied to the real server and the
+response (and the upstream tool list) is written to the fixtures directory.
+
+Usage:
+    # Replay recorded fixtures / demo data on http://127.0.0.1:8765/mcp
+    python -m financial_advisor.tools.mcp_replay_server
+
+    # Proxy to Alpha Vantage and record responses (needs ALPHA_VANTAGE_API_KEY)
+    python -m financial_advisor.tools.mcp_replay_server --record
+
+    # Point the agents at the stand-in
+    export ALPHA_VANTAGE_MCP_URL=http://127.0.0.1:8765/mcp
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+from mcp import types
+from mcp.server.lowlevel import Server
+
+from .alpha_vantage_tools import DEFAULT_ALPHA_VANTAGE_MCP_URL
+from .demo_data import DEMO_MARKET_DATA
+from .response_cache import normalize_tool_args
+
+DEFAULT_FIXTURES_DIR = Path(__file__).parent / "fixtures" / "alpha_vantage"
+
+_SYMBOL_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "symbol": {"type": "string", "description": "Ticker symbol, e.g. IBM"},
+        "datatype": {"type": "string", "enum": ["json", "csv"]},
+    },
+    "required": ["symbol"],
+}
+
+# Tool declarations used when no recorded tools.json is available
+DEFAULT_TOOLS = [
+    types.Tool(
+        name="GLOBAL_QUOTE",
+        description="Latest price and volume information for a ticker.",
+        inputSchema=_SYMBOL_SCHEMA,
+    ),
+    types.Tool(
+        name="COMPANY_OVERVIEW",
+        description="Company information, financial ratios and key metrics.",
+        inputSchema=_SYMBOL_SCHEMA,
+    ),
+    types.Tool(
+        name="TIME_SERIES_DAILY",
+        description="Daily OHLCV time series for a ticker.",
+        inputSchema={
+            **_SYMBOL_SCHEMA,
+            "properties": {
+                **_SYMBOL_SCHEMA["properties"],
+                "outputsize": {"type": "string", "enum": ["compact", "full"]},
+            },
+        },
+    ),
+    types.Tool(
+        name="NEWS_SENTIMENT",
+        description="Market news and sentiment for tickers or topics.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "tickers": {"type": "string", "description": "Comma-separated tickers"},
+                "topics": {"type": "string"},
+                "time_from": {"type": "string", "description": "YYYYMMDDTHHMM"},
+                "sort": {"type": "string", "enum": ["LATEST", "EARLIEST", "RELEVANCE"]},
+                "limit": {"type": "integer"},
+            },
+        },
+    ),
+]
+
+
+class FixtureStore:
+    """Recorded tool list and tool responses on disk."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _response_path(self, tool_name: str, args: dict | None) -> Path:
+        digest = hashlib.sha1(normalize_tool_args(args).encode()).hexdigest()[:16]
+        return self.root / "responses" / tool_name.upper() / f"{digest}.json"
+
+    def load_tools(self) -> list | None:
+        """Return the recorded tool list, or None if none was recorded."""
+        path = self.root / "tools.json"
+        if not path.exists():
+            return None
+        return [types.Tool.model_validate(t) for t in json.loads(path.read_text())]
+
+    def save_tools(self, tools: list) -> None:
+        """Record the upstream tool list."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        payload = [t.model_dump(mode="json", exclude_none=True) for t in tools]
+        (self.root / "tools.json").write_text(json.dumps(payload, indent=2))
+
+    def load_response(
+        self, tool_name: str, args: dict | None
+    ) -> types.CallToolResult | None:
+        """Return the recorded response for a call, if any."""
+        path = self._response_path(tool_name, args)
+        if not path.exists():
+            return None
+        return types.CallToolResult.model_validate(
+            json.loads(path.read_text())["result"]
+        )
+
+    def save_response(
+        self, tool_name: str, args: dict | None, result: types.CallToolResult
+    ) -> None:
+        """Record the response for a call."""
+        path = self._response_path(tool_name, args)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {
+                    "tool": tool_name,
+                    "args": args,
+                    "result": result.model_dump(mode="json", exclude_none=True),
+                },
+                indent=2,
+            )
+        )
+
+
+def _demo_daily_series(data: dict, days: int = 100) -> dict:
+    """Deterministic random-walk daily bars ending at the demo price."""
+    rng = random.Random(data["symbol"])
+    closes = [data["current_price"]]
+    for _ in range(days - 1):
+        closes.append(closes[-1] / (1 + rng.gauss(0.0005, 0.015)))
+
+    # Newest bar first, matching Alpha Vantage's ordering
+    series = {}
+    day = date(2025, 1, 20)
+    for close in closes:
+        while day.weekday() >= 5:
+            day -= timedelta(days=1)
+        open_ = close * (1 + rng.gauss(0, 0.005))
+        series[day.isoformat()] = {
+            "1. open": f"{open_:.4f}",
+            "2. high": f"{max(open_, close) * (1 + abs(rng.gauss(0, 0.006))):.4f}",
+            "3. low": f"{min(open_, close) * (1 - abs(rng.gauss(0, 0.006))):.4f}",
+            "4. close": f"{close:.4f}",
+            "5. volume": str(int(data["volume"] * (0.7 + 0.6 * rng.random()))),
+        }
+        day -= timedelta(days=1)
+    return series
+
+
+def _sentiment_label(score: float) -> str:
+    if score <= -0.35:
+        return "Bearish"
+    if score < -0.15:
+        return "Somewhat-Bearish"
+    if score < 0.15:
+        return "Neutral"
+    if score < 0.35:
+        return "Somewhat-Bullish"
+    return "Bullish"
+
+
+def _demo_news_feed(data: dict) -> dict:
+    """Three headlines whose sentiment follows the demo price change."""
+    symbol = data["symbol"]
+    direction = "gain" if data["change"] >= 0 else "slip"
+    momentum = data["change_percent"] / 5
+    change = f"{abs(data['change_percent']):.2f}%"
+    week_range = f"{data['week_52_low']:.2f}-{data['week_52_high']:.2f}"
+    multiple = f"{data['pe_ratio']:.1f}x"
+    headlines = [
+        (f"{symbol} shares {direction} {change} in active trading", momentum),
+        (f"What analysts watch as {symbol} trades at {multiple} earnings", 0.05),
+        (f"{data['sector']} stocks: {symbol} within its 52-week range {week_range}", 0.1),
+    ]
+    feed = []
+    for hour, (title, score) in enumerate(headlines):
+        score = max(-1.0, min(1.0, round(score, 4)))
+        feed.append(
+            {
+                "title": title,
+                "url": f"https://example.com/demo/{symbol.lower()}/{hour}",
+                "time_published": f"20250120T{14 - hour:02d}0000",
+                "authors": [],
+                "summary": data["description"],
+                "source": "Demo Newswire",
+                "overall_sentiment_score": score,
+                "overall_sentiment_label": _sentiment_label(score),
+                "ticker_sentiment": [
+                    {
+                        "ticker": symbol,
+                        "relevance_score": "0.900000",
+                        "ticker_sentiment_score": f"{score:.6f}",
+                        "ticker_sentiment_label": _sentiment_label(score),
+                    }
+                ],
+            }
+        )
+    return {
+        "items": str(len(feed)),
+        "sentiment_score_definition": (
+            "x <= -0.35: Bearish; -0.35 < x <= -0.15: Somewhat-Bearish; "
+            "-0.15 < x < 0.15: Neutral; 0.15 <= x < 0.35: Somewhat-Bullish; "
+            "x >= 0.35: Bullish"
+        ),
+        "relevance_score_definition": "0 < x <= 1, higher is more relevant",
+        "feed": feed,
+    }
+
+
+def demo_response(tool_name: str, args: dict | None) -> dict | None:
+    """
+    Synthesize an Alpha Vantage-shaped response from demo data
+
+    Args:
+        tool_name: Name of the tool being called
+        args: Tool arguments (``symbol``, or the first of ``tickers`` for
+            NEWS_SENTIMENT)
+
+    Returns:
+        dict: Response payload, or None if the tool/ticker is not covered
+    """
+    args = args or {}
+    symbol = str(args.get("symbol") or args.get("tickers") or "").split(",")[0]
+    symbol = symbol.strip().upper()
+    data = DEMO_MARKET_DATA.get(symbol)
+    if data is None:
+        return None
+
+    tool_name = tool_name.upper()
+    if tool_name == "GLOBAL_QUOTE":
+        return {
+            "Global Quote": {
+                "01. symbol": symbol,
+                "02. open": f"{data['previous_close']:.4f}",
+                "03. high": f"{max(data['current_price'], data['previous_close']):.4f}",
+                "04. low": f"{min(data['current_price'], data['previous_close']):.4f}",
+                "05. price": f"{data['current_price']:.4f}",
+                "06. volume": str(data["volume"]),
+                "07. latest trading day": "2025-01-20",
+                "08. previous close": f"{data['previous_close']:.4f}",
+                "09. change": f"{data['change']:.4f}",
+                "10. change percent": f"{data['change_percent']:.4f}%",
+            }
+        }
+    if tool_name == "COMPANY_OVERVIEW":
+        return {
+            "Symbol": symbol,
+            "Description": data["description"],
+            "Sector": data["sector"],
+            "Industry": data["industry"],
+            "MarketCapitalization": str(data["market_cap"]),
+            "PERatio": str(data["pe_ratio"]),
+            "EPS": str(data["eps"]),
+            "DividendYield": str(data["dividend_yield"] / 100),
+            "52WeekHigh": str(data["week_52_high"]),
+            "52WeekLow": str(data["week_52_low"]),
+        }
+    if tool_name == "TIME_SERIES_DAILY":
+        return {
+            "Meta Data": {
+                "1. Information": "Daily Prices (open, high, low, close) and Volumes",
+                "2. Symbol": symbol,
+                "3. Last Refreshed": "2025-01-20",
+            },
+            "Time Series (Daily)": _demo_daily_series(data),
+        }
+    if tool_name == "NEWS_SENTIMENT":
+        return _demo_news_feed(data)
+    return None
+
+
+def create_server(
+    fixtures_dir: Path = DEFAULT_FIXTURES_DIR,
+    record: bool = False,
+    upstream_url: str | None = None,
+    latency_ms: float = 0,
+) -> Server:
+    """
+    Build the stand-in MCP server
+
+    Args:
+        fixtures_dir: Directory holding tools.json and recorded responses
+        record: Proxy calls to ``upstream_url`` and record the responses
+        upstream_url: Real MCP endpoint (including the apikey) for record mode
+        latency_ms: Artificial delay added to every replayed call
+
+    Returns:
+        Server: Low-level MCP server exposing the Alpha Vantage tools
+    """
+    store = FixtureStore(fixtures_dir)
+    server = Server("alpha-vantage-replay")
+
+    @contextlib.asynccontextmanager
+    async def upstream_session():
+        from mcp import ClientSession
+        from mcp.client.streamable_http import streamablehttp_client
+
+        async with streamablehttp_client(upstream_url) as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                yield session
+
+    @server.list_tools()
+    async def list_tools() -> list[types.Tool]:
+        if record:
+            async with upstream_session() as session:
+                tools = (await session.list_tools()).tools
+            store.save_tools(tools)
+            return tools
+        return store.load_tools() or DEFAULT_TOOLS
+
+    @server.call_tool()
+    async def call_tool(name: str, arguments: dict) -> list:
+        if record:
+            async with upstream_session() as session:
+                result = await session.call_tool(name, arguments=arguments)
+            if not result.isError:
+                store.save_response(name, arguments, result)
+            return result.content
+
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+        result = store.load_response(name, arguments)
+        if result is not None:
+            return result.content
+
+        payload = demo_response(name, arguments)
+        if payload is not None:
+            return [types.TextContent(type="text", text=json.dumps(payload))]
+
+        raise ValueError(
+            f"No recorded response for {name} {normalize_tool_args(arguments)}. "
+            "Run the stand-in with --record to capture it."
+        )
+
+    return server
+
+
+def create_app(server: Server, path: str = "/mcp"):
+    """Wrap the MCP server in a Starlette app using streamable HTTP."""
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.routing import Mount
+
+    session_manager = StreamableHTTPSessionManager(app=server, stateless=True)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        async with session_manager.run():
+            yield
+
+    return Starlette(
+        routes=[Mount(path, app=session_manager.handle_request)],
+        lifespan=lifespan,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--fixtures",
+        type=Path,
+        default=Path(os.getenv("ALPHA_VANTAGE_FIXTURES_DIR", DEFAULT_FIXTURES_DIR)),
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="Proxy calls to the real Alpha Vantage MCP server and record them",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0,
+        help="Artificial delay per replayed call, for reproducible benchmarks",
+    )
+    args = parser.parse_args()
+
+    upstream_url = None
+    if args.record:
+        api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
+        if not api_key:
+            parser.error("--record requires ALPHA_VANTAGE_API_KEY")
+        upstream_url = f"{DEFAULT_ALPHA_VANTAGE_MCP_URL}?apikey={api_key}"
+
+    import uvicorn
+
+    server = create_server(args.fixtures, args.record, upstream_url, args.latency_ms)
+    uvicorn.run(create_app(server), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
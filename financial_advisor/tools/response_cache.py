@@ -0,0 +1,285 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent, TTL-aware cache for Alpha Vantage tool responses"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+# Time-to-live per Alpha Vantage tool, in seconds. Quotes go stale quickly,
+# company fundamentals change at most daily, and financial statements only
+# change when a new quarter is reported.
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+QUARTER = 91 * DAY
+
+DEFAULT_TOOL_TTLS = {
+    "GLOBAL_QUOTE": 60,
+    "REALTIME_BULK_QUOTES": 60,
+    "TIME_SERIES_INTRADAY": 5 * MINUTE,
+    "NEWS_SENTIMENT": 30 * MINUTE,
+    "TOP_GAINERS_LOSERS": 30 * MINUTE,
+    "MARKET_STATUS": 5 * MINUTE,
+    "TIME_SERIES_DAILY": 6 * HOUR,
+    "TIME_SERIES_DAILY_ADJUSTED": 6 * HOUR,
+    "TIME_SERIES_WEEKLY": DAY,
+    "TIME_SERIES_MONTHLY": DAY,
+    "COMPANY_OVERVIEW": DAY,
+    "EARNINGS": QUARTER,
+    "INCOME_STATEMENT": QUARTER,
+    "BALANCE_SHEET": QUARTER,
+    "CASH_FLOW": QUARTER,
+}
+
+# Fallback TTL for tools not listed above (technical indicators, etc.)
+DEFAULT_TTL = 15 * MINUTE
+
+# Argument names whose values are ticker symbols and should be case-folded
+_SYMBOL_ARGS = {"symbol", "symbols", "tickers", "from_symbol", "to_symbol"}
+
+
+def normalize_tool_args(args: dict | None) -> str:
+    """
+    Build a stable cache key fragment from tool arguments
+
+    Drops empty values, strips whitespace, upper-cases ticker symbols and
+    sorts keys so that semantically identical calls share one cache entry.
+
+    Args:
+        args: The arguments the model passed to the tool
+
+    Returns:
+        str: Canonical JSON encoding of the arguments
+    """
+    normalized = {}
+    for key, value in (args or {}).items():
+        if value is None or value == "":
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+            if key.lower() in _SYMBOL_ARGS:
+                value = value.upper()
+        normalized[key.lower()] = value
+    return json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def get_default_cache_path() -> Path:
+    """Return the on-disk location of the response cache database"""
+    configured = os.getenv("ALPHA_VANTAGE_CACHE_PATH")
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".cache" / "financial_advisor" / "alpha_vantage_cache.sqlite3"
+
+
+class ToolResponseCache:
+    """
+    SQLite-backed cache of tool responses keyed by (tool name, arguments).
+
+    Entries expire according to a per-tool TTL. The cache is bounded by
+    ``max_entries``; when full, the least recently used entries are evicted.
+    Hit, miss and eviction counters are kept for the lifetime of the process.
+    With ``keep_stale`` expired entries are kept that many more seconds, so
+    ``get_stale`` can still serve them when the upstream is unavailable.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        ttls: dict | None = None,
+        default_ttl: float = DEFAULT_TTL,
+        max_entries: int = 10_000,
+        keep_stale: float = 0,
+    ):
+        self.path = Path(path) if path else get_default_cache_path()
+        self.ttls = {**DEFAULT_TOOL_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.keep_stale = keep_stale
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the schema on first use."""
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                tool TEXT NOT NULL,
+                args TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (tool, args)
+            )
+            """
+        )
+        conn.commit()
+        return conn
+
+    def ttl_for(self, tool_name: str) -> float:
+        """Return the TTL in seconds for the given tool."""
+        return self.ttls.get(tool_name.upper(), self.default_ttl)
+
+    def get(self, tool_name: str, args: dict | None) -> Any | None:
+        """
+        Look up a fresh cached response
+
+        Args:
+            tool_name: Name of the tool (e.g. "GLOBAL_QUOTE")
+            args: Tool arguments
+
+        Returns:
+            The cached JSON payload, or None on a miss or expired entry
+        """
+        key = (tool_name.upper(), normalize_tool_args(args))
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM responses WHERE tool = ? AND args = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            payload, expires_at = row
+            if expires_at <= now < expires_at + self.keep_stale:
+                self.misses += 1
+                return None
+            if expires_at <= now:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE tool = ? AND args = ?", key
+                )
+                self._conn.commit()
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE tool = ? AND args = ?",
+                (now, *key),
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(payload)
+
+    def get_stale(
+        self, tool_name: str, args: dict | None
+    ) -> tuple[Any, float] | None:
+        """
+        Look up the last stored response, fresh or expired
+
+        Args:
+            tool_name: Name of the tool (e.g. "GLOBAL_QUOTE")
+            args: Tool arguments
+
+        Returns:
+            tuple: (cached JSON payload, time it was stored), or None
+        """
+        key = (tool_name.upper(), normalize_tool_args(args))
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, stored_at, expires_at FROM responses "
+                "WHERE tool = ? AND args = ?",
+                key,
+            ).fetchone()
+        if row is None or time.time() >= row[2] + self.keep_stale:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, tool_name: str, args: dict | None, payload: Any) -> None:
+        """
+        Store a JSON-serializable response
+
+        Args:
+            tool_name: Name of the tool (e.g. "GLOBAL_QUOTE")
+            args: Tool arguments
+            payload: JSON-serializable response to cache
+        """
+        ttl = self.ttl_for(tool_name)
+        if ttl <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    tool_name.upper(),
+                    normalize_tool_args(args),
+                    json.dumps(payload, default=str),
+                    now,
+                    now + ttl,
+                    now,
+                ),
+            )
+            self._evict_overflow()
+            self._conn.commit()
+
+    def _evict_overflow(self) -> None:
+        """Drop least recently used rows beyond ``max_entries``. Lock held."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                """
+                DELETE FROM responses WHERE rowid IN (
+                    SELECT rowid FROM responses ORDER BY accessed_at ASC LIMIT ?
+                )
+                """,
+                (overflow,),
+            )
+            self.evictions += overflow
+
+    def purge_expired(self) -> int:
+        """Delete entries past their stale window; return how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE expires_at <= ?",
+                (time.time() - self.keep_stale,),
+            )
+            self._conn.commit()
+            self.evictions += cursor.rowcount
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """Remove every entry (counters are left untouched)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and the current entry count."""
+        with self._lock:
+            (entries,) = self._conn.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -12,24 +12,79 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Risk Analyst tools - Volatility and risk metrics from Alpha Vantage MCP"""
+"""Risk Analyst tools - Volatility and risk metrics computed locally from daily prices"""
 
-from .alpha_vantage_tools import get_alpha_vantage_mcp_toolset
+from google.adk.tools import FunctionTool
+from google.adk.tools.tool_context import ToolContext
+
+from ..analytics import indicators
+from .market_data import data_source_fields, fetch_daily_ohlcv
+
+
+async def compute_risk_metrics(ticker: str, tool_context: ToolContext) -> dict:
+    """
+    Compute volatility and risk metrics for a ticker from its daily price history.
+
+    Fetches the daily OHLCV series ONCE and computes every metric locally:
+    - ATR(14) and ATR as a percent of price - Volatility measurement, stop sizing
+    - BBANDS(20, 2) band width - Volatility regime
+    - STDDEV(20) - Price dispersion
+    - 20-day annualized historical volatility
+    - Maximum drawdown and total return over the fetched period
+
+    Args:
+        ticker: Stock ticker symbol (e.g., "AAPL", "GOOGL")
+
+    Returns:
+        dict: Latest value of each metric, or an error status and message
+    """
+    try:
+        bars = await fetch_daily_ohlcv(ticker, tool_context)
+    except Exception as e:
+        return {"status": "error", "message": f"Error fetching daily prices for {ticker}: {str(e)}"}
+
+    high, low, close = bars["high"], bars["low"], bars["close"]
+    if not len(close):
+        return {"status": "error", "message": f"No daily prices returned for {ticker}"}
+
+    atr = indicators.latest(indicators.atr(high, low, close, 14))
+    bbands = indicators.bbands(close)
+    width = (bbands["upper"] - bbands["lower"]) / bbands["middle"] * 100.0
+    last_close = float(close[-1])
+
+    return {
+        "status": "success",
+        "ticker": ticker.upper(),
+        "as_of": str(bars["dates"][-1]),
+        "bars": len(close),
+        "close": round(last_close, 4),
+        "atr_14": atr,
+        "atr_14_percent": None if atr is None else round(atr / last_close * 100.0, 2),
+        "bbands_20_width_percent": indicators.latest(width),
+        "stddev_20": indicators.latest(indicators.stddev(close, 20)),
+        "historical_volatility_20d_percent": indicators.latest(indicators.historical_volatility(close, 20)),
+        "max_drawdown_percent": round(indicators.max_drawdown(close), 2),
+        "period_return_percent": round((last_close / float(close[0]) - 1.0) * 100.0, 2),
+        "period_high": round(float(high.max()), 4),
+        "period_low": round(float(low.min()), 4),
+        **data_source_fields(bars),
+    }
+
+
+# Create FunctionTool instances (function names are the tool names the model sees)
+compute_risk_metrics_tool = FunctionTool(func=compute_risk_metrics)
 
 
 def get_risk_analyst_tools():
     """
     Get risk assessment tools for Risk Analyst
 
-    Returns Alpha Vantage MCP toolset which includes:
+    Returns local risk tools that need a single TIME_SERIES_DAILY call per
+    ticker (shared with the trading analyst through the response cache):
     - ATR (Average True Range) - Volatility measurement
     - BBANDS (Bollinger Bands) - Volatility regime
     - STDDEV (Standard Deviation) - Price dispersion
-    - Historical price data - Stress testing and drawdown analysis
-    - Beta coefficient - Market sensitivity
-    - Correlation analysis - Diversification assessment
-    - And other risk metrics
-
-    The MCP server provides all these tools automatically.
+    - Historical volatility - Annualized return dispersion
+    - Maximum drawdown - Stress testing
     """
-    return get_alpha_vantage_mcp_toolset()
+    return [compute_risk_metrics_tool]
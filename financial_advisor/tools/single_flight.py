@@ -0,0 +1,74 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Single-flight de-duplication of concurrent identical async calls"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the work as a separate task; callers
+    arriving while it is running await the same task and receive the same
+    result (or exception). Each caller awaits through ``asyncio.shield`` so a
+    cancelled session does not cancel the work other sessions are waiting on.
+    """
+
+    def __init__(self):
+        self._tasks: dict = {}
+        self.calls = 0
+        self.executed = 0
+        self.collapsed = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn`` unless an identical call is already in flight
+
+        Args:
+            key: Identity of the call, e.g. (tool name, normalized args)
+            fn: Zero-argument coroutine function performing the work
+
+        Returns:
+            The result of the shared execution
+        """
+        self.calls += 1
+        task = self._tasks.get(key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.collapsed += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        """Drop a finished task so the next call for ``key`` runs afresh."""
+        self._tasks.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            task.exception()
+
+    def stats(self) -> dict:
+        """Return call, execution and collapse counters."""
+        return {
+            "calls": self.calls,
+            "executed": self.executed,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._tasks),
+        }
@@ -0,0 +1,177 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""On-disk cache of the Alpha Vantage MCP tool list
+
+Listing the server's 60+ tools costs an MCP session and a large response on
+every cold start. The list is stored as JSON together with what it depends
+on, and an entry is only reused while all of it still matches:
+
+    format       layout of this file (SCHEMA_CACHE_FORMAT)
+    server       MCP endpoint, without the API key
+    mcp_version  version of the mcp package that parsed the schemas
+    fetched_at   reused for at most ALPHA_VANTAGE_TOOLS_CACHE_TTL seconds
+
+When an entry is re-listed after its TTL, the fingerprint of the new list is
+compared with the cached one and a change is logged and counted, so a tool
+set change on the server is visible without re-listing on every start.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from importlib import metadata
+from pathlib import Path
+
+from mcp.types import Tool
+
+from .response_cache import DAY
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_CACHE_FORMAT = 1
+DEFAULT_SCHEMA_TTL = DAY
+
+
+def get_default_schema_cache_path() -> Path:
+    """Return the on-disk location of the tool list cache"""
+    configured = os.getenv("ALPHA_VANTAGE_TOOLS_CACHE_PATH")
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".cache" / "financial_advisor" / "alpha_vantage_tools.json"
+
+
+def _mcp_version() -> str:
+    try:
+        return metadata.version("mcp")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def fingerprint_tools(tools: list[Tool]) -> str:
+    """Return a short hash of tool names, descriptions and input schemas."""
+    payload = json.dumps(
+        [tool.model_dump(mode="json", exclude_none=True) for tool in tools],
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class ToolSchemaCache:
+    """
+    JSON file holding the last tool list fetched from an MCP server
+
+    Args:
+        path: File to store the list in
+        ttl: Seconds a stored list is reused before the server is asked again
+    """
+
+    def __init__(
+        self, path: Path | None = None, ttl: float = DEFAULT_SCHEMA_TTL
+    ):
+        self.path = Path(path) if path else get_default_schema_cache_path()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.changes = 0
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict | None:
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def load(self, server: str) -> list[Tool] | None:
+        """
+        Return the stored tool list if it is still valid for this server
+
+        Args:
+            server: MCP endpoint URL, without credentials
+
+        Returns:
+            list: The tools, or None if there is no valid entry
+        """
+        with self._lock:
+            entry = self._read()
+            valid = (
+                entry is not None
+                and entry.get("format") == SCHEMA_CACHE_FORMAT
+                and entry.get("server") == server
+                and entry.get("mcp_version") == _mcp_version()
+                and time.time() - entry.get("fetched_at", 0) < self.ttl
+            )
+            if not valid:
+                self.misses += 1
+                return None
+            try:
+                tools = [Tool.model_validate(tool) for tool in entry["tools"]]
+            except (KeyError, TypeError, ValueError):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return tools
+
+    def save(self, server: str, tools: list[Tool]) -> None:
+        """
+        Store a freshly listed tool list, noting whether it changed
+
+        Args:
+            server: MCP endpoint URL, without credentials
+            tools: Tools returned by the server
+        """
+        if self.ttl <= 0:
+            return
+        fingerprint = fingerprint_tools(tools)
+        with self._lock:
+            previous = self._read()
+            if (
+                previous
+                and previous.get("server") == server
+                and previous.get("fingerprint") != fingerprint
+            ):
+                self.changes += 1
+                logger.info(
+                    "MCP tool list of %s changed (%s -> %s)",
+                    server,
+                    previous.get("fingerprint"),
+                    fingerprint,
+                )
+            entry = {
+                "format": SCHEMA_CACHE_FORMAT,
+                "server": server,
+                "mcp_version": _mcp_version(),
+                "fetched_at": time.time(),
+                "fingerprint": fingerprint,
+                "tools": [
+                    tool.model_dump(mode="json", exclude_none=True) for tool in tools
+                ],
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            partial = self.path.with_suffix(".tmp")
+            partial.write_text(json.dumps(entry))
+            partial.replace(self.path)
+
+    def invalidate(self) -> None:
+        """Drop the stored list so the next start lists the tools again."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        """Return hit, miss and change counters."""
+        return {"hits": self.hits, "misses": self.misses, "changes": self.changes}
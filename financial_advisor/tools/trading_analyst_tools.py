@@ -12,16 +12,81 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Trading Analyst tools - Technical indicators from Alpha Vantage MCP"""
+"""Trading Analyst tools - Technical indicators computed locally from daily prices"""
 
-from .alpha_vantage_tools import get_alpha_vantage_mcp_toolset
+from google.adk.tools import FunctionTool
+from google.adk.tools.tool_context import ToolContext
+
+from ..analytics import indicators
+from .market_data import data_source_fields, fetch_daily_ohlcv
+
+
+async def compute_technical_indicators(ticker: str, tool_context: ToolContext) -> dict:
+    """
+    Compute technical indicators for a ticker from its daily price history.
+
+    Fetches the daily OHLCV series ONCE and computes every indicator locally,
+    instead of calling a separate API endpoint per indicator:
+    - RSI(14) - Momentum indicator
+    - MACD(12, 26, 9) - Trend indicator
+    - EMA(20), EMA(50) and SMA(50) - Trend identification
+    - BBANDS(20, 2) - Volatility indicator
+    - STOCH(14, 3, 3) - Momentum indicator
+    - ADX(14) with +DI/-DI - Trend strength
+    - OBV - Volume indicator
+
+    Args:
+        ticker: Stock ticker symbol (e.g., "AAPL", "GOOGL")
+
+    Returns:
+        dict: Latest value of each indicator, or an error status and message
+    """
+    try:
+        bars = await fetch_daily_ohlcv(ticker, tool_context)
+    except Exception as e:
+        return {"status": "error", "message": f"Error fetching daily prices for {ticker}: {str(e)}"}
+
+    high, low, close, volume = bars["high"], bars["low"], bars["close"], bars["volume"]
+    if not len(close):
+        return {"status": "error", "message": f"No daily prices returned for {ticker}"}
+
+    macd = indicators.macd(close)
+    bbands = indicators.bbands(close)
+    stoch = indicators.stoch(high, low, close)
+    adx = indicators.adx(high, low, close)
+    obv = indicators.obv(close, volume)
+
+    return {
+        "status": "success",
+        "ticker": ticker.upper(),
+        "as_of": str(bars["dates"][-1]),
+        "bars": len(close),
+        "close": indicators.latest(close),
+        "rsi_14": indicators.latest(indicators.rsi(close, 14)),
+        "macd": {name: indicators.latest(series) for name, series in macd.items()},
+        "ema_20": indicators.latest(indicators.ema(close, 20)),
+        "ema_50": indicators.latest(indicators.ema(close, 50)),
+        "sma_50": indicators.latest(indicators.sma(close, 50)),
+        "bbands_20": {name: indicators.latest(series) for name, series in bbands.items()},
+        "stoch": {name: indicators.latest(series) for name, series in stoch.items()},
+        "adx_14": {name: indicators.latest(series) for name, series in adx.items()},
+        "obv": indicators.latest(obv),
+        "obv_change_20d": indicators.latest(obv - obv[-21]) if len(obv) > 20 else None,
+        **data_source_fields(bars),
+    }
+
+
+# Create FunctionTool instances (function names are the tool names the model sees)
+compute_technical_indicators_tool = FunctionTool(func=compute_technical_indicators)
 
 
 def get_trading_analyst_tools():
     """
     Get technical analysis tools for Trading Analyst
 
-    Returns Alpha Vantage MCP toolset which includes:
+    Returns local indicator tools that need a single TIME_SERIES_DAILY call
+    per ticker (served from the response cache when fresh) instead of one
+    Alpha Vantage call per indicator endpoint:
     - RSI (Relative Strength Index) - Momentum indicator
     - MACD (Moving Average Convergence Divergence) - Trend indicator
     - EMA (Exponential Moving Average) - Trend identification
@@ -29,8 +94,5 @@ def get_trading_analyst_tools():
     - STOCH (Stochastic Oscillator) - Momentum indicator
     - ADX (Average Directional Index) - Trend strength
     - OBV (On-Balance Volume) - Volume indicator
-    - And 50+ other technical indicators
-
-    The MCP server provides all these tools automatically.
     """
-    return get_alpha_vantage_mcp_toolset()
+    return [compute_technical_indicators_tool]
@@ -12,18 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Visualization and PDF export tools"""
+"""Visualization and PDF export tools
+
+matplotlib and fpdf are only imported when a chart or PDF is first made.
+"""
 
 from google.adk.tools import FunctionTool
-from ..utils import plot_stock_trend, generate_pdf_report
+from google.adk.tools.tool_context import ToolContext
+
+from ..structured_outputs import key_figures, load_structured
 
 
-def _create_stock_trend_plot(market_analysis: str) -> str:
+def _create_stock_trend_plot(market_analysis: str, tool_context: ToolContext) -> str:
     """
     Create a stock price trend visualization chart from market analysis data.
 
     This tool generates a 30-day price trend chart showing the stock's recent
     performance, including trend direction (uptrend, downtrend, or sideways).
+    The structured market data recorded by the data analyst is used when it
+    is in state; the analysis text is only read when it is not.
 
     Args:
         market_analysis: The market analysis output containing stock price data,
@@ -33,18 +40,23 @@ def _create_stock_trend_plot(market_analysis: str) -> str:
         str: Path to the saved chart image file (saved in Downloads folder)
     """
     try:
-        file_path = plot_stock_trend(market_analysis)
+        from ..utils import plot_stock_trend
+
+        market_data = load_structured(tool_context.state, "market_data_analysis_output")
+        file_path = plot_stock_trend(market_analysis, market_data=market_data)
         return f"Stock trend chart created successfully! Saved to: {file_path}"
     except Exception as e:
         return f"Error creating stock trend chart: {str(e)}"
 
 
-def _export_summary_to_pdf(summary_text: str, ticker: str) -> str:
+def _export_summary_to_pdf(summary_text: str, ticker: str, tool_context: ToolContext) -> str:
     """
     Export the executive summary to a formatted PDF report.
 
     This tool takes the executive summary generated by the summary_agent and
-    creates a professional PDF document saved to the Downloads folder.
+    creates a professional PDF document saved to the Downloads folder. The
+    sections and key figures recorded in state are laid out directly when
+    present.
 
     Args:
         summary_text: The executive summary text from the summary_agent
@@ -54,7 +66,14 @@ def _export_summary_to_pdf(summary_text: str, ticker: str) -> str:
         str: Path to the saved PDF file
     """
     try:
-        file_path = generate_pdf_report(summary_text, ticker)
+        from ..utils import generate_pdf_report
+
+        file_path = generate_pdf_report(
+            summary_text,
+            ticker,
+            summary=load_structured(tool_context.state, "executive_summary_output"),
+            figures=key_figures(tool_context.state),
+        )
         return f"PDF report created successfully! Saved to: {file_path}\n\nYou can now download and review the complete financial analysis report.\n\nReminder: This entire process is for EDUCATIONAL and INFORMATIONAL purposes ONLY and does NOT constitute financial advice. All investment decisions should be made after conducting your own thorough research and, ideally, consulting with a qualified independent financial advisor."
     except Exception as e:
         return f"Error creating PDF report: {str(e)}"
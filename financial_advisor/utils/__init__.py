@@ -12,9 +12,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Utils package"""
+"""Utils package
 
-from .pdf_generator import generate_pdf_report
-from .stock_plotter import plot_stock_trend
+The PDF and chart helpers pull in fpdf and matplotlib, so they are imported
+on first access rather than with the package.
+"""
 
-__all__ = ["generate_pdf_report", "plot_stock_trend"]
+import importlib
+
+from .stage_timing import record_stage_end, record_stage_start, record_stage_timing
+
+_LAZY_EXPORTS = {
+    "generate_pdf_report": ".pdf_generator",
+    "plot_stock_trend": ".stock_plotter",
+}
+
+__all__ = [
+    "generate_pdf_report",
+    "plot_stock_trend",
+    "record_stage_end",
+    "record_stage_start",
+    "record_stage_timing",
+]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
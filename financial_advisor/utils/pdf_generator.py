@@ -16,6 +16,7 @@
 
 import os
 from datetime import datetime
+
 from fpdf import FPDF
 
 
@@ -61,13 +62,49 @@ class FinancialReportPDF(FPDF):
         self.ln(4)
 
 
-def generate_pdf_report(summary_text: str, ticker: str = "STOCK") -> str:
+def _render_key_figures(pdf: FinancialReportPDF, figures: list, clean) -> None:
+    """Lay out (label, value) rows as a two-column table."""
+    pdf.chapter_title('KEY FIGURES')
+    for label, value in figures:
+        pdf.set_font('Arial', 'B', 9)
+        pdf.cell(70, 6, clean(str(label)), 0, 0, 'L')
+        pdf.set_font('Arial', '', 9)
+        pdf.multi_cell(0, 6, clean(str(value)))
+        pdf.ln(1)
+    pdf.add_separator()
+
+
+def _render_sections(pdf: FinancialReportPDF, summary, clean) -> None:
+    """Lay out the structured executive summary section by section."""
+    if summary.title:
+        pdf.chapter_title(clean(summary.title))
+    for number, section in enumerate(summary.sections, start=1):
+        pdf.add_separator()
+        pdf.chapter_title(clean(f'{number}. {section.heading}'))
+        for paragraph in section.paragraphs:
+            pdf.body_text(clean(paragraph))
+        for bullet in section.bullets:
+            pdf.set_font('Arial', '', 9)
+            pdf.cell(10)  # Indent
+            pdf.multi_cell(0, 5, f'- {clean(bullet)}')
+            pdf.ln(1)
+    if summary.recommendation:
+        pdf.add_separator()
+        pdf.section_title('Recommendation')
+        pdf.body_text(clean(summary.recommendation))
+
+
+def generate_pdf_report(summary_text: str, ticker: str = "STOCK",
+                        summary=None, figures: list = None) -> str:
     """
     Generate PDF report from executive summary text
 
     Args:
-        summary_text: The executive summary text from summary_agent
+        summary_text: The executive summary text from summary_agent, laid out
+            line by line when no structured summary is given
         ticker: The stock ticker symbol
+        summary: Structured ExecutiveSummary recorded by the summary agent
+        figures: (label, value) rows shown as a key figures table
 
     Returns:
         str: Path to the generated PDF file
@@ -129,8 +166,13 @@ def generate_pdf_report(summary_text: str, ticker: str = "STOCK") -> str:
     # Add new page for content
     pdf.add_page()
 
-    # Parse and format the summary text
-    lines = summary_text.split('\n')
+    if figures:
+        _render_key_figures(pdf, figures, clean_text_for_pdf)
+
+    # Lay out the structured summary directly, or parse and format the text
+    lines = [] if summary is not None else summary_text.split('\n')
+    if summary is not None:
+        _render_sections(pdf, summary, clean_text_for_pdf)
 
     for line in lines:
         line = line.strip()
@@ -163,7 +205,7 @@ def generate_pdf_report(summary_text: str, ticker: str = "STOCK") -> str:
             if clean_line:
                 pdf.set_font('Arial', '', 9)
                 pdf.cell(10)  # Indent
-                pdf.multi_cell(0, 5, f'• {clean_line}')
+                pdf.multi_cell(0, 5, f'- {clean_line}')
 
         # Handle table-like content (|)
         elif '|' in line and not line.strip().startswith('|'):
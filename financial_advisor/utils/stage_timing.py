@@ -0,0 +1,88 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-stage wall-clock timing recorded in session state"""
+
+import threading
+import time
+import weakref
+from collections.abc import MutableMapping
+from typing import Any
+
+from google.adk.agents.callback_context import CallbackContext
+
+STAGE_TIMINGS_KEY = "stage_timings"
+
+# Start times of running stages, keyed by the id of the agent's invocation
+# context. An entry is dropped when the context is garbage collected, so an
+# agent that raises (and never reaches after_agent_callback) does not leak it.
+_stage_starts: dict = {}
+_stage_starts_lock = threading.Lock()
+
+
+def record_stage_timing(
+    state: MutableMapping[str, Any], stage: str, seconds: float, **details: Any
+) -> None:
+    """
+    Record how long a stage took under ``state["stage_timings"][stage]``
+
+    The timings dict is replaced rather than mutated so the change is picked
+    up as a state delta (and forwarded to the parent session when the stage
+    runs inside an AgentTool).
+
+    Args:
+        state: Session state (or a plain dict)
+        stage: Stage name, e.g. the agent name
+        seconds: Wall-clock duration of the stage
+        **details: Extra fields stored with the timing
+    """
+    timings = dict(state.get(STAGE_TIMINGS_KEY) or {})
+    previous = timings.get(stage) or {}
+    runs = previous.get("runs", 0) + 1
+    timings[stage] = {
+        "seconds": round(seconds, 3),
+        "runs": runs,
+        "total_seconds": round(previous.get("total_seconds", 0.0) + seconds, 3),
+        **details,
+    }
+    state[STAGE_TIMINGS_KEY] = timings
+
+
+def record_stage_start(callback_context: CallbackContext) -> None:
+    """before_agent_callback: remember when the agent started."""
+    invocation = callback_context._invocation_context
+    key = id(invocation)
+    with _stage_starts_lock:
+        _stage_starts[key] = time.perf_counter()
+    weakref.finalize(invocation, _forget_stage_start, key)
+    return None
+
+
+def _forget_stage_start(key: int) -> None:
+    with _stage_starts_lock:
+        _stage_starts.pop(key, None)
+
+
+def record_stage_end(callback_context: CallbackContext) -> None:
+    """after_agent_callback: store the agent's duration in session state."""
+    key = id(callback_context._invocation_context)
+    with _stage_starts_lock:
+        started: float | None = _stage_starts.pop(key, None)
+    if started is not None:
+        record_stage_timing(
+            callback_context.state,
+            callback_context.agent_name,
+            time.perf_counter() - started,
+        )
+    return None
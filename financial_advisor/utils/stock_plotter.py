@@ -14,10 +14,14 @@
 
 """Stock trend plotting utility"""
 
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from datetime import datetime
 import re
+from datetime import datetime
+
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+
+from ..analytics.ohlcv_store import get_ohlcv_store
+from ..structured_outputs import MarketData
 
 
 def parse_price_trend_from_analysis(market_analysis: str) -> dict:
@@ -63,19 +67,48 @@ def parse_price_trend_from_analysis(market_analysis: str) -> dict:
     return result
 
 
-def plot_stock_trend(market_analysis: str, save_path: str = None) -> str:
+def price_trend_from_market_data(market_data: MarketData) -> dict:
+    """
+    Read price trend data from the structured market data payload
+
+    Args:
+        market_data: The payload recorded by the data analyst
+
+    Returns:
+        dict: Same fields as parse_price_trend_from_analysis
+    """
+    result = {
+        "ticker": market_data.ticker.upper(),
+        "current_price": market_data.current_price or 0.0,
+        "trend_description": market_data.trend_30d or "No trend data available",
+        "price_change_30d": None
+    }
+    if market_data.change_30d is not None:
+        result["price_change_30d"] = {
+            "change": market_data.change_30d,
+            "percent": market_data.change_30d_percent
+        }
+    return result
+
+
+def plot_stock_trend(market_analysis: str = "", save_path: str = None,
+                     market_data: MarketData = None) -> str:
     """
     Create a stock trend plot from market analysis data
 
     Args:
-        market_analysis: The market_data_analysis_output text
+        market_analysis: The market_data_analysis_output text, parsed only
+            when no structured market data is given
         save_path: Optional path to save the plot
+        market_data: Structured market data recorded by the data analyst
 
     Returns:
         str: Path to the saved plot image
     """
-    # Parse the analysis data
-    data = parse_price_trend_from_analysis(market_analysis)
+    if market_data is not None:
+        data = price_trend_from_market_data(market_data)
+    else:
+        data = parse_price_trend_from_analysis(market_analysis)
 
     ticker = data["ticker"]
     current_price = data["current_price"]
@@ -84,11 +117,40 @@ def plot_stock_trend(market_analysis: str, save_path: str = None) -> str:
     # Create figure
     fig, ax = plt.subplots(figsize=(10, 6))
 
-    # Since we don't have actual historical data points, create a simple visualization
-    # showing current price and trend direction based on the analysis
+    # Use stored daily closes when the OHLCV store has them; otherwise create a
+    # simple visualization showing current price and trend direction based on
+    # the analysis
+    history = get_ohlcv_store().read(ticker, "daily", last=30)
+    if len(history["close"]) >= 2:
+        closes = history["close"]
+        if current_price <= 0:
+            current_price = float(closes[-1])
+        first, last = float(closes[0]), float(closes[-1])
+        is_uptrend = last > first * 1.01
+        is_downtrend = last < first * 0.99
+
+        ax.plot(history["dates"], closes,
+                linewidth=2, color='#1f77b4', label=f'{ticker} Close')
+        ax.scatter([history["dates"][-1]], [last],
+                   color='red', s=100, zorder=5, label=f'Last close: ${last:.2f}')
+        ax.grid(True, alpha=0.3, linestyle='--')
+        ax.set_xlabel('Date', fontsize=12)
+        ax.set_ylabel('Price ($)', fontsize=12)
+        ax.set_title(f'{ticker} - {len(closes)}-Day Price History\n{trend_desc}', fontsize=14, fontweight='bold')
+        ax.legend(loc='best')
+        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:.2f}'))
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
+        fig.autofmt_xdate()
+
+        trend_color = 'green' if is_uptrend else 'red' if is_downtrend else 'gray'
+        trend_label = '▲ UPTREND' if is_uptrend else '▼ DOWNTREND' if is_downtrend else '→ SIDEWAYS'
+        ax.text(0.02, 0.98, trend_label, transform=ax.transAxes,
+                fontsize=12, fontweight='bold', color=trend_color,
+                verticalalignment='top',
+                bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
 
     # Create a simple trend line based on description
-    if current_price > 0:
+    elif current_price > 0:
         # Determine trend direction from description
         is_uptrend = any(word in trend_desc.lower() for word in ['up', 'gain', 'increase', 'rising', 'bullish', 'positive'])
         is_downtrend = any(word in trend_desc.lower() for word in ['down', 'loss', 'decrease', 'falling', 'bearish', 'negative'])
@@ -0,0 +1,252 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Warm-up of an instance before it takes traffic
+
+Started by the FastAPI lifespan as a background task, so the server answers
+liveness checks (``/health``) at once while readiness (``/ready``) stays 503
+until every warm-up step has finished. Steps, in order:
+
+    mcp      open the Alpha Vantage MCP session and fetch the tool list,
+             which the managed toolset keeps for later requests
+    model    create a client for every configured agent model, loading
+             credentials and the HTTP stack (WARMUP_MODEL_CALL=1 also sends
+             a count_tokens request per model)
+    reports  load matplotlib's font cache and fpdf, used by the chart and
+             PDF tools
+    tickers  fetch daily bars of WARMUP_TICKERS into the response cache and
+             OHLCV store
+
+WARMUP_STEPS selects steps (default: all; "tickers" runs only when
+WARMUP_TICKERS is set) and WARMUP_DISABLED skips warm-up entirely. A failed
+or timed-out step is reported but does not hold back readiness: the request
+that needs it pays the cost instead, as it would without warm-up.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+STEPS = ("mcp", "model", "reports", "tickers")
+DEFAULT_STEP_TIMEOUT = 60.0
+
+
+def get_warmup_steps() -> list[str]:
+    """Return the configured warm-up steps, in run order."""
+    if os.getenv("WARMUP_DISABLED"):
+        return []
+    configured = os.getenv("WARMUP_STEPS")
+    if configured is None:
+        selected = set(STEPS)
+    else:
+        selected = {step.strip().lower() for step in configured.split(",") if step.strip()}
+        unknown = selected - set(STEPS)
+        if unknown:
+            logger.warning("Ignoring unknown WARMUP_STEPS: %s", ", ".join(sorted(unknown)))
+    if not get_warmup_tickers():
+        selected.discard("tickers")
+    return [step for step in STEPS if step in selected]
+
+
+def get_warmup_tickers() -> list[str]:
+    """Return the tickers named in WARMUP_TICKERS (comma-separated)."""
+    return [
+        ticker.strip().upper()
+        for ticker in os.getenv("WARMUP_TICKERS", "").split(",")
+        if ticker.strip()
+    ]
+
+
+async def warm_mcp() -> dict:
+    """Connect to the Alpha Vantage MCP server and list its tools."""
+    from google.adk.tools.base_toolset import BaseToolset
+
+    from .tools.alpha_vantage_tools import get_alpha_vantage_mcp_toolset
+
+    toolset = get_alpha_vantage_mcp_toolset()
+    if not isinstance(toolset, BaseToolset):
+        return {"skipped": "ALPHA_VANTAGE_API_KEY not set"}
+    tools = await toolset.get_tools()
+    return {"tools": len(tools)}
+
+
+async def warm_model() -> dict:
+    """Create a client per configured model (and optionally call each one)."""
+    from google.adk.models.registry import LLMRegistry
+
+    from .model_routing import get_model_assignments
+
+    models = sorted(set(get_model_assignments().values()))
+    llms = [LLMRegistry.new_llm(model) for model in models]
+    # Client creation loads credentials synchronously
+    clients = await asyncio.to_thread(
+        lambda: [
+            (llm.api_client, model)
+            for llm, model in zip(llms, models, strict=True)
+            if hasattr(llm, "api_client")
+        ]
+    )
+    if os.getenv("WARMUP_MODEL_CALL", "").lower() in ("1", "true"):
+        await asyncio.gather(
+            *(
+                client.aio.models.count_tokens(model=model, contents="ping")
+                for client, model in clients
+            )
+        )
+    return {"models": models}
+
+
+def _load_report_libraries() -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from fpdf import FPDF
+    from matplotlib import font_manager
+
+    font_manager.findfont("DejaVu Sans")
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=11)
+
+
+async def warm_reports() -> dict:
+    """Load matplotlib (with its font cache) and fpdf off the event loop."""
+    await asyncio.to_thread(_load_report_libraries)
+    return {}
+
+
+async def warm_tickers() -> dict:
+    """Fetch daily bars of the hot tickers; stale or demo bars do not count."""
+    from .tools.market_data import data_source_fields, fetch_daily_ohlcv
+
+    tickers = get_warmup_tickers()
+    results = await asyncio.gather(
+        *(fetch_daily_ohlcv(ticker) for ticker in tickers), return_exceptions=True
+    )
+    failed = [
+        ticker
+        for ticker, result in zip(tickers, results, strict=True)
+        if isinstance(result, Exception)
+        or not len(result["close"])
+        or data_source_fields(result)
+    ]
+    if failed:
+        raise RuntimeError(f"no daily bars for {', '.join(failed)}")
+    return {"tickers": tickers}
+
+
+_STEP_FUNCTIONS: dict[str, Callable[[], Awaitable[dict]]] = {
+    "mcp": warm_mcp,
+    "model": warm_model,
+    "reports": warm_reports,
+    "tickers": warm_tickers,
+}
+
+
+class Warmup:
+    """
+    Runs the warm-up steps once and tracks readiness
+
+    Args:
+        steps: Step names to run, in order
+        step_timeout: Seconds each step may take before it is abandoned
+        step_functions: Step name -> coroutine function (defaults to the
+            built-in steps)
+    """
+
+    def __init__(
+        self,
+        steps: list[str],
+        step_timeout: float = DEFAULT_STEP_TIMEOUT,
+        step_functions: dict | None = None,
+    ):
+        self.steps = list(steps)
+        self.step_timeout = step_timeout
+        self.step_functions = step_functions or _STEP_FUNCTIONS
+        self.results = {step: {"status": "pending"} for step in self.steps}
+        self.started_at: float | None = None
+        self.seconds: float | None = None
+        self._done = asyncio.Event()
+
+    @property
+    def ready(self) -> bool:
+        """True once every step has finished, successfully or not."""
+        return self._done.is_set()
+
+    async def wait(self) -> None:
+        """Wait until warm-up has finished."""
+        await self._done.wait()
+
+    async def run(self) -> None:
+        """Run every step in order; never raises."""
+        self.started_at = time.perf_counter()
+        try:
+            for step in self.steps:
+                self.results[step] = {"status": "running"}
+                step_started = time.perf_counter()
+                try:
+                    details = await asyncio.wait_for(
+                        self.step_functions[step](), timeout=self.step_timeout
+                    )
+                    status = "skipped" if "skipped" in details else "ok"
+                    self.results[step] = {"status": status, **details}
+                except asyncio.TimeoutError:
+                    self.results[step] = {"status": "timeout"}
+                except Exception as e:
+                    logger.warning("Warm-up step %s failed: %s", step, e)
+                    self.results[step] = {"status": "failed", "error": str(e)}
+                self.results[step]["seconds"] = round(time.perf_counter() - step_started, 3)
+        finally:
+            self.seconds = round(time.perf_counter() - self.started_at, 3)
+            self._done.set()
+            logger.info("Warm-up finished in %.1fs: %s", self.seconds, self.results)
+
+    def snapshot(self) -> dict:
+        """Return readiness, total seconds and the result of each step."""
+        return {"ready": self.ready, "seconds": self.seconds, "steps": self.results}
+
+    def stats(self) -> dict:
+        """Numeric summary for the metrics endpoint."""
+        failed = sum(
+            result["status"] in ("failed", "timeout") for result in self.results.values()
+        )
+        return {"ready": int(self.ready), "seconds": self.seconds or 0.0, "failed_steps": failed}
+
+
+# Singleton instance
+_warmup_instance: Warmup | None = None
+_warmup_lock = threading.Lock()
+
+
+def get_warmup() -> Warmup:
+    """
+    Get or create the process-wide warm-up from the environment.
+
+    Returns:
+        Warmup: Warm-up of WARMUP_STEPS with WARMUP_STEP_TIMEOUT seconds per step
+    """
+    global _warmup_instance
+    with _warmup_lock:
+        if _warmup_instance is None:
+            _warmup_instance = Warmup(
+                get_warmup_steps(),
+                step_timeout=float(os.getenv("WARMUP_STEP_TIMEOUT", DEFAULT_STEP_TIMEOUT)),
+            )
+        return _warmup_instance
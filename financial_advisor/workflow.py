@@ -0,0 +1,193 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Workflow root agent: a fixed analysis pipeline behind a conversational front end
+
+The LLM coordinator in ``agent.py`` spends a model turn deciding to call each
+sub-agent. Here the analysts run as a SequentialAgent whose stages read their
+inputs straight from state keys, so the only LLM turns outside the analysts
+are the user-facing ones (collecting the ticker and preferences, and the
+optional summary/PDF step at the end). Upstream reports reach each stage
+through ``context_shaping``, which passes only the sections it needs.
+Each stage keeps its prompt as ``static_instruction`` and sends those inputs
+as a user turn after it, so the prompt is the same on every run and can be
+served from the context cache.
+"""
+
+import logging
+
+from google.adk.agents import BaseAgent, LlmAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools import FunctionTool
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.tool_context import ToolContext
+from google.adk.utils.instructions_utils import inject_session_state
+from google.genai import types
+
+from . import prompt
+from .context_shaping import render_inputs
+from .model_routing import get_model
+from .sub_agents.data_analyst import data_analyst_agent
+from .sub_agents.execution_analyst import execution_analyst_agent
+from .sub_agents.risk_analyst import risk_analyst_agent
+from .sub_agents.summary_agent import summary_agent
+from .sub_agents.trading_analyst import trading_analyst_agent
+from .tools.market_data import fetch_daily_ohlcv
+from .tools.visualization_tools import export_summary_to_pdf
+
+logger = logging.getLogger(__name__)
+
+MODEL = get_model("workflow_coordinator")
+
+PIPELINE_AGENT_NAME = "analysis_pipeline"
+
+_PREFERENCES = """
+user_risk_attitude: {user_risk_attitude}
+user_investment_period: {user_investment_period}
+user_execution_preferences: {user_execution_preferences?}
+"""
+
+
+def _stage(agent: LlmAgent, inputs: str = "", context: tuple = ()) -> LlmAgent:
+    """
+    Copy of a sub-agent that takes its inputs from state instead of chat history
+
+    Args:
+        agent: Sub-agent to copy
+        inputs: Template of small inputs, filled from state like an instruction
+        context: Upstream output keys, rendered through context shaping
+    """
+
+    async def instruction(ctx: ReadonlyContext) -> str:
+        return (
+            "* Workflow Inputs (from session state):\n"
+            + render_inputs(agent.name, ctx.state, context)
+            + await inject_session_state(inputs, ctx)
+        )
+
+    return agent.clone(
+        update={
+            "static_instruction": types.Content(parts=[types.Part(text=agent.instruction)]),
+            "instruction": instruction,
+            "include_contents": "none",
+        }
+    )
+
+
+class PriceHistoryPrefetchAgent(BaseAgent):
+    """Loads the ticker's daily bars into the OHLCV store without any LLM call.
+
+    Runs alongside the data analyst so the indicator and risk tools of the
+    later stages read price history from the local store.
+    """
+
+    async def _run_async_impl(self, ctx: InvocationContext):
+        ticker = ctx.session.state.get("ticker")
+        if ticker:
+            try:
+                await fetch_daily_ohlcv(ticker)
+            except Exception as e:
+                logger.warning("Price history prefetch failed for %s: %s", ticker, e)
+        return
+        yield  # AsyncGenerator requires having at least one yield statement
+
+
+market_data_stage = ParallelAgent(
+    name="market_data_stage",
+    sub_agents=[
+        _stage(data_analyst_agent, "ticker: {ticker}\n"),
+        PriceHistoryPrefetchAgent(name="price_history_prefetch"),
+    ],
+)
+
+analysis_pipeline = SequentialAgent(
+    name=PIPELINE_AGENT_NAME,
+    description="Runs market data, trading, execution and risk analysis in order.",
+    sub_agents=[
+        market_data_stage,
+        _stage(trading_analyst_agent, _PREFERENCES, ("market_data_analysis_output",)),
+        _stage(execution_analyst_agent, _PREFERENCES, ("proposed_trading_strategies_output",)),
+        _stage(
+            risk_analyst_agent,
+            _PREFERENCES,
+            (
+                "market_data_analysis_output",
+                "proposed_trading_strategies_output",
+                "execution_plan_output",
+            ),
+        ),
+    ],
+)
+
+
+def start_analysis(
+    ticker: str,
+    risk_attitude: str,
+    investment_period: str,
+    execution_preferences: str,
+    tool_context: ToolContext,
+) -> dict:
+    """
+    Save the user's inputs and hand over to the analysis pipeline.
+
+    Args:
+        ticker: Stock ticker symbol (e.g., "AAPL")
+        risk_attitude: The user's risk attitude (e.g., conservative, moderate, aggressive)
+        investment_period: The user's investment period (e.g., short-term, long-term)
+        execution_preferences: Optional execution preferences (empty string if none)
+
+    Returns:
+        dict: Confirmation of the saved inputs
+    """
+    tool_context.state["ticker"] = ticker.strip().upper()
+    tool_context.state["user_risk_attitude"] = risk_attitude
+    tool_context.state["user_investment_period"] = investment_period
+    tool_context.state["user_execution_preferences"] = execution_preferences or "None stated"
+    tool_context.actions.transfer_to_agent = PIPELINE_AGENT_NAME
+    return {"status": "success", "ticker": tool_context.state["ticker"]}
+
+
+start_analysis_tool = FunctionTool(func=start_analysis)
+
+
+workflow_coordinator = LlmAgent(
+    name="workflow_coordinator",
+    model=MODEL,
+    description=(
+        "collect the ticker and investment preferences from the user, run the "
+        "fixed analysis pipeline, and optionally produce an executive summary "
+        "with PDF export."
+    ),
+    instruction=prompt.WORKFLOW_COORDINATOR_PROMPT,
+    tools=[
+        start_analysis_tool,
+        AgentTool(
+            agent=_stage(
+                summary_agent,
+                _PREFERENCES,
+                (
+                    "market_data_analysis_output",
+                    "proposed_trading_strategies_output",
+                    "execution_plan_output",
+                    "final_risk_assessment_output",
+                ),
+            )
+        ),
+        export_summary_to_pdf,
+    ],
+    sub_agents=[analysis_pipeline],
+)
+
+workflow_root_agent = workflow_coordinator
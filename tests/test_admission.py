@@ -0,0 +1,74 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for admission control"""
+
+import asyncio
+
+import pytest
+
+from financial_advisor.admission import AdmissionController, AdmissionRejected
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_with_retry_after():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=5)
+    running = await controller.acquire("alice")
+    waiting = asyncio.create_task(controller.acquire("bob"))
+    await asyncio.sleep(0)
+    assert controller.snapshot()["queue_depth"] == 1
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("carol")
+    assert rejected.value.reason == "queue_full"
+    assert rejected.value.retry_after >= 1
+
+    running.release()
+    (await waiting).release()
+    snapshot = controller.snapshot()
+    assert snapshot["in_flight"] == 0 and snapshot["queue_depth"] == 0
+    assert snapshot["admitted"] == 2 and snapshot["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_frees_the_queue_slot():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.01)
+    running = await controller.acquire("alice")
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("bob")
+    assert rejected.value.reason == "queue_timeout"
+    assert controller.snapshot()["queue_depth"] == 0
+    running.release()
+    assert controller.snapshot()["timed_out"] == 1
+
+
+@pytest.mark.asyncio
+async def test_waiting_users_are_served_round_robin():
+    controller = AdmissionController(max_concurrent=1, max_queue=10, queue_timeout=5)
+    order = []
+
+    async def run(user):
+        async with controller.admit(user):
+            order.append(user)
+            await asyncio.sleep(0)
+
+    blocker = await controller.acquire("blocker")
+    tasks = [asyncio.create_task(run(user)) for user in ["alice"] * 3 + ["bob", "carol"]]
+    await asyncio.sleep(0)
+    blocker.release()
+    await asyncio.gather(*tasks)
+    assert order == ["alice", "bob", "carol", "alice", "alice"]
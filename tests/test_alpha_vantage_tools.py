@@ -0,0 +1,557 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the Alpha Vantage toolset wrappers"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from google.adk.tools import BaseTool, MCPToolset
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.mcp_tool.mcp_toolset import StreamableHTTPConnectionParams
+from mcp.types import CallToolResult, TextContent, Tool
+
+from financial_advisor.structured_outputs import key_figures
+from financial_advisor.tools.alpha_vantage_tools import (
+    DEFAULT_TOOL_ALLOWLISTS,
+    AlphaVantageScheduler,
+    DeferredAlphaVantageToolset,
+    DegradationPolicy,
+    ManagedMCPToolset,
+    get_alpha_vantage_tools_for,
+)
+from financial_advisor.tools.deadlines import DeadlinePolicy
+from financial_advisor.tools.degraded_data import DEGRADED_DATA_KEY
+from financial_advisor.tools.mcp_pool import CircuitBreaker, MCPConnectionPool
+from financial_advisor.tools.mcp_replay_server import (
+    DEFAULT_FIXTURES_DIR,
+    DEFAULT_TOOLS,
+    FixtureStore,
+    demo_response,
+)
+from financial_advisor.tools.response_cache import ToolResponseCache
+from financial_advisor.tools.tool_schema_cache import ToolSchemaCache
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class FakeMCPTool(BaseTool):
+    """Counts upstream calls and echoes the symbol back."""
+
+    def __init__(self, name: str, text: str = "price 185.50", delay: float = 0):
+        super().__init__(name=name, description=f"fake {name}")
+        self.calls = 0
+        self.text = text
+        self.delay = delay
+
+    async def run_async(self, *, args, tool_context):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return CallToolResult(
+            content=[TextContent(type="text", text=f"{args['symbol']} {self.text}")]
+        )
+
+
+class FakeMCPToolset(BaseToolset):
+    def __init__(self, tools):
+        super().__init__()
+        self.tools = tools
+        self.listings = 0
+        self.closed = False
+
+    async def get_tools(self, readonly_context=None):
+        self.listings += 1
+        return self.tools
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ToolResponseCache(path=tmp_path / "cache.sqlite3")
+
+
+def test_cache_normalizes_arguments(cache):
+    cache.set("GLOBAL_QUOTE", {"symbol": "aapl "}, {"price": 1})
+    assert cache.get("global_quote", {"symbol": "AAPL", "datatype": None}) == {
+        "price": 1
+    }
+    assert cache.get("GLOBAL_QUOTE", {"symbol": "MSFT"}) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_expires_entries(tmp_path):
+    cache = ToolResponseCache(path=tmp_path / "cache.sqlite3", ttls={"GLOBAL_QUOTE": 0.05})
+    cache.set("GLOBAL_QUOTE", {"symbol": "AAPL"}, {"price": 1})
+    time.sleep(0.1)
+    assert cache.get("GLOBAL_QUOTE", {"symbol": "AAPL"}) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ToolResponseCache(path=tmp_path / "cache.sqlite3", max_entries=2)
+    cache.set("COMPANY_OVERVIEW", {"symbol": "AAPL"}, 1)
+    cache.set("COMPANY_OVERVIEW", {"symbol": "MSFT"}, 2)
+    cache.get("COMPANY_OVERVIEW", {"symbol": "AAPL"})
+    cache.set("COMPANY_OVERVIEW", {"symbol": "TSLA"}, 3)
+    assert cache.get("COMPANY_OVERVIEW", {"symbol": "MSFT"}) is None
+    assert cache.get("COMPANY_OVERVIEW", {"symbol": "AAPL"}) == 1
+    assert cache.stats()["entries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_toolset_serves_repeat_calls(cache):
+    quote = FakeMCPTool("GLOBAL_QUOTE")
+    toolset = ManagedMCPToolset(FakeMCPToolset([quote]), cache=cache)
+    (tool,) = await toolset.get_tools()
+
+    assert tool.name == "GLOBAL_QUOTE"
+    first = await tool.run_async(args={"symbol": "AAPL"}, tool_context=None)
+    second = await tool.run_async(args={"symbol": "aapl"}, tool_context=None)
+
+    assert quote.calls == 1
+    assert isinstance(second, CallToolResult)
+    assert second.content[0].text == first.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_cached_toolset_skips_rate_limited_responses(cache):
+    quote = FakeMCPTool("GLOBAL_QUOTE", text="Thank you for using Alpha Vantage!")
+    toolset = ManagedMCPToolset(FakeMCPToolset([quote]), cache=cache)
+    (tool,) = await toolset.get_tools()
+
+    await tool.run_async(args={"symbol": "AAPL"}, tool_context=None)
+    await tool.run_async(args={"symbol": "AAPL"}, tool_context=None)
+
+    assert quote.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_returns_budget_exhausted_result():
+    quote = FakeMCPTool("GLOBAL_QUOTE")
+    scheduler = AlphaVantageScheduler(calls_per_minute=5, calls_per_day=1, max_wait=0.1)
+    toolset = ManagedMCPToolset(FakeMCPToolset([quote]), scheduler=scheduler)
+    (tool,) = await toolset.get_tools()
+
+    await tool.run_async(args={"symbol": "AAPL"}, tool_context=None)
+    result = await tool.run_async(args={"symbol": "MSFT"}, tool_context=None)
+
+    assert quote.calls == 1
+    assert result.isError
+    assert json.loads(result.content[0].text)["status"] == "budget_exhausted"
+    assert scheduler.stats["budget_exhausted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_quotes_before_news():
+    scheduler = AlphaVantageScheduler(calls_per_minute=600, calls_per_day=100)
+    scheduler.minute_bucket.tokens = 0
+    order = []
+
+    async def call(name):
+        order.append(name)
+
+    await asyncio.gather(
+        scheduler.submit("NEWS_SENTIMENT", lambda: call("news")),
+        scheduler.submit("GLOBAL_QUOTE", lambda: call("quote")),
+    )
+
+    assert order == ["quote", "news"]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_collapses_identical_calls():
+    quote = FakeMCPTool("GLOBAL_QUOTE", delay=0.05)
+    toolset = ManagedMCPToolset(FakeMCPToolset([quote]))
+    (tool,) = await toolset.get_tools()
+
+    results = await asyncio.gather(
+        *(tool.run_async(args={"symbol": "AAPL"}, tool_context=None) for _ in range(3)),
+        tool.run_async(args={"symbol": "MSFT"}, tool_context=None),
+    )
+
+    assert quote.calls == 2
+    assert toolset.single_flight.stats()["collapsed"] == 2
+    assert len({r.content[0].text for r in results[:3]}) == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_cancelled_caller():
+    quote = FakeMCPTool("GLOBAL_QUOTE", delay=0.05)
+    toolset = ManagedMCPToolset(FakeMCPToolset([quote]))
+    (tool,) = await toolset.get_tools()
+
+    first = asyncio.create_task(
+        tool.run_async(args={"symbol": "AAPL"}, tool_context=None)
+    )
+    await asyncio.sleep(0)
+    second = asyncio.create_task(
+        tool.run_async(args={"symbol": "AAPL"}, tool_context=None)
+    )
+    await asyncio.sleep(0)
+    first.cancel()
+
+    result = await second
+    assert result.content[0].text.startswith("AAPL")
+    assert quote.calls == 1
+
+
+def test_replay_fixture_store_round_trip(tmp_path):
+    store = FixtureStore(tmp_path)
+    result = CallToolResult(content=[TextContent(type="text", text="recorded")])
+    store.save_response("GLOBAL_QUOTE", {"symbol": "ibm"}, result)
+
+    replayed = store.load_response("GLOBAL_QUOTE", {"symbol": "IBM "})
+    assert replayed.content[0].text == "recorded"
+    assert store.load_response("GLOBAL_QUOTE", {"symbol": "AAPL"}) is None
+
+
+def test_replay_demo_responses_are_deterministic():
+    quote = demo_response("GLOBAL_QUOTE", {"symbol": "aapl"})
+    assert quote["Global Quote"]["05. price"] == "185.5000"
+
+    series = demo_response("TIME_SERIES_DAILY", {"symbol": "TSLA"})
+    assert series == demo_response("TIME_SERIES_DAILY", {"symbol": "TSLA"})
+    assert demo_response("GLOBAL_QUOTE", {"symbol": "XYZ"}) is None
+
+
+def test_replay_fixtures_cover_the_allowlisted_tools():
+    store = FixtureStore(DEFAULT_FIXTURES_DIR)
+    allowlist = DEFAULT_TOOL_ALLOWLISTS["data_analyst_agent"]
+    assert {tool.name for tool in store.load_tools()} >= set(allowlist)
+    assert {tool.name for tool in DEFAULT_TOOLS} >= set(allowlist)
+
+    news = store.load_response("NEWS_SENTIMENT", {"tickers": "AAPL"})
+    assert json.loads(news.content[0].text) == demo_response("NEWS_SENTIMENT", {"tickers": "aapl"})
+    assert json.loads(news.content[0].text)["feed"][0]["ticker_sentiment"][0]["ticker"] == "AAPL"
+
+
+@pytest.mark.asyncio
+async def test_tool_list_is_fetched_once_until_closed():
+    upstream = FakeMCPToolset([FakeMCPTool("GLOBAL_QUOTE")])
+    toolset = ManagedMCPToolset(upstream)
+    first, second = await asyncio.gather(toolset.get_tools(), toolset.get_tools())
+    assert [tool.name for tool in first] == [tool.name for tool in second] == ["GLOBAL_QUOTE"]
+    assert upstream.listings == 1
+
+    await toolset.close()
+    await toolset.get_tools()
+    assert upstream.closed and upstream.listings == 2
+
+
+def _schema(name):
+    return Tool(name=name, description=f"fake {name}", inputSchema={"type": "object"})
+
+
+@pytest.mark.asyncio
+async def test_tool_list_is_served_from_the_schema_cache(tmp_path):
+    schema_cache = ToolSchemaCache(path=tmp_path / "tools.json")
+    schema_cache.save("http://av.test/mcp", [_schema("GLOBAL_QUOTE"), _schema("NEWS_SENTIMENT")])
+    # Nothing listens on this port: any listing would fail
+    upstream = MCPToolset(
+        connection_params=StreamableHTTPConnectionParams(url="http://127.0.0.1:9/mcp")
+    )
+    toolset = ManagedMCPToolset(upstream, schema_cache=schema_cache, server="http://av.test/mcp")
+
+    tools = await toolset.get_tools()
+
+    assert [tool.name for tool in tools] == ["GLOBAL_QUOTE", "NEWS_SENTIMENT"]
+    assert tools[0]._get_declaration().name == "GLOBAL_QUOTE"
+    assert schema_cache.stats()["hits"] == 1
+
+
+def test_schema_cache_rejects_stale_or_foreign_entries(tmp_path):
+    schema_cache = ToolSchemaCache(path=tmp_path / "tools.json", ttl=0.05)
+    schema_cache.save("http://av.test/mcp", [_schema("GLOBAL_QUOTE")])
+    assert schema_cache.load("http://other.test/mcp") is None
+    assert [tool.name for tool in schema_cache.load("http://av.test/mcp")] == ["GLOBAL_QUOTE"]
+
+    time.sleep(0.1)
+    assert schema_cache.load("http://av.test/mcp") is None
+    schema_cache.save("http://av.test/mcp", [_schema("GLOBAL_QUOTE"), _schema("EARNINGS")])
+    assert schema_cache.stats() == {"hits": 1, "misses": 2, "changes": 1}
+
+
+@pytest.mark.asyncio
+async def test_allowlist_limits_declared_tools(monkeypatch):
+    from financial_advisor.tools import alpha_vantage_tools
+
+    upstream = FakeMCPToolset(
+        [FakeMCPTool("GLOBAL_QUOTE"), FakeMCPTool("RSI"), FakeMCPTool("NEWS_SENTIMENT")]
+    )
+    monkeypatch.setattr(
+        alpha_vantage_tools, "_alpha_vantage_toolset_instance", ManagedMCPToolset(upstream)
+    )
+
+    default = get_alpha_vantage_tools_for("data_analyst_agent")
+    assert [t.name for t in await default.get_tools()] == ["GLOBAL_QUOTE", "NEWS_SENTIMENT"]
+
+    monkeypatch.setenv("ALPHA_VANTAGE_TOOLS_DATA_ANALYST_AGENT", "*")
+    assert len(await get_alpha_vantage_tools_for("data_analyst_agent").get_tools()) == 3
+
+    unknown = DeferredAlphaVantageToolset(("INCOME_STATEMENT",))
+    assert len(await unknown.get_tools()) == 3
+
+
+class FlakyMCPTool(FakeMCPTool):
+    """Raises like a dropped connection while ``down`` is set."""
+
+    down = True
+
+    async def run_async(self, *, args, tool_context):
+        if self.down:
+            self.calls += 1
+            raise ConnectionError("session dropped")
+        return await super().run_async(args=args, tool_context=tool_context)
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_falls_back_to_stale_then_demo_data(tmp_path):
+    cache = ToolResponseCache(
+        path=tmp_path / "cache.sqlite3", ttls={"GLOBAL_QUOTE": 0.01}, keep_stale=60
+    )
+    cache.set("GLOBAL_QUOTE", {"symbol": "IBM"}, CallToolResult(
+        content=[TextContent(type="text", text="IBM price 170.00")]
+    ).model_dump(mode="json"))
+    time.sleep(0.02)
+    pool = MCPConnectionPool(
+        StreamableHTTPConnectionParams(url="http://127.0.0.1:9/mcp"),
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.1),
+    )
+    quote = FlakyMCPTool("GLOBAL_QUOTE")
+    toolset = ManagedMCPToolset(
+        FakeMCPToolset([quote]), cache=cache, pool=pool,
+        degradation=DegradationPolicy(cache),
+    )
+    (tool,) = await toolset.get_tools()
+
+    stale = await tool.run_async(args={"symbol": "IBM"}, tool_context=None)
+    assert stale.content[0].text.startswith("[STALE DATA]")
+    assert stale.content[1].text == "IBM price 170.00"
+    await tool.run_async(args={"symbol": "MSFT"}, tool_context=None)
+    assert pool.stats()["circuit_open"] == 1
+
+    demo = await tool.run_async(args={"symbol": "AAPL"}, tool_context=None)
+    assert quote.calls == 2
+    assert demo.meta["source"] == "demo"
+    assert demo.structuredContent["Global Quote"]["05. price"] == "185.5000"
+    assert toolset.degradation.stats == {"stale_cache": 1, "demo": 2, "unavailable": 0}
+
+    quote.down = False
+    await asyncio.sleep(0.1)
+    live = await tool.run_async(args={"symbol": "TSLA"}, tool_context=None)
+    assert live.content[0].text == "TSLA price 185.50"
+    assert pool.stats()["circuit_open"] == pool.stats()["circuit_half_open"] == 0
+
+
+class FakeStream:
+    _closed = False
+
+
+class FakeSession:
+    def __init__(self):
+        self._read_stream = FakeStream()
+        self._write_stream = FakeStream()
+
+
+class FakeHandle:
+    open = True
+
+    async def close(self):
+        self.open = False
+
+
+class FakeConnectionPool(MCPConnectionPool):
+    """Connects without a server; the first ``failures`` attempts fail."""
+
+    def __init__(self, failures=0, **kwargs):
+        super().__init__(
+            StreamableHTTPConnectionParams(url="http://127.0.0.1:9/mcp"),
+            keepalive_interval=0,
+            backoff_base=0.001,
+            **kwargs,
+        )
+        self.failures = failures
+
+    async def _connect(self, merged_headers):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("refused")
+        return FakeSession(), FakeHandle()
+
+
+@pytest.mark.asyncio
+async def test_pool_reconnects_with_backoff_and_bounds_requests():
+    pool = FakeConnectionPool(failures=2, size=2, max_concurrent=1)
+    first = await pool.create_session()
+    second = await pool.create_session()
+    assert first is not second and await pool.create_session() is first
+    assert pool.stats()["connect_failures"] == 2
+
+    second._read_stream._closed = True
+    assert await pool.create_session() not in (first, second)
+    assert pool.stats()["reconnects"] == 1
+
+    release = asyncio.Event()
+
+    async def request():
+        async with pool.lease():
+            await release.wait()
+
+    tasks = [asyncio.create_task(request()) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    assert (pool.in_flight, pool.waiting) == (1, 1)
+    release.set()
+    await asyncio.gather(*tasks)
+    assert pool.stats()["requests"] == 2
+
+    with pytest.raises(ConnectionError):
+        await FakeConnectionPool(failures=3, connect_attempts=3).create_session()
+
+
+@pytest.mark.asyncio
+async def test_deadline_substitutes_stale_data_and_flags_it(tmp_path):
+    cache = ToolResponseCache(
+        path=tmp_path / "cache.sqlite3", ttls={"GLOBAL_QUOTE": 0.01}, keep_stale=60
+    )
+    cache.set("GLOBAL_QUOTE", {"symbol": "IBM"}, CallToolResult(
+        content=[TextContent(type="text", text="IBM price 170.00")]
+    ).model_dump(mode="json"))
+    time.sleep(0.02)
+    deadlines = DeadlinePolicy(deadlines={"GLOBAL_QUOTE": 0.05})
+    toolset = ManagedMCPToolset(
+        FakeMCPToolset([FakeMCPTool("GLOBAL_QUOTE", delay=5)]), cache=cache,
+        degradation=DegradationPolicy(cache), deadlines=deadlines,
+    )
+    (tool,) = await toolset.get_tools()
+    context = SimpleNamespace(state={})
+
+    started = time.monotonic()
+    result = await tool.run_async(args={"symbol": "ibm"}, tool_context=context)
+
+    assert time.monotonic() - started < 1
+    assert "no answer within 0.05s" in result.content[0].text
+    assert deadlines.stats["deadline_exceeded"] == 1
+    (entry,) = context.state[DEGRADED_DATA_KEY]
+    assert (entry["tool"], entry["symbol"], entry["source"]) == ("GLOBAL_QUOTE", "IBM", "stale_cache")
+    assert key_figures(context.state)[0] == ("Stale data: GLOBAL_QUOTE IBM", f"as of {entry['as_of']}")
+
+
+@pytest.mark.asyncio
+async def test_expired_deadline_counts_as_a_breaker_failure():
+    pool = MCPConnectionPool(
+        StreamableHTTPConnectionParams(url="http://127.0.0.1:9/mcp"),
+        breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60),
+    )
+    toolset = ManagedMCPToolset(
+        FakeMCPToolset([FakeMCPTool("GLOBAL_QUOTE", delay=5)]), pool=pool,
+        degradation=DegradationPolicy(None),
+        deadlines=DeadlinePolicy(deadlines={"GLOBAL_QUOTE": 0.05}),
+    )
+    (tool,) = await toolset.get_tools()
+
+    first = await tool.run_async(args={"symbol": "AAPL"}, tool_context=None)
+    second = await tool.run_async(args={"symbol": "MSFT"}, tool_context=None)
+
+    assert "no answer within 0.05s" in first.content[0].text
+    assert pool.breaker.state == CircuitBreaker.OPEN
+    assert second.meta["reason"] == "circuit open"
+
+
+@pytest.mark.asyncio
+async def test_deadline_starts_when_the_scheduler_dispatches_the_call():
+    scheduler = AlphaVantageScheduler(calls_per_minute=600, calls_per_day=100)
+    scheduler.minute_bucket.tokens = 0
+    deadlines = DeadlinePolicy(deadlines={"GLOBAL_QUOTE": 0.05})
+    toolset = ManagedMCPToolset(
+        FakeMCPToolset([FakeMCPTool("GLOBAL_QUOTE")]), scheduler=scheduler,
+        deadlines=deadlines,
+    )
+    (tool,) = await toolset.get_tools()
+
+    started = time.monotonic()
+    result = await tool.run_async(args={"symbol": "AAPL"}, tool_context=None)
+
+    assert time.monotonic() - started > 0.05
+    assert result.content[0].text == "AAPL price 185.50"
+    assert deadlines.stats["deadline_exceeded"] == 0
+
+
+class SlowOnceTool(FakeMCPTool):
+    """The first call hangs; later calls answer at once."""
+
+    async def run_async(self, *, args, tool_context):
+        self.delay = 5 if self.calls == 0 else 0
+        return await super().run_async(args=args, tool_context=tool_context)
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_after_the_latency_percentile():
+    deadlines = DeadlinePolicy(hedge_percentile=95, min_samples=3)
+    for seconds in (0.01, 0.02, 0.03):
+        deadlines.record("GLOBAL_QUOTE", seconds)
+    quote = SlowOnceTool("GLOBAL_QUOTE")
+    toolset = ManagedMCPToolset(FakeMCPToolset([quote]), deadlines=deadlines)
+    (tool,) = await toolset.get_tools()
+
+    started = time.monotonic()
+    result = await tool.run_async(args={"symbol": "AAPL"}, tool_context=None)
+
+    assert time.monotonic() - started < 1
+    assert result.content[0].text == "AAPL price 185.50"
+    assert quote.calls == 2
+    assert deadlines.stats == {"calls": 1, "deadline_exceeded": 0, "hedged": 1, "hedge_wins": 1}
+
+
+@pytest.mark.asyncio
+async def test_daily_bars_are_parsed_from_stale_and_demo_results(tmp_path, monkeypatch):
+    from financial_advisor.analytics import ohlcv_store
+    from financial_advisor.tools import market_data
+    from financial_advisor.tools.trading_analyst_tools import (
+        compute_technical_indicators,
+    )
+
+    store = ohlcv_store.OHLCVStore(tmp_path / "ohlcv")
+    monkeypatch.setattr(ohlcv_store, "_store_instance", store)
+    monkeypatch.delenv("DEMO_MODE", raising=False)
+    cache = ToolResponseCache(
+        path=tmp_path / "cache.sqlite3", ttls={"TIME_SERIES_DAILY": 0.01}, keep_stale=60
+    )
+    series = demo_response("TIME_SERIES_DAILY", {"symbol": "MSFT"})
+    cache.set("TIME_SERIES_DAILY", {"symbol": "MSFT", "outputsize": "compact"}, CallToolResult(
+        content=[TextContent(type="text", text=json.dumps(series))]
+    ).model_dump(mode="json"))
+    time.sleep(0.02)
+    toolset = ManagedMCPToolset(
+        FakeMCPToolset([FlakyMCPTool("TIME_SERIES_DAILY")]), cache=cache,
+        degradation=DegradationPolicy(cache),
+    )
+    monkeypatch.setattr(market_data, "get_alpha_vantage_mcp_toolset", lambda: toolset)
+
+    stale = await market_data.fetch_daily_ohlcv("MSFT")
+    assert len(stale["close"]) == len(series["Time Series (Daily)"])
+    assert stale["data_source"]["source"] == "stale_cache"
+    assert store.last_timestamp("MSFT", "daily") == stale["dates"][-1]
+
+    context = SimpleNamespace(state={})
+    demo = await compute_technical_indicators("AAPL", context)
+    assert demo["status"] == "success" and demo["bars"] > 0
+    assert demo["data_source"]["source"] == "demo"
+    assert context.state[DEGRADED_DATA_KEY][0]["source"] == "demo"
+    assert store.last_timestamp("AAPL", "daily") is None
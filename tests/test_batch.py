@@ -0,0 +1,162 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for batch analysis jobs"""
+
+import asyncio
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from google.genai import errors
+
+from financial_advisor import batch, workflow
+from financial_advisor.admission import AdmissionController
+from financial_advisor.batch import (
+    BatchManager,
+    BatchStore,
+    analyze_ticker,
+    is_quota_error,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+PROFILE = {"risk_attitude": "moderate", "investment_period": "long-term"}
+
+
+class FakeAnalyzer:
+    """Fails for the given tickers; counts concurrent runs."""
+
+    def __init__(self, failing=(), quota_failures=0):
+        self.failing = set(failing)
+        self.quota_failures = quota_failures
+        self.running = self.peak = 0
+        self.calls = []
+
+    async def __call__(self, ticker, profile):
+        self.calls.append(ticker)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.01)
+            if self.quota_failures:
+                self.quota_failures -= 1
+                raise RuntimeError("429 RESOURCE_EXHAUSTED")
+            if ticker in self.failing:
+                raise RuntimeError(f"no data for {ticker}")
+            return {"final_risk_assessment_output": f"{ticker} {profile['risk_attitude']}"}
+        finally:
+            self.running -= 1
+
+
+@pytest.mark.asyncio
+async def test_failed_tickers_are_resumed_without_rerunning_the_rest(tmp_path):
+    analyzer = FakeAnalyzer(failing={"MSFT"})
+    manager = BatchManager(BatchStore(tmp_path / "batch.sqlite3"), analyze=analyzer, max_concurrency=2)
+
+    job_id = manager.submit(["aapl", "MSFT", " nvda", "AAPL", "goog"], PROFILE)
+    await manager.wait(job_id)
+
+    job = manager.store.get_job(job_id)
+    assert [item["ticker"] for item in job["items"]] == ["AAPL", "MSFT", "NVDA", "GOOG"]
+    assert job["status"] == "partial"
+    assert job["counts"] == {"pending": 0, "running": 0, "done": 3, "failed": 1}
+    assert job["items"][0]["result"] == {"final_risk_assessment_output": "AAPL moderate"}
+    assert analyzer.peak == 2
+
+    analyzer.failing.clear()
+    assert manager.resume(job_id)
+    await manager.wait(job_id)
+    assert analyzer.calls.count("MSFT") == 2 and analyzer.calls.count("AAPL") == 1
+    assert manager.store.get_job(job_id)["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_quota_errors_are_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "QUOTA_RETRY_SECONDS", 0)
+    analyzer = FakeAnalyzer(quota_failures=2)
+    manager = BatchManager(BatchStore(tmp_path / "batch.sqlite3"), analyze=analyzer)
+
+    job_id = manager.submit(["AAPL"], PROFILE)
+    await manager.wait(job_id)
+    (item,) = manager.store.get_job(job_id)["items"]
+    assert item["status"] == "done" and item["attempts"] == 3
+
+
+def test_quota_errors_are_recognized_by_status_not_digits():
+    quota = errors.ClientError(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}})
+    assert is_quota_error(quota)
+    assert is_quota_error(RuntimeError("RESOURCE_EXHAUSTED: quota exceeded"))
+    assert not is_quota_error(RuntimeError("no filing 0001429 for TICK"))
+    assert not is_quota_error(errors.ClientError(404, {"error": {"code": 404, "status": "NOT_FOUND"}}))
+
+
+SLOTS_HELD = []
+
+
+class AdmissionProbe(BaseAgent):
+    """Records how many admission slots are held while it runs."""
+
+    async def _run_async_impl(self, ctx):
+        SLOTS_HELD.append(batch.get_admission_controller().in_flight)
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            actions=EventActions(state_delta={"final_risk_assessment_output": "ok"}),
+        )
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_hold_an_admission_slot(monkeypatch):
+    controller = AdmissionController(max_concurrent=1, max_queue=4, queue_timeout=5)
+    monkeypatch.setattr(batch, "get_admission_controller", lambda: controller)
+    monkeypatch.setattr(workflow, "analysis_pipeline", AdmissionProbe(name="probe"))
+
+    held = await controller.acquire("someone")
+    run = asyncio.create_task(analyze_ticker("AAPL", PROFILE))
+    await asyncio.sleep(0.05)
+    assert not run.done() and controller.queue_depth == 1
+
+    held.release()
+    assert await run == {"final_risk_assessment_output": "ok"}
+    assert SLOTS_HELD == [1] and controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_job_pauses_when_alpha_vantage_budget_is_spent(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "alpha_vantage_budget_spent", lambda: True)
+    manager = BatchManager(BatchStore(tmp_path / "batch.sqlite3"), analyze=FakeAnalyzer())
+
+    job_id = manager.submit(["AAPL", "MSFT"], PROFILE)
+    await manager.wait(job_id)
+    job = manager.store.get_job(job_id)
+    assert job["status"] == "paused" and job["counts"]["pending"] == 2
+
+
+@pytest.mark.asyncio
+async def test_results_stream_as_tickers_complete(tmp_path):
+    manager = BatchManager(BatchStore(tmp_path / "batch.sqlite3"), analyze=FakeAnalyzer())
+    job_id = manager.submit(["AAPL", "MSFT", "NVDA"], PROFILE)
+
+    events = [event async for event in manager.results(job_id)]
+    assert sorted(data["ticker"] for kind, data in events if kind == "result") == [
+        "AAPL", "MSFT", "NVDA"
+    ]
+    assert events[-1] == ("done", {"job_id": job_id, "status": "completed",
+                                   "pending": 0, "running": 0, "done": 3, "failed": 0})
+
+    # A late subscriber gets the stored results replayed
+    replayed = [event async for event in manager.results(job_id)]
+    assert len(replayed) == 4
@@ -0,0 +1,252 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for context caching of static agent instructions"""
+
+import time
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.apps import App
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from pydantic import Field
+
+from financial_advisor import context_cache
+from financial_advisor.agent import financial_coordinator
+from financial_advisor.context_cache import (
+    ContextCacheManager,
+    ContextCachePlugin,
+    static_prefix,
+)
+from financial_advisor.metrics import REGISTRY, MetricsPlugin
+from financial_advisor.sub_agents.summary_agent import summary_agent
+from financial_advisor.workflow import analysis_pipeline
+
+pytest_plugins = ("pytest_asyncio",)
+
+LONG_PROMPT = "You are a careful analyst. " * 400
+
+
+class FakeCaches:
+    """In-memory stand-in for the ``client.aio.caches`` API."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.created: dict = {}
+        self.updated: list = []
+        self.deleted: list = []
+
+    async def create(self, model, config):
+        if self.fail:
+            raise RuntimeError("400 cached content is too small")
+        name = f"cachedContents/{len(self.created) + 1}"
+        self.created[name] = (model, config)
+        return types.CachedContent(name=name, model=model)
+
+    async def update(self, name, config):
+        self.updated.append((name, config.ttl))
+
+    async def delete(self, name):
+        self.deleted.append(name)
+
+
+class FakeClient:
+    def __init__(self, caches: FakeCaches):
+        self.aio = type("Aio", (), {"caches": caches})()
+
+
+class CacheAwareLlm(BaseLlm):
+    """Calls one tool if asked, then replies; reports cached tokens when a cache is used."""
+
+    reply: str
+    call: dict = Field(default_factory=dict)
+    requests: list = Field(default_factory=list)
+
+    async def generate_content_async(self, llm_request, stream=False):
+        config = llm_request.config
+        self.requests.append(
+            (config.cached_content, config.system_instruction, bool(config.tools))
+        )
+        answered = any(
+            part.function_response
+            for content in llm_request.contents
+            for part in content.parts or []
+        )
+        if self.call and not answered:
+            part = types.Part.from_function_call(**self.call)
+        else:
+            part = types.Part(text=self.reply)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=1000,
+                cached_content_token_count=800 if config.cached_content else None,
+                candidates_token_count=10,
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_manager_creates_reuses_refreshes_and_evicts():
+    caches = FakeCaches()
+    manager = ContextCacheManager(FakeClient(caches), ttl_seconds=600, max_entries=1)
+
+    first = await manager.get_cache_name("gemini-2.5-flash", LONG_PROMPT)
+    assert await manager.get_cache_name("gemini-2.5-flash", LONG_PROMPT) == first
+    assert len(caches.created) == 1
+    assert caches.created[first][1].ttl == "600s"
+
+    # About to expire: the TTL is extended instead of creating a new cache
+    entry = next(iter(manager._entries.values()))
+    entry.expire_time = time.time() + 30
+    assert await manager.get_cache_name("gemini-2.5-flash", LONG_PROMPT) == first
+    assert caches.updated == [(first, "600s")]
+    assert entry.expire_time > time.time() + 500
+
+    # Expired: a new cache is created
+    entry.expire_time = time.time() - 1
+    second = await manager.get_cache_name("gemini-2.5-flash", LONG_PROMPT)
+    assert second != first
+
+    # A second prefix evicts the least recently used entry
+    third = await manager.get_cache_name("gemini-2.5-pro", LONG_PROMPT)
+    assert caches.deleted == [second]
+
+    await manager.close()
+    assert caches.deleted == [second, third]
+    assert manager.stats() == {
+        "entries": 0,
+        "cached_prefix_tokens": 0,
+        "hits": 2,
+        "creates": 3,
+        "refreshes": 1,
+        "expirations": 1,
+        "evictions": 1,
+        "errors": 0,
+        "skipped": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_manager_skips_small_prefixes_and_backs_off_after_errors():
+    caches = FakeCaches(fail=True)
+    manager = ContextCacheManager(FakeClient(caches))
+
+    assert await manager.get_cache_name("gemini-2.5-flash", "short prompt") is None
+    assert await manager.get_cache_name("gemini-2.5-flash", LONG_PROMPT) is None
+    assert await manager.get_cache_name("gemini-2.5-flash", LONG_PROMPT) is None
+    assert manager.stats()["skipped"] == 1
+    assert manager.stats()["errors"] == 1  # not retried during the back-off
+
+
+def test_static_prefix_covers_plain_and_static_instructions():
+    assert static_prefix(financial_coordinator) == financial_coordinator.instruction
+    assert static_prefix(LlmAgent(name="templated", instruction="Risk: {user_risk_attitude}")) is None
+    stage = analysis_pipeline.sub_agents[1]
+    assert stage.name == "trading_analyst_agent"
+    assert static_prefix(stage) == stage.static_instruction.parts[0].text
+    assert callable(stage.instruction)
+
+
+def _sample(agent: str, token_type: str) -> float:
+    return REGISTRY.get_sample_value(
+        "financial_advisor_model_tokens_total",
+        {"agent": agent, "model": "gemini-2.5-flash", "type": token_type},
+    ) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_plugin_serves_static_instructions_from_shared_caches(monkeypatch):
+    monkeypatch.setenv("AGENT_OUTPUT_CACHE_DISABLED", "1")
+    caches = FakeCaches()
+    monkeypatch.setattr(
+        context_cache, "_manager_instance", ContextCacheManager(FakeClient(caches))
+    )
+    summary_llm = CacheAwareLlm(model="gemini-2.5-flash", reply="summary", requests=[])
+    coordinator_llm = CacheAwareLlm(
+        model="gemini-2.5-flash",
+        reply="done",
+        call={"name": "summary_agent", "args": {"request": "summarize"}},
+        requests=[],
+    )
+    monkeypatch.setattr(summary_agent, "model", summary_llm)
+    monkeypatch.setattr(financial_coordinator, "model", coordinator_llm)
+    uncached_before = _sample("financial_coordinator", "uncached")
+
+    runner = Runner(
+        app=App(
+            name="financial_advisor",
+            root_agent=financial_coordinator,
+            plugins=[MetricsPlugin(), ContextCachePlugin()],
+        ),
+        session_service=InMemorySessionService(),
+    )
+    # Two sessions share the coordinator's and the sub-agent's caches
+    for session_id in ("s1", "s2"):
+        await runner.session_service.create_session(
+            app_name="financial_advisor", user_id="u", session_id=session_id
+        )
+        async for _ in runner.run_async(
+            user_id="u",
+            session_id=session_id,
+            new_message=types.Content(role="user", parts=[types.Part(text="hi")]),
+        ):
+            pass
+
+    assert len(caches.created) == 2
+    instructions = {config.system_instruction for _, config in caches.created.values()}
+    assert any(text.startswith(financial_coordinator.instruction) for text in instructions)
+    assert any(text.startswith(summary_agent.instruction) for text in instructions)
+    assert all(tools for _, config in caches.created.values() for tools in [config.tools])
+
+    # Every request points at a cache and leaves the prefix out
+    for llm in (coordinator_llm, summary_llm):
+        assert {name for name, _, _ in llm.requests} <= set(caches.created)
+        assert all(name and instruction is None and not has_tools
+                   for name, instruction, has_tools in llm.requests)
+    assert context_cache.get_context_cache_stats()["hits"] == 4
+    # 4 coordinator calls of 1000 prompt tokens, 800 of them cached
+    assert _sample("financial_coordinator", "uncached") - uncached_before == 800
+
+
+@pytest.mark.asyncio
+async def test_plugin_leaves_other_models_and_disabled_runs_alone(monkeypatch):
+    caches = FakeCaches()
+    monkeypatch.setattr(
+        context_cache, "_manager_instance", ContextCacheManager(FakeClient(caches))
+    )
+    llm = CacheAwareLlm(model="scripted", reply="hi", requests=[])
+    agent = LlmAgent(name="plain", model=llm, instruction=LONG_PROMPT)
+    runner = Runner(
+        app=App(name="plain", root_agent=agent, plugins=[ContextCachePlugin()]),
+        session_service=InMemorySessionService(),
+    )
+    await runner.session_service.create_session(app_name="plain", user_id="u", session_id="s")
+    for model, disabled in (("scripted", ""), ("gemini-2.5-flash", "1")):
+        monkeypatch.setattr(llm, "model", model)
+        monkeypatch.setenv("CONTEXT_CACHE_DISABLED", disabled)
+        async for _ in runner.run_async(
+            user_id="u",
+            session_id="s",
+            new_message=types.Content(role="user", parts=[types.Part(text="hi")]),
+        ):
+            pass
+    assert caches.created == {}
+    assert len(llm.requests) == 2
+    assert all(instruction.startswith(LONG_PROMPT) for _, instruction, _ in llm.requests)
@@ -0,0 +1,114 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for context shaping"""
+
+import json
+from pathlib import Path
+
+from financial_advisor import context_shaping
+from financial_advisor.context_benchmark import measure_inputs
+from financial_advisor.context_shaping import (
+    TRUNCATION_MARK,
+    Shape,
+    clip,
+    digest,
+    render_inputs,
+    select_sections,
+    shape,
+)
+
+REPORT = """**Report for: AAPL**
+
+**1. Current Market Data:**
+* **Current Stock Price:** $230.10
+* **Trading Volume:** 51,200,000
+
+**2. Executive Summary:**
+* Apple shows a strong market position.
+
+### **Part 1: All Proposed Strategies**
+Long prose about five strategies.
+### **Part 2: TOP 2 RECOMMENDED STRATEGIES**
+#### **TOP STRATEGY #1: Sector Leader**
+**Risk-Adjusted Return Metrics:**
+*   **Sharpe Ratio Estimate:** 0.8 - 1.1
+Why it ranks first.
+#### **TOP STRATEGY #2: Value Entry**
+*   **Expected Return:** 15% per year
+### **Part 3: Notes**
+Closing remarks.
+"""
+
+SESSIONS = sorted(Path(__file__).resolve().parents[1].glob("session-*.json"))
+
+
+def test_select_sections_keeps_matching_sections_with_their_sub_sections():
+    selected = select_sections(REPORT, ["top 2 recommended"])
+    assert selected.startswith("### **Part 2: TOP 2 RECOMMENDED STRATEGIES**")
+    assert "Why it ranks first." in selected and "15% per year" in selected
+    assert "Part 1" not in selected and "Closing remarks." not in selected
+
+    assert "Apple shows" in select_sections(REPORT, ["executive summary"])
+    assert select_sections(REPORT, ["no such heading"]) == ""
+
+
+def test_digest_keeps_key_metrics_under_their_headings():
+    lines = digest(REPORT).splitlines()
+    assert lines[:3] == [
+        "**1. Current Market Data:**",
+        "- **Current Stock Price:** $230.10",
+        "- **Trading Volume:** 51,200,000",
+    ]
+    assert "#### **TOP STRATEGY #1: Sector Leader**" in lines
+    assert "**2. Executive Summary:**" not in lines  # no key lines in that section
+    assert "Long prose about five strategies." not in lines
+
+
+def test_shape_falls_back_to_the_full_text_and_caps_it():
+    prose = "no headings here\n" * 10
+    assert shape(prose, Shape(sections=("risk",), digest=True), max_chars=0) == prose
+    clipped = clip(prose, 40)
+    assert clipped == "no headings here\nno headings here" + TRUNCATION_MARK
+
+
+def test_render_inputs_follows_the_switch_and_plan_file(monkeypatch, tmp_path):
+    state = {"execution_plan_output": REPORT}
+    full = "execution_plan_output:\n" + REPORT + "\n"
+
+    monkeypatch.setenv("CONTEXT_SHAPING", "off")
+    assert render_inputs("risk_analyst_agent", state, ["execution_plan_output"]) == full
+
+    monkeypatch.setenv("CONTEXT_SHAPING", "on")
+    shaped = render_inputs("risk_analyst_agent", state, ["execution_plan_output"])
+    assert "$230.10" in shaped and "Closing remarks." not in shaped
+
+    plan = tmp_path / "plan.json"
+    plan.write_text(json.dumps({"risk_analyst_agent": {"execution_plan_output": {"sections": ["notes"]}}}))
+    monkeypatch.setenv("CONTEXT_SHAPING_PLAN", str(plan))
+    assert context_shaping.get_plan("risk_analyst_agent")["execution_plan_output"] == Shape(
+        sections=("notes",)
+    )
+    shaped = render_inputs("risk_analyst_agent", state, ["execution_plan_output"])
+    assert "Closing remarks." in shaped and "$230.10" not in shaped
+
+
+def test_recorded_sessions_shrink_for_downstream_stages(monkeypatch):
+    monkeypatch.delenv("CONTEXT_SHAPING_PLAN", raising=False)
+    assert SESSIONS
+    for path in SESSIONS:
+        rows = {row["agent"]: row for row in measure_inputs(json.loads(path.read_text())["state"])}
+        for agent in ("execution_analyst_agent", "risk_analyst_agent", "summary_agent"):
+            assert rows[agent]["shaped_tokens"] < 0.6 * rows[agent]["full_tokens"]
@@ -0,0 +1,286 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the FastAPI application"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from pydantic import Field
+
+from financial_advisor.agent import financial_coordinator
+from financial_advisor.fast_api_app import app
+from financial_advisor.streaming import HEARTBEAT_FRAME, EventTranslator, stream_events
+from financial_advisor.sub_agents.summary_agent import summary_agent
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class ScriptedLlm(BaseLlm):
+    """Optionally calls one tool, then streams its reply in two chunks."""
+
+    reply: str
+    call: dict = Field(default_factory=dict)
+
+    async def generate_content_async(self, llm_request, stream=False):
+        answered = any(
+            part.function_response
+            for content in llm_request.contents
+            for part in content.parts or []
+        )
+        if self.call and not answered:
+            part = types.Part.from_function_call(**self.call)
+            yield LlmResponse(content=types.Content(role="model", parts=[part]))
+            return
+        if stream:
+            for chunk in (self.reply[:4], self.reply[4:]):
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                    partial=True,
+                )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=self.reply)]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=100, candidates_token_count=10
+            ),
+        )
+
+
+def parse_frames(body: str) -> list:
+    frames = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if lines:
+            frames.append((lines["event"], json.loads(lines["data"])))
+    return frames
+
+
+def test_query_stream_sends_tokens_and_sub_agent_boundaries(monkeypatch):
+    monkeypatch.setenv("AGENT_OUTPUT_CACHE_DISABLED", "1")
+    monkeypatch.setattr(summary_agent, "model", ScriptedLlm(model="scripted", reply="summary"))
+    monkeypatch.setattr(
+        financial_coordinator,
+        "model",
+        ScriptedLlm(
+            model="scripted",
+            reply="Here is your summary",
+            call={"name": "summary_agent", "args": {"request": "summarize"}},
+        ),
+    )
+
+    with TestClient(app) as client:
+        response = client.post("/query/stream", json={"query": "hi", "session_id": "s1"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = parse_frames(response.text)
+    kinds = [kind for kind, _ in frames]
+    assert kinds.index("agent_start") < kinds.index("agent_end") < kinds.index("token")
+    assert frames[kinds.index("agent_start")][1] == {"agent": "summary_agent"}
+    assert "".join(d["text"] for k, d in frames if k == "token") == "Here is your summary"
+    assert frames[-1] == ("done", {"session_id": "s1"})
+
+
+def test_query_returns_the_final_response(monkeypatch):
+    monkeypatch.setattr(
+        financial_coordinator, "model", ScriptedLlm(model="scripted", reply="Hello!")
+    )
+    with TestClient(app) as client:
+        response = client.post("/query", json={"query": "hi", "session_id": "q1"})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["result"], body["session_id"]) == ("Hello!", "q1")
+    assert body["usage"]["agents"]["financial_coordinator"]["prompt_tokens"] == 100
+
+
+def test_health_reports_session_memory_use():
+    with TestClient(app) as client:
+        sessions = client.get("/health").json()["sessions"]
+    assert set(sessions) >= {"sessions", "bytes", "limit_bytes", "evictions"}
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_heartbeats_and_cancels_on_disconnect():
+    cancelled = asyncio.Event()
+
+    async def silent_run():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        yield  # pragma: no cover
+
+    checks = iter([False, True])
+
+    async def is_disconnected():
+        return next(checks)
+
+    frames = [
+        frame
+        async for frame in stream_events(
+            silent_run(),
+            EventTranslator("root", set()),
+            "s1",
+            heartbeat_seconds=0.02,
+            is_disconnected=is_disconnected,
+        )
+    ]
+
+    assert frames == [HEARTBEAT_FRAME]
+    assert cancelled.is_set()
+
+
+def test_batch_endpoints_poll_and_stream(monkeypatch, tmp_path):
+    from financial_advisor import batch
+
+    async def analyze(ticker, profile):
+        return {"final_risk_assessment_output": f"{ticker} {profile['investment_period']}"}
+
+    monkeypatch.setattr(
+        batch, "_manager_instance", batch.BatchManager(batch.BatchStore(tmp_path / "b.db"), analyze)
+    )
+    with TestClient(app) as client:
+        created = client.post(
+            "/batch",
+            json={"tickers": ["AAPL", "MSFT"], "risk_attitude": "moderate",
+                  "investment_period": "long-term"},
+        )
+        assert created.status_code == 202 and created.json()["total"] == 2
+        job_id = created.json()["job_id"]
+
+        frames = parse_frames(client.get(f"/batch/{job_id}/stream").text)
+        assert [kind for kind, _ in frames] == ["result", "result", "done"]
+        job = client.get(f"/batch/{job_id}").json()
+        assert job["status"] == "completed"
+        assert job["items"][1]["result"] == {"final_risk_assessment_output": "MSFT long-term"}
+        assert client.get("/batch/unknown").status_code == 404
+
+
+def test_query_is_shed_with_503_when_the_queue_is_full(monkeypatch):
+    from financial_advisor import admission
+
+    controller = admission.AdmissionController(max_concurrent=1, max_queue=0)
+    controller.in_flight = 1
+    monkeypatch.setattr(admission, "_controller_instance", controller)
+    with TestClient(app) as client:
+        response = client.post("/query", json={"query": "hi", "session_id": "busy"})
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.json()["reason"] == "queue_full"
+
+
+def test_stream_is_shed_before_its_session_is_created(monkeypatch):
+    from financial_advisor import admission, fast_api_app
+
+    controller = admission.AdmissionController(max_concurrent=1, max_queue=0)
+    controller.in_flight = 1
+    monkeypatch.setattr(admission, "_controller_instance", controller)
+    with TestClient(app) as client:
+        response = client.post("/query/stream", json={"query": "hi", "session_id": "shed"})
+    assert response.status_code == 503
+    session = asyncio.run(
+        fast_api_app.session_service.get_session(
+            app_name=fast_api_app.adk_app.name, user_id="default", session_id="shed"
+        )
+    )
+    assert session is None
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_releases_its_slot_if_never_sent():
+    from starlette.requests import ClientDisconnect
+
+    from financial_advisor.admission import AdmissionController
+    from financial_advisor.fast_api_app import AdmittedStreamingResponse
+
+    controller = AdmissionController(max_concurrent=1)
+    iterated = []
+
+    async def body():
+        iterated.append(True)
+        yield "data"
+
+    async def send(message):
+        raise OSError("client went away")
+
+    response = AdmittedStreamingResponse(body(), await controller.acquire("u"))
+    with pytest.raises(ClientDisconnect):
+        await response({"type": "http", "asgi": {"spec_version": "2.4"}}, None, send)
+    assert not iterated and controller.in_flight == 0
+
+
+def test_metrics_cover_requests_agents_tools_and_tokens(monkeypatch):
+    monkeypatch.setenv("AGENT_OUTPUT_CACHE_DISABLED", "1")
+    monkeypatch.setattr(summary_agent, "model", ScriptedLlm(model="scripted", reply="summary"))
+    monkeypatch.setattr(
+        financial_coordinator,
+        "model",
+        ScriptedLlm(
+            model="scripted",
+            reply="done",
+            call={"name": "summary_agent", "args": {"request": "summarize"}},
+        ),
+    )
+    with TestClient(app) as client:
+        client.post("/query", json={"query": "hi", "session_id": "m1"})
+        response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'financial_advisor_http_request_duration_seconds_count{method="POST",route="/query",status="200"}' in text
+    assert 'financial_advisor_agent_run_duration_seconds_count{agent="summary_agent"}' in text
+    assert 'financial_advisor_tool_call_duration_seconds_count{kind="agent",tool="summary_agent"}' in text
+    assert 'financial_advisor_model_tokens_total{agent="summary_agent",model="scripted",type="prompt"}' in text
+    assert "financial_advisor_sessions_bytes" in text
+    assert "financial_advisor_admission_queue_depth" in text
+
+
+def test_ready_waits_for_warmup_while_health_is_live(monkeypatch):
+    from financial_advisor import warmup
+
+    gate = threading.Event()
+
+    async def slow_mcp():
+        while not gate.is_set():
+            await asyncio.sleep(0.01)
+        return {"tools": 3}
+
+    async def failing_model():
+        raise RuntimeError("no credentials")
+
+    monkeypatch.setattr(
+        warmup,
+        "_warmup_instance",
+        warmup.Warmup(["mcp", "model"], step_functions={"mcp": slow_mcp, "model": failing_model}),
+    )
+    with TestClient(app) as client:
+        health = client.get("/health")
+        assert health.status_code == 200 and health.json()["ready"] is False
+        assert client.get("/ready").status_code == 503
+        gate.set()
+        deadline = time.monotonic() + 5
+        while (ready := client.get("/ready")).status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert ready.status_code == 200
+    steps = ready.json()["steps"]
+    assert steps["mcp"]["status"] == "ok" and steps["mcp"]["tools"] == 3
+    assert steps["model"]["status"] == "failed" and steps["model"]["error"] == "no credentials"
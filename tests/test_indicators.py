@@ -0,0 +1,154 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the local technical indicator engine"""
+
+import numpy as np
+import pytest
+
+from financial_advisor.analytics import indicators
+from financial_advisor.analytics.ohlcv_store import OHLCVStore
+from financial_advisor.tools.market_data import parse_time_series
+from financial_advisor.tools.mcp_replay_server import demo_response
+
+
+@pytest.fixture
+def bars():
+    return parse_time_series(demo_response("TIME_SERIES_DAILY", {"symbol": "AAPL"}))
+
+
+def reference_wilder(values, period, alpha):
+    """Straightforward loop implementation used as the oracle."""
+    out = [np.nan] * len(values)
+    out[period - 1] = sum(values[:period]) / period
+    for i in range(period, len(values)):
+        out[i] = out[i - 1] + alpha * (values[i] - out[i - 1])
+    return np.array(out)
+
+
+def test_parse_time_series_orders_oldest_first(bars):
+    assert len(bars["close"]) == 100
+    assert bars["dates"][0] < bars["dates"][-1]
+    assert bars["close"][-1] == pytest.approx(185.50)
+
+
+def test_parse_time_series_accepts_csv():
+    csv_text = (
+        "timestamp,open,high,low,close,volume\n"
+        "2025-01-21,2,3,1,2.5,100\n"
+        "2025-01-20,1,2,0.5,1.5,200\n"
+    )
+    bars = parse_time_series(csv_text)
+    assert bars["close"].tolist() == [1.5, 2.5]
+
+
+def test_ema_matches_recursive_definition(bars):
+    close = bars["close"]
+    expected = reference_wilder(close, 20, 2 / 21)
+    np.testing.assert_allclose(indicators.ema(close, 20), expected, rtol=1e-9)
+
+
+def test_rsi_matches_recursive_definition(bars):
+    close = bars["close"]
+    change = np.diff(close)
+    gain = reference_wilder(np.clip(change, 0, None), 14, 1 / 14)
+    loss = reference_wilder(np.clip(-change, 0, None), 14, 1 / 14)
+    expected = np.concatenate(([np.nan], 100 - 100 / (1 + gain / loss)))
+    result = indicators.rsi(close, 14)
+    np.testing.assert_allclose(result, expected, rtol=1e-9)
+    assert np.isnan(result[:14]).all() and not np.isnan(result[14:]).any()
+
+
+def test_atr_matches_recursive_definition(bars):
+    high, low, close = bars["high"], bars["low"], bars["close"]
+    tr = [
+        max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        for i in range(1, len(close))
+    ]
+    expected = np.concatenate(([np.nan], reference_wilder(np.array(tr), 14, 1 / 14)))
+    np.testing.assert_allclose(indicators.atr(high, low, close, 14), expected, rtol=1e-9)
+
+
+def test_bands_oscillators_and_volume_are_well_formed(bars):
+    high, low, close, volume = bars["high"], bars["low"], bars["close"], bars["volume"]
+
+    bands = indicators.bbands(close)
+    valid = ~np.isnan(bands["middle"])
+    assert (bands["upper"][valid] >= bands["middle"][valid]).all()
+    assert (bands["lower"][valid] <= bands["middle"][valid]).all()
+
+    stoch = indicators.stoch(high, low, close)
+    k = stoch["slow_k"][~np.isnan(stoch["slow_k"])]
+    assert ((k >= 0) & (k <= 100)).all()
+
+    adx = indicators.adx(high, low, close)["adx"]
+    assert np.isnan(adx[:27]).all()
+    assert 0 <= adx[-1] <= 100
+
+    obv = indicators.obv([1, 2, 2, 1], [10, 20, 30, 40])
+    assert obv.tolist() == [10, 30, 30, -10]
+
+    steps = np.abs(np.diff(indicators.obv(close, volume)))
+    moved = np.diff(np.asarray(close, dtype=float)) != 0
+    np.testing.assert_allclose(steps, np.where(moved, np.asarray(volume)[1:], 0))
+
+    macd = indicators.macd(close)
+    np.testing.assert_allclose(
+        macd["histogram"][-1], macd["macd"][-1] - macd["signal"][-1]
+    )
+    assert indicators.max_drawdown([100, 120, 90, 130]) == pytest.approx(-25.0)
+
+
+def test_ohlcv_store_appends_only_new_bars(tmp_path, bars):
+    store = OHLCVStore(tmp_path)
+    older = {name: column[:60] for name, column in bars.items()}
+    assert store.append("aapl", "daily", older) == 60
+    assert store.append("AAPL", "daily", bars) == 40
+    assert store.append("AAPL", "daily", bars) == 0
+
+    stored = store.read("AAPL", "daily")
+    np.testing.assert_array_equal(stored["dates"], bars["dates"])
+    np.testing.assert_array_equal(stored["close"], bars["close"])
+    assert store.last_timestamp("AAPL", "daily") == bars["dates"][-1]
+
+    tail = store.read("AAPL", "daily", start=str(bars["dates"][90]), last=3)
+    np.testing.assert_array_equal(tail["close"], bars["close"][-3:])
+
+
+def test_ohlcv_store_replaces_the_open_bar(tmp_path, bars):
+    store = OHLCVStore(tmp_path)
+    store.append("AAPL", "daily", bars)
+    revised = {name: column[-1:].copy() for name, column in bars.items()}
+    revised["close"][0] = 200.0
+    assert store.append("AAPL", "daily", revised) == 0
+    assert store.read("AAPL", "daily", last=1)["close"][0] == 200.0
+
+
+def test_ohlcv_store_drops_rows_of_an_interrupted_append(tmp_path, bars):
+    store = OHLCVStore(tmp_path)
+    store.append("AAPL", "daily", {name: column[:60] for name, column in bars.items()})
+    # A crash after the price columns were written but before the timestamps
+    for name in ("open", "high", "low", "close", "volume"):
+        with open(tmp_path / "AAPL" / "daily" / f"{name}.f8", "ab") as f:
+            f.write(np.full(3, -1.0).tobytes())
+
+    revised = {name: column[59:60].copy() for name, column in bars.items()}
+    revised["close"][0] = 200.0
+    assert store.append("AAPL", "daily", revised) == 0
+    assert store.read("AAPL", "daily", last=1)["close"][0] == 200.0
+    assert store.append("AAPL", "daily", bars) == 40
+
+    stored = store.read("AAPL", "daily")
+    np.testing.assert_array_equal(stored["close"][60:], bars["close"][60:])
+    np.testing.assert_array_equal(stored["open"], bars["open"])
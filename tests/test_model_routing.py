@@ -0,0 +1,73 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for per-agent model routing and the model benchmark"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from financial_advisor.model_benchmark import (
+    format_table,
+    load_agent_requests,
+    summarize,
+)
+from financial_advisor.model_routing import (
+    FAST_MODEL,
+    PRO_MODEL,
+    estimate_cost,
+    get_model,
+)
+
+SESSION_FILE = Path(__file__).parent.parent / "session-5eacfd80-33a5-4b48-96eb-1b01ee9fe045.json"
+
+
+def test_get_model_overrides_in_order(monkeypatch, tmp_path):
+    assert get_model("risk_analyst_agent") == PRO_MODEL
+    assert get_model("summary_agent") == FAST_MODEL
+
+    monkeypatch.setenv("FINANCIAL_ADVISOR_MODEL_DEFAULT", "gemini-2.5-flash-lite")
+    assert get_model("risk_analyst_agent") == "gemini-2.5-flash-lite"
+
+    config = tmp_path / "models.json"
+    config.write_text(json.dumps({"risk_analyst_agent": FAST_MODEL}))
+    monkeypatch.setenv("FINANCIAL_ADVISOR_MODEL_CONFIG", str(config))
+    assert get_model("risk_analyst_agent") == FAST_MODEL
+
+    monkeypatch.setenv("FINANCIAL_ADVISOR_MODEL_RISK_ANALYST_AGENT", PRO_MODEL)
+    assert get_model("risk_analyst_agent") == PRO_MODEL
+
+
+def test_estimate_cost():
+    assert estimate_cost(PRO_MODEL, 1_000_000, 100_000) == pytest.approx(2.25)
+    assert estimate_cost(PRO_MODEL, 1_000_000, 0, cached_tokens=1_000_000) == pytest.approx(0.3125)
+    assert estimate_cost("unknown-model", 10, 10) is None
+
+
+def test_benchmark_replays_recorded_requests_and_summarizes():
+    names = {"data_analyst_agent", "trading_analyst_agent", "risk_analyst_agent"}
+    calls, state = load_agent_requests(SESSION_FILE, names)
+    assert [name for name, _ in calls][:2] == ["data_analyst_agent", "trading_analyst_agent"]
+    assert "AAPL" in calls[0][1]
+    assert "market_data_analysis_output" in state
+
+    results = [
+        {"agent": "summary_agent", "model": FAST_MODEL, "seconds": s,
+         "prompt_tokens": 1000, "output_tokens": 200, "cost_usd": 0.0008}
+        for s in (1.0, 3.0)
+    ]
+    (row,) = summarize(results)
+    assert row["runs"] == 2 and row["mean_seconds"] == 2.0 and row["configured"]
+    assert "summary_agent" in format_table([row])
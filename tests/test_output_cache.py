@@ -0,0 +1,218 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the sub-agent output cache"""
+
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.adk.sessions.state import State
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+from pydantic import Field
+
+from financial_advisor import output_cache
+from financial_advisor.agent import financial_coordinator
+from financial_advisor.output_cache import (
+    OutputCachePlugin,
+    check_agent_output_cache,
+    fingerprint_inputs,
+)
+from financial_advisor.sub_agents.trading_analyst import trading_analyst_agent
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class CountingLlm(BaseLlm):
+    """Optionally calls one tool, then replies with fixed text; counts calls."""
+
+    reply: str
+    call: dict = Field(default_factory=dict)
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request, stream=False):
+        self.calls += 1
+        answered = any(
+            part.function_response
+            for content in llm_request.contents
+            for part in content.parts or []
+        )
+        if self.call and not answered:
+            part = types.Part.from_function_call(**self.call)
+        else:
+            part = types.Part(text=self.reply)
+        yield LlmResponse(content=types.Content(role="model", parts=[part]))
+
+
+def test_fingerprint_normalizes_profile_from_request_or_state():
+    state = {"market_data_analysis_output": "AAPL report"}
+    from_request = fingerprint_inputs(
+        "trading_analyst_agent",
+        state,
+        "The user's risk attitude is 'Moderate' and their investment period is 'Long Term'.",
+    )
+    from_state = fingerprint_inputs(
+        "trading_analyst_agent",
+        {**state, "user_risk_attitude": "balanced", "user_investment_period": "long-term"},
+    )
+    assert from_request == from_state
+    assert from_request["risk_attitude"] == "moderate"
+    assert from_request["investment_period"] == "long-term"
+
+    assert fingerprint_inputs("trading_analyst_agent", state, "no profile given") is None
+    assert fingerprint_inputs("data_analyst_agent", {"ticker": "aapl"})["ticker"] == "AAPL"
+
+
+def test_data_analyst_is_not_cached_on_a_ticker_guessed_from_the_request():
+    for request in (
+        "The ticker is MSFT",
+        "Analyze ticker for Apple (AAPL)",
+        "Compare the ticker NVDA and GOOGL",
+    ):
+        assert fingerprint_inputs("data_analyst_agent", {}, request) is None
+    assert fingerprint_inputs("data_analyst_agent", {"ticker": "MSFT"}, "The ticker is MSFT")[
+        "ticker"
+    ] == "MSFT"
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_are_answered_from_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("AGENT_OUTPUT_CACHE_PATH", str(tmp_path / "outputs.sqlite3"))
+    monkeypatch.setattr(output_cache, "_cache_instance", None)
+
+    trading_model = CountingLlm(model="scripted", reply="five strategies")
+    monkeypatch.setattr(trading_analyst_agent, "model", trading_model)
+    monkeypatch.setattr(
+        financial_coordinator,
+        "model",
+        CountingLlm(
+            model="scripted",
+            reply="done",
+            call={
+                "name": "trading_analyst_agent",
+                "args": {"request": "Risk attitude: moderate. Investment period: long-term."},
+            },
+        ),
+    )
+
+    runner = InMemoryRunner(agent=financial_coordinator)
+    states = []
+    for user in ("alice", "bob"):
+        session = await runner.session_service.create_session(
+            app_name=runner.app_name,
+            user_id=user,
+            state={"market_data_analysis_output": "AAPL market report"},
+        )
+        async for _event in runner.run_async(
+            user_id=user,
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text="go")]),
+        ):
+            pass
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name, user_id=user, session_id=session.id
+        )
+        states.append(session.state)
+
+    assert trading_model.calls == 1
+    assert states[0]["agent_output_cache"]["agents"] == {"trading_analyst_agent": "miss"}
+    assert states[1]["agent_output_cache"] == {
+        "hits": 1,
+        "misses": 0,
+        "agents": {"trading_analyst_agent": "hit"},
+    }
+    assert states[1]["proposed_trading_strategies_output"] == "five strategies"
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_restores_the_structured_payload(monkeypatch, tmp_path):
+    monkeypatch.setenv("AGENT_OUTPUT_CACHE_PATH", str(tmp_path / "outputs.sqlite3"))
+    monkeypatch.setattr(output_cache, "_cache_instance", None)
+
+    strategies = {"strategies": [{"name": "Sector Leader", "top_rank": 1}]}
+    monkeypatch.setattr(
+        trading_analyst_agent,
+        "model",
+        CountingLlm(
+            model="scripted",
+            reply="five strategies",
+            call={"name": "record_trading_strategies", "args": {"strategies": strategies}},
+        ),
+    )
+    monkeypatch.setattr(
+        financial_coordinator,
+        "model",
+        CountingLlm(
+            model="scripted",
+            reply="done",
+            call={
+                "name": "trading_analyst_agent",
+                "args": {"request": "Risk attitude: moderate. Investment period: long-term."},
+            },
+        ),
+    )
+
+    runner = InMemoryRunner(agent=financial_coordinator)
+    states = []
+    for user in ("alice", "bob"):
+        session = await runner.session_service.create_session(
+            app_name=runner.app_name,
+            user_id=user,
+            state={"market_data_analysis_output": "AAPL market report"},
+        )
+        async for _event in runner.run_async(
+            user_id=user,
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text="go")]),
+        ):
+            pass
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name, user_id=user, session_id=session.id
+        )
+        states.append(session.state)
+
+    assert states[1]["agent_output_cache"]["hits"] == 1
+    for state in states:
+        assert state["proposed_trading_strategies_output"] == "five strategies"
+        assert state["trading_strategies_structured"] == strategies
+
+
+@pytest.mark.asyncio
+async def test_a_miss_clears_the_payload_and_a_failed_call_is_forgotten(monkeypatch, tmp_path):
+    monkeypatch.setenv("AGENT_OUTPUT_CACHE_PATH", str(tmp_path / "outputs.sqlite3"))
+    monkeypatch.setattr(output_cache, "_cache_instance", None)
+    tool = AgentTool(agent=trading_analyst_agent)
+    context = SimpleNamespace(
+        function_call_id="call-1",
+        state=State(
+            {
+                "market_data_analysis_output": "MSFT market report",
+                "trading_strategies_structured": {"strategies": ["from AAPL"]},
+            },
+            {},
+        ),
+    )
+    request = {"request": "Risk attitude: moderate. Investment period: long-term."}
+
+    assert check_agent_output_cache(tool, request, context) is None
+    assert context.state["trading_strategies_structured"] is None
+    assert "call-1" in output_cache._pending
+
+    await OutputCachePlugin().on_tool_error_callback(
+        tool=tool, tool_args=request, tool_context=context, error=RuntimeError("boom")
+    )
+    assert "call-1" not in output_cache._pending
@@ -0,0 +1,143 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the concurrent sub-agent fan-out"""
+
+import asyncio
+import gc
+import time
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from financial_advisor.pipeline import fan_out
+from financial_advisor.utils import stage_timing
+from financial_advisor.utils.stage_timing import record_stage_end, record_stage_start
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class SlowEchoAgent(BaseAgent):
+    """Replies with the request after a delay, tracking peak concurrency."""
+
+    delay: float = 0.1
+    running: int = 0
+    peak: int = 0
+
+    async def _run_async_impl(self, ctx):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            request = ctx.user_content.parts[0].text
+            if request == "fail":
+                raise RuntimeError("boom")
+            yield Event(
+                author=self.name,
+                invocation_id=ctx.invocation_id,
+                content=types.Content(
+                    role="model", parts=[types.Part(text=f"echo {request}")]
+                ),
+            )
+        finally:
+            self.running -= 1
+
+
+@pytest.mark.asyncio
+async def test_fan_out_runs_items_concurrently_up_to_the_limit():
+    agent = SlowEchoAgent(name="echo_agent")
+    state = {"market_data_analysis_output": "prior"}
+    requests = {f"T{i}": f"ticker {i}" for i in range(4)}
+
+    started = time.perf_counter()
+    results = await fan_out(agent, requests, state, stage="echo_stage", max_concurrency=2)
+    elapsed = time.perf_counter() - started
+
+    assert agent.peak == 2
+    assert 0.2 <= elapsed < 0.35
+    assert results["T3"]["status"] == "success"
+    assert results["T3"]["output"] == "echo ticker 3"
+    assert results["T3"]["seconds"] == pytest.approx(0.1, abs=0.05)
+
+    timings = state["stage_timings"]
+    assert timings["echo_stage"]["items"] == 4
+    assert timings["echo_stage"]["max_concurrency"] == 2
+    assert set(timings) == {"echo_stage"} | {f"echo_agent[T{i}]" for i in range(4)}
+    assert state["market_data_analysis_output"] == "prior"
+
+
+@pytest.mark.asyncio
+async def test_fan_out_reports_failed_items_without_failing_the_rest():
+    agent = SlowEchoAgent(name="echo_agent", delay=0)
+    results = await fan_out(agent, {"ok": "hi", "bad": "fail"}, {}, stage="echo_stage")
+
+    assert results["ok"]["output"] == "echo hi"
+    assert results["bad"]["status"] == "error"
+    assert "boom" in results["bad"]["message"]
+
+
+@pytest.mark.asyncio
+async def test_stage_callbacks_record_agent_duration_in_state():
+    agent = SlowEchoAgent(
+        name="echo_agent",
+        delay=0.05,
+        before_agent_callback=record_stage_start,
+        after_agent_callback=record_stage_end,
+    )
+    runner = InMemoryRunner(agent=agent)
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="test_user"
+    )
+    for _ in range(2):
+        async for _event in runner.run_async(
+            user_id="test_user",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text="hi")]),
+        ):
+            pass
+
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id="test_user", session_id=session.id
+    )
+    timing = session.state["stage_timings"]["echo_agent"]
+    assert timing["runs"] == 2
+    assert timing["seconds"] == pytest.approx(0.05, abs=0.04)
+    assert timing["total_seconds"] >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_stage_start_is_forgotten_when_the_agent_raises():
+    agent = SlowEchoAgent(
+        name="echo_agent",
+        delay=0,
+        before_agent_callback=record_stage_start,
+        after_agent_callback=record_stage_end,
+    )
+    runner = InMemoryRunner(agent=agent)
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="test_user"
+    )
+    with pytest.raises(RuntimeError, match="boom"):
+        async for _event in runner.run_async(
+            user_id="test_user",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text="fail")]),
+        ):
+            pass
+
+    gc.collect()
+    assert stage_timing._stage_starts == {}
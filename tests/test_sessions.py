@@ -0,0 +1,203 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the persistent session services"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from google.adk.events import Event, EventActions
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+from financial_advisor.sessions import (
+    BoundedMemorySessionService,
+    RedisSessionService,
+    SqliteSessionService,
+    get_session_service,
+)
+from financial_advisor.sessions.redis_stand_in import RedisStandIn
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+@pytest_asyncio.fixture(params=["sqlite", "redis"])
+async def make_service(request, tmp_path):
+    """Factory of services sharing one store, as separate instances would."""
+    services = []
+    server = None
+    if request.param == "redis":
+        server = await RedisStandIn().start()
+
+    def make(**options):
+        if server is not None:
+            service = RedisSessionService(url=server.url, **options)
+        else:
+            service = SqliteSessionService(tmp_path / "sessions.sqlite3", **options)
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        if isinstance(service, RedisSessionService):
+            await service.close()
+    if server is not None:
+        await server.stop()
+
+
+def delta_event(index: int, **delta) -> Event:
+    return Event(
+        invocation_id=f"inv-{index}",
+        author="financial_coordinator",
+        actions=EventActions(state_delta=delta),
+    )
+
+
+@pytest.mark.asyncio
+async def test_state_deltas_are_shared_between_instances(make_service):
+    first, second = make_service(), make_service()
+    created = await first.create_session(
+        app_name="app", user_id="alice", session_id="s1",
+        state={"ticker": "AAPL", "user:risk": "moderate", "app:version": 1},
+    )
+    assert created.state == {"ticker": "AAPL", "user:risk": "moderate", "app:version": 1}
+
+    # Each instance appends to its own copy; only the changed keys are written
+    other = await second.get_session(app_name="app", user_id="alice", session_id="s1")
+    await first.append_event(created, delta_event(1, market_data_analysis_output="report"))
+    await second.append_event(
+        other, delta_event(2, proposed_trading_strategies_output="plan", **{"temp:x": 1})
+    )
+
+    session = await make_service().get_session(app_name="app", user_id="alice", session_id="s1")
+    assert session.state == {
+        "ticker": "AAPL",
+        "user:risk": "moderate",
+        "app:version": 1,
+        "market_data_analysis_output": "report",
+        "proposed_trading_strategies_output": "plan",
+    }
+    assert [event.invocation_id for event in session.events] == ["inv-1", "inv-2"]
+
+    # app: and user: keys are visible from the user's other sessions
+    await first.create_session(app_name="app", user_id="alice", session_id="s2")
+    (s1, s2) = sorted(
+        (await second.list_sessions(app_name="app", user_id="alice")).sessions,
+        key=lambda s: s.id,
+    )
+    assert s2.state == {"user:risk": "moderate", "app:version": 1}
+    assert s1.events == []
+
+    await second.delete_session(app_name="app", user_id="alice", session_id="s1")
+    assert await first.get_session(app_name="app", user_id="alice", session_id="s1") is None
+
+
+@pytest.mark.asyncio
+async def test_event_history_is_capped(make_service):
+    service = make_service(max_events=3)
+    session = await service.create_session(app_name="app", user_id="bob")
+    for index in range(5):
+        await service.append_event(session, delta_event(index, step=index))
+    assert len(session.events) == 3
+
+    stored = await service.get_session(app_name="app", user_id="bob", session_id=session.id)
+    assert [event.invocation_id for event in stored.events] == ["inv-2", "inv-3", "inv-4"]
+    assert stored.state["step"] == 4
+
+    recent = await service.get_session(
+        app_name="app", user_id="bob", session_id=session.id,
+        config=GetSessionConfig(num_recent_events=1),
+    )
+    assert [event.invocation_id for event in recent.events] == ["inv-4"]
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_expire(make_service):
+    service = make_service(ttl_seconds=0.2)
+    idle = await service.create_session(app_name="app", user_id="carol", session_id="idle")
+    active = await service.create_session(app_name="app", user_id="carol", session_id="active")
+    await asyncio.sleep(0.15)
+    await service.append_event(active, delta_event(1, touched=True))
+    await asyncio.sleep(0.1)
+
+    assert await service.get_session(app_name="app", user_id="carol", session_id=idle.id) is None
+    listed = await service.list_sessions(app_name="app", user_id="carol")
+    assert [session.id for session in listed.sessions] == ["active"]
+
+
+def test_get_session_service_by_backend(monkeypatch, tmp_path):
+    monkeypatch.setenv("SESSION_DB_PATH", str(tmp_path / "sessions.sqlite3"))
+    assert isinstance(get_session_service(), BoundedMemorySessionService)
+    assert isinstance(get_session_service("memory"), InMemorySessionService)
+    monkeypatch.setenv("SESSION_BACKEND", "sqlite")
+    assert isinstance(get_session_service(), SqliteSessionService)
+    with pytest.raises(ValueError):
+        get_session_service("postgres")
+
+
+@pytest.mark.asyncio
+async def test_bounded_store_evicts_least_recently_used_and_spills(tmp_path):
+    service = BoundedMemorySessionService(
+        max_bytes=5000, spill_path=tmp_path / "spill.sqlite3", min_idle_seconds=0
+    )
+    report = "x" * 1000
+    for name in ("a", "b"):
+        session = await service.create_session(
+            app_name="app", user_id="dan", session_id=name, state={"user:plan": "pro"}
+        )
+        await service.append_event(session, delta_event(1, market_data_analysis_output=report))
+    assert service.usage()["sessions"] == 2
+    # The report is counted twice: in state and in the event carrying its delta
+    assert 4000 < service.usage()["bytes"] <= 5000
+
+    # Touch "a" so "b" is the least recently used when "c" pushes past the ceiling
+    await service.get_session(app_name="app", user_id="dan", session_id="a")
+    session = await service.create_session(app_name="app", user_id="dan", session_id="c")
+    await service.append_event(session, delta_event(1, market_data_analysis_output=report))
+
+    usage = service.usage()
+    assert usage["evictions"] == 1 and usage["spilled"] == 1
+    assert usage["bytes"] <= 5000
+    listed = await service.list_sessions(app_name="app", user_id="dan")
+    assert sorted(s.id for s in listed.sessions) == ["a", "b", "c"]
+
+    restored = await service.get_session(app_name="app", user_id="dan", session_id="b")
+    assert restored.state == {"user:plan": "pro", "market_data_analysis_output": report}
+    assert [event.invocation_id for event in restored.events] == ["inv-1"]
+    assert service.usage()["restored"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bounded_store_keeps_active_sessions():
+    service = BoundedMemorySessionService(max_bytes=100, min_idle_seconds=60)
+    session = await service.create_session(app_name="app", user_id="eve")
+    await service.append_event(session, delta_event(1, market_data_analysis_output="x" * 500))
+    assert service.usage()["evictions"] == 0
+    assert service.usage()["bytes"] > service.max_bytes
+    assert await service.get_session(app_name="app", user_id="eve", session_id=session.id)
+
+
+@pytest.mark.asyncio
+async def test_bounded_store_never_evicts_a_session_with_an_active_run():
+    service = BoundedMemorySessionService(max_bytes=100, min_idle_seconds=0)
+    session = await service.create_session(app_name="app", user_id="fay")
+    with service.active_run(app_name="app", user_id="fay", session_id=session.id):
+        await service.append_event(session, delta_event(1, market_data_analysis_output="x" * 500))
+        assert service.usage()["evictions"] == 0
+        assert service.usage()["active_runs"] == 1
+    other = await service.create_session(app_name="app", user_id="gus")
+    assert service.usage()["evictions"] == 1
+    assert await service.get_session(app_name="app", user_id="gus", session_id=other.id)
@@ -0,0 +1,94 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for keeping slow initialization off the import path"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from financial_advisor import utils
+from financial_advisor.import_benchmark import DEFERRED, parse_importtime, summarize
+from financial_advisor.tools import alpha_vantage_tools
+
+pytest_plugins = ("pytest_asyncio",)
+
+_IMPORT_APP = """
+import sys
+import google.auth
+
+def _fail(*args, **kwargs):
+    raise AssertionError("google.auth.default() called at import")
+
+google.auth.default = _fail
+import financial_advisor.fast_api_app
+from financial_advisor.tools import alpha_vantage_tools
+
+assert alpha_vantage_tools._alpha_vantage_toolset_instance is None, "toolset built at import"
+print(",".join(sorted(name for name in {DEFERRED!r} if name in sys.modules)))
+"""
+
+
+def test_app_import_defers_auth_mcp_and_report_libraries():
+    completed = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", _IMPORT_APP.format(DEFERRED=DEFERRED)],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).parent.parent,
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    assert completed.stdout.strip() == ""
+
+
+def test_lazy_exports_resolve_on_first_use():
+    from financial_advisor.utils.pdf_generator import generate_pdf_report
+
+    assert utils.generate_pdf_report is generate_pdf_report
+    assert not hasattr(utils, "missing_helper")
+
+
+@pytest.mark.asyncio
+async def test_deferred_toolset_offers_no_tools_without_an_api_key(monkeypatch):
+    monkeypatch.delenv("ALPHA_VANTAGE_API_KEY", raising=False)
+    monkeypatch.setattr(alpha_vantage_tools, "_alpha_vantage_toolset_instance", None)
+    toolset = alpha_vantage_tools.get_all_alpha_vantage_tools()
+    assert alpha_vantage_tools._alpha_vantage_toolset_instance is None
+    with pytest.warns(UserWarning, match="ALPHA_VANTAGE_API_KEY"):
+        assert await toolset.get_tools() == []
+
+
+def test_importtime_output_is_summarized():
+    stderr = "\n".join(
+        [
+            "some warning",
+            "import time: self [us] | cumulative | imported package",
+            "import time:       500 |        500 |     fpdf.fonts",
+            "import time:      1500 |       2000 |   fpdf",
+            "import time:      3000 |       5000 | financial_advisor.utils",
+        ]
+    )
+    records = parse_importtime(stderr)
+    assert [(r.name, r.depth) for r in records] == [
+        ("fpdf.fonts", 2),
+        ("fpdf", 1),
+        ("financial_advisor.utils", 0),
+    ]
+    summary = summarize("financial_advisor.utils", records)
+    assert summary["total_ms"] == 5.0
+    assert summary["packages"][0] == ("financial_advisor", 3.0)
+    assert summary["own_modules"] == [("financial_advisor.utils", 5.0)]
+    assert summary["deferred_imported"] == ["fpdf"]
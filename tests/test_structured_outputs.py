@@ -0,0 +1,163 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the structured sub-agent payloads"""
+
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from pydantic import Field
+
+from financial_advisor.context_shaping import render_inputs
+from financial_advisor.structured_outputs import (
+    ExecutiveSummary,
+    MarketData,
+    key_figures,
+    load_structured,
+    record_market_data,
+)
+from financial_advisor.sub_agents.data_analyst import data_analyst_agent
+from financial_advisor.utils.pdf_generator import generate_pdf_report
+from financial_advisor.utils.stock_plotter import price_trend_from_market_data
+
+pytest_plugins = ("pytest_asyncio",)
+
+MARKET_DATA = {
+    "ticker": "AAPL",
+    "current_price": 230.1,
+    "trend_30d": "Up 4% over the last month",
+    "change_30d": 8.9,
+    "change_30d_percent": 4.0,
+    "pe_ratio": 37.32,
+    "week_52_low": 168.63,
+    "week_52_high": 288.62,
+}
+
+STATE = {
+    "market_data_structured": MARKET_DATA,
+    "trading_strategies_structured": {
+        "strategies": [
+            {"name": "Value Entry", "top_rank": 2},
+            {"name": "Sector Leader", "top_rank": 1, "estimated_annual_return_percent": 17},
+            {"name": "Dividend Growth"},
+        ]
+    },
+    "risk_assessment_structured": {
+        "strategies": [{"strategy": "Sector Leader", "risk_level": "Medium", "risk_score": 4}],
+        "recommended_strategy": "Sector Leader",
+    },
+}
+
+
+class RecordingLlm(BaseLlm):
+    """Records market data through the tool if given a payload, then replies."""
+
+    payload: dict = Field(default_factory=dict)
+
+    async def generate_content_async(self, llm_request, stream=False):
+        answered = any(
+            part.function_response
+            for content in llm_request.contents
+            for part in content.parts or []
+        )
+        if self.payload and not answered:
+            part = types.Part.from_function_call(
+                name="record_market_data", args={"market_data": self.payload}
+            )
+        else:
+            part = types.Part(text="**Market Analysis Report for: AAPL**")
+        yield LlmResponse(content=types.Content(role="model", parts=[part]))
+
+
+def test_record_tool_validates_before_storing():
+    tool_context = SimpleNamespace(state={})
+    result = record_market_data({"current_price": "not a number"}, tool_context)
+    assert result["status"] == "error"
+    assert any(error.startswith("ticker:") for error in result["errors"])
+    assert any(error.startswith("current_price:") for error in result["errors"])
+    assert tool_context.state == {}
+
+    assert record_market_data(MARKET_DATA, tool_context)["status"] == "success"
+    assert tool_context.state["market_data_structured"] == MARKET_DATA  # unset fields are not stored
+    assert load_structured(tool_context.state, "market_data_analysis_output").pe_ratio == 37.32
+
+
+@pytest.mark.asyncio
+async def test_agent_records_payload_and_a_later_run_clears_it(monkeypatch):
+    monkeypatch.setattr(data_analyst_agent, "tools", data_analyst_agent.tools[1:])
+    runner = InMemoryRunner(agent=data_analyst_agent)
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="u"
+    )
+
+    async def run(payload):
+        monkeypatch.setattr(data_analyst_agent, "model", RecordingLlm(model="scripted", payload=payload))
+        async for _event in runner.run_async(
+            user_id="u",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text="AAPL")]),
+        ):
+            pass
+        return (
+            await runner.session_service.get_session(
+                app_name=runner.app_name, user_id="u", session_id=session.id
+            )
+        ).state
+
+    state = await run(MARKET_DATA)
+    assert state["market_data_structured"]["current_price"] == 230.1
+    assert state["market_data_analysis_output"] == "**Market Analysis Report for: AAPL**"
+
+    state = await run({})
+    assert state["market_data_structured"] is None
+
+
+def test_consumers_read_fields_instead_of_prose():
+    trend = price_trend_from_market_data(MarketData.model_validate(MARKET_DATA))
+    assert trend == {
+        "ticker": "AAPL",
+        "current_price": 230.1,
+        "trend_description": "Up 4% over the last month",
+        "price_change_30d": {"change": 8.9, "percent": 4.0},
+    }
+
+    figures = dict(key_figures(STATE))
+    assert figures["Current price"] == "$230.10"
+    assert figures["52-week range"] == "$168.63 - $288.62"
+    assert figures["Top strategy #1"] == "Sector Leader (17% per year)"
+    assert figures["Risk: Sector Leader"] == "Medium (4/10)"
+
+    shaped = render_inputs(
+        "summary_agent",
+        {**STATE, "market_data_analysis_output": "long prose report"},
+        ["market_data_analysis_output"],
+        enabled=True,
+    )
+    assert shaped.startswith("market_data_analysis_output (structured):\n{")
+    assert "long prose report" not in shaped
+
+
+def test_pdf_is_laid_out_from_the_structured_summary(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    summary = ExecutiveSummary.model_validate(
+        {"sections": [{"heading": "Market Overview", "bullets": ["P/E of 37.32"]}]}
+    )
+    path = generate_pdf_report("", "AAPL", summary=summary, figures=key_figures(STATE))
+    assert (tmp_path / path).read_bytes().startswith(b"%PDF")
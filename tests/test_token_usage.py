@@ -0,0 +1,127 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for per-run token and cost accounting"""
+
+import json
+from pathlib import Path
+
+import pytest
+from google.adk.apps import App
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from pydantic import Field
+
+from financial_advisor.agent import financial_coordinator
+from financial_advisor.model_routing import PRO_MODEL
+from financial_advisor.sub_agents.summary_agent import summary_agent
+from financial_advisor.token_usage import (
+    RUN_USAGE_KEY,
+    SESSION_USAGE_KEY,
+    TokenUsagePlugin,
+    format_report,
+    session_usage,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+SESSION_FILE = Path(__file__).parent.parent / "session-5eacfd80-33a5-4b48-96eb-1b01ee9fe045.json"
+
+
+class MeteredLlm(BaseLlm):
+    """Optionally calls one tool, then replies; reports fixed token usage."""
+
+    reply: str
+    call: dict = Field(default_factory=dict)
+
+    async def generate_content_async(self, llm_request, stream=False):
+        answered = any(
+            part.function_response
+            for content in llm_request.contents
+            for part in content.parts or []
+        )
+        if self.call and not answered:
+            part = types.Part.from_function_call(**self.call)
+        else:
+            part = types.Part(text=self.reply)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=1000, cached_content_token_count=400, candidates_token_count=50
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_runs_accumulate_usage_per_agent_in_state(monkeypatch):
+    monkeypatch.setenv("AGENT_OUTPUT_CACHE_DISABLED", "1")
+    monkeypatch.setattr(summary_agent, "model", MeteredLlm(model=PRO_MODEL, reply="summary"))
+    monkeypatch.setattr(
+        financial_coordinator,
+        "model",
+        MeteredLlm(
+            model=PRO_MODEL,
+            reply="done",
+            call={"name": "summary_agent", "args": {"request": "summarize"}},
+        ),
+    )
+    runner = Runner(
+        app=App(name="usage", root_agent=financial_coordinator, plugins=[TokenUsagePlugin()]),
+        session_service=InMemorySessionService(),
+    )
+    session = await runner.session_service.create_session(app_name="usage", user_id="u")
+    for _ in range(2):
+        async for _event in runner.run_async(
+            user_id="u",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text="go")]),
+        ):
+            pass
+    state = (
+        await runner.session_service.get_session(
+            app_name="usage", user_id="u", session_id=session.id
+        )
+    ).state
+
+    # The second run answers without calling the summary agent again
+    run = state[RUN_USAGE_KEY]
+    assert run["agents"] == {"financial_coordinator": run["agents"]["financial_coordinator"]}
+    assert run["total"]["calls"] == 1
+
+    # Session totals add up both runs, including the sub-agent's nested run
+    session_report = state[SESSION_USAGE_KEY]
+    assert session_report["agents"]["financial_coordinator"]["calls"] == 3
+    assert session_report["agents"]["summary_agent"] == {
+        "model": PRO_MODEL,
+        "calls": 1,
+        "prompt_tokens": 1000,
+        "cached_tokens": 400,
+        "output_tokens": 50,
+        "thoughts_tokens": 0,
+        "cost_usd": pytest.approx((600 * 1.25 + 400 * 1.25 * 0.25 + 50 * 10) / 1e6),
+    }
+    assert session_report["total"]["prompt_tokens"] == 4000
+
+
+def test_report_falls_back_to_recorded_event_usage():
+    report = session_usage(json.loads(SESSION_FILE.read_text()))
+    coordinator = report["agents"]["financial_coordinator"]
+    assert coordinator["model"] == PRO_MODEL
+    assert coordinator["calls"] > 0 and coordinator["prompt_tokens"] > coordinator["cached_tokens"]
+    assert report["total"]["cost_usd"] == pytest.approx(coordinator["cost_usd"])
+    assert "financial_coordinator" in format_report(report, sessions=1)
@@ -0,0 +1,59 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for instance warm-up"""
+
+import asyncio
+
+import pytest
+
+from financial_advisor.warmup import Warmup, get_warmup_steps, warm_mcp
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+def test_steps_follow_the_environment(monkeypatch):
+    monkeypatch.delenv("WARMUP_STEPS", raising=False)
+    monkeypatch.delenv("WARMUP_TICKERS", raising=False)
+    assert get_warmup_steps() == ["mcp", "model", "reports"]
+    monkeypatch.setenv("WARMUP_TICKERS", "aapl, msft")
+    assert get_warmup_steps() == ["mcp", "model", "reports", "tickers"]
+    monkeypatch.setenv("WARMUP_STEPS", "tickers,MCP,bogus")
+    assert get_warmup_steps() == ["mcp", "tickers"]
+    monkeypatch.setenv("WARMUP_DISABLED", "1")
+    assert get_warmup_steps() == []
+
+
+@pytest.mark.asyncio
+async def test_slow_steps_time_out_without_blocking_readiness():
+    async def hang():
+        await asyncio.sleep(10)
+
+    warmup = Warmup(["mcp"], step_timeout=0.05, step_functions={"mcp": hang})
+    assert not warmup.ready
+    await warmup.run()
+    assert warmup.ready
+    assert warmup.snapshot()["steps"]["mcp"]["status"] == "timeout"
+    assert warmup.stats()["failed_steps"] == 1
+
+
+@pytest.mark.asyncio
+async def test_mcp_step_is_skipped_without_an_api_key(monkeypatch):
+    from financial_advisor.tools import alpha_vantage_tools
+
+    monkeypatch.delenv("ALPHA_VANTAGE_API_KEY", raising=False)
+    monkeypatch.setattr(alpha_vantage_tools, "_alpha_vantage_toolset_instance", None)
+    with pytest.warns(UserWarning):
+        assert await warm_mcp() == {"skipped": "ALPHA_VANTAGE_API_KEY not set"}
@@ -0,0 +1,122 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the workflow root agent"""
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from pydantic import Field
+
+from financial_advisor import get_root_agent
+from financial_advisor.workflow import workflow_root_agent
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class ScriptedLlm(BaseLlm):
+    """Calls start_analysis once if offered, otherwise replies with fixed text."""
+
+    reply: str
+    prompts: list = Field(default_factory=list)
+
+    async def generate_content_async(self, llm_request, stream=False):
+        texts = [
+            part.text
+            for content in llm_request.contents
+            for part in content.parts or []
+            if part.text
+        ]
+        self.prompts.append("\n".join([llm_request.config.system_instruction, *texts]))
+        answered = any(
+            part.function_response
+            for content in llm_request.contents
+            for part in content.parts or []
+        )
+        if "start_analysis" in llm_request.tools_dict and not answered:
+            part = types.Part.from_function_call(
+                name="start_analysis",
+                args={
+                    "ticker": "aapl",
+                    "risk_attitude": "moderate",
+                    "investment_period": "long-term",
+                    "execution_preferences": "",
+                },
+            )
+        else:
+            part = types.Part(text=self.reply)
+        yield LlmResponse(content=types.Content(role="model", parts=[part]))
+
+
+def _llm_agents(agent):
+    if isinstance(agent, LlmAgent):
+        yield agent
+    for sub_agent in agent.sub_agents:
+        yield from _llm_agents(sub_agent)
+
+
+def test_root_agent_is_selectable(monkeypatch):
+    assert get_root_agent("workflow") is workflow_root_agent
+    monkeypatch.setenv("FINANCIAL_ADVISOR_ROOT_AGENT", "coordinator")
+    assert get_root_agent().name == "financial_coordinator"
+    with pytest.raises(ValueError):
+        get_root_agent("unknown")
+
+
+@pytest.mark.asyncio
+async def test_workflow_runs_every_stage_with_state_inputs(monkeypatch):
+    monkeypatch.setenv("DEMO_MODE", "1")
+    models = {}
+    for agent in _llm_agents(workflow_root_agent):
+        models[agent.name] = ScriptedLlm(
+            model="scripted", reply=f"{agent.name} output", prompts=[]
+        )
+        monkeypatch.setattr(agent, "model", models[agent.name])
+        if agent.name == "data_analyst_agent":
+            monkeypatch.setattr(agent, "tools", [])
+
+    runner = InMemoryRunner(agent=workflow_root_agent)
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="test_user"
+    )
+    authors = []
+    async for event in runner.run_async(
+        user_id="test_user",
+        session_id=session.id,
+        new_message=types.Content(
+            role="user", parts=[types.Part(text="AAPL, moderate, long-term")]
+        ),
+    ):
+        authors.append(event.author)
+
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id="test_user", session_id=session.id
+    )
+    state = session.state
+    assert state["ticker"] == "AAPL"
+    assert state["final_risk_assessment_output"] == "risk_analyst_agent output"
+    assert authors.count("workflow_coordinator") == 2  # call + response, no routing turns
+    assert set(state["stage_timings"]) >= {
+        "data_analyst_agent",
+        "trading_analyst_agent",
+        "execution_analyst_agent",
+        "risk_analyst_agent",
+    }
+
+    risk_prompt = models["risk_analyst_agent"].prompts[0]
+    assert "execution_analyst_agent output" in risk_prompt
+    assert "user_risk_attitude: moderate" in risk_prompt